@@ -0,0 +1,62 @@
+# file: benchmarks/bench_cse.py
+"""
+Loop bodies that repeat the same pure sub-expressions (distance-style
+arithmetic, a repeated call to a pure helper).
+
+The CSE pass computes each repeated value once per iteration and reads it
+back from a hidden local. wasmtime's optimising tier already merges repeated
+plain arithmetic itself, so expect the gain on the call, and on smaller
+code (fewer instructions) for the products.
+"""
+from lmn.compiler.optimizer.options import OptimizerOptions
+
+from bench_utils import report, time_main
+
+N = 1_000_000
+
+PROGRAMS = {
+    "repeated products": f"""
+function main()
+  let total = 0
+  for i = 0 to {N}
+    let dx = i - 500
+    let dy = i - 250
+    total = total + (dx * dx + dy * dy) % 7 + (dx * dx + dy * dy) % 11 + (dx * dx + dy * dy) % 13
+  end
+  print total
+  return 0
+end
+""",
+    "repeated pure call": f"""
+function mix(x)
+  let h = x
+  for k = 0 to 8
+    h = h * 31 + k
+  end
+  return h
+end
+
+function main()
+  let total = 0
+  for i = 0 to {N // 4}
+    total = total + mix(i) % 3 + mix(i) % 5
+  end
+  print total
+  return 0
+end
+""",
+}
+
+def main():
+    for title, code in PROGRAMS.items():
+        rows = []
+        for label, optimize in (
+            ("opt without CSE", OptimizerOptions(cse=False)),
+            ("opt", True),
+        ):
+            seconds, output = time_main(code, optimize=optimize, repeat=3)
+            rows.append((label, seconds, output))
+        report(title, rows)
+
+if __name__ == "__main__":
+    main()
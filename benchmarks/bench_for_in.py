@@ -0,0 +1,75 @@
+# file: benchmarks/bench_for_in.py
+"""
+Summing a 1M-element typed array with `for x in xs`.
+
+The array is written into linear memory by the host (LMN has no array
+constructor for a million elements) and passed to an exported LMN function.
+The loop reads the length once and walks the elements with a cursor, one
+load per element; Python's built-in sum() over the same values is shown for
+reference.
+"""
+import struct
+import time
+
+from lmn.runtime.host.core.malloc.call_malloc import call_malloc
+
+from bench_utils import compile_and_instantiate, report
+
+N = 1_000_000
+
+PROGRAMS = {
+    "int[]": ("i", "int", "0"),
+    "long[]": ("q", "long", "0"),
+    "double[]": ("d", "double", "0.0"),
+}
+
+def program(element_type, zero):
+    return f"""
+function total(xs: {element_type}[])
+  let t: {element_type} = {zero}
+  for x in xs
+    t = t + x
+  end
+  return t
+end
+
+function main()
+  return 0
+end
+"""
+
+def write_array(env, memory, fmt, values):
+    # [length:i32][elements...], elements starting at pointer + 4
+    data = struct.pack("<i", len(values)) + struct.pack(f"<{len(values)}{fmt}", *values)
+    ptr = call_malloc(env["store"], memory, env["output_lines"], len(data) + 8)
+    ptr += -(ptr + 4) % 8  # 8-byte aligned elements
+    memory.write(env["store"], data, ptr)
+    return ptr
+
+def main():
+    for title, (fmt, element_type, zero) in PROGRAMS.items():
+        values = [i % 1000 for i in range(N)]
+        if fmt == "d":
+            values = [v * 0.5 for v in values]
+
+        env, exports, _ = compile_and_instantiate(program(element_type, zero))
+        ptr = write_array(env, exports["memory"], fmt, values)
+
+        best, result = None, None
+        for _ in range(5):
+            start = time.perf_counter()
+            result = exports["total"](env["store"], ptr)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        start = time.perf_counter()
+        expected = sum(values)
+        python_seconds = time.perf_counter() - start
+
+        report(f"sum of {N} {title} elements", [
+            ("for x in xs", best, result),
+            ("python sum() (reference)", python_seconds, expected),
+        ])
+
+if __name__ == "__main__":
+    main()
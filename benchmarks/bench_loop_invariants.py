@@ -0,0 +1,49 @@
+# file: benchmarks/bench_loop_invariants.py
+"""
+A for-loop whose bound is a function call.
+
+Without the loop pass the bound `limit(n)` is called on every iteration
+(limit itself loops n times), so the loop is quadratic. With the pass the
+bound is evaluated once into a hidden local, `k * 3` moves to the loop
+preheader, and the loop is bottom-tested.
+"""
+from lmn.compiler.optimizer.options import OptimizerOptions
+
+from bench_utils import report, time_main
+
+N = 20_000
+
+CALL_BOUND = f"""
+function limit(n)
+  let total = 0
+  for i = 0 to n
+    total = total + 1
+  end
+  return total
+end
+
+function main()
+  let sum = 0
+  let k = 7
+  for i = 0 to limit({N})
+    sum = sum + k * 3 + i
+  end
+  print sum
+  return 0
+end
+"""
+
+def main():
+    rows = []
+    for label, optimize in (
+        ("no-opt", False),
+        ("opt without loop pass", OptimizerOptions(loops=False)),
+        ("opt", True),
+    ):
+        seconds, output = time_main(CALL_BOUND, optimize, repeat=3)
+        rows.append((label, seconds, output))
+
+    report(f"Call-valued loop bound, n = {N:,}", rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# file: benchmarks/bench_short_circuit.py
+"""
+An expensive right-hand side behind `and` / `or`.
+
+`slow(n)` stands in for a costly call (an llm(...) or tool call in real
+programs). The left side already decides the result, so with short-circuit
+codegen slow() never runs. The "eager" rows evaluate the right side into a
+variable first, which is what the old `and` / `or` code (i32.add of both
+sides) cost.
+"""
+from bench_utils import report, time_main
+
+N = 20_000
+ITERATIONS = 100
+
+def program(condition, eager):
+    rhs = "slow(i) > 0"
+    if eager:
+        setup = f"    let rhs = {rhs}\n"
+        test = f"{condition} rhs"
+    else:
+        setup = ""
+        test = f"{condition} {rhs}"
+    return f"""
+function slow(seed)
+  let total = 0
+  for k = 0 to {N}
+    total = total + seed
+  end
+  return total
+end
+
+function main()
+  let hits = 0
+  for i = 0 to {ITERATIONS}
+{setup}    if {test}
+      hits = hits + 1
+    end
+  end
+  print hits
+  return 0
+end
+"""
+
+def main():
+    rows = []
+    for label, condition in (("and", "i < 0 and"), ("or", "i >= 0 or")):
+        for mode, eager in (("eager", True), ("short-circuit", False)):
+            seconds, output = time_main(program(condition, eager), repeat=3)
+            rows.append((f"{label} ({mode})", seconds, output))
+
+    report(f"Expensive right-hand side, {ITERATIONS} evaluations", rows)
+
+if __name__ == "__main__":
+    main()
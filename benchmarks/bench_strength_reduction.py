@@ -0,0 +1,67 @@
+# file: benchmarks/bench_strength_reduction.py
+"""
+Tight integer loops dominated by multiplications, divisions and remainders
+by constants (hashing, digit sums, index arithmetic).
+
+The strength-reduction pass turns them into shifts, adds and magic-number
+multiplies, and `i * c` in a loop body into an induction variable.
+"""
+from lmn.compiler.optimizer.options import OptimizerOptions
+
+from bench_utils import report, time_main
+
+N = 1_000_000
+
+PROGRAMS = {
+    "digit sums (/ 10, % 10)": f"""
+function main()
+  let total = 0
+  for i = 0 to {N}
+    let x = i + 1
+    let digits = 0
+    for d = 0 to 7
+      digits = digits + x % 10
+      x = x / 10
+    end
+    total = total + digits
+  end
+  print total
+  return 0
+end
+""",
+    "mixed hash (* 8, / 4, % 16)": f"""
+function main()
+  let h = 7
+  for i = 0 to {N}
+    h = h * 8 + i / 4 + i % 16
+    h = h % 1000003
+  end
+  print h
+  return 0
+end
+""",
+    "index arithmetic (i * 12)": f"""
+function main()
+  let total = 0
+  for i = 0 to {N}
+    total = total + i * 12 + i * 5
+  end
+  print total
+  return 0
+end
+""",
+}
+
+def main():
+    for title, code in PROGRAMS.items():
+        rows = []
+        for label, optimize in (
+            ("opt without strength reduction", OptimizerOptions(strength_reduction=False)),
+            ("opt", True),
+        ):
+            seconds, output = time_main(code, optimize, repeat=5)
+            rows.append((label, seconds, output))
+        report(f"{title}, n = {N:,}", rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# file: benchmarks/bench_strings.py
+"""
+Printing long string literals: every print_string call makes the host read
+the whole string out of linear memory.
+
+With the "nul" layout the host searches for the terminator; with the
+"length" layout it reads the u32 length in front of the pointer and copies
+the text in one go. Before the layouts were added the host scanned byte by
+byte and cut every string off at 64 KB.
+"""
+from bench_utils import report, time_main
+
+PRINTS = 200
+
+def program(size):
+    text = "lorem ipsum " * (size // 12)
+    return "function main()\n" + f'  print "{text}"\n' * PRINTS + "  return 0\nend\n"
+
+def main():
+    for size in (1_000, 60_000):
+        code = program(size)
+        rows = []
+        for layout in ("nul", "length"):
+            seconds, output = time_main(code, repeat=3, string_layout=layout)
+            rows.append((f"string_layout={layout}", seconds, f"{len(output)} chars"))
+        report(f"{PRINTS} prints of a {size} byte literal", rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# file: benchmarks/bench_switch.py
+"""
+64-way integer dispatch (a state machine as LLM-generated code tends to
+write it: one long if/elseif chain on the state).
+
+Without the switch pass every step walks the chain comparison by comparison;
+with it a dense chain is a single br_table and a sparse one a binary search.
+"""
+from lmn.compiler.optimizer.options import OptimizerOptions
+
+from bench_utils import report, time_main
+
+WAYS = 64
+STEPS = 200_000
+
+def program(stride):
+    arms = []
+    for state in range(WAYS):
+        keyword = "if" if state == 0 else "elseif"
+        arms.append(
+            f"    {keyword} state == {state * stride}\n"
+            f"      acc = acc + {state + 1}\n"
+            f"      state = {((state * 37 + 11) % WAYS) * stride}"
+        )
+    return f"""
+function main()
+  let state = 0
+  let acc = 0
+  for step = 0 to {STEPS}
+{chr(10).join(arms)}
+    else
+      state = 0
+    end
+  end
+  print acc
+  return 0
+end
+"""
+
+def main():
+    for title, stride in (("dense constants", 1), ("sparse constants", 1000)):
+        code = program(stride)
+        rows = []
+        for label, optimize in (
+            ("no-opt", False),
+            ("opt without switch pass", OptimizerOptions(switches=False)),
+            ("opt", True),
+        ):
+            seconds, output = time_main(code, optimize, repeat=3)
+            rows.append((label, seconds, output))
+        report(f"{WAYS}-way dispatch, {STEPS:,} steps, {title}", rows)
+
+if __name__ == "__main__":
+    main()
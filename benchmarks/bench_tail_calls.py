@@ -0,0 +1,79 @@
+# file: benchmarks/bench_tail_calls.py
+"""
+Deep recursion with and without the tail-call pass.
+
+Without optimisation every call pushes a wasm frame, so a depth of one
+million exhausts the call stack. With the pass, both the plain tail call
+(count) and the accumulator pattern (depth: `return 1 + depth(n - 1)`)
+run as loops in constant stack space.
+"""
+from lmn.compiler.optimizer.options import OptimizerOptions
+
+from bench_utils import report, time_main
+
+DEPTH = 1_000_000
+
+COUNT = f"""
+function count(n, acc)
+  if n == 0
+    return acc
+  end
+  return count(n - 1, acc + 1)
+end
+
+function main()
+  print count({DEPTH}, 0)
+  return 0
+end
+"""
+
+DEPTH_ACC = f"""
+function depth(n)
+  if n == 0
+    return 0
+  end
+  return 1 + depth(n - 1)
+end
+
+function main()
+  print depth({DEPTH})
+  return 0
+end
+"""
+
+MUTUAL = f"""
+function is_even(n)
+  if n == 0
+    return 1
+  end
+  return is_odd(n - 1)
+end
+
+function is_odd(n)
+  if n == 0
+    return 0
+  end
+  return is_even(n - 1)
+end
+
+function main()
+  print is_even({DEPTH})
+  return 0
+end
+"""
+
+def main():
+    rows = []
+    for name, code in (("count (tail call)", COUNT), ("depth (accumulator)", DEPTH_ACC)):
+        for label, optimize in (("no-opt", False), ("opt", True)):
+            seconds, output = time_main(code, optimize)
+            rows.append((f"{name} {label}", seconds, output))
+
+    for label, optimize in (("opt", True), ("opt + return_call", OptimizerOptions(use_return_call=True))):
+        seconds, output = time_main(MUTUAL, optimize)
+        rows.append((f"is_even/is_odd {label}", seconds, output))
+
+    report(f"Recursion depth {DEPTH:,}", rows)
+
+if __name__ == "__main__":
+    main()
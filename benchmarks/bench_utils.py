@@ -0,0 +1,67 @@
+# file: benchmarks/bench_utils.py
+"""
+Small helpers shared by the benchmark scripts in this directory.
+
+Run a benchmark from the repo root, e.g.:
+
+    uv run python benchmarks/bench_tail_calls.py
+
+Programs are compiled with compile_code_to_wat(...) and instantiated straight
+from the WAT text (wasmtime accepts WAT), so wat2wasm is not required.
+"""
+import time
+
+import wasmtime
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.runtime.wasm_runner import create_environment
+
+
+def compile_and_instantiate(code, optimize=True, **compile_kwargs):
+    """
+    Compile LMN code and return (env, exports, wat_text). Extra keyword
+    arguments go to compile_code_to_wat (e.g. string_layout="length").
+    """
+    env = create_environment()
+    wat_text, _ = compile_code_to_wat(code, optimize=optimize, **compile_kwargs)
+    module = wasmtime.Module(env["engine"], wat_text)
+    instance = env["linker"].instantiate(env["store"], module)
+    exports = instance.exports(env["store"])
+    env["memory_ref"][0] = exports["memory"]
+    return env, exports, wat_text
+
+
+def time_main(code, optimize=True, repeat=5, **compile_kwargs):
+    """
+    Best-of-'repeat' wall time of main() in seconds, plus the program output.
+    Returns (None, error_message) if compilation or execution fails
+    (e.g. 'call stack exhausted').
+    """
+    try:
+        env, exports, _ = compile_and_instantiate(code, optimize, **compile_kwargs)
+    except Exception as e:
+        return None, f"compile error: {e}"
+
+    best = None
+    output = ""
+    for _ in range(repeat):
+        env["output_lines"].clear()
+        start = time.perf_counter()
+        try:
+            exports["main"](env["store"])
+        except wasmtime.Trap as e:
+            return None, str(e).splitlines()[-1].strip()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        output = "".join(env["output_lines"]).strip()
+    return best, output
+
+
+def report(title, rows):
+    """
+    Print a table of (label, seconds_or_None, output) rows.
+    """
+    print(f"=== {title} ===")
+    for label, seconds, output in rows:
+        timing = f"{seconds * 1000:10.3f} ms" if seconds is not None else "    failed   "
+        print(f"  {label:<34} {timing}   {output}")
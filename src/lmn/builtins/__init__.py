@@ -4,6 +4,11 @@ import json
 # Empty dictionary to store the flattened builtins
 BUILTINS = {}
 
+# Host functions with a "prefetch_handler" are also imported as
+# '<name>__prefetch' (same parameters, no result), which starts the call
+# in the background; see lmn.compiler.optimizer.fanout
+PREFETCH_SUFFIX = "__prefetch"
+
 # The directory containing this __init__.py file
 dir_path = os.path.dirname(__file__)
 
@@ -50,9 +55,24 @@ def _flatten_functions_in_block(block: dict) -> dict:
             "name": fn_name,
             "namespace": namespace,
             "signature": func_def["signature"],
-            "handler": func_def["handler"],
+            # inline builtins (e.g. array.json) have no host handler: the
+            # emitter generates their code into the module
+            "handler": func_def.get("handler"),
+            "inline": func_def.get("inline", wasm_block.get("inline", False)),
             "description": description,
-            "typechecker": typechecker
+            "typechecker": typechecker,
+            # optional: "pure": true => no side effects, so the optimizer
+            # may hoist or reuse calls (see lmn.compiler.optimizer.purity)
+            "pure": func_def.get("pure", block.get("pure", False)),
+            # optional: handler of '<name>__prefetch' (see PREFETCH_SUFFIX)
+            "prefetch_handler": func_def.get("prefetch_handler"),
+            # optional: "record": true => network-bound / nondeterministic, so
+            # the call is logged / served by a host-call trace
+            # (see lmn.runtime.host.host_call_trace)
+            "record": func_def.get("record", block.get("record", False)),
+            # optional: how call_tools finds the tool ("keywords", "default_args";
+            # see lmn.runtime.host.core.tools.tool_router)
+            "router": block.get("router")
         }
 
     return flattened
@@ -3,18 +3,26 @@
 import logging
 import colorama
 from colorama import Fore, Style
-from ollama import chat, ChatResponse
 
 # Import cli modules
 from lmn.cli.utils.banner import get_ascii_banner
 from lmn.cli.utils.system_prompt import get_system_prompt
+from lmn.cli.utils.chat_history import ChatHistory
 
 # Import lmn modules
-from lmn.runtime.wasm_runner import run_wasm, create_environment
-from lmn.runtime.utils import extract_lmn_code
+from lmn.runtime.wasm_runner import create_environment
+from lmn.runtime.code_block_pipeline import CodeBlockPipeline
+from lmn.runtime.host.core.llm.client_manager import get_client_manager
 
-# Initialize environment for the chat session
-env = create_environment()
+# the chat model
+CHAT_MODEL = "llama3.2"
+
+def show_output(text):
+    # program output (and `print llm(...)` chunks) as soon as it is produced
+    print(f"{Fore.CYAN}{text}{Style.RESET_ALL}", end="", flush=True)
+
+# Initialize environment for the chat session (loading the chat model meanwhile)
+env = create_environment(warm_up_models=[CHAT_MODEL], on_output=show_output)
 
 # setup logging
 logging.basicConfig(
@@ -35,8 +43,9 @@ def main():
     # Grab the system prompt from our new module
     system_prompt = get_system_prompt()
 
-    # setup the conversation history
-    conversation = [{"role": "system", "content": system_prompt}]
+    # setup the conversation history (fixed system prompt, older turns
+    # summarised once they outgrow the token budget)
+    history = ChatHistory(system_prompt)
 
     # loop until the user quits
     while True:
@@ -61,48 +70,62 @@ def main():
             continue
 
         # 1) Add user's message
-        conversation.append({"role": "user", "content": user_input})
-
-        # 2) Call Ollama
-        response_text = do_llama_chat(conversation)
-
-        # 3) Print LLM's raw reply
-        print(f"{Fore.MAGENTA}LLM> {Style.RESET_ALL}{response_text}")
+        history.add_user(user_input)
+        conversation = history.prompt()
+        print(f"{Style.DIM}[{history.report()}]{Style.RESET_ALL}")
 
-        # 4) Extract LMN code blocks
-        blocks = extract_lmn_code(response_text)
+        # 2) + 3) + 4) Call Ollama, printing the reply while it arrives; each
+        #    LMN code block compiles on a worker as soon as its fence closes
+        #    and runs (in order) once ready, even before the reply is complete
+        pipeline = CodeBlockPipeline(env, on_start=show_block_start, on_result=show_block_result)
+        print(f"{Fore.MAGENTA}LLM> {Style.RESET_ALL}", end="", flush=True)
+        response_text = do_llama_chat(conversation, on_chunk=lambda chunk: show_reply_chunk(pipeline, chunk))
+        print()
 
-        # check if blocks
-        if blocks:
-            # print some debug to show we've executred the code
-            print(f"{Fore.YELLOW}[Detected {len(blocks)} LMN code block(s). Running...]{Style.RESET_ALL}")
-
-            # for each detected code block
-            for block in blocks:
-                # run the was
-                outputs = run_wasm(block, env=env)
-
-                # print the outputs
-                for line in outputs:
-                    # print the output
-                    print(f"{Fore.CYAN}{line}{Style.RESET_ALL}")
+        # the remaining blocks (compiled meanwhile, most likely)
+        pipeline.finish()
 
         # 5) Add LLM response to conversation
-        conversation.append({"role": "assistant", "content": response_text})
-
-def do_llama_chat(conversation) -> str:
+        history.add_assistant(response_text)
+
+def show_reply_chunk(pipeline, chunk):
+    # print the chunk, then let the pipeline pick up / run finished code blocks
+    print(chunk, end="", flush=True)
+    pipeline.feed(chunk)
+
+def show_block_start(block):
+    # the block's output follows live (show_output)
+    print(f"\n{Fore.YELLOW}[Running LMN code block...]{Style.RESET_ALL}")
+
+def show_block_result(block, outputs):
+    # compile / instantiation errors come back as a separate list
+    if outputs is not env["output_lines"]:
+        print(f"\n{Fore.YELLOW}[LMN code block failed]{Style.RESET_ALL}")
+        for line in outputs:
+            print(f"{Fore.CYAN}{line}{Style.RESET_ALL}")
+    print()
+
+def do_llama_chat(conversation, on_chunk=None) -> str:
     try:
-        # setup the response
-        response: ChatResponse = chat(
-            model='llama3.2',
-            messages=conversation,
-        )
-
-        # return the content
-        return response.message.content
+        # setup the response (pooled client, model kept loaded)
+        if on_chunk is None:
+            response = get_client_manager().chat(CHAT_MODEL, conversation)
+            return response.message.content
+
+        # streamed: hand over each chunk as it arrives
+        parts = []
+        for part in get_client_manager().chat(CHAT_MODEL, conversation, stream=True):
+            chunk = part.message.content or ""
+            if chunk:
+                parts.append(chunk)
+                on_chunk(chunk)
+        return "".join(parts)
     except Exception as e:
-        # error
-        return f"(Error during LLM call: {e})"
+        # error
+        message = f"(Error during LLM call: {e})"
+        if on_chunk is not None:
+            on_chunk(message)
+        return message
 
 def show_help():
     # show help
@@ -7,6 +7,8 @@ import os
 
 # Make sure this import pulls in your updated 4-step pipeline code:
 from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.emitter.wasm.string_layout import NUL_TERMINATED, STRING_LAYOUTS
+from lmn.compiler.compile_profile import CompileProfile
 
 logging.basicConfig(
     level=logging.CRITICAL,
@@ -46,6 +48,22 @@ def main():
         "--wasm",
         help="Path to write the .wasm file. If omitted, no .wasm is produced."
     )
+    parser.add_argument(
+        "--no-opt",
+        action="store_true",
+        help="Disable the optimizer passes (inlining, ...)."
+    )
+    parser.add_argument(
+        "--string-layout",
+        choices=STRING_LAYOUTS,
+        default=NUL_TERMINATED,
+        help="How strings are stored: NUL-terminated, or with a u32 length header."
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print stage timings and optimizer decisions to stderr."
+    )
     args = parser.parse_args()
 
     # 1) Gather LMN source
@@ -72,12 +90,22 @@ def main():
     also_produce_wasm = bool(args.wasm)
 
     # 3) Compile code using the updated pipeline
+    profile = CompileProfile()
     try:
-        wat_text, wasm_bytes = compile_code_to_wat(code, also_produce_wasm=also_produce_wasm)
+        wat_text, wasm_bytes = compile_code_to_wat(
+            code,
+            also_produce_wasm=also_produce_wasm,
+            optimize=not args.no_opt,
+            profile=profile,
+            string_layout=args.string_layout
+        )
     except Exception as e:
         print(f"Compilation error: {e}")
         sys.exit(1)
 
+    if args.profile:
+        print(profile.format_report(), file=sys.stderr)
+
     # 4) Output WAT
     if args.wat:
         wat_path = os.path.abspath(args.wat)
@@ -15,8 +15,12 @@ logging.basicConfig(
     format="%(levelname)s - %(name)s - %(message)s"
 )
 
+def show_output(text):
+    # program output (and `print llm(...)` chunks) as soon as it is produced
+    print(f"{Fore.CYAN}{text}{Style.RESET_ALL}", end="", flush=True)
+
 # Initialize environment at the start of the REPL session
-env = create_environment()
+env = create_environment(on_output=show_output)
 
 def main():
     # setup colorama
@@ -85,18 +89,13 @@ def main():
 
                 outputs = compile_and_run(full_code)
 
-                # ------------------------------------------------
-                # NEW LOGIC: Join the outputs on one line
-                # ------------------------------------------------
-                cleaned = [item.strip() for item in outputs if item.strip()]
-                single_line = " ".join(cleaned).strip()
-
-                # Optional: filter out trailing "0" if you don't want function return
-                if single_line.endswith(" 0"):
-                    single_line = single_line[:-2].strip()
-
-                if single_line:
-                    print(f"{Fore.CYAN}{single_line}{Style.RESET_ALL}")
+                # the program's output was shown while it ran (show_output);
+                # compile / instantiation errors come back as a separate list
+                if outputs is not env["output_lines"]:
+                    for line in outputs:
+                        print(f"{Fore.CYAN}{line}{Style.RESET_ALL}")
+                elif outputs and not "".join(outputs).endswith("\n"):
+                    print()
 
             first_line = True
         else:
@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 # src/lmn/cli/run_wasm.py
 import sys
+import argparse
 import logging
 import wasmtime
+from lmn.runtime.host.host_call_trace import HostCallTrace, RECORD, REPLAY
 from lmn.runtime.wasm_runner import create_environment
+from lmn.runtime.runtime_profile import RuntimeProfile
 
 def main():
     # Setup logging
@@ -13,12 +16,23 @@ def main():
     )
 
     # Check arguments
-    if len(sys.argv) != 2:
-        print("Usage: run_wasm.py <wasm_file>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Run a compiled LMN .wasm file.")
+    parser.add_argument("wasm_file")
+    trace_group = parser.add_mutually_exclusive_group()
+    trace_group.add_argument("--record", metavar="TRACE",
+                             help="log the llm / tool calls to this trace file (.jsonl or .jsonl.gz)")
+    trace_group.add_argument("--replay", metavar="TRACE",
+                             help="answer the llm / tool calls from this trace file, offline")
+    args = parser.parse_args()
+
+    trace = None
+    if args.record:
+        trace = HostCallTrace(args.record, RECORD)
+    elif args.replay:
+        trace = HostCallTrace(args.replay, REPLAY)
 
     # Create environment (this sets up all host functions)
-    env = create_environment()
+    env = create_environment(trace=trace)
 
     try:
         # Get environment components
@@ -29,7 +43,7 @@ def main():
         output_lines = env["output_lines"]
 
         # Load and instantiate the WASM module directly
-        module = wasmtime.Module.from_file(engine, sys.argv[1])
+        module = wasmtime.Module.from_file(engine, args.wasm_file)
         instance = linker.instantiate(store, module)
 
         # Get memory if available
@@ -64,9 +78,18 @@ def main():
             print("Error: Neither 'main' nor '__top_level__' was found in module exports.")
             sys.exit(1)
 
+        # Memo table / LLM cache hit rates (only if there were any)
+        profile = RuntimeProfile()
+        profile.collect(store, exports)
+        if profile.memo or profile.llm_cache_lookups():
+            print(profile.format_report(), file=sys.stderr)
+
     except Exception as e:
         print(f"Error running WASM file: {e}")
         sys.exit(1)
+    finally:
+        if trace is not None:
+            trace.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,128 @@
+# file: src/lmn/cli/utils/chat_history.py
+
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Rough token estimate: ~4 characters per token, plus a few tokens of
+# chat-template overhead per message
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Leaves room for the reply in a 4096-token context
+DEFAULT_TOKEN_BUDGET = 3072
+DEFAULT_MAX_SUMMARY_TOKENS = 256
+# When over budget, compact down to this share of it, so the prompt prefix
+# stays the same for several turns (the server can reuse its cache)
+DEFAULT_LOW_WATER = 0.75
+
+SUMMARY_HEADER = "Earlier in this conversation (summarised):"
+SUMMARY_LINE_CHARS = 120
+
+_CODE_BLOCK = re.compile(r"```.*?(```|$)", re.DOTALL)
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN) + MESSAGE_OVERHEAD_TOKENS
+
+def estimate_messages_tokens(messages: list[dict]) -> int:
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+def summarize_turns(previous: str, dropped: list[dict], max_tokens: int) -> str:
+    """
+    The default summariser (local, no LLM call): one shortened line per
+    dropped message, code blocks replaced by [code], appended to the previous
+    summary; only the most recent lines that fit in 'max_tokens' are kept.
+    """
+    lines = previous.splitlines() if previous else []
+    for message in dropped:
+        text = " ".join(_CODE_BLOCK.sub("[code]", message["content"]).split())
+        if len(text) > SUMMARY_LINE_CHARS:
+            text = text[:SUMMARY_LINE_CHARS - 3] + "..."
+        lines.append(f"{message['role']}: {text}")
+
+    kept, size = [], 0
+    for line in reversed(lines):
+        size += len(line) + 1
+        if size > max_tokens * CHARS_PER_TOKEN:
+            break
+        kept.append(line)
+    return "\n".join(reversed(kept))
+
+
+class ChatHistory:
+    """
+    The messages lmn_chat sends to the model, bounded by a token budget:
+
+      - the system prompt is always the first message, unchanged
+      - then a summary of the turns that no longer fit (if any)
+      - then the most recent turns, verbatim
+
+    When the estimated prompt exceeds 'token_budget', the oldest turns are
+    folded into the summary until it is back under low_water * budget (the
+    newest user message always stays). 'summarize(previous, dropped,
+    max_tokens)' may be replaced, e.g. by an LLM call.
+    """
+
+    def __init__(self, system_prompt: str, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 max_summary_tokens: int = DEFAULT_MAX_SUMMARY_TOKENS, low_water: float = DEFAULT_LOW_WATER,
+                 summarize=summarize_turns):
+        self.system_message = {"role": "system", "content": system_prompt}
+        self.token_budget = token_budget
+        self.max_summary_tokens = max_summary_tokens
+        self.low_water = low_water
+        self.summarize = summarize
+
+        self.recent = []            # messages of the turns sent verbatim
+        self.summary = ""
+        self.summarized_turns = 0
+        self.last_prompt_tokens = 0
+
+    def add_user(self, text: str) -> None:
+        self.recent.append({"role": "user", "content": text})
+
+    def add_assistant(self, text: str) -> None:
+        self.recent.append({"role": "assistant", "content": text})
+
+    def prompt(self) -> list[dict]:
+        """
+        The messages for the next request (compacting the history first if
+        it outgrew the budget).
+        """
+        if estimate_messages_tokens(self._messages()) > self.token_budget:
+            self._compact()
+        messages = self._messages()
+        self.last_prompt_tokens = estimate_messages_tokens(messages)
+        return messages
+
+    def report(self) -> str:
+        return (
+            f"prompt ~{self.last_prompt_tokens} tokens "
+            f"({len(self.recent)} recent message(s), {self.summarized_turns} earlier turn(s) summarised)"
+        )
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+    def _messages(self) -> list[dict]:
+        messages = [self.system_message]
+        if self.summary:
+            messages.append({"role": "system", "content": f"{SUMMARY_HEADER}\n{self.summary}"})
+        return messages + self.recent
+
+    def _compact(self):
+        # 1) Drop the oldest turns (a user message + the replies after it)
+        #    until the rest plus a full summary fits under the low-water mark
+        target = self.token_budget * self.low_water
+        fixed = estimate_tokens(self.system_message["content"]) + estimate_tokens(SUMMARY_HEADER) + self.max_summary_tokens
+        dropped = []
+        while len(self.recent) > 1 and fixed + estimate_messages_tokens(self.recent) > target:
+            end = next((i for i in range(1, len(self.recent)) if self.recent[i]["role"] == "user"), len(self.recent) - 1)
+            dropped += self.recent[:end]
+            del self.recent[:end]
+            self.summarized_turns += 1
+
+        # 2) Fold them into the summary
+        if dropped:
+            self.summary = self.summarize(self.summary, dropped, self.max_summary_tokens)
+        logger.debug("ChatHistory: summarised %d message(s) => %s", len(dropped), self.report())
@@ -1,6 +1,6 @@
 # lmn/compiler/ast/statements/function_definition.py
 from __future__ import annotations
-from typing import List, Literal
+from typing import List, Literal, Optional
 from pydantic import Field
 
 # lmn imports
@@ -20,6 +20,9 @@ class FunctionDefinition(StatementBase):
     # Now 'body' is a list of Node objects
     body: List["Statement"] = Field(default_factory=list)
 
+    # Annotations written in front of the definition, e.g. ["memo"] for @memo
+    annotations: Optional[List[str]] = None
+
     def __str__(self):
         # create a string representation of the parameters
         params_str = ", ".join(
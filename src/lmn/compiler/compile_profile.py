@@ -0,0 +1,98 @@
+# file: lmn/compiler/compile_profile.py
+
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+class CompileProfile:
+    """
+    Collects timings and optimisation statistics for a single compilation.
+
+    The pipeline records how long each stage took, and every optimisation
+    pass can record counters ("stats") and human-readable decisions, e.g.:
+
+        profile.add_stat("inliner", "inlined", 1)
+        profile.add_decision("inliner", "inlined 'add' into 'main' (size=4)")
+
+    Pass a CompileProfile to compile_code_to_wat(...) and inspect it afterwards,
+    or print profile.format_report().
+    """
+
+    def __init__(self):
+        # stage name => elapsed seconds (insertion order = pipeline order)
+        self.stage_times = {}
+
+        # pass name => { "stats": {...}, "decisions": [...] }
+        self.passes = {}
+
+    @contextmanager
+    def time_stage(self, stage_name: str):
+        """
+        Context manager measuring the wall time of one pipeline stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stage_times[stage_name] = self.stage_times.get(stage_name, 0.0) + elapsed
+            logger.debug("CompileProfile: stage '%s' took %.6fs", stage_name, elapsed)
+
+    def _pass_entry(self, pass_name: str) -> dict:
+        if pass_name not in self.passes:
+            self.passes[pass_name] = {"stats": {}, "decisions": []}
+        return self.passes[pass_name]
+
+    def add_stat(self, pass_name: str, key: str, amount=1):
+        """
+        Add 'amount' to a numeric counter of the given pass.
+        """
+        stats = self._pass_entry(pass_name)["stats"]
+        stats[key] = stats.get(key, 0) + amount
+
+    def set_stat(self, pass_name: str, key: str, value):
+        """
+        Overwrite a statistic of the given pass (for non-cumulative values).
+        """
+        self._pass_entry(pass_name)["stats"][key] = value
+
+    def get_stat(self, pass_name: str, key: str, default=0):
+        return self.passes.get(pass_name, {}).get("stats", {}).get(key, default)
+
+    def add_decision(self, pass_name: str, message: str):
+        """
+        Record a human-readable optimisation decision.
+        """
+        logger.debug("CompileProfile[%s]: %s", pass_name, message)
+        self._pass_entry(pass_name)["decisions"].append(message)
+
+    def to_dict(self) -> dict:
+        return {
+            "stage_times": dict(self.stage_times),
+            "passes": {
+                name: {
+                    "stats": dict(entry["stats"]),
+                    "decisions": list(entry["decisions"])
+                }
+                for name, entry in self.passes.items()
+            }
+        }
+
+    def format_report(self) -> str:
+        """
+        Render the profile as plain text, e.g. for `lmn-compiler --profile`.
+        """
+        lines = ["=== Compile profile ==="]
+        for stage_name, elapsed in self.stage_times.items():
+            lines.append(f"  {stage_name:<24} {elapsed * 1000:9.3f} ms")
+
+        for pass_name, entry in self.passes.items():
+            lines.append(f"--- {pass_name} ---")
+            for key, value in entry["stats"].items():
+                lines.append(f"  {key}: {value}")
+            for message in entry["decisions"]:
+                lines.append(f"  * {message}")
+
+        return "\n".join(lines)
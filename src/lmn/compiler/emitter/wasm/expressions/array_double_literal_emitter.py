@@ -23,8 +23,7 @@ class DoubleArrayLiteralEmitter:
         :param emitter: a WasmEmitter-like object that provides:
           - emitter._add_data_segment(text: str) -> int
           - emitter.emit_expression(node, out_lines): code that yields f64 on stack
-          - emitter.current_data_offset (int)
-          - emitter.data_segments (List of (offset, bytes))
+          - emitter._add_data_bytes(data: bytes, align, header) -> int
           - emitter.request_local(name: str, wasm_type: str)
         """
         self.emitter = emitter
@@ -86,9 +85,7 @@ class DoubleArrayLiteralEmitter:
         logger.info("Emitting empty f64[] => 4 bytes (length=0)")
         data_bytes = struct.pack("<i", 0)  # i32=0 => length
 
-        offset = self.emitter.current_data_offset
-        self.emitter.data_segments.append((offset, data_bytes))
-        self.emitter.current_data_offset += len(data_bytes)
+        offset = self.emitter._add_data_bytes(data_bytes, align=8, header=4)
 
         logger.debug(
             "Empty double-array => offset=%d, bytes=%s",
@@ -132,9 +129,7 @@ class DoubleArrayLiteralEmitter:
                 i, val_d, packed.hex()
             )
 
-        offset = self.emitter.current_data_offset
-        self.emitter.data_segments.append((offset, data_bytes))
-        self.emitter.current_data_offset += len(data_bytes)
+        offset = self.emitter._add_data_bytes(data_bytes, align=8, header=4)
 
         logger.debug(
             "Static f64-array => offset=%d, total_bytes=%d",
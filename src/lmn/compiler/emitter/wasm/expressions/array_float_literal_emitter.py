@@ -23,8 +23,7 @@ class FloatArrayLiteralEmitter:
         :param emitter: A WasmEmitter-like object providing:
             - emitter._add_data_segment(text: str) -> int
             - emitter.emit_expression(node, out_lines): code that leaves a float on stack
-            - emitter.current_data_offset (int)
-            - emitter.data_segments (List[(offset, bytes)])
+            - emitter._add_data_bytes(data: bytes, align) -> int
             - emitter.request_local(name: str, wasm_type: str)
         """
         self.emitter = emitter
@@ -86,9 +85,7 @@ class FloatArrayLiteralEmitter:
         array_length = 0
         data_bytes = struct.pack("<i", array_length)  # i32 zero
 
-        offset = self.emitter.current_data_offset
-        self.emitter.data_segments.append((offset, data_bytes))
-        self.emitter.current_data_offset += len(data_bytes)
+        offset = self.emitter._add_data_bytes(data_bytes, align=4)
 
         logger.debug("Empty f32-array => offset=%d, bytes=%s", offset, data_bytes.hex())
 
@@ -125,9 +122,7 @@ class FloatArrayLiteralEmitter:
             data_bytes += packed
             logger.debug("static element[%d] => %s => bytes %s", i, val_f, packed.hex())
 
-        offset = self.emitter.current_data_offset
-        self.emitter.data_segments.append((offset, data_bytes))
-        self.emitter.current_data_offset += len(data_bytes)
+        offset = self.emitter._add_data_bytes(data_bytes, align=4)
 
         logger.debug("Static f32-array => offset=%d, total_bytes=%d", offset, len(data_bytes))
 
@@ -18,8 +18,7 @@ class IntArrayLiteralEmitter:
         :param emitter: Instance of WasmEmitter (or similar) providing:
             - emitter._add_data_segment(text: str) -> int
             - emitter.emit_expression(node, out_lines)
-            - emitter.current_data_offset (int)
-            - emitter.data_segments (List)
+            - emitter._add_data_bytes(data: bytes, align) -> int
             - emitter.request_local(name: str, wasm_type: str)
         """
         self.emitter = emitter
@@ -74,9 +73,7 @@ class IntArrayLiteralEmitter:
         array_length = 0
         array_bytes = struct.pack("<i", array_length)
 
-        offset = self.emitter.current_data_offset
-        self.emitter.data_segments.append((offset, array_bytes))
-        self.emitter.current_data_offset += len(array_bytes)
+        offset = self.emitter._add_data_bytes(array_bytes, align=4)
 
         logger.debug("Empty int-array at offset=%d, bytes=%s", offset, array_bytes.hex())
 
@@ -108,9 +105,7 @@ class IntArrayLiteralEmitter:
             logger.debug("Static element[%d] = %s => bytes %s", i, val_str, val_bytes.hex())
 
         # 3) store in data segment
-        offset = self.emitter.current_data_offset
-        self.emitter.data_segments.append((offset, data_bytes))
-        self.emitter.current_data_offset += len(data_bytes)
+        offset = self.emitter._add_data_bytes(data_bytes, align=4)
 
         logger.debug(
             "Static int-array => offset=%d, total_bytes=%d", 
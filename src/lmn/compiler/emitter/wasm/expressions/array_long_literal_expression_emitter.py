@@ -23,8 +23,7 @@ class LongArrayLiteralEmitter:
         :param emitter: A WasmEmitter-like object providing:
             - emitter._add_data_segment(text: str) -> int
             - emitter.emit_expression(node, out_lines): code to produce a value
-            - emitter.current_data_offset (int)
-            - emitter.data_segments (List[ (offset, bytes) ])
+            - emitter._add_data_bytes(data: bytes, align, header) -> int
             - emitter.request_local(name: str, wasm_type: str)
         """
         self.emitter = emitter
@@ -84,9 +83,7 @@ class LongArrayLiteralEmitter:
         array_length = 0
         array_bytes = struct.pack("<i", array_length)  # i32 zero
 
-        offset = self.emitter.current_data_offset
-        self.emitter.data_segments.append((offset, array_bytes))
-        self.emitter.current_data_offset += len(array_bytes)
+        offset = self.emitter._add_data_bytes(array_bytes, align=8, header=4)
 
         logger.debug(
             "Empty i64-array at offset=%d, bytes=%s", offset, array_bytes.hex()
@@ -121,9 +118,7 @@ class LongArrayLiteralEmitter:
             )
 
         # 3) store in data segment
-        offset = self.emitter.current_data_offset
-        self.emitter.data_segments.append((offset, data_bytes))
-        self.emitter.current_data_offset += len(data_bytes)
+        offset = self.emitter._add_data_bytes(data_bytes, align=8, header=4)
 
         logger.debug(
             "Static i64-array => offset=%d, total_bytes=%d",
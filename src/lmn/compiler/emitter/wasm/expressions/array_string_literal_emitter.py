@@ -30,10 +30,8 @@ class StringArrayLiteralEmitter:
               Stores text in memory and returns its offset.
           - emitter.emit_expression(node, out_lines):
               Recursively emits code for expressions (e.g. FnExpression).
-          - emitter.current_data_offset (int):
-              Current memory offset for data segments.
-          - emitter.data_segments (List):
-              Append data segments as (offset, bytes).
+          - emitter._add_data_bytes(data: bytes, align) -> int:
+              Stores raw bytes (the pointer array) and returns their offset.
           - emitter.request_local(name: str, wasm_type: str):
               Ensures (local $name wasm_type) is declared in the function.
         """
@@ -102,9 +100,7 @@ class StringArrayLiteralEmitter:
         array_bytes = array_length.to_bytes(4, "little")  # i32 length = 0
         
         # Store the array in memory
-        array_offset = self.emitter.current_data_offset
-        self.emitter.data_segments.append((array_offset, array_bytes))
-        self.emitter.current_data_offset += len(array_bytes)
+        array_offset = self.emitter._add_data_bytes(array_bytes, align=4)
 
         logger.debug("Empty array at offset=%d, bytes=%s", array_offset, array_bytes)
 
@@ -138,9 +134,7 @@ class StringArrayLiteralEmitter:
         array_bytes = length_bytes + ptrs_bytes
 
         # 3) Store
-        array_offset = self.emitter.current_data_offset
-        self.emitter.data_segments.append((array_offset, array_bytes))
-        self.emitter.current_data_offset += len(array_bytes)
+        array_offset = self.emitter._add_data_bytes(array_bytes, align=4)
         logger.debug(
             "Static array => offset=%d, total_bytes=%d", array_offset, len(array_bytes)
         )
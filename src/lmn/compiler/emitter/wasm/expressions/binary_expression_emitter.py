@@ -4,10 +4,22 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+LOGICAL_OPERATORS = ("and", "or")
+
+# Operators that already leave 0 / 1 on the stack.
+BOOLEAN_OPERATORS = ("<", "<=", ">", ">=", "==", "!=") + LOGICAL_OPERATORS
+
+# A right-hand side this small (in AST nodes), without calls or traps, is
+# cheaper to evaluate unconditionally with 'select' than to branch around.
+MAX_SELECT_NODES = 7
+
 class BinaryExpressionEmitter:
     """
     Emits WebAssembly ops for binary expressions (+, -, *, /, //, %, <, <=, >, >=, ==, !=)
     on the new numeric lowered types: i32, i64, f32, f64.
+
+    'and' / 'or' short-circuit: the right side only runs when the left side
+    does not decide the result already.
     """
 
     def __init__(self, controller):
@@ -37,6 +49,11 @@ class BinaryExpressionEmitter:
         left = node["left"]
         right = node["right"]
 
+        # 0) 'and' / 'or' => short-circuit evaluation
+        if op in LOGICAL_OPERATORS:
+            self._emit_logical(op, left, right, out_lines)
+            return
+
         # 1) Emit code for left, then right
         self.controller.emit_expression(left, out_lines)
         self.controller.emit_expression(right, out_lines)
@@ -48,6 +65,81 @@ class BinaryExpressionEmitter:
         wasm_op = self._map_operator(op, op_type)
         out_lines.append(f"  {wasm_op}")
 
+    def _emit_logical(self, op, left, right, out_lines):
+        """
+        a and b  =>  <a> if (result i32) <b != 0> else i32.const 0 end
+        a or b   =>  <a> if (result i32) i32.const 1 else <b != 0> end
+
+        If b is trivially cheap and cannot trap, branch-free instead:
+        a and b  =>  <b != 0> i32.const 0 <a> select
+        a or b   =>  i32.const 1 <b != 0> <a> select
+        """
+        if self._select_cost(right) is not None:
+            logger.debug("BinaryExpressionEmitter: '%s' with cheap right side => select", op)
+            if op == "and":
+                self._emit_boolean(right, out_lines)
+                out_lines.append("  i32.const 0")
+            else:
+                out_lines.append("  i32.const 1")
+                self._emit_boolean(right, out_lines)
+            # 'select' and 'if' only test the condition for != 0
+            self.controller.emit_expression(left, out_lines)
+            out_lines.append("  select")
+            return
+
+        logger.debug("BinaryExpressionEmitter: '%s' => short-circuit if/else", op)
+        self.controller.emit_expression(left, out_lines)
+        out_lines.append("  if (result i32)")
+        if op == "and":
+            self._emit_boolean(right, out_lines)
+            out_lines.append("  else")
+            out_lines.append("  i32.const 0")
+        else:
+            out_lines.append("  i32.const 1")
+            out_lines.append("  else")
+            self._emit_boolean(right, out_lines)
+        out_lines.append("  end")
+
+    def _emit_boolean(self, expr, out_lines):
+        """
+        Emit expr normalised to 0 / 1.
+        """
+        self.controller.emit_expression(expr, out_lines)
+        is_boolean = (
+            (expr.get("type") == "BinaryExpression" and expr.get("operator") in BOOLEAN_OPERATORS)
+            or (expr.get("type") == "UnaryExpression" and expr.get("operator") == "not")
+        )
+        if not is_boolean:
+            out_lines.append("  i32.const 0")
+            out_lines.append("  i32.ne")
+
+    def _select_cost(self, expr, budget=MAX_SELECT_NODES):
+        """
+        Number of nodes in expr if it is side-effect free, cannot trap and
+        fits the budget; otherwise None.
+        """
+        etype = expr.get("type")
+        if etype in ("LiteralExpression", "VariableExpression"):
+            return 1 if budget >= 1 else None
+        if etype == "BinaryExpression" and expr.get("operator") not in ("/", "//", "%"):
+            children = [expr.get("left"), expr.get("right")]
+        elif etype == "UnaryExpression":
+            children = [expr.get("operand")]
+        elif etype == "ConversionExpression":
+            children = [expr.get("source_expr")]
+        else:
+            return None
+
+        total = 1
+        for child in children:
+            if not isinstance(child, dict):
+                return None
+            cost = self._select_cost(child, budget - total)
+            if cost is None:
+                return None
+            total += cost
+        return total if total <= budget else None
+
     def _map_operator(self, op, op_type):
         """
         Maps (operator, op_type) to the correct WASM mnemonic.
@@ -102,6 +194,12 @@ class BinaryExpressionEmitter:
                 "i32": "i32.ne",   "i64": "i64.ne",
                 "f32": "f32.ne",   "f64": "f64.ne",
             },
+            # Internal integer operators, produced by the optimizer's
+            # strength-reduction pass (never by the parser)
+            "__shl":   {"i32": "i32.shl",   "i64": "i64.shl"},
+            "__shr_s": {"i32": "i32.shr_s", "i64": "i64.shr_s"},
+            "__shr_u": {"i32": "i32.shr_u", "i64": "i64.shr_u"},
+            "__and":   {"i32": "i32.and",   "i64": "i64.and"},
         }
 
         if op not in mapping or op_type not in mapping[op]:
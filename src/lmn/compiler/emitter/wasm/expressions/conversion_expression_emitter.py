@@ -9,6 +9,7 @@ class ConversionExpressionEmitter:
     Handles explicit type conversions between the new lowered WASM types:
       - i32 <-> i64
       - f32 <-> f64
+      - i32/i64 -> f32/f64
       - i32_string -> i32 (string pointer parse)
       etc.
     """
@@ -58,6 +59,10 @@ class ConversionExpressionEmitter:
         elif from_t == "i64" and to_t == "i32":
             out_lines.append("  i32.wrap_i64")
 
+        # integer => float widening (signed)
+        elif from_t in ("i32", "i64") and to_t in ("f32", "f64"):
+            out_lines.append(f"  {to_t}.convert_{from_t}_s")
+
         # === NEW CODE: handle string->int parse ===
         elif from_t == "i32_string" and to_t == "i32":
             # Insert your parse call:
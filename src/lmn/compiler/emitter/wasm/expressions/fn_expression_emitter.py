@@ -2,6 +2,8 @@
 
 import logging
 
+from lmn.compiler.emitter.wasm.simd_array_builtins import is_inline_builtin
+
 logger = logging.getLogger(__name__)
 
 class FnExpressionEmitter:
@@ -35,7 +37,15 @@ class FnExpressionEmitter:
           2) Use get_emitted_function_name(...) to handle aliasing
           3) Emit each argument expression => leaves results on the stack
           4) call $functionName
+
+        If the optimizer inlined this call (node["inline"]), the callee body is
+        emitted in place by the InlinedCallEmitter instead; array builtins go
+        to the SimdArrayBuiltinEmitter.
         """
+        if node.get("inline"):
+            self.controller.inlined_call_emitter.emit_inlined(node, out_lines)
+            return
+
         # 1) Retrieve raw function name
         name_node = node.get("name", {})
         raw_func_name = name_node.get("name", "unknown")  # e.g. "llm" or "sum_func"
@@ -43,6 +53,16 @@ class FnExpressionEmitter:
         # 2) Possibly aliased => get real function name
         real_func_name = self.controller.get_emitted_function_name(raw_func_name)
 
+        # Inline array builtins (sum, dot, ...) call a SIMD helper emitted into
+        # the module, unless a user function of that name shadows them
+        if (
+            real_func_name == raw_func_name
+            and raw_func_name not in self.controller.defined_function_names
+            and is_inline_builtin(raw_func_name)
+        ):
+            self.controller.simd_array_emitter.emit_call(raw_func_name, node, out_lines)
+            return
+
         # 3) Normalize into valid WAT function label
         wat_func_name = self._normalize_function_name(real_func_name)
 
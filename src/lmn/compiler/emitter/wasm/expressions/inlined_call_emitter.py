@@ -0,0 +1,65 @@
+# file: lmn/compiler/emitter/wasm/expressions/inlined_call_emitter.py
+
+import logging
+
+from lmn.compiler.emitter.wasm.wasm_utils import default_zero_for
+
+logger = logging.getLogger(__name__)
+
+class InlinedCallEmitter:
+    """
+    Emits a call site that the optimizer's inliner has expanded, i.e. a
+    FnExpression / CallStatement carrying an "inline" payload:
+
+      "inline": {
+        "label": "inline_0",
+        "return_type": "i32",
+        "bindings": [ {"name": "__inl0_a", "type": "i32", "expression": <arg>}, ... ],
+        "body": [ ...callee statements... ]
+      }
+
+    Output:
+        <arg0> local.set $__inl0_a        ;; arguments, in call order
+        ...
+        block $inline_0 (result i32)
+          <body>                          ;; 'return e' => <e> br $inline_0
+          i32.const 0                     ;; fallthrough (no return reached)
+        end
+    """
+
+    def __init__(self, controller):
+        self.controller = controller
+
+    def emit_inlined(self, node, out_lines, discard_result=False):
+        inline = node["inline"]
+        label = f"${inline['label']}"
+        result_type = self.controller._wasm_basetype(inline.get("return_type") or "i32")
+
+        logger.debug(
+            "InlinedCallEmitter: inlining '%s' as block %s (result %s)",
+            inline.get("callee"), label, result_type
+        )
+
+        # 1) Evaluate the arguments into the renamed parameter locals
+        for binding in inline.get("bindings", []):
+            self.controller.request_local(binding["name"], binding["type"])
+            self.controller.emit_expression(binding["expression"], out_lines)
+            local_label = self.controller._normalize_local_name(binding["name"])
+            out_lines.append(f"  local.set {local_label}")
+
+        # 2) The callee body runs inside a block; ReturnEmitter branches out of it
+        out_lines.append(f"  block {label} (result {result_type})")
+        self.controller.inline_return_targets.append((label, result_type))
+        try:
+            for stmt in inline.get("body", []):
+                self.controller.emit_statement(stmt, out_lines)
+        finally:
+            self.controller.inline_return_targets.pop()
+
+        # 3) Falling off the end behaves like the FunctionEmitter fallback return
+        out_lines.append(f"  {default_zero_for(result_type)}")
+        out_lines.append("  end")
+
+        # 4) Statement calls discard the result
+        if discard_result:
+            out_lines.append("  drop")
@@ -15,7 +15,7 @@ class JsonLiteralExpressionEmitter:
         """
         :param controller: Typically your main WasmEmitter or context with:
            - controller._add_data_segment(text) -> offset
-           - controller.data_segments, controller.current_data_offset, etc.
+           - controller.literal_pool (see literal_pool.py)
         """
         self.controller = controller
 
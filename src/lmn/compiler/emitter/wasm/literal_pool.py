@@ -0,0 +1,155 @@
+# file: lmn/compiler/emitter/wasm/literal_pool.py
+
+import logging
+
+from lmn.compiler.emitter.wasm.string_layout import (
+    LAYOUT_MARKER, LAYOUT_MARKER_OFFSET, LENGTH_HEADER_SIZE, LENGTH_PREFIXED, NUL_TERMINATED,
+    check_string_layout, encode_string,
+)
+
+logger = logging.getLogger(__name__)
+
+PASS_NAME = "data"
+
+# Static data starts above the first KiB (offset 0 stays a null pointer).
+DATA_BASE_OFFSET = 1024
+
+# Bytes that may appear unescaped inside a WAT string literal.
+PLAIN_BYTES = frozenset(range(0x20, 0x7f)) - {ord('"'), ord("\\")}
+
+def escape_wat_bytes(data: bytes) -> str:
+    """
+    WAT string body for 'data': printable ASCII as is, everything else \\xx.
+    """
+    return "".join(chr(b) if b in PLAIN_BYTES else f"\\{b:02x}" for b in data)
+
+class LiteralPool:
+    """
+    Lays out the static data (string / JSON literals, constant arrays) of a
+    module in one contiguous block of linear memory, starting at
+    DATA_BASE_OFFSET.
+
+    With 'intern' on, identical byte sequences are stored once, and a
+    NUL-terminated string that is the tail of one already stored
+    ("world" in "hello world") points into it instead of being copied.
+    Literals are never written at runtime (the heap starts at 64 KiB, see
+    the malloc host function), so sharing is safe.
+
+    Typed arrays ask for alignment: add(data, align=8, header=4) places an
+    i64 / f64 array so that its elements - after the 4-byte length - sit on
+    an 8-byte boundary.
+
+    With string_layout="length" (see string_layout.py) every string gets a
+    4-byte aligned length header and the returned offset points just past
+    it. A tail has no header of its own, so only identical strings are
+    shared; segments() then also carries the layout marker.
+    """
+
+    def __init__(
+        self,
+        base_offset: int = DATA_BASE_OFFSET,
+        intern: bool = True,
+        profile=None,
+        string_layout: str = NUL_TERMINATED,
+    ):
+        self.base_offset = base_offset
+        self.intern = intern
+        self.profile = profile
+        self.string_layout = check_string_layout(string_layout)
+
+        self.data = bytearray()
+        self.offsets = {}   # (bytes, align, header) => offset
+        self.strings = []   # (offset, bytes) of stored NUL-terminated strings
+
+        self.literals = 0
+        self.bytes_requested = 0
+
+    @property
+    def end_offset(self) -> int:
+        return self.base_offset + len(self.data)
+
+    # -------------------------------------------------------------------------
+    # Adding literals
+    # -------------------------------------------------------------------------
+    def add_string(self, text: str) -> int:
+        """
+        Store text in the pool's string layout and return the string
+        pointer (the offset of its first UTF-8 byte).
+        """
+        data = encode_string(text, self.string_layout)
+        if self.string_layout == LENGTH_PREFIXED:
+            return self.add(data, align=LENGTH_HEADER_SIZE) + LENGTH_HEADER_SIZE
+        self._count(data)
+
+        if self.intern:
+            for offset, stored in self.strings:
+                if stored.endswith(data):
+                    shared = offset + len(stored) - len(data)
+                    logger.debug("LiteralPool: %r shares the tail of the string at %d => %d", text, offset, shared)
+                    return shared
+
+        offset = self._append(data)
+        self.strings.append((offset, data))
+        return offset
+
+    def add(self, data: bytes, align: int = 1, header: int = 0) -> int:
+        """
+        Store raw bytes and return their offset; offset + header is a
+        multiple of 'align'.
+        """
+        data = bytes(data)
+        self._count(data)
+
+        key = (data, align, header)
+        if self.intern and key in self.offsets:
+            logger.debug("LiteralPool: reusing %d byte(s) at %d", len(data), self.offsets[key])
+            return self.offsets[key]
+
+        padding = -(self.end_offset + header) % align
+        self.data += b"\0" * padding
+        offset = self._append(data)
+        self.offsets[key] = offset
+        return offset
+
+    def _append(self, data: bytes) -> int:
+        offset = self.end_offset
+        self.data += data
+        logger.debug("LiteralPool: stored %d byte(s) at offset=%d", len(data), offset)
+        return offset
+
+    def _count(self, data: bytes):
+        self.literals += 1
+        self.bytes_requested += len(data)
+
+    # -------------------------------------------------------------------------
+    # Output
+    # -------------------------------------------------------------------------
+    def segments(self) -> list:
+        """
+        [(offset, bytes)] - a single segment, or none if nothing was stored
+        (plus the layout marker for length-prefixed strings).
+        """
+        segments = []
+        if self.string_layout == LENGTH_PREFIXED:
+            segments.append((LAYOUT_MARKER_OFFSET, LAYOUT_MARKER))
+        if self.data:
+            segments.append((self.base_offset, bytes(self.data)))
+        return segments
+
+    def report(self) -> None:
+        """
+        Record literal / byte counts in the compile profile.
+        """
+        if self.profile is None or not self.literals:
+            return
+        stored = len(self.data)
+        saved = max(self.bytes_requested - stored, 0)
+        self.profile.add_stat(PASS_NAME, "literals", self.literals)
+        self.profile.add_stat(PASS_NAME, "bytes_requested", self.bytes_requested)
+        self.profile.add_stat(PASS_NAME, "bytes_stored", stored)
+        self.profile.add_stat(PASS_NAME, "bytes_saved", saved)
+        if saved:
+            self.profile.add_decision(
+                PASS_NAME,
+                f"{self.literals} literal(s): {self.bytes_requested} => {stored} data bytes (-{saved})"
+            )
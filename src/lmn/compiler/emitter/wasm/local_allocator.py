@@ -0,0 +1,236 @@
+# file: lmn/compiler/emitter/wasm/local_allocator.py
+
+import logging
+import re
+
+from lmn.compiler.emitter.wasm.peephole import BLOCK_OPENERS, parse_instruction
+
+logger = logging.getLogger(__name__)
+
+PASS_NAME = "locals"
+
+LOCAL_OPCODES = ("local.get", "local.set", "local.tee")
+DEFINING_OPCODES = ("local.set", "local.tee")
+
+LOCAL_DECLARATION = re.compile(r"^\(local (\$\S+) (\w+)\)$")
+NAME_TOKEN = re.compile(r"\$[^\s()]+")
+
+class _Region:
+    """
+    A structured region of a function body: the body itself, a block, a
+    loop, or one arm of an if. Code after a local.set in the same region is
+    only reachable through that set (wasm branches only leave regions, or
+    jump back to the start of a loop).
+    """
+
+    def __init__(self, kind, parent, start):
+        self.kind = kind
+        self.parent = parent
+        self.start = start
+        self.end = None
+
+    def chain(self):
+        region = self
+        while region is not None:
+            yield region
+            region = region.parent
+
+class LocalAllocator:
+    """
+    Shares WASM local slots between locals whose live ranges never overlap,
+    working on the per-function WAT line lists collected by the WasmEmitter
+    (after the peephole pass).
+
+    A local takes part if it is always written before it is read: its first
+    occurrence is a local.set / local.tee, and every other occurrence comes
+    later inside the same region (see _Region). It is then live from that
+    set to its last occurrence, extended to the end of every loop that uses
+    it without redefining it. Locals of the same type with disjoint ranges
+    are renamed to one slot (named after the first local in it); the slot's
+    stale value is never observed because each user writes it first.
+
+    Everything else (locals relying on zero-initialisation, locals that
+    escape their region, names used outside plain local.get/set/tee) keeps
+    its own slot. Declared locals that are never used are dropped.
+    """
+
+    def __init__(self, profile=None):
+        self.profile = profile
+
+    # -------------------------------------------------------------------------
+    # Entry points
+    # -------------------------------------------------------------------------
+    def allocate_functions(self, functions) -> None:
+        """
+        Compact the locals of every function's line list (in place).
+        """
+        for index, func_lines in enumerate(functions):
+            before = self._declared_count(func_lines)
+            func_lines[:] = self.allocate_function(func_lines)
+            after = self._declared_count(func_lines)
+
+            name = self._function_name(func_lines) or f"#{index}"
+            logger.debug("LocalAllocator: %s => %d local(s) -> %d", name, before, after)
+            if self.profile is not None:
+                self.profile.add_stat(PASS_NAME, "locals_before", before)
+                self.profile.add_stat(PASS_NAME, "locals_after", after)
+                if after < before:
+                    self.profile.add_decision(PASS_NAME, f"'{name}': {before} => {after} locals")
+
+    def allocate_function(self, func_lines) -> list:
+        """
+        Return a copy of a single function's lines with compacted locals.
+        """
+        lines = list(func_lines)
+
+        # 1) Declarations
+        declared = {}
+        declaration_index = {}
+        for index, line in enumerate(lines):
+            match = LOCAL_DECLARATION.match(line.strip())
+            if match:
+                declared[match.group(1)] = match.group(2)
+                declaration_index[match.group(1)] = index
+        if not declared:
+            return lines
+
+        # 2) Occurrences and live ranges
+        declaration_lines = set(declaration_index.values())
+        ranges, pinned, used = self._live_ranges(lines, declared, declaration_lines)
+
+        # 3) Greedy assignment in order of definition
+        slot_of = {name: name for name in pinned}
+        slots = {}  # wasm type => [[slot name, busy until], ...]
+        for name, (start, end) in sorted(ranges.items(), key=lambda item: (item[1][0], item[0])):
+            type_slots = slots.setdefault(declared[name], [])
+            for slot in type_slots:
+                if slot[1] < start:
+                    slot[1] = end
+                    slot_of[name] = slot[0]
+                    break
+            else:
+                type_slots.append([name, end])
+                slot_of[name] = name
+
+        # 4) Rename uses, rewrite the declarations
+        kept = set(slot_of.values())
+        out = []
+        for index, line in enumerate(lines):
+            if index in declaration_lines:
+                match = LOCAL_DECLARATION.match(line.strip())
+                if match.group(1) in kept:
+                    out.append(line)
+                continue
+            instr = parse_instruction(line)
+            if instr is not None and instr[0] in LOCAL_OPCODES and len(instr[1]) == 1:
+                name = instr[1][0]
+                if name in slot_of and slot_of[name] != name:
+                    indent = line[:len(line) - len(line.lstrip())]
+                    out.append(f"{indent}{instr[0]} {slot_of[name]}")
+                    continue
+            out.append(line)
+
+        logger.debug(
+            "LocalAllocator: %d declared, %d used, %d slot(s)",
+            len(declared), len(used), len(kept)
+        )
+        return out
+
+    # -------------------------------------------------------------------------
+    # Liveness
+    # -------------------------------------------------------------------------
+    def _live_ranges(self, lines, declared, declaration_lines):
+        """
+        Returns ({local: (start, end)} for locals that may share a slot,
+        pinned locals, every used local).
+        """
+        root = _Region("func", None, 0)
+        region = root
+        occurrences = {}  # local => [(index, opcode, region), ...]
+        pinned = set()
+
+        for index, line in enumerate(lines):
+            if index in declaration_lines:
+                continue
+            instr = parse_instruction(line)
+            if instr is None:
+                # s-expressions, header, closing ')' => any local named here is opaque
+                pinned.update(self._names_in(line, declared))
+                continue
+
+            opcode, operands = instr
+            if opcode in LOCAL_OPCODES and len(operands) == 1 and operands[0] in declared:
+                occurrences.setdefault(operands[0], []).append((index, opcode, region))
+                continue
+            pinned.update(self._names_in(line, declared))
+
+            if opcode in BLOCK_OPENERS:
+                region = _Region(opcode, region, index)
+            elif opcode == "else" and region.parent is not None:
+                region.end = index
+                region = _Region("else", region.parent, index)
+            elif opcode == "end" and region.parent is not None:
+                region.end = index
+                region = region.parent
+        root.end = len(lines)
+
+        ranges = {}
+        for name, uses in occurrences.items():
+            if name in pinned:
+                continue
+            live = self._live_range(uses)
+            if live is None:
+                pinned.add(name)
+            else:
+                ranges[name] = live
+
+        # pinned locals that are never used at all are simply dropped
+        used = set(occurrences) | (pinned & set(declared))
+        pinned &= used
+        return ranges, pinned, used
+
+    def _live_range(self, uses):
+        start, opcode, home = uses[0]
+        if opcode not in DEFINING_OPCODES:
+            # read before any write => relies on the zero-initialised slot
+            return None
+
+        end = start
+        for index, _, region in uses[1:]:
+            chain = list(region.chain())
+            if home not in chain:
+                return None
+            end = max(end, index)
+            # a loop entered after the definition reads it again on every iteration
+            for enclosing in chain:
+                if enclosing is home:
+                    break
+                if enclosing.kind == "loop":
+                    if enclosing.end is None:
+                        return None
+                    end = max(end, enclosing.end)
+        return start, end
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+    def _names_in(self, line, declared):
+        text = line.split(";;", 1)[0]
+        return {token for token in NAME_TOKEN.findall(text) if token in declared}
+
+    def _declared_count(self, lines) -> int:
+        return sum(1 for line in lines if LOCAL_DECLARATION.match(line.strip()))
+
+    def _function_name(self, lines):
+        for line in lines:
+            text = line.strip()
+            if text.startswith("(func "):
+                return text.split()[1].lstrip("$").rstrip(")")
+        return None
+
+
+def allocate_locals(functions, profile=None) -> None:
+    """
+    Run the local slot allocator over WasmEmitter.functions (in place).
+    """
+    LocalAllocator(profile).allocate_functions(functions)
@@ -0,0 +1,232 @@
+# file: lmn/compiler/emitter/wasm/memo_table.py
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A memoised function f is emitted as two functions:
+#
+#   $f               the wrapper every caller (and f's own recursion) calls:
+#                    looks the arguments up in f's table, calls the body on a
+#                    miss and stores the result
+#   $f__memo_body    the original body
+#
+# The table is a direct-mapped hash table in linear memory, allocated with
+# $malloc on the first call and zero-filled. Every entry is
+#
+#   <occupied:i32> <pad:i32> <key0:8 bytes> ... <keyN-1:8 bytes> <result:8 bytes>
+#
+# A key hashes to exactly one entry, so a new result simply replaces (evicts)
+# whatever was stored there; the table never grows beyond 'capacity' entries.
+# Hits, misses and evictions are counted in exported i64 globals
+# (__memo_<f>_hits, ...) that the runtime profile reads after a run.
+MEMO_ANNOTATION = "memo"
+MEMO_BODY_SUFFIX = "__memo_body"
+MEMO_EXPORT_PREFIX = "__memo_"
+MEMO_COUNTERS = ("hits", "misses", "evictions")
+
+DEFAULT_MEMO_CAPACITY = 4096
+
+# Parameter (key) and result types a table can hold
+MEMO_KEY_TYPES = ("i32", "i64")
+MEMO_RESULT_TYPES = ("i32", "i64", "f32", "f64")
+
+ENTRY_HEADER_SIZE = 8
+ENTRY_SLOT_SIZE = 8
+
+# Fibonacci hashing: multiply by 2^32 / phi and keep the top bits
+HASH_MULTIPLIER = -1640531535  # 0x9E3779B1 as a signed i32
+
+def is_memoised(node: dict) -> bool:
+    return MEMO_ANNOTATION in (node.get("annotations") or [])
+
+def memo_body_name(fn_name: str) -> str:
+    return f"{fn_name}{MEMO_BODY_SUFFIX}"
+
+def memo_counter_export(fn_name: str, counter: str) -> str:
+    return f"{MEMO_EXPORT_PREFIX}{fn_name}_{counter}"
+
+def memo_capacity(requested: int) -> int:
+    """
+    The table size actually used: a power of two, at least 2.
+    """
+    capacity = 2
+    while capacity < requested:
+        capacity *= 2
+    return capacity
+
+def entry_size(param_count: int) -> int:
+    return ENTRY_HEADER_SIZE + ENTRY_SLOT_SIZE * (param_count + 1)
+
+
+class MemoTableEmitter:
+    """
+    Emits the wrapper function and globals of one memoised function
+    (see the layout above). Used by FunctionEmitter.
+    """
+
+    def __init__(self, controller):
+        self.controller = controller
+
+    def emit_wrapper(self, fn_name: str, params, result_type: str, capacity: int) -> list:
+        """
+        'params' are (wasm name, wasm type) pairs, e.g. [("$n", "i32")].
+        Registers the table/counter globals and returns the wrapper's lines.
+        """
+        # 1) Validate the signature
+        for p_name, p_type in params:
+            if p_type not in MEMO_KEY_TYPES:
+                raise ValueError(
+                    f"@memo function '{fn_name}': parameter {p_name} has type {p_type} "
+                    f"(only integer parameters can be memoised)"
+                )
+        if result_type not in MEMO_RESULT_TYPES:
+            raise ValueError(f"@memo function '{fn_name}' must return a number, not {result_type}")
+        if not params:
+            raise ValueError(f"@memo function '{fn_name}' needs at least one parameter")
+
+        capacity = memo_capacity(capacity)
+        size = entry_size(len(params))
+        table_bytes = capacity * size
+        shift = 32 - (capacity.bit_length() - 1)
+        result_offset = ENTRY_HEADER_SIZE + ENTRY_SLOT_SIZE * len(params)
+
+        table = f"$__memo_{fn_name}_table"
+        counters = {c: f"${memo_counter_export(fn_name, c)}" for c in MEMO_COUNTERS}
+        body = f"${memo_body_name(fn_name)}"
+        slot = "$__memo_slot"
+        result = "$__memo_result"
+
+        # 2) Globals: table pointer (0 = not allocated yet) + exported counters
+        self.controller.globals.append(f"(global {table} (mut i32) (i32.const 0))")
+        for counter, global_name in counters.items():
+            export = memo_counter_export(fn_name, counter)
+            self.controller.globals.append(f'(global {global_name} (export "{export}") (mut i64) (i64.const 0))')
+
+        param_section = " ".join(f"(param {p_name} {p_type})" for p_name, p_type in params)
+        call_body = [f"  local.get {p_name}" for p_name, _ in params] + [f"  call {body}"]
+
+        lines = [f"(func ${fn_name} {param_section} (result {result_type})"]
+        lines.append(f"  (local {slot} i32)")
+        lines.append(f"  (local {result} {result_type})")
+
+        # 3) First call => allocate (8-byte aligned) and clear the table;
+        #    without memory, just run the body
+        lines += [
+            f"  global.get {table}",
+            "  i32.eqz",
+            "  if",
+            f"  i32.const {table_bytes + 7}",
+            "  call $malloc",
+            "  i32.const 7",
+            "  i32.add",
+            "  i32.const -8",
+            "  i32.and",
+            f"  global.set {table}",
+            f"  global.get {table}",
+            "  i32.const 8",
+            "  i32.lt_u",
+            "  if",
+            "  i32.const 0",
+            f"  global.set {table}",
+        ]
+        lines += call_body
+        lines += [
+            "  return",
+            "  end",
+            f"  global.get {table}",
+            "  i32.const 0",
+            f"  i32.const {table_bytes}",
+            "  memory.fill",
+            "  end",
+        ]
+
+        # 4) slot = table + ((hash(keys) * K) >> shift) * entry size
+        for index, (p_name, p_type) in enumerate(params):
+            lines += self._key_to_i32(p_name, p_type)
+            if index > 0:
+                lines.append("  i32.xor")
+            lines += [f"  i32.const {HASH_MULTIPLIER}", "  i32.mul"]
+        lines += [
+            f"  i32.const {shift}",
+            "  i32.shr_u",
+            f"  i32.const {size}",
+            "  i32.mul",
+            f"  global.get {table}",
+            "  i32.add",
+            f"  local.tee {slot}",
+            "  i32.load",
+        ]
+
+        # 5) Occupied: same keys => hit, otherwise the entry gets evicted below
+        lines.append("  if")
+        for index, (p_name, p_type) in enumerate(params):
+            lines += [
+                f"  local.get {slot}",
+                f"  {p_type}.load offset={ENTRY_HEADER_SIZE + ENTRY_SLOT_SIZE * index}",
+                f"  local.get {p_name}",
+                f"  {p_type}.eq",
+            ]
+            if index > 0:
+                lines.append("  i32.and")
+        lines.append("  if")
+        lines += self._increment(counters["hits"])
+        lines += [
+            f"  local.get {slot}",
+            f"  {result_type}.load offset={result_offset}",
+            "  return",
+            "  end",
+        ]
+        lines += self._increment(counters["evictions"])
+        lines.append("  end")
+
+        # 6) Miss: run the body and remember the result
+        lines += self._increment(counters["misses"])
+        lines += call_body
+        lines += [
+            f"  local.set {result}",
+            f"  local.get {slot}",
+            "  i32.const 1",
+            "  i32.store",
+        ]
+        for index, (p_name, p_type) in enumerate(params):
+            lines += [
+                f"  local.get {slot}",
+                f"  local.get {p_name}",
+                f"  {p_type}.store offset={ENTRY_HEADER_SIZE + ENTRY_SLOT_SIZE * index}",
+            ]
+        lines += [
+            f"  local.get {slot}",
+            f"  local.get {result}",
+            f"  {result_type}.store offset={result_offset}",
+            f"  local.get {result}",
+            "  return",
+            ")",
+        ]
+
+        logger.debug(
+            "MemoTableEmitter: '%s' => %d entries x %d bytes (%d params)",
+            fn_name, capacity, size, len(params)
+        )
+        return lines
+
+    def _key_to_i32(self, p_name: str, p_type: str) -> list:
+        if p_type == "i64":
+            # fold the high half into the low half
+            return [
+                f"  local.get {p_name}",
+                f"  local.get {p_name}",
+                "  i64.const 32",
+                "  i64.shr_u",
+                "  i64.xor",
+                "  i32.wrap_i64",
+            ]
+        return [f"  local.get {p_name}"]
+
+    def _increment(self, global_name: str) -> list:
+        return [
+            f"  global.get {global_name}",
+            "  i64.const 1",
+            "  i64.add",
+            f"  global.set {global_name}",
+        ]
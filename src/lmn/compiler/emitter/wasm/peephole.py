@@ -0,0 +1,375 @@
+# file: lmn/compiler/emitter/wasm/peephole.py
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+PASS_NAME = "peephole"
+
+# Instructions that only push a value (removable together with a following drop).
+PURE_PUSHES = ("i32.const", "i64.const", "f32.const", "f64.const", "local.get", "global.get")
+
+# Instructions after which the rest of the enclosing block is unreachable.
+TERMINATORS = ("br", "br_table", "return", "return_call", "unreachable")
+
+# Instructions opening a structured block (closed by 'end').
+BLOCK_OPENERS = ("block", "loop", "if")
+
+# eqz(a <cmp> b) == a <inverse> b  (integer compares only: float compares are
+# not invertible because of NaN)
+INVERTED_COMPARES = {
+    "eq": "ne", "ne": "eq",
+    "lt_s": "ge_s", "ge_s": "lt_s", "gt_s": "le_s", "le_s": "gt_s",
+    "lt_u": "ge_u", "ge_u": "lt_u", "gt_u": "le_u", "le_u": "gt_u",
+}
+
+INTEGER_BITS = {"i32": 32, "i64": 64}
+
+# ---------------------------------------------------------------------------
+# Helpers on (opcode, operands) tuples
+# ---------------------------------------------------------------------------
+def parse_instruction(line: str):
+    """
+    '  local.get $x  ;; comment' => ('local.get', ('$x',)).
+    Lines that are not plain instructions (empty, comments, s-expressions
+    such as '(local ...)') => None.
+    """
+    text = line.split(";;", 1)[0].strip()
+    if not text or text.startswith("(") or text.startswith(")"):
+        return None
+    parts = text.split()
+    return parts[0], tuple(parts[1:])
+
+def _int_const(instr, bits=None):
+    """
+    Value of an 'iNN.const' instruction (optionally of a given width), else None.
+    """
+    if instr is None:
+        return None
+    opcode, operands = instr
+    if not opcode.endswith(".const") or opcode[:3] not in INTEGER_BITS or len(operands) != 1:
+        return None
+    if bits is not None and INTEGER_BITS[opcode[:3]] != bits:
+        return None
+    try:
+        return int(operands[0].replace("_", ""), 0)
+    except ValueError:
+        return None
+
+def _wrap(value, bits, signed=True):
+    value &= (1 << bits) - 1
+    if signed and value >= 1 << (bits - 1):
+        value -= 1 << bits
+    return value
+
+def _split_opcode(opcode):
+    """
+    'i32.lt_s' => ('i32', 'lt_s'); anything without a type prefix => (None, opcode).
+    """
+    prefix, _, op = opcode.partition(".")
+    return (prefix, op) if op else (None, opcode)
+
+def _const_binary(op, a, b, bits):
+    """
+    Fold 'a op b' for wrapping integers; None for anything we do not fold
+    (division may trap and is left alone).
+    """
+    ua, ub = _wrap(a, bits, signed=False), _wrap(b, bits, signed=False)
+    sa, sb = _wrap(a, bits), _wrap(b, bits)
+    shift = ub % bits
+    table = {
+        "add": lambda: sa + sb,
+        "sub": lambda: sa - sb,
+        "mul": lambda: sa * sb,
+        "and": lambda: ua & ub,
+        "or": lambda: ua | ub,
+        "xor": lambda: ua ^ ub,
+        "shl": lambda: ua << shift,
+        "shr_s": lambda: sa >> shift,
+        "shr_u": lambda: ua >> shift,
+        "eq": lambda: int(ua == ub),
+        "ne": lambda: int(ua != ub),
+        "lt_s": lambda: int(sa < sb),
+        "lt_u": lambda: int(ua < ub),
+        "gt_s": lambda: int(sa > sb),
+        "gt_u": lambda: int(ua > ub),
+        "le_s": lambda: int(sa <= sb),
+        "le_u": lambda: int(ua <= ub),
+        "ge_s": lambda: int(sa >= sb),
+        "ge_u": lambda: int(ua >= ub),
+    }
+    if op not in table:
+        return None
+    return table[op]()
+
+# ---------------------------------------------------------------------------
+# Rules: window of parsed instructions => replacement lines (or None)
+# ---------------------------------------------------------------------------
+def _set_get_to_tee(window):
+    (op1, args1), (op2, args2) = window
+    if op1 == "local.set" and op2 == "local.get" and args1 == args2:
+        return [f"local.tee {args1[0]}"]
+    return None
+
+def _get_set_same_local(window):
+    (op1, args1), (op2, args2) = window
+    if op1 == "local.get" and op2 == "local.set" and args1 == args2:
+        return []
+    return None
+
+def _tee_drop_to_set(window):
+    (op1, args1), (op2, _) = window
+    if op1 == "local.tee" and op2 == "drop":
+        return [f"local.set {args1[0]}"]
+    return None
+
+def _push_drop(window):
+    (op1, _), (op2, _) = window
+    if op1 in PURE_PUSHES and op2 == "drop":
+        return []
+    return None
+
+def _fold_eqz_const(window):
+    value = _int_const(window[0])
+    prefix = window[0][0][:3]
+    if value is not None and window[1][0] == f"{prefix}.eqz":
+        return [f"i32.const {int(_wrap(value, INTEGER_BITS[prefix]) == 0)}"]
+    return None
+
+def _fold_binary_const(window):
+    a, b = _int_const(window[0]), _int_const(window[1])
+    prefix, op = _split_opcode(window[2][0])
+    if a is None or b is None or prefix not in INTEGER_BITS:
+        return None
+    if window[0][0] != f"{prefix}.const" or window[1][0] != f"{prefix}.const":
+        return None
+    bits = INTEGER_BITS[prefix]
+    result = _const_binary(op, a, b, bits)
+    if result is None:
+        return None
+    if op in INVERTED_COMPARES:
+        return [f"i32.const {result}"]
+    return [f"{prefix}.const {_wrap(result, bits)}"]
+
+def _identity_operand(window):
+    """
+    x + 0, x - 0, x * 1, x | 0, x ^ 0, x << 0 ... => x
+    """
+    value = _int_const(window[0])
+    prefix, op = _split_opcode(window[1][0])
+    if value is None or prefix not in INTEGER_BITS or window[0][0] != f"{prefix}.const":
+        return None
+    if value == 0 and op in ("add", "sub", "or", "xor", "shl", "shr_s", "shr_u"):
+        return []
+    if value == 1 and op == "mul":
+        return []
+    return None
+
+def _compare_eqz_inversion(window):
+    prefix, op = _split_opcode(window[0][0])
+    if prefix in INTEGER_BITS and op in INVERTED_COMPARES and window[1][0] == "i32.eqz":
+        return [f"{prefix}.{INVERTED_COMPARES[op]}"]
+    return None
+
+def _double_eqz_condition(window):
+    """
+    eqz(eqz(x)) is x != 0, which is all 'br_if' / 'if' look at anyway.
+    """
+    (op1, _), (op2, _), (op3, args3) = window
+    if op1 == "i32.eqz" and op2 == "i32.eqz" and op3 in ("br_if", "if"):
+        return [" ".join((op3,) + args3)]
+    return None
+
+def _const_br_if(window):
+    value = _int_const(window[0], bits=32)
+    opcode, args = window[1]
+    if value is None or opcode != "br_if":
+        return None
+    if value == 0:
+        return []
+    return [" ".join(("br",) + args)]
+
+# group name => [(rule name, window size, rewrite)]
+PEEPHOLE_RULES = {
+    "local_tee": [
+        ("set_get_to_tee", 2, _set_get_to_tee),
+        ("get_set_same_local", 2, _get_set_same_local),
+        ("tee_drop_to_set", 2, _tee_drop_to_set),
+    ],
+    "const_folding": [
+        ("push_drop", 2, _push_drop),
+        ("fold_eqz_const", 2, _fold_eqz_const),
+        ("fold_binary_const", 3, _fold_binary_const),
+        ("identity_operand", 2, _identity_operand),
+        ("compare_eqz_inversion", 2, _compare_eqz_inversion),
+    ],
+    "branches": [
+        ("double_eqz_condition", 3, _double_eqz_condition),
+        ("const_br_if", 2, _const_br_if),
+    ],
+}
+
+# Not a window rule (see PeepholeOptimizer._remove_unreachable), but switched
+# on and off like one.
+UNREACHABLE_RULE = ("branches", "unreachable_code")
+
+class PeepholeOptimizer:
+    """
+    Rewrites short instruction sequences in the per-function WAT line lists
+    collected by the WasmEmitter (WasmEmitter.functions), e.g.
+
+        local.set $x  local.get $x     =>  local.tee $x
+        i32.const 0   i32.eqz          =>  i32.const 1
+        i32.lt_s      i32.eqz          =>  i32.ge_s
+        i32.const 4   drop             =>  (nothing)
+        br $l         <dead code>  end =>  br $l  end
+
+    Rules are grouped (see PEEPHOLE_RULES). 'rules' selects group and/or
+    rule names (None => everything). Every rule only looks at adjacent plain
+    instructions, so a sequence never matches across a label or block
+    boundary. Rules are re-applied until nothing changes.
+    """
+
+    def __init__(self, rules=None, profile=None):
+        self.profile = profile
+        self.enabled = None if rules is None else set(rules)
+        self.rules = [
+            (name, size, rewrite)
+            for group, group_rules in PEEPHOLE_RULES.items()
+            for name, size, rewrite in group_rules
+            if self._is_enabled(group, name)
+        ]
+        self.remove_unreachable = self._is_enabled(*UNREACHABLE_RULE)
+
+    def _is_enabled(self, group, name) -> bool:
+        return self.enabled is None or group in self.enabled or name in self.enabled
+
+    # -------------------------------------------------------------------------
+    # Entry points
+    # -------------------------------------------------------------------------
+    def optimize_functions(self, functions) -> None:
+        """
+        Optimise every function's line list (in place).
+        """
+        for index, func_lines in enumerate(functions):
+            before = self._instruction_count(func_lines)
+            func_lines[:] = self.optimize_function(func_lines)
+            removed = before - self._instruction_count(func_lines)
+
+            name = self._function_name(func_lines) or f"#{index}"
+            logger.debug("PeepholeOptimizer: %s => removed %d instruction(s)", name, removed)
+            if self.profile is not None:
+                self.profile.add_stat(PASS_NAME, "instructions_removed", removed)
+                self.profile.set_stat(PASS_NAME, f"removed[{name}]", removed)
+                if removed:
+                    self.profile.add_decision(
+                        PASS_NAME,
+                        f"'{name}': {before} => {before - removed} instructions (-{removed})"
+                    )
+
+    def optimize_function(self, func_lines) -> list:
+        """
+        Return an optimised copy of a single function's lines.
+        """
+        lines = list(func_lines)
+        changed = True
+        while changed:
+            changed = self._apply_rules(lines)
+            if self.remove_unreachable:
+                changed = self._remove_unreachable(lines) or changed
+        return lines
+
+    # -------------------------------------------------------------------------
+    # Window rules
+    # -------------------------------------------------------------------------
+    def _apply_rules(self, lines) -> bool:
+        changed = False
+        i = 0
+        while i < len(lines):
+            for name, size, rewrite in self.rules:
+                window = [parse_instruction(line) for line in lines[i:i + size]]
+                if len(window) < size or None in window:
+                    continue
+                replacement = rewrite(window)
+                if replacement is None:
+                    continue
+
+                indent = self._indent(lines[i])
+                lines[i:i + size] = [indent + text for text in replacement]
+                self._stat(name)
+                changed = True
+                # the replacement may complete a pattern with what precedes it
+                i = max(i - 2, 0)
+                break
+            else:
+                i += 1
+        return changed
+
+    # -------------------------------------------------------------------------
+    # Unreachable code: everything after br/return/... up to the 'end' or
+    # 'else' that closes the enclosing block
+    # -------------------------------------------------------------------------
+    def _remove_unreachable(self, lines) -> bool:
+        changed = False
+        i = 0
+        while i < len(lines):
+            instr = parse_instruction(lines[i])
+            if instr is None or instr[0] not in TERMINATORS:
+                i += 1
+                continue
+
+            end = i + 1
+            depth = 0
+            while end < len(lines):
+                following = parse_instruction(lines[end])
+                if following is None:
+                    if lines[end].strip():
+                        # '(local ...)', ')', comments => stop here
+                        break
+                    end += 1
+                    continue
+                opcode = following[0]
+                if opcode in BLOCK_OPENERS:
+                    depth += 1
+                elif opcode == "end":
+                    if depth == 0:
+                        break
+                    depth -= 1
+                elif opcode == "else" and depth == 0:
+                    break
+                end += 1
+
+            # an unbalanced dead region (should not happen) is left alone
+            if end > i + 1 and depth == 0:
+                self._stat("unreachable_code", end - i - 1)
+                del lines[i + 1:end]
+                changed = True
+            i += 1
+        return changed
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+    def _indent(self, line) -> str:
+        return line[:len(line) - len(line.lstrip())]
+
+    def _instruction_count(self, lines) -> int:
+        return sum(1 for line in lines if parse_instruction(line) is not None)
+
+    def _function_name(self, lines):
+        for line in lines:
+            text = line.strip()
+            if text.startswith("(func "):
+                return text.split()[1].lstrip("$").rstrip(")")
+        return None
+
+    def _stat(self, key, amount=1):
+        if self.profile is not None:
+            self.profile.add_stat(PASS_NAME, key, amount)
+
+
+def optimize_functions(functions, rules=None, profile=None) -> None:
+    """
+    Run the peephole pass over WasmEmitter.functions (in place).
+    """
+    PeepholeOptimizer(rules, profile).optimize_functions(functions)
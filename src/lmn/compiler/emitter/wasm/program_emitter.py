@@ -54,6 +54,8 @@ class ProgramEmitter:
             else:
                 top_level_stmts.append(node)
 
+        self.wasm_emitter.defined_function_names = {fn_node["name"] for fn_node in function_defs}
+
         logger.debug(
             "emit_program: found %d function defs, %d top-level statements",
             len(function_defs),
@@ -0,0 +1,283 @@
+# file: lmn/compiler/emitter/wasm/simd_array_builtins.py
+
+import logging
+
+from lmn.builtins import BUILTINS
+from lmn.compiler.emitter.wasm.statements.for_emitter import ARRAY_HEADER_SIZE
+
+logger = logging.getLogger(__name__)
+
+# The array builtins of lmn/builtins/array.json (sum, min, max, dot, scale,
+# add) are not host imports: every call site calls a helper function that is
+# emitted into the module once per (builtin, element type), e.g.
+# $__array_sum_f64. A helper walks the elements 16 bytes (one v128) at a time
+# and finishes the remaining 0-3 elements with scalar instructions:
+#
+#   $n         = length (the shorter one for dot / add)
+#   $vec_bytes = (n rounded down to whole vectors) * element size
+#   $bytes     = n * element size
+#   vector loop   $off = 0, 16, ...      while $off < $vec_bytes
+#   scalar tail   $off = ..., +size      while $off < $bytes
+#
+# Arrays are [length:i32][elements...] (see ForEmitter); elements start at
+# pointer + 4 and are therefore loaded with align=1.
+VECTOR_BYTES = 16
+
+# lowered array type => (element type, SIMD shape, element size)
+SIMD_ELEMENTS = {
+    "i32_ptr": ("i32", "i32x4", 4),
+    "i64_ptr": ("i64", "i64x2", 8),
+    "f32_ptr": ("f32", "f32x4", 4),
+    "f64_ptr": ("f64", "f64x2", 8),
+}
+
+REDUCTIONS = ("sum", "min", "max", "dot")
+ELEMENTWISE = ("scale", "add")
+
+def is_inline_builtin(name: str) -> bool:
+    """
+    True for builtins whose JSON block is marked "inline" (emitted into the
+    module instead of imported from the host).
+    """
+    return bool(BUILTINS.get(name, {}).get("inline"))
+
+def simd_helper_name(op: str, element_type: str) -> str:
+    return f"__array_{op}_{element_type}"
+
+
+class SimdArrayBuiltinEmitter:
+    """
+    Emits calls to the inline array builtins and, on first use, the SIMD
+    helper function behind them (see the layout above).
+    """
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.emitted_helpers = set()
+
+    def emit_call(self, op: str, node, out_lines):
+        arguments = node.get("arguments", [])
+        array_type = arguments[0].get("inferred_type") if arguments else None
+        if array_type not in SIMD_ELEMENTS:
+            raise ValueError(f"{op}(): expected a typed numeric array, got '{array_type}'")
+
+        element_type = SIMD_ELEMENTS[array_type][0]
+        helper = simd_helper_name(op, element_type)
+        if helper not in self.emitted_helpers:
+            self.emitted_helpers.add(helper)
+            self.controller.functions.append(self.build_helper(op, array_type))
+            logger.debug("SimdArrayBuiltinEmitter: emitted helper $%s", helper)
+
+        for arg in arguments:
+            self.controller.emit_expression(arg, out_lines)
+        out_lines.append(f"  call ${helper}")
+
+    # -------------------------------------------------------------------------
+    # Helper functions
+    # -------------------------------------------------------------------------
+    def build_helper(self, op: str, array_type: str) -> list:
+        element_type, shape, size = SIMD_ELEMENTS[array_type]
+        name = simd_helper_name(op, element_type)
+        binary = op in ("dot", "add")
+
+        if op in REDUCTIONS:
+            params = "(param $a i32) (param $b i32)" if binary else "(param $a i32)"
+            lines = [f"(func ${name} {params} (result {element_type})"]
+            locals_ = [("$acc", "v128"), ("$x", "v128"), ("$total", element_type), ("$elem", element_type)]
+        elif op in ELEMENTWISE:
+            params = "(param $a i32) (param $b i32)" if binary else f"(param $a i32) (param $k {element_type})"
+            lines = [f"(func ${name} {params} (result i32)"]
+            locals_ = [("$out", "i32"), ("$kv", "v128")]
+        else:
+            raise ValueError(f"SimdArrayBuiltinEmitter: unknown array builtin '{op}'")
+
+        for local_name, local_type in [("$n", "i32"), ("$bytes", "i32"), ("$vec_bytes", "i32"), ("$off", "i32")] + locals_:
+            lines.append(f"  (local {local_name} {local_type})")
+
+        # 1) Length / byte counts
+        lines += ["  local.get $a", "  i32.load"]
+        if binary:
+            lines += [
+                "  local.get $b",
+                "  i32.load",
+                "  local.get $a",
+                "  i32.load",
+                "  local.get $b",
+                "  i32.load",
+                "  i32.lt_u",
+                "  select",
+            ]
+        shift = size.bit_length() - 1
+        lines += [
+            "  local.set $n",
+            "  local.get $n",
+            f"  i32.const {shift}",
+            "  i32.shl",
+            "  local.set $bytes",
+            "  local.get $n",
+            f"  i32.const {-(VECTOR_BYTES // size)}",
+            "  i32.and",
+            f"  i32.const {shift}",
+            "  i32.shl",
+            "  local.set $vec_bytes",
+        ]
+
+        # 2) Op-specific setup, vector step, scalar step and result
+        if op in REDUCTIONS:
+            lines += self._reduction(op, element_type, shape, size)
+        else:
+            lines += self._elementwise(op, element_type, shape, size)
+        lines.append(")")
+        return lines
+
+    def _reduction(self, op, element_type, shape, size) -> list:
+        lanes = VECTOR_BYTES // size
+        lines = []
+
+        # a) Start value: 0 for sum / dot, the first element for min / max
+        if op in ("min", "max"):
+            lines += [
+                "  local.get $n",
+                "  i32.eqz",
+                "  if",
+                f"  {element_type}.const 0",
+                "  return",
+                "  end",
+                "  local.get $a",
+                f"  {element_type}.load offset={ARRAY_HEADER_SIZE}",
+                "  local.tee $total",
+                f"  {shape}.splat",
+                "  local.set $acc",
+            ]
+
+        # b) Vector loop: fold one v128 into $acc
+        vector_step = self._load_vector("$a")
+        if op == "sum":
+            vector_step = ["  local.get $acc"] + vector_step + [f"  {shape}.add", "  local.set $acc"]
+        elif op == "dot":
+            vector_step = (
+                ["  local.get $acc"] + vector_step + self._load_vector("$b")
+                + [f"  {shape}.mul", f"  {shape}.add", "  local.set $acc"]
+            )
+        else:
+            vector_step = vector_step + ["  local.set $x"] + self._vector_min_max(op, element_type, shape)
+        lines += self._loop("vec", "$vec_bytes", VECTOR_BYTES, vector_step)
+
+        # c) Horizontal: fold the lanes into $total
+        for lane in range(lanes):
+            lines += ["  local.get $acc", f"  {shape}.extract_lane {lane}", "  local.set $elem"]
+            lines += self._combine(op, element_type)
+
+        # d) Scalar tail
+        scalar_step = self._load_scalar("$a", element_type)
+        if op == "dot":
+            scalar_step += self._load_scalar("$b", element_type) + [f"  {element_type}.mul"]
+        scalar_step += ["  local.set $elem"] + self._combine(op, element_type)
+        lines += self._loop("tail", "$bytes", size, scalar_step)
+
+        lines.append("  local.get $total")
+        return lines
+
+    def _elementwise(self, op, element_type, shape, size) -> list:
+        # a) out = malloc(header + bytes), out.length = n
+        lines = [
+            "  local.get $bytes",
+            f"  i32.const {ARRAY_HEADER_SIZE}",
+            "  i32.add",
+            "  call $malloc",
+            "  local.tee $out",
+            "  local.get $n",
+            "  i32.store",
+        ]
+        if op == "scale":
+            lines += ["  local.get $k", f"  {shape}.splat", "  local.set $kv"]
+            vector_operand, vector_op = ["  local.get $kv"], f"{shape}.mul"
+            scalar_operand, scalar_op = ["  local.get $k"], f"{element_type}.mul"
+        else:
+            vector_operand, vector_op = self._load_vector("$b"), f"{shape}.add"
+            scalar_operand, scalar_op = self._load_scalar("$b", element_type), f"{element_type}.add"
+
+        # b) Vector loop / scalar tail: out[i] = a[i] <op> operand
+        out_address = ["  local.get $out", "  local.get $off", "  i32.add"]
+        lines += self._loop("vec", "$vec_bytes", VECTOR_BYTES, (
+            out_address + self._load_vector("$a") + vector_operand
+            + [f"  {vector_op}", f"  v128.store offset={ARRAY_HEADER_SIZE} align=1"]
+        ))
+        lines += self._loop("tail", "$bytes", size, (
+            out_address + self._load_scalar("$a", element_type) + scalar_operand
+            + [f"  {scalar_op}", f"  {element_type}.store offset={ARRAY_HEADER_SIZE}"]
+        ))
+
+        lines.append("  local.get $out")
+        return lines
+
+    # -------------------------------------------------------------------------
+    # Building blocks
+    # -------------------------------------------------------------------------
+    def _loop(self, label: str, limit: str, step: int, body: list) -> list:
+        """
+        while $off < limit: body; $off += step   ($off carries over)
+        """
+        return [
+            f"  block ${label}_done",
+            f"  loop ${label}",
+            "  local.get $off",
+            f"  local.get {limit}",
+            "  i32.ge_u",
+            f"  br_if ${label}_done",
+            *body,
+            "  local.get $off",
+            f"  i32.const {step}",
+            "  i32.add",
+            "  local.set $off",
+            f"  br ${label}",
+            "  end",
+            "  end",
+        ]
+
+    def _load_vector(self, array: str) -> list:
+        return [f"  local.get {array}", "  local.get $off", "  i32.add",
+                f"  v128.load offset={ARRAY_HEADER_SIZE} align=1"]
+
+    def _load_scalar(self, array: str, element_type: str) -> list:
+        return [f"  local.get {array}", "  local.get $off", "  i32.add",
+                f"  {element_type}.load offset={ARRAY_HEADER_SIZE}"]
+
+    def _vector_min_max(self, op: str, element_type: str, shape: str) -> list:
+        """
+        $acc = lane-wise min/max($acc, $x)
+        """
+        if element_type in ("f32", "f64"):
+            return ["  local.get $acc", "  local.get $x", f"  {shape}.{op}", "  local.set $acc"]
+        if element_type == "i32":
+            return ["  local.get $acc", "  local.get $x", f"  {shape}.{op}_s", "  local.set $acc"]
+        # i64x2 has no min/max => select the lanes with a compare mask
+        compare = "lt_s" if op == "min" else "gt_s"
+        return [
+            "  local.get $acc",
+            "  local.get $x",
+            "  local.get $acc",
+            "  local.get $x",
+            f"  {shape}.{compare}",
+            "  v128.bitselect",
+            "  local.set $acc",
+        ]
+
+    def _combine(self, op: str, element_type: str) -> list:
+        """
+        $total = $total <op> $elem
+        """
+        if op in ("sum", "dot"):
+            return ["  local.get $total", "  local.get $elem", f"  {element_type}.add", "  local.set $total"]
+        if element_type in ("f32", "f64"):
+            return ["  local.get $total", "  local.get $elem", f"  {element_type}.{op}", "  local.set $total"]
+        compare = "lt_s" if op == "min" else "gt_s"
+        return [
+            "  local.get $total",
+            "  local.get $elem",
+            "  local.get $total",
+            "  local.get $elem",
+            f"  {element_type}.{compare}",
+            "  select",
+            "  local.set $total",
+        ]
@@ -27,7 +27,13 @@ class CallEmitter:
          3) Normalize the function name into valid WAT syntax (prepend '$').
          4) Emit 'call $functionName'.
          5) If 'discardReturn' is True, emit 'drop' to discard the function's return value.
+
+        Calls expanded by the optimizer's inliner (node["inline"]) are emitted
+        in place by the InlinedCallEmitter; their block result is always dropped.
         """
+        if node.get("inline"):
+            self.controller.inlined_call_emitter.emit_inlined(node, out_lines, discard_result=True)
+            return
 
         # 1) Emit each argument expression
         args = node.get("arguments", [])
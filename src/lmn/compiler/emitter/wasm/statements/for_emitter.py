@@ -4,6 +4,17 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# for-in loops: lowered collection type => (element wasm type, load, element size)
+# Every array is [length:i32][elements...], elements starting at pointer + 4.
+COLLECTION_ELEMENTS = {
+    "i32_ptr":          ("i32", "i32.load", 4),
+    "i64_ptr":          ("i64", "i64.load", 8),
+    "f32_ptr":          ("f32", "f32.load", 4),
+    "f64_ptr":          ("f64", "f64.load", 8),
+    "i32_string_array": ("i32", "i32.load", 4),
+}
+ARRAY_HEADER_SIZE = 4
+
 class ForEmitter:
     def __init__(self, controller):
         """
@@ -14,6 +25,7 @@ class ForEmitter:
           - _normalize_local_name(name)
         """
         self.controller = controller
+        self.collection_loops = 0
 
     def emit_for(self, node, out_lines):
         """
@@ -59,11 +71,28 @@ class ForEmitter:
               br $for_loop
             end
           end
+
+        Loops annotated by the optimizer's loop pass (lmn.compiler.optimizer.loops)
+        may also carry:
+          "end_local" / "step_local": evaluate end_expr / step_expr once into
+                                      that hidden local
+          "preheader":  statements run once, after the entry check
+          "rotate":     emit the bottom-tested form (see _emit_rotated)
+
+        and the strength-reduction pass (lmn.compiler.optimizer.strength) with
+          "induction":  [{"name", "factor", "step"}] hidden locals holding
+                        i * factor, bumped by 'step' next to i's increment
+
+        `for x in array` (no end_expr) is emitted by _emit_collection.
         """
 
         raw_var_name = node["variable"]["name"]
         var_name     = self.controller._normalize_local_name(raw_var_name)
 
+        if node.get("end_expr") is None:
+            self._emit_collection(node, var_name, out_lines)
+            return
+
         # 1) Ensure local i is declared as i32
         self.controller.request_local(var_name, "i32")
 
@@ -71,17 +100,29 @@ class ForEmitter:
         self.controller.emit_expression(node["start_expr"], out_lines)
         out_lines.append(f"  local.set {var_name}")
 
+        # 2b) Invariant bound / step => evaluate once into hidden locals
+        for expr_key, local_key in (("end_expr", "end_local"), ("step_expr", "step_local")):
+            hidden = node.get(local_key)
+            if hidden and node.get(expr_key) is not None:
+                self.controller.request_local(hidden, "i32")
+                self.controller.emit_expression(node[expr_key], out_lines)
+                out_lines.append(f"  local.set {self.controller._normalize_local_name(hidden)}")
+
+        if node.get("rotate"):
+            self._emit_rotated(node, var_name, out_lines)
+            return
+
+        for stmt in node.get("preheader", []):
+            self.controller.emit_statement(stmt, out_lines)
+        self._emit_induction_init(node, var_name, out_lines)
+
         # 3) Emit the block and loop
         out_lines.append("  block $for_exit")
         out_lines.append("    loop $for_loop")
 
         # 4) Top-of-loop condition check
         out_lines.append(f"  local.get {var_name}")
-        if node.get("end_expr") is not None:
-            self.controller.emit_expression(node["end_expr"], out_lines)
-        else:
-            # No end_expr => pick a large sentinel
-            out_lines.append("  i32.const 999999")
+        self._emit_end(node, out_lines)
 
         # i < end_expr => i32.lt_s => if false => i >= end_expr => br_if $for_exit
         out_lines.append("  i32.lt_s")
@@ -95,7 +136,157 @@ class ForEmitter:
         #    - If BreakStatement => br $for_exit
         #    - If ContinueStatement => br $for_continue
         #    - Otherwise => normal
+        self._emit_body(node, out_lines)
+
+        # 7) End of the block for continue
+        #    (if none of the statements jumped with br $for_continue,
+        #     we fall through to here)
+        out_lines.append("  end $for_continue")
 
+        # 8) After the body, we do the increment step
+        self._emit_induction_step(node, out_lines)
+        out_lines.append(f"  local.get {var_name}")
+        self._emit_step(node, out_lines)
+        out_lines.append("  i32.add")
+        out_lines.append(f"  local.set {var_name}")
+
+        # 9) Jump back to the top
+        out_lines.append("  br $for_loop")
+
+        # 10) Close the loop and the outer block
+        out_lines.append("  end")  # end of loop $for_loop
+        out_lines.append("  end")  # end of block $for_exit
+
+    def _emit_rotated(self, node, var_name, out_lines):
+        """
+        Bottom-tested loop: one entry check, then a single br_if per iteration.
+
+          block $for_exit
+            local.get $i  <end>  i32.lt_s  i32.eqz  br_if $for_exit
+            <preheader>
+            loop $for_loop
+              block $for_continue
+                <body>
+              end $for_continue
+              local.get $i  <step>  i32.add  local.tee $i
+              <end>  i32.lt_s
+              br_if $for_loop
+            end
+          end
+        """
+        out_lines.append("  block $for_exit")
+
+        # 1) Entry check (zero-trip loops skip the preheader, too)
+        out_lines.append(f"  local.get {var_name}")
+        self._emit_end(node, out_lines)
+        out_lines.append("  i32.lt_s")
+        out_lines.append("  i32.eqz")
+        out_lines.append("  br_if $for_exit")
+
+        # 2) Loop-invariant values
+        for stmt in node.get("preheader", []):
+            self.controller.emit_statement(stmt, out_lines)
+        self._emit_induction_init(node, var_name, out_lines)
+
+        # 3) Body
+        out_lines.append("    loop $for_loop")
+        out_lines.append("  block $for_continue")
+        self._emit_body(node, out_lines)
+        out_lines.append("  end $for_continue")
+
+        # 4) Increment + bottom test
+        self._emit_induction_step(node, out_lines)
+        out_lines.append(f"  local.get {var_name}")
+        self._emit_step(node, out_lines)
+        out_lines.append("  i32.add")
+        out_lines.append(f"  local.tee {var_name}")
+        self._emit_end(node, out_lines)
+        out_lines.append("  i32.lt_s")
+        out_lines.append("  br_if $for_loop")
+
+        out_lines.append("  end")  # end of loop $for_loop
+        out_lines.append("  end")  # end of block $for_exit
+
+    def _emit_collection(self, node, var_name, out_lines):
+        """
+        for x in <typed array>: the length is read once, then a cursor walks
+        the elements with one load of the element's width per iteration.
+
+          <collection>  local.tee $cur
+          i32.load  i32.const <log2 size>  i32.shl
+          local.get $cur  i32.add  local.set $end     ;; $cur + length * size
+          block $for_exit
+            local.get $cur  local.get $end  i32.ge_u  br_if $for_exit
+            <preheader>
+            loop $for_loop
+              local.get $cur  <T>.load offset=4  local.set $x
+              block $for_continue
+                <body>
+              end $for_continue
+              local.get $cur  i32.const <size>  i32.add  local.tee $cur
+              local.get $end  i32.lt_u
+              br_if $for_loop
+            end
+          end
+        """
+        collection_type = node["start_expr"].get("inferred_type", "")
+        if collection_type not in COLLECTION_ELEMENTS:
+            raise ValueError(f"ForEmitter: cannot iterate over '{collection_type}'")
+        element_type, load, size = COLLECTION_ELEMENTS[collection_type]
+
+        # 1) Hidden cursor / end locals, unique per loop (loops may nest)
+        index = self.collection_loops
+        self.collection_loops += 1
+        cursor = f"__for_cur_{index}"
+        end = f"__for_end_{index}"
+        for hidden in (cursor, end):
+            self.controller.request_local(hidden, "i32")
+        cursor = self.controller._normalize_local_name(cursor)
+        end = self.controller._normalize_local_name(end)
+        self.controller.request_local(var_name, element_type)
+        logger.debug("ForEmitter: for %s in %s => %s (%d bytes)", var_name, collection_type, load, size)
+
+        # 2) Length read once => end pointer
+        self.controller.emit_expression(node["start_expr"], out_lines)
+        out_lines.append(f"  local.tee {cursor}")
+        out_lines.append("  i32.load")
+        out_lines.append(f"  i32.const {size.bit_length() - 1}")
+        out_lines.append("  i32.shl")
+        out_lines.append(f"  local.get {cursor}")
+        out_lines.append("  i32.add")
+        out_lines.append(f"  local.set {end}")
+
+        # 3) Entry check (empty arrays skip the preheader, too)
+        out_lines.append("  block $for_exit")
+        out_lines.append(f"  local.get {cursor}")
+        out_lines.append(f"  local.get {end}")
+        out_lines.append("  i32.ge_u")
+        out_lines.append("  br_if $for_exit")
+        for stmt in node.get("preheader", []):
+            self.controller.emit_statement(stmt, out_lines)
+
+        # 4) Body: load the element, run the statements
+        out_lines.append("    loop $for_loop")
+        out_lines.append(f"  local.get {cursor}")
+        out_lines.append(f"  {load} offset={ARRAY_HEADER_SIZE}")
+        out_lines.append(f"  local.set {var_name}")
+        out_lines.append("  block $for_continue")
+        self._emit_body(node, out_lines)
+        out_lines.append("  end $for_continue")
+
+        # 5) Advance the cursor + bottom test
+        out_lines.append(f"  local.get {cursor}")
+        out_lines.append(f"  i32.const {size}")
+        out_lines.append("  i32.add")
+        out_lines.append(f"  local.tee {cursor}")
+        out_lines.append(f"  local.get {end}")
+        out_lines.append("  i32.lt_u")
+        out_lines.append("  br_if $for_loop")
+
+        out_lines.append("  end")  # end of loop $for_loop
+        out_lines.append("  end")  # end of block $for_exit
+
+    def _emit_body(self, node, out_lines):
         for stmt in node["body"]:
             stype = stmt["type"]
 
@@ -108,24 +299,36 @@ class ForEmitter:
             else:
                 self.controller.emit_statement(stmt, out_lines)
 
-        # 7) End of the block for continue
-        #    (if none of the statements jumped with br $for_continue,
-        #     we fall through to here)
-        out_lines.append("  end $for_continue")
+    def _emit_end(self, node, out_lines):
+        if node.get("end_local"):
+            out_lines.append(f"  local.get {self.controller._normalize_local_name(node['end_local'])}")
+        elif node.get("end_expr") is not None:
+            self.controller.emit_expression(node["end_expr"], out_lines)
+        else:
+            # No end_expr => pick a large sentinel
+            out_lines.append("  i32.const 999999")
 
-        # 8) After the body, we do the increment step
-        out_lines.append(f"  local.get {var_name}")
-        step_expr = node.get("step_expr")
-        if step_expr:
-            self.controller.emit_expression(step_expr, out_lines)
+    def _emit_step(self, node, out_lines):
+        if node.get("step_local"):
+            out_lines.append(f"  local.get {self.controller._normalize_local_name(node['step_local'])}")
+        elif node.get("step_expr"):
+            # constant steps end up as a single i32.const immediate
+            self.controller.emit_expression(node["step_expr"], out_lines)
         else:
             out_lines.append("  i32.const 1")
-        out_lines.append("  i32.add")
-        out_lines.append(f"  local.set {var_name}")
 
-        # 9) Jump back to the top
-        out_lines.append("  br $for_loop")
+    def _emit_induction_init(self, node, var_name, out_lines):
+        for induction in node.get("induction", []):
+            self.controller.request_local(induction["name"], "i32")
+            out_lines.append(f"  local.get {var_name}")
+            out_lines.append(f"  i32.const {induction['factor']}")
+            out_lines.append("  i32.mul")
+            out_lines.append(f"  local.set {self.controller._normalize_local_name(induction['name'])}")
 
-        # 10) Close the loop and the outer block
-        out_lines.append("  end")  # end of loop $for_loop
-        out_lines.append("  end")  # end of block $for_exit
+    def _emit_induction_step(self, node, out_lines):
+        for induction in node.get("induction", []):
+            local_label = self.controller._normalize_local_name(induction["name"])
+            out_lines.append(f"  local.get {local_label}")
+            out_lines.append(f"  i32.const {induction['step']}")
+            out_lines.append("  i32.add")
+            out_lines.append(f"  local.set {local_label}")
@@ -1,6 +1,9 @@
 # file: lmn/compiler/emitter/wasm/statements/function_emitter.py
 import logging
 from lmn.compiler.emitter.wasm.wasm_utils import default_zero_for
+from lmn.compiler.emitter.wasm.memo_table import (
+    DEFAULT_MEMO_CAPACITY, MemoTableEmitter, is_memoised, memo_body_name
+)
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +33,11 @@ class FunctionEmitter:
             param_lines.append(f"(param {norm_p_name} {wasm_param_type})")
 
         param_section = " ".join(param_lines)
-        func_header = f"(func ${fname}"
+
+        # 2b) Memoised => this is the body; callers go through a wrapper that
+        #     caches results (see memo_table.py)
+        memo = is_memoised(node)
+        func_header = f"(func ${memo_body_name(fname) if memo else fname}"
         if param_section:
             func_header += f" {param_section}"
 
@@ -57,11 +64,25 @@ class FunctionEmitter:
         # 5) Emit body statements
         body_instructions = []
         encountered_return = False
+
+        # 5a) Tail-call optimised => body runs inside 'loop $label'
+        #     (TailCallStatement re-assigns params and branches back)
+        tail_call = node.get("tail_call")
+        if tail_call:
+            for stmt in tail_call.get("prelude", []):
+                self.controller.emit_statement(stmt, body_instructions)
+            body_instructions.append(f"  loop ${tail_call['label']}")
+
         for stmt in body_nodes:
             if stmt.get("type") == "ReturnStatement":
                 encountered_return = True
             self.controller.emit_statement(stmt, body_instructions)
 
+        if tail_call:
+            body_instructions.append("  end")
+            # falling out of the loop still needs a result
+            encountered_return = False
+
         # 6) Insert local declarations for new variables
         local_decl_lines = []
         for var_name in sorted(self.controller.new_locals):
@@ -95,6 +116,19 @@ class FunctionEmitter:
 
         out_lines.append(")")
 
+        # 9) Memo wrapper under the function's own name
+        if memo:
+            wrapper_params = [
+                (self._normalize_local_name(p["name"]),
+                 self.controller._wasm_basetype(p.get("type_annotation", "i32")))
+                for p in params
+            ]
+            capacity = node.get("memo_capacity", DEFAULT_MEMO_CAPACITY)
+            self.controller.functions.append(
+                MemoTableEmitter(self.controller).emit_wrapper(fname, wrapper_params, ret_type, capacity)
+            )
+            logger.debug("FunctionEmitter: '%s' memoised (capacity=%s)", fname, capacity)
+
     def _normalize_local_name(self, var_name: str) -> str:
         if var_name.startswith('$$'):
             return '$' + var_name[2:]
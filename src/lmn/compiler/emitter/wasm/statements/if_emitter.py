@@ -22,8 +22,19 @@ class IfEmitter:
           ...
         }
 
-        We'll generate nested 'if/else' blocks for chained elseifs.
+        We'll generate nested 'if/else' blocks for chained elseifs, unless
+        the optimizer marked the chain as an integer "switch" (SwitchEmitter).
+
+        ASTs coming from the pipeline are serialized by alias, so the same
+        fields may arrive as "thenBody", "elseifClauses" and "elseBody".
         """
+        if node.get("switch"):
+            self.controller.switch_emitter.emit_switch(node, out_lines)
+            return
+
+        then_body = node.get("then_body", node.get("thenBody")) or []
+        clauses = node.get("elseif_clauses", node.get("elseifClauses")) or []
+        else_body = node.get("else_body", node.get("elseBody")) or []
 
         # 1) Emit expression for condition => i32 on WASM stack
         self.controller.emit_expression(node["condition"], out_lines)
@@ -32,23 +43,21 @@ class IfEmitter:
         out_lines.append('  if')
 
         # 3) Then-branch
-        then_body = node.get("then_body", [])
         for statement in then_body:
             self.controller.emit_statement(statement, out_lines)
 
         # 4) If there's either elseif_clauses or else_body, we do an 'else' block
-        has_elseif = bool(node.get("elseif_clauses"))
-        has_else   = bool(node.get("else_body"))
+        has_elseif = bool(clauses)
+        has_else   = bool(else_body)
 
         if has_elseif or has_else:
             out_lines.append('  else')
-            clauses = node.get("elseif_clauses", [])
             if clauses:
                 # handle chain of elseifs
-                self._emit_elseif_chain(clauses, node.get("else_body", []), out_lines)
+                self._emit_elseif_chain(clauses, else_body, out_lines)
             else:
                 # no elseif => just else_body
-                for statement in node["else_body"]:
+                for statement in else_body:
                     self.controller.emit_statement(statement, out_lines)
 
         # 5) end
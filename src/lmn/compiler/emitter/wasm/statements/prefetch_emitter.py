@@ -0,0 +1,41 @@
+# file: lmn/compiler/emitter/wasm/statements/prefetch_emitter.py
+
+import logging
+
+from lmn.builtins import BUILTINS, PREFETCH_SUFFIX
+from lmn.compiler.optimizer.ast_utils import called_function_name
+
+logger = logging.getLogger(__name__)
+
+class PrefetchEmitter:
+    def __init__(self, controller):
+        self.controller = controller
+
+    def emit_prefetch(self, node, out_lines):
+        """
+        PrefetchStatement nodes are produced by the optimizer's fan-out pass:
+
+          {
+            "type": "PrefetchStatement",
+            "calls": [ <FnExpression llm(...)>, <FnExpression ask_tools(...)>, ... ]
+          }
+
+        Each call becomes its '<name>__prefetch' host import with the same
+        arguments and no result, imported only by programs that use it.
+        """
+        for call in node.get("calls", []):
+            # 1) Push the arguments, exactly as the real call will
+            for arg in call.get("arguments", []):
+                self.controller.emit_expression(arg, out_lines)
+
+            # 2) Declare + call the prefetch import
+            name = called_function_name(call)
+            prefetch_name = f"{name}{PREFETCH_SUFFIX}"
+            info = BUILTINS[name]
+            self.controller.declare_host_import(
+                prefetch_name,
+                {"parameters": info["signature"].get("parameters", []), "results": []},
+                info.get("namespace", "env"),
+            )
+            logger.debug("PrefetchEmitter: call $%s", prefetch_name)
+            out_lines.append(f"  call ${prefetch_name}")
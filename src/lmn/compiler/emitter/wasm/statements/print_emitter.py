@@ -1,7 +1,13 @@
 import logging
 
+from lmn.builtins import BUILTINS
+from lmn.compiler.optimizer.ast_utils import called_function_name
+
 logger = logging.getLogger(__name__)
 
+# `print llm(...)` => this host function streams the response while it arrives
+STREAMING_PRINTS = {"llm": "llm_print"}
+
 class PrintEmitter:
     def __init__(self, controller):
         self.controller = controller
@@ -15,6 +21,10 @@ class PrintEmitter:
 
         # 1) Print each expression in the statement
         for ex in node["expressions"]:
+            # (a0) `print llm(...)` => streamed by the host
+            if self._emit_streaming_print(ex, out_lines):
+                continue
+
             # (a) Emit code to push the expression's value on the stack
             self.controller.emit_expression(ex, out_lines)
 
@@ -73,6 +83,28 @@ class PrintEmitter:
         out_lines.append(f"  i32.const {newline_offset}")
         out_lines.append("  call $print_string")
 
+    def _emit_streaming_print(self, ex, out_lines) -> bool:
+        """
+        `print llm(prompt, model)` calls 'llm_print' instead of 'llm' +
+        'print_string': the host writes the response to the output chunk by
+        chunk as it arrives (and still returns the stored string, dropped here).
+        """
+        name = called_function_name(ex) if ex.get("type") == "FnExpression" else None
+        if (name not in STREAMING_PRINTS or name in self.controller.defined_function_names
+                or ex.get("inline") or ex.get("cse_store")):
+            return False
+
+        streaming_name = STREAMING_PRINTS[name]
+        info = BUILTINS[streaming_name]
+        self.controller.declare_host_import(streaming_name, info["signature"], info.get("namespace", "env"))
+
+        for arg in ex.get("arguments", []):
+            self.controller.emit_expression(arg, out_lines)
+        out_lines.append(f"  call ${streaming_name}")
+        out_lines.append("  drop")
+        logger.debug(f"PrintEmitter: streaming print via '{streaming_name}'")
+        return True
+
     def _get_newline_offset(self):
         """
         Returns the memory offset where "\n" is stored.
@@ -1,5 +1,7 @@
 # file: lmn/compiler/emitter/wasm/statements/return_emitter.py
 
+from lmn.compiler.emitter.wasm.wasm_utils import default_zero_for
+
 class ReturnEmitter:
     def __init__(self, controller):
         """
@@ -18,6 +20,9 @@ class ReturnEmitter:
 
         We'll emit code for the expression (if present), pushing its result
         on the stack, then emit a 'return' instruction.
+
+        Inside an inlined call body the 'return' becomes a branch to the end
+        of the inline block instead (see InlinedCallEmitter).
         """
         # 1) Check if there's an expression
         expr = node.get("expression", None)
@@ -25,5 +30,13 @@ class ReturnEmitter:
             # If present, emit expression => places the result on the stack
             self.controller.emit_expression(expr, out_lines)
 
+        inline_targets = getattr(self.controller, "inline_return_targets", None)
+        if inline_targets:
+            label, result_type = inline_targets[-1]
+            if not expr:
+                out_lines.append(f"  {default_zero_for(result_type)}")
+            out_lines.append(f"  br {label}")
+            return
+
         # 2) Emit the WASM 'return' instruction
         out_lines.append("  return")
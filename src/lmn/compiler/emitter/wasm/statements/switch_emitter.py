@@ -0,0 +1,129 @@
+# file: lmn/compiler/emitter/wasm/statements/switch_emitter.py
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Below this many constants a binary search just compares them one by one.
+LINEAR_SEARCH_CASES = 3
+
+class SwitchEmitter:
+    def __init__(self, controller):
+        self.controller = controller
+
+    def emit_switch(self, node, out_lines):
+        """
+        Emits an IfStatement carrying a "switch" hint from the optimizer's
+        switch pass (see optimizer/switches.py). Every arm gets its own block;
+        the dispatch branches straight to the right one:
+
+          block $switch_0
+            block $switch_0_default
+              block $switch_0_case_1
+                block $switch_0_case_0
+                  <dispatch>             ;; br_table, or a binary search of br_ifs
+                end
+                <then body>   br $switch_0
+              end
+              <elseif body> br $switch_0
+            end
+            <else body>
+          end
+        """
+        switch = node["switch"]
+        label = switch["label"]
+        then_body = node.get("then_body", node.get("thenBody")) or []
+        clauses = node.get("elseif_clauses", node.get("elseifClauses")) or []
+        else_body = node.get("else_body", node.get("elseBody")) or []
+
+        arms = [then_body] + [clause.get("body", []) for clause in clauses]
+        case_labels = [f"${label}_case_{arm}" for arm in range(len(arms))]
+        default_label = f"${label}_default"
+
+        logger.debug(
+            "SwitchEmitter: %d-way %s dispatch on %d constant(s)",
+            len(arms), switch["mode"], len(switch["cases"])
+        )
+
+        # 1) Open the exit, default and per-arm blocks (arm 0 innermost)
+        out_lines.append(f"  block ${label}")
+        out_lines.append(f"  block {default_label}")
+        for case_label in reversed(case_labels):
+            out_lines.append(f"  block {case_label}")
+
+        # 2) Dispatch
+        if switch["mode"] == "table":
+            self._emit_table(switch, case_labels, default_label, out_lines)
+        else:
+            operand = self._operand_local(switch, out_lines)
+            self._emit_search(switch["cases"], operand, case_labels, default_label, out_lines)
+
+        # 3) Arm bodies, each closing its own block
+        for body in arms:
+            out_lines.append("  end")
+            for stmt in body:
+                self.controller.emit_statement(stmt, out_lines)
+            out_lines.append(f"  br ${label}")
+
+        # 4) Default => else body
+        out_lines.append("  end")
+        for stmt in else_body:
+            self.controller.emit_statement(stmt, out_lines)
+        out_lines.append("  end")
+
+    def _emit_table(self, switch, case_labels, default_label, out_lines):
+        """
+        operand - min  =>  br_table (one entry per value in [min, max]);
+        values outside the range wrap to large unsigned indexes => default.
+        """
+        arm_of = {value: arm for value, arm in switch["cases"]}
+        low, high = min(arm_of), max(arm_of)
+
+        self.controller.emit_expression(switch["operand"], out_lines)
+        if low != 0:
+            out_lines.append(f"  i32.const {low}")
+            out_lines.append("  i32.sub")
+
+        targets = [
+            case_labels[arm_of[value]] if value in arm_of else default_label
+            for value in range(low, high + 1)
+        ]
+        out_lines.append(f"  br_table {' '.join(targets)} {default_label}")
+
+    def _emit_search(self, cases, operand, case_labels, default_label, out_lines):
+        """
+        Binary search over the sorted constants; every path ends in a branch.
+        """
+        if len(cases) <= LINEAR_SEARCH_CASES:
+            for value, arm in cases:
+                out_lines.append(f"  local.get {operand}")
+                out_lines.append(f"  i32.const {value}")
+                out_lines.append("  i32.eq")
+                out_lines.append(f"  br_if {case_labels[arm]}")
+            out_lines.append(f"  br {default_label}")
+            return
+
+        middle = len(cases) // 2
+        out_lines.append(f"  local.get {operand}")
+        out_lines.append(f"  i32.const {cases[middle][0]}")
+        out_lines.append("  i32.lt_s")
+        out_lines.append("  if")
+        self._emit_search(cases[:middle], operand, case_labels, default_label, out_lines)
+        out_lines.append("  end")
+        self._emit_search(cases[middle:], operand, case_labels, default_label, out_lines)
+
+    def _operand_local(self, switch, out_lines):
+        """
+        The binary search reads the operand several times => a variable is
+        used directly, anything else is evaluated once into a hidden local.
+        """
+        operand = switch["operand"]
+        if operand.get("type") == "VariableExpression":
+            return self.controller._normalize_local_name(operand["name"])
+
+        local_name = f"__{switch['label']}"
+        self.controller.request_local(local_name, "i32")
+        local_label = self.controller._normalize_local_name(local_name)
+        self.controller.emit_expression(operand, out_lines)
+        out_lines.append(f"  local.set {local_label}")
+        return local_label
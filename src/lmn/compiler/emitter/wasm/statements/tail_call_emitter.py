@@ -0,0 +1,53 @@
+# file: lmn/compiler/emitter/wasm/statements/tail_call_emitter.py
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TailCallEmitter:
+    def __init__(self, controller):
+        self.controller = controller
+
+    def emit_tail_call(self, node, out_lines):
+        """
+        TailCallStatement nodes are produced by the optimizer's tail-call pass:
+
+          {
+            "type": "TailCallStatement",
+            "mode": "loop",               # self-recursion => re-enter loop
+            "function": "fact",
+            "label": "tail_fact",
+            "params": ["n"],
+            "arguments": [ expr, ... ]
+          }
+
+          {
+            "type": "TailCallStatement",
+            "mode": "return_call",        # wasm tail-call proposal
+            "function": "other",
+            "arguments": [ expr, ... ]
+          }
+
+        For "loop" we evaluate *all* arguments first (they may read the old
+        parameter values), then store them into the params in reverse order
+        and branch back to the function's loop label.
+        """
+        # 1) Push every argument
+        arguments = node.get("arguments", [])
+        for arg in arguments:
+            self.controller.emit_expression(arg, out_lines)
+
+        # 2) return_call => the engine reuses the current frame
+        if node.get("mode") == "return_call":
+            real_func_name = self.controller.get_emitted_function_name(node["function"])
+            func_label = self.controller._normalize_local_name(real_func_name)
+            logger.debug("TailCallEmitter: return_call %s", func_label)
+            out_lines.append(f"  return_call {func_label}")
+            return
+
+        # 3) loop => re-assign params, innermost argument on top of the stack
+        for p_name in reversed(node.get("params", [])):
+            out_lines.append(f"  local.set {self.controller._normalize_local_name(p_name)}")
+
+        logger.debug("TailCallEmitter: br $%s (%d args)", node["label"], len(arguments))
+        out_lines.append(f"  br ${node['label']}")
@@ -0,0 +1,50 @@
+# file: lmn/compiler/emitter/wasm/string_layout.py
+
+import struct
+
+# How strings sit in linear memory. Shared by the emitter (literals) and the
+# host functions (lmn/runtime/host/memory_utils*.py), which read and write
+# strings through a pointer to their first byte.
+#
+#   "nul"    : <utf-8 bytes> 0x00                  (C string, length = scan)
+#   "length" : <length:u32> <utf-8 bytes> 0x00     (pointer => first text byte,
+#                                                   length at pointer - 4)
+#
+# The "length" layout keeps the NUL terminator, so code that only knows
+# about C strings still reads it correctly.
+NUL_TERMINATED = "nul"
+LENGTH_PREFIXED = "length"
+STRING_LAYOUTS = (NUL_TERMINATED, LENGTH_PREFIXED)
+
+LENGTH_HEADER = struct.Struct("<I")
+LENGTH_HEADER_SIZE = LENGTH_HEADER.size
+
+# A module built with the "length" layout stores this marker in the (otherwise
+# unused) first KiB of memory, below the literal pool, so the host functions
+# know they may trust the length headers.
+LAYOUT_MARKER_OFFSET = 16
+LAYOUT_MARKER = b"LMNSTR\x01\x00"
+
+def check_string_layout(layout: str) -> str:
+    """
+    Return 'layout' if it is a known layout, else raise ValueError.
+    """
+    if layout not in STRING_LAYOUTS:
+        raise ValueError(f"Unknown string layout {layout!r} (expected one of {', '.join(STRING_LAYOUTS)})")
+    return layout
+
+def encode_string(text: str, layout: str = NUL_TERMINATED) -> bytes:
+    """
+    The bytes of 'text' in the given layout; the string pointer is the start
+    of the block plus header_size(layout).
+    """
+    data = text.encode("utf-8", errors="replace")
+    if layout == LENGTH_PREFIXED:
+        return LENGTH_HEADER.pack(len(data)) + data + b"\0"
+    return data + b"\0"
+
+def header_size(layout: str) -> int:
+    """
+    Bytes in front of the first text byte.
+    """
+    return LENGTH_HEADER_SIZE if layout == LENGTH_PREFIXED else 0
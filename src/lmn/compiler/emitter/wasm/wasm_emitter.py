@@ -26,10 +26,14 @@ from lmn.compiler.emitter.wasm.statements.print_emitter import PrintEmitter
 from lmn.compiler.emitter.wasm.statements.return_emitter import ReturnEmitter
 from lmn.compiler.emitter.wasm.statements.for_emitter import ForEmitter
 from lmn.compiler.emitter.wasm.statements.call_emitter import CallEmitter
+from lmn.compiler.emitter.wasm.statements.tail_call_emitter import TailCallEmitter
+from lmn.compiler.emitter.wasm.statements.switch_emitter import SwitchEmitter
+from lmn.compiler.emitter.wasm.statements.prefetch_emitter import PrefetchEmitter
 from lmn.compiler.emitter.wasm.statements.function_emitter import FunctionEmitter
 
 from lmn.compiler.emitter.wasm.expressions.binary_expression_emitter import BinaryExpressionEmitter
 from lmn.compiler.emitter.wasm.expressions.fn_expression_emitter import FnExpressionEmitter
+from lmn.compiler.emitter.wasm.expressions.inlined_call_emitter import InlinedCallEmitter
 from lmn.compiler.emitter.wasm.expressions.unary_expression_emitter import UnaryExpressionEmitter
 from lmn.compiler.emitter.wasm.expressions.literal_expression_emitter import LiteralExpressionEmitter
 from lmn.compiler.emitter.wasm.expressions.variable_expression_emitter import VariableExpressionEmitter
@@ -38,6 +42,8 @@ from lmn.compiler.emitter.wasm.expressions.variable_expression_emitter import Va
 #  External module builder for final (module ...) construction
 # -------------------------------------------------------------------------
 from lmn.compiler.emitter.wasm.wasm_module_builder import build_module
+from lmn.compiler.emitter.wasm.literal_pool import LiteralPool
+from lmn.compiler.emitter.wasm.simd_array_builtins import SimdArrayBuiltinEmitter
 
 # -------------------------------------------------------------------------
 #  Helper imports (if you have unify_types, normalize_params, etc.)
@@ -48,26 +54,42 @@ from lmn.compiler.emitter.wasm.param_utils import normalize_params
 logger = logging.getLogger(__name__)
 
 class WasmEmitter:
-    def __init__(self, import_memory=False):
+    def __init__(self, import_memory=False, peephole=None, local_allocator=None, literal_pool=None):
         """
         Orchestrates the WASM (WAT) code emission from the typed AST,
         including top-level Program logic AND function-level logic.
+
+        'peephole' is an optional PeepholeOptimizer run over the collected
+        function lines before the module is built; 'local_allocator' an
+        optional LocalAllocator run after it. 'literal_pool' lays out the
+        static data (default: a LiteralPool without interning).
         """
         self.import_memory = import_memory
+        self.peephole = peephole
+        self.local_allocator = local_allocator
 
         # A) We'll collect strings of WAT lines for each function
         self.functions = []
         self.function_names = []
         self.function_counter = 0
 
+        # A2) Names of the program's own functions (they shadow builtins)
+        self.defined_function_names = set()
+
         # B) Track local variables inside the *current* function
         self.new_locals = set()
         self.func_local_map = {}
         self.local_counter = 0
 
+        # B2) Module-level (global ...) declarations, e.g. memo tables
+        self.globals = []
+
+        # B3) Host imports declared only when used ('llm__prefetch', ...):
+        #     import name => (import ...) line
+        self.host_imports = {}
+
         # C) Data segments for strings, arrays, etc.
-        self.data_segments = []
-        self.current_data_offset = 1024
+        self.literal_pool = literal_pool if literal_pool is not None else LiteralPool(intern=False)
 
         # D) Emitter classes for statements & expressions
         self.if_emitter = IfEmitter(self)
@@ -79,10 +101,14 @@ class WasmEmitter:
         self.break_emitter = BreakEmitter(self)
         self.continue_emitter = ContinueEmitter(self)
         self.call_emitter = CallEmitter(self)
+        self.tail_call_emitter = TailCallEmitter(self)
+        self.switch_emitter = SwitchEmitter(self)
+        self.prefetch_emitter = PrefetchEmitter(self)
         self.function_emitter = FunctionEmitter(self)
 
         self.binary_expr_emitter = BinaryExpressionEmitter(self)
         self.fn_expr_emitter = FnExpressionEmitter(self)
+        self.inlined_call_emitter = InlinedCallEmitter(self)
         self.unary_expr_emitter = UnaryExpressionEmitter(self)
         self.literal_expr_emitter = LiteralExpressionEmitter(self)
         self.variable_expr_emitter = VariableExpressionEmitter(self)
@@ -101,9 +127,16 @@ class WasmEmitter:
         self.double_array_literal_emitter = DoubleArrayLiteralEmitter(self)
         self.string_array_literal_emitter = StringArrayLiteralEmitter(self)
 
+        # 3) Array builtins (sum, dot, ...) => SIMD helper functions
+        self.simd_array_emitter = SimdArrayBuiltinEmitter(self)
+
         # Track inlined function aliases (e.g. sum_func -> anon_0)
         self.func_alias_map = {}
 
+        # Stack of (block label, result type) for call sites expanded by the
+        # optimizer's inliner => 'return' inside them branches to the label
+        self.inline_return_targets = []
+
         # Create the ProgramEmitter, passing self
         self.program_emitter = ProgramEmitter(self)
 
@@ -146,6 +179,10 @@ class WasmEmitter:
             self.call_emitter.emit_call(stmt, out_lines)
         elif stype == "AssignmentStatement":
             self.assignment_emitter.emit_assignment(stmt, out_lines)
+        elif stype == "TailCallStatement":
+            self.tail_call_emitter.emit_tail_call(stmt, out_lines)
+        elif stype == "PrefetchStatement":
+            self.prefetch_emitter.emit_prefetch(stmt, out_lines)
         elif stype == "FunctionDefinition":
             # Already handled in top-level rewriting => do nothing
             logger.debug("emit_statement: 'FunctionDefinition' => skip (already handled)")
@@ -185,6 +222,12 @@ class WasmEmitter:
             logger.debug("emit_expression: no emitter found for etype='%s' => fallback i32.const 0", etype)
             out_lines.append('  i32.const 0')
 
+        # The optimizer's CSE pass reuses this value later => keep a copy
+        cse_local = expr.get("cse_store")
+        if cse_local:
+            self.request_local(cse_local, self._wasm_basetype(expr.get("inferred_type", "i32")))
+            out_lines.append(f"  local.tee {self._normalize_local_name(cse_local)}")
+
     def _emit_array_literal(self, expr, out_lines):
         """
         Distinguish different array-literal types by `expr.get("inferred_type")`.
@@ -222,6 +265,16 @@ class WasmEmitter:
         """
         Calls the external wasm_module_builder to produce the final (module ...) text.
         """
+        if self.peephole is not None:
+            logger.debug("build_module: running peephole pass over %d function(s)", len(self.functions))
+            self.peephole.optimize_functions(self.functions)
+
+        if self.local_allocator is not None:
+            logger.debug("build_module: compacting locals of %d function(s)", len(self.functions))
+            self.local_allocator.allocate_functions(self.functions)
+
+        self.literal_pool.report()
+
         logger.debug("build_module: about to build final (module ...) from collected functions & data segments")
         return build_module(self)
 
@@ -230,27 +283,30 @@ class WasmEmitter:
     # -------------------------------------------------------------------------
     def _add_data_segment(self, text: str) -> int:
         """
-        Store text in a data segment, returning the linear-memory offset.
-        The text is UTF-8 encoded + a null terminator, so 'hello' => b'hello\0'.
+        Store text in the literal pool, returning the string pointer.
+        The text is UTF-8 encoded + a null terminator, so 'hello' => b'hello\0'
+        (preceded by a u32 length with the "length" string layout).
         """
-        data_bytes = text.encode('utf-8', errors='replace') + b'\0'
-        offset = self.current_data_offset
+        offset = self.literal_pool.add_string(text)
+        logger.debug("_add_data_segment: text=%r => offset=%d", text, offset)
+        return offset
 
-        logger.debug(
-            "_add_data_segment: Storing text=%r at offset=%d, current_data_offset=%d", 
-            text, offset, self.current_data_offset
-        )
+    def _add_data_bytes(self, data_bytes: bytes, align: int = 1, header: int = 0) -> int:
+        """
+        Store raw bytes (e.g. a constant array) in the literal pool and return
+        the offset; offset + header is a multiple of 'align'.
+        """
+        offset = self.literal_pool.add(data_bytes, align, header)
+        logger.debug("_add_data_bytes: %d byte(s) => offset=%d", len(data_bytes), offset)
+        return offset
 
-        self.data_segments.append((offset, data_bytes))
-        logger.debug("_add_data_segment: data_bytes=%r", data_bytes)
+    @property
+    def data_segments(self) -> list:
+        return self.literal_pool.segments()
 
-        self.current_data_offset += len(data_bytes)
-        logger.debug(
-            "_add_data_segment: updated current_data_offset to %d after storing %d bytes", 
-            self.current_data_offset, len(data_bytes)
-        )
-
-        return offset
+    @property
+    def current_data_offset(self) -> int:
+        return self.literal_pool.end_offset
 
     # -------------------------------------------------------------------------
     # (E) Type Helpers
@@ -314,6 +370,18 @@ class WasmEmitter:
             logger.debug("get_emitted_function_name: no alias => keeping '%s'", raw_name)
         return resolved
     
+    def declare_host_import(self, import_name: str, signature: dict, namespace: str = "env"):
+        """
+        Import a host function only this program uses (e.g. 'llm__prefetch');
+        'signature' has the builtins JSON shape {"parameters": [...], "results": [...]}.
+        """
+        if import_name in self.host_imports:
+            return
+        params = " ".join(param["type"] for param in signature.get("parameters", []))
+        results = " ".join(result["type"] for result in signature.get("results", []))
+        func_type = (f" (param {params})" if params else "") + (f" (result {results})" if results else "")
+        self.host_imports[import_name] = f'(import "{namespace}" "{import_name}" (func ${import_name}{func_type}))'
+
     def request_local(self, local_name: str, local_type: str):
         """
         Ensure a local variable named 'local_name' with type 'local_type'
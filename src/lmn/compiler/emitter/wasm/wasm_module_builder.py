@@ -1,6 +1,8 @@
 # file: lmn/compiler/emitter/wasm/wasm_module_builder.py
 import logging
 
+from lmn.compiler.emitter.wasm.literal_pool import escape_wat_bytes
+
 # logger
 logger = logging.getLogger(__name__)
 
@@ -50,6 +52,10 @@ def build_module(wasm_emitter):
     # 6) call_tools => takes a single i32 pointer, returns i32 pointer
     lines.append('  (import "env" "call_tools" (func $call_tools (param i32) (result i32)))')
 
+    # Imports only some programs use (e.g. llm__prefetch, see PrefetchEmitter)
+    for import_line in wasm_emitter.host_imports.values():
+        lines.append(f"  {import_line}")
+
 
     # Memory
     if wasm_emitter.import_memory:
@@ -67,6 +73,10 @@ def build_module(wasm_emitter):
 
         lines.append(f'  (memory (export "memory") {required_pages})')
 
+    # Globals
+    for global_line in wasm_emitter.globals:
+        lines.append(f"  {global_line}")
+
     # Collected functions
     for f_lines in wasm_emitter.functions:
         for line in f_lines:
@@ -78,8 +88,9 @@ def build_module(wasm_emitter):
 
     # Data segments
     if not wasm_emitter.import_memory:
+        # one contiguous segment from the literal pool (see literal_pool.py)
         for (offset, data_bytes) in wasm_emitter.data_segments:
-            escaped = "".join(f"\\{b:02x}" for b in data_bytes)
+            escaped = escape_wat_bytes(data_bytes)
             lines.append(f'  (data (i32.const {offset}) "{escaped}")')
 
     # close the brackets
@@ -55,6 +55,7 @@ class LmnTokenType(Enum):
     RBRACKET  = ']'
     DOT       = 'DOT'
     COLON     = ':'
+    AT        = '@'         # function annotation, e.g. @memo
 
     # ------------------------------
     # Comment
@@ -193,4 +194,5 @@ class LmnTokenType(Enum):
             '}': LmnTokenType.RBRACE,
             '.': LmnTokenType.DOT,
             ':': LmnTokenType.COLON,
+            '@': LmnTokenType.AT,
         }
@@ -15,6 +15,12 @@ LANG_TO_WASM_SCALARS: Dict[str, str] = {
     "float":       "f32",
     "double":      "f64",
     "f64":         "f64",        # Some DSLs explicitly say "f64" for double-precision
+    # Already-lowered scalars stay as they are (call arguments are lowered
+    # both with the call and as children of the enclosing node).
+    "i32":         "i32",
+    "i64":         "i64",
+    "f32":         "f32",
+    "i32_json":    "i32_json",
     "string":      "i32_string",
     "i32_string":  "i32_string",
     "json":        "i32_json",
@@ -33,6 +39,14 @@ LANG_TO_WASM_ARRAYS: Dict[str, str] = {
     # Force it to remain i32_string_array (rather than fallback to i32).
     "i32_string_array": "i32_string_array",
 
+    # Already-lowered array types stay as they are (array literals are
+    # lowered twice: once in A.5, once with every other inferred_type).
+    "i32_ptr":     "i32_ptr",
+    "i64_ptr":     "i64_ptr",
+    "f32_ptr":     "f32_ptr",
+    "f64_ptr":     "f64_ptr",
+    "i32_json_array": "i32_json_array",
+
     # If the DSL uses "array" as a general untyped array:
     "array":       "i32_ptr",
 }
@@ -315,6 +329,12 @@ def lower_node(node: Any) -> None:
             for st in node.body:
                 lower_node(st)
 
+    if node_type == "ForStatement":
+        # loop variable, range bounds or the iterated collection
+        for field in ("variable", "start_expr", "end_expr", "step_expr"):
+            if getattr(node, field, None):
+                lower_node(getattr(node, field))
+
     if node_type == "ReturnStatement":
         if getattr(node, "expression", None):
             lower_node(node.expression)
@@ -0,0 +1,222 @@
+# file: lmn/compiler/optimizer/ast_utils.py
+
+import copy
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Function-like nodes open a new scope; most passes must not descend into them.
+FUNCTION_NODE_TYPES = ("FunctionDefinition", "AnonymousFunction")
+
+# Keys holding statement lists. IfStatement keys show up both in their
+# by-alias form (pipeline output) and snake_case (hand-written test ASTs).
+THEN_BODY_KEYS = ("thenBody", "then_body")
+ELSEIF_KEYS = ("elseifClauses", "elseif_clauses")
+ELSE_BODY_KEYS = ("elseBody", "else_body")
+
+
+def get_first(node: dict, keys, default=None):
+    """
+    Return node[key] for the first key of 'keys' present in node.
+    """
+    for key in keys:
+        if key in node:
+            return node[key]
+    return default
+
+
+def then_body(node: dict) -> list:
+    return get_first(node, THEN_BODY_KEYS, []) or []
+
+
+def elseif_clauses(node: dict) -> list:
+    return get_first(node, ELSEIF_KEYS, []) or []
+
+
+def else_body(node: dict) -> list:
+    return get_first(node, ELSE_BODY_KEYS, []) or []
+
+
+def statement_lists(stmt: dict) -> list:
+    """
+    Every nested statement list of a statement, e.g. the then/elseif/else
+    bodies of an IfStatement or the body of a ForStatement.
+    """
+    stype = stmt.get("type")
+    if stype == "IfStatement":
+        lists = [then_body(stmt)]
+        lists.extend(clause.get("body", []) for clause in elseif_clauses(stmt))
+        lists.append(else_body(stmt))
+        return lists
+    if stype in ("ForStatement", "WhileStatement", "BlockStatement"):
+        return [stmt.get("body", [])]
+    return []
+
+
+def remove_statements(statements: list, predicate) -> int:
+    """
+    Remove (in place) every statement for which predicate(stmt) is true,
+    from 'statements' and all nested statement lists (function bodies
+    included). Returns how many statements were removed.
+    """
+    removed = 0
+    kept = []
+    for stmt in statements:
+        if predicate(stmt):
+            removed += 1
+            continue
+        if stmt.get("type") == "FunctionDefinition":
+            removed += remove_statements(stmt.get("body", []), predicate)
+        for nested in statement_lists(stmt):
+            removed += remove_statements(nested, predicate)
+        kept.append(stmt)
+    statements[:] = kept
+    return removed
+
+
+def iter_children(node):
+    """
+    Yield (container, key, child) for every AST child dict of 'node',
+    so callers can replace a child with container[key] = new_child.
+    Works on dict nodes and on plain lists of nodes.
+    """
+    if isinstance(node, list):
+        for index, item in enumerate(node):
+            if isinstance(item, dict):
+                yield node, index, item
+            elif isinstance(item, list):
+                yield from iter_children(item)
+        return
+
+    for key, value in node.items():
+        if isinstance(value, dict):
+            if "type" in value:
+                yield node, key, value
+            else:
+                # e.g. the "inline" payload of an inlined FnExpression
+                yield from iter_children(value)
+        elif isinstance(value, list):
+            yield from iter_children(value)
+
+
+def walk(node, enter_functions: bool = False):
+    """
+    Pre-order generator over every typed dict node below (and including) 'node'.
+    Nested function bodies are skipped unless enter_functions=True.
+    """
+    if isinstance(node, list):
+        for _, _, child in iter_children(node):
+            yield from walk(child, enter_functions)
+        return
+
+    if not isinstance(node, dict):
+        return
+
+    if "type" in node:
+        yield node
+        if node["type"] in FUNCTION_NODE_TYPES and not enter_functions:
+            return
+
+    for _, _, child in iter_children(node):
+        yield from walk(child, enter_functions)
+
+
+def node_size(node) -> int:
+    """
+    Number of AST nodes below 'node' - the cost model used by several passes.
+    """
+    return sum(1 for _ in walk(node, enter_functions=True))
+
+
+def called_function_name(node: dict):
+    """
+    Return the callee name of a FnExpression / CallStatement, else None.
+    """
+    ntype = node.get("type")
+    if ntype == "FnExpression":
+        name_node = node.get("name")
+        if isinstance(name_node, dict):
+            return name_node.get("name")
+        return name_node
+    if ntype == "CallStatement":
+        return node.get("tool_name")
+    return None
+
+
+def collect_called_names(node) -> set:
+    """
+    Every function name called anywhere below 'node' (same scope only).
+    """
+    names = set()
+    for sub in walk(node):
+        name = called_function_name(sub)
+        if name:
+            names.add(name)
+    return names
+
+
+def assigned_names(node) -> set:
+    """
+    Every local name written below 'node': let targets, assignments,
+    for-loop variables, postfix ++/-- operands and inlined-call parameters.
+    """
+    names = set()
+    for sub in walk(node):
+        stype = sub.get("type")
+        if stype == "LetStatement":
+            names.add(sub["variable"]["name"])
+        elif stype == "AssignmentStatement":
+            names.add(sub["variable_name"])
+        elif stype == "ForStatement":
+            names.add(sub["variable"]["name"])
+        elif stype == "AssignmentExpression":
+            left = sub.get("left") or {}
+            if left.get("name"):
+                names.add(left["name"])
+        elif stype == "PostfixExpression":
+            operand = sub.get("operand") or {}
+            if operand.get("type") == "VariableExpression":
+                names.add(operand["name"])
+
+        # inlined calls store their arguments into renamed parameter locals
+        inline = sub.get("inline")
+        if isinstance(inline, dict):
+            names.update(binding["name"] for binding in inline.get("bindings", []))
+    return names
+
+
+def uninitialised_locals(body, param_names=()) -> set:
+    """
+    Locals written in 'body' that are neither parameters nor introduced by an
+    initialising `let` / for-loop header. Passes that make a local outlive a
+    single call (inlining, tail-call loops) must not see such locals, since
+    a fresh call would start them at zero.
+    """
+    initialised = set()
+    for sub in walk(body):
+        stype = sub.get("type")
+        if stype == "LetStatement" and sub.get("expression") is not None:
+            initialised.add(sub["variable"]["name"])
+        elif stype == "ForStatement":
+            initialised.add(sub["variable"]["name"])
+    return assigned_names(body) - set(param_names) - initialised
+
+
+def is_pure_expression(expr, pure_functions=()) -> bool:
+    """
+    True if evaluating 'expr' has no side effects: no calls (other than to
+    'pure_functions'), no assignment expressions and no ++/--.
+    """
+    if expr is None:
+        return True
+    for sub in walk(expr):
+        stype = sub.get("type")
+        if stype in ("AssignmentExpression", "PostfixExpression", "AnonymousFunction"):
+            return False
+        if stype == "FnExpression" and called_function_name(sub) not in pure_functions:
+            return False
+    return True
+
+
+def deep_copy(node):
+    return copy.deepcopy(node)
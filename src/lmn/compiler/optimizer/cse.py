@@ -0,0 +1,334 @@
+# file: lmn/compiler/optimizer/cse.py
+
+import json
+import logging
+
+from lmn.compiler.optimizer.ast_utils import (
+    FUNCTION_NODE_TYPES,
+    assigned_names,
+    called_function_name,
+    is_pure_expression,
+    iter_children,
+    statement_lists,
+    walk,
+)
+from lmn.compiler.optimizer.loops import NUMERIC_TYPES
+from lmn.compiler.optimizer.purity import pure_function_names
+
+logger = logging.getLogger(__name__)
+
+PASS_NAME = "cse"
+
+# Expressions worth a hidden local (variables / literals are already cheap).
+CANDIDATE_TYPES = ("BinaryExpression", "UnaryExpression", "FnExpression", "ConversionExpression")
+
+# Comparisons carry their operand type as inferred_type (the result is an
+# i32), and/or are short-circuited => neither is cached.
+NON_ARITHMETIC_OPERATORS = ("<", "<=", ">", ">=", "==", "!=", "and", "or")
+
+# Hints of other passes that never change the value of an expression.
+IGNORED_KEYS = ("inline", "cse_store")
+
+# Statement keys that are not evaluated where the statement stands: loop
+# headers run on every iteration, preheaders / induction variables are
+# emitted by the ForEmitter around the body.
+SKIPPED_KEYS = ("variable", "end_expr", "step_expr", "preheader", "induction", "switch")
+
+def _expression_key(expr) -> str:
+    return json.dumps(_strip_hints(expr), sort_keys=True, default=str)
+
+def _strip_hints(value):
+    if isinstance(value, dict):
+        return {k: _strip_hints(v) for k, v in value.items() if k not in IGNORED_KEYS}
+    if isinstance(value, list):
+        return [_strip_hints(item) for item in value]
+    return value
+
+class CommonSubexpressionEliminator:
+    """
+    Local value numbering over the statement lists of each function.
+
+    Walking a block in evaluation order, every pure numeric sub-expression
+    gets a value number (its canonical JSON). When the same value shows up
+    again, the first occurrence is marked
+
+        "cse_store": "__cse_N"      emit the value, then `local.tee $__cse_N`
+
+    and the repeat becomes a plain `VariableExpression` reading that local,
+    so `(a*b) + (a*b)` or a repeated `fn(x)` on a pure function computes the
+    value once.
+
+    A value is forgotten as soon as it may change:
+      - a let / assignment (or for-loop variable) writes a local it reads
+      - a call to a non-pure (host) function happens, for values that
+        contain calls themselves (pure builtins may read linear memory)
+      - a statement contains `x = ...` / `x++` inside an expression
+
+    Nested blocks (if arms, loop bodies) start from a copy of the enclosing
+    table, minus anything their loop writes, and their own values die with
+    them. Expressions that may not run (right side of and/or, elseif
+    conditions) only reuse values, they never provide one.
+    """
+
+    def __init__(self, options, profile=None):
+        self.options = options
+        self.profile = profile
+        self.pure = set()
+        self.temp_counter = 0
+
+        # per-function counts for the decisions log
+        self.eliminated = 0
+        self.temporaries = 0
+
+    def run(self, program: dict) -> None:
+        self.pure = pure_function_names(program, self.options.invariant_functions)
+        logger.debug("CommonSubexpressionEliminator: pure functions=%s", sorted(self.pure))
+
+        top_level = []
+        for stmt in program.get("body", []):
+            if stmt.get("type") == "FunctionDefinition":
+                self._optimize_function(stmt.get("name"), stmt.get("body", []))
+            else:
+                top_level.append(stmt)
+        if top_level:
+            self._optimize_function("<top-level>", top_level)
+
+    def _optimize_function(self, name, body):
+        outer_counts = (self.eliminated, self.temporaries)
+        self.eliminated = 0
+        self.temporaries = 0
+        self._optimize_block(body, {})
+        if self.eliminated:
+            self._decision(
+                f"'{name}': {self.eliminated} repeated expression(s) "
+                f"read from {self.temporaries} temporary local(s)"
+            )
+        self.eliminated, self.temporaries = outer_counts
+
+    # -------------------------------------------------------------------------
+    # Statements
+    # -------------------------------------------------------------------------
+    def _optimize_block(self, statements, table):
+        for stmt in statements:
+            self._optimize_statement(stmt, table)
+
+    def _optimize_statement(self, stmt, table):
+        stype = stmt.get("type")
+
+        # 1) Nested functions have their own locals
+        if stype in FUNCTION_NODE_TYPES:
+            self._optimize_function(stmt.get("name"), stmt.get("body", []))
+            return
+
+        nested_lists = statement_lists(stmt)
+        nested_ids = {id(lst) for lst in nested_lists}
+        skipped = SKIPPED_KEYS
+        if stype == "IfStatement" and stmt.get("switch"):
+            # the switch dispatch replaces the conditions of the chain
+            skipped += ("condition", "elseifClauses", "elseif_clauses")
+        elif stype == "WhileStatement":
+            # re-evaluated after every iteration of the body
+            skipped += ("condition",)
+        inline = stmt.get("inline")
+        if isinstance(inline, dict):
+            # an inlined call statement is emitted from its bindings
+            skipped += ("arguments", "inline")
+
+        own = [
+            (key, value) for key, value in stmt.items()
+            if key not in skipped and id(value) not in nested_ids
+        ]
+
+        # 2) Side effects inside expressions => give up on this statement
+        if any(self._has_side_effects(value) for _, value in own):
+            table.clear()
+            for nested in nested_lists:
+                self._optimize_block(nested, {})
+            return
+
+        # 3) Expressions owned by the statement, in evaluation order
+        for key, value in own:
+            if isinstance(value, dict) and "type" in value:
+                self._optimize_expression(stmt, key, table, stmt_key=key)
+            elif isinstance(value, list):
+                for index, item in enumerate(value):
+                    if not isinstance(item, dict) or "type" not in item:
+                        continue
+                    if item["type"] == "ElseIfClause":
+                        # only evaluated when the previous conditions fail
+                        self._optimize_expression(item, "condition", table, conditional=True)
+                    else:
+                        self._optimize_expression(value, index, table)
+        if isinstance(inline, dict):
+            self._optimize_inline(stmt, table, False)
+
+        # 4) Nested blocks start from what is still valid inside them
+        written = assigned_names(stmt)
+        calls = self._calls_host(stmt)
+        for nested in nested_lists:
+            if stype in ("ForStatement", "WhileStatement"):
+                inner = self._surviving(table, written, calls)
+            else:
+                inner = dict(table)
+            self._optimize_block(nested, inner)
+
+        # 5) Whatever the statement wrote is stale from here on
+        table_after = self._surviving(table, written, calls)
+        table.clear()
+        table.update(table_after)
+
+    # -------------------------------------------------------------------------
+    # Expressions
+    # -------------------------------------------------------------------------
+    def _optimize_expression(self, parent, key, table, conditional=False, stmt_key=None):
+        expr = parent[key]
+        if not isinstance(expr, dict) or "type" not in expr:
+            return
+        if expr["type"] in FUNCTION_NODE_TYPES:
+            return
+
+        candidate = self._is_candidate(expr)
+        value_key = _expression_key(expr) if candidate else None
+
+        # 1) Seen before => read the temporary instead
+        #    (`let a = <variable>` is emitted as an alias, never as a local)
+        aliasing_let = parent.get("type") == "LetStatement" if isinstance(parent, dict) else False
+        if candidate and value_key in table and not (aliasing_let and stmt_key == "expression"):
+            parent[key] = self._reuse(table[value_key])
+            return
+
+        # 2) Children, in the order the emitter evaluates them
+        self._optimize_children(expr, table, conditional)
+
+        # 3) A host call may change anything a cached call result depends on
+        if expr["type"] == "FnExpression" and called_function_name(expr) not in self.pure:
+            self._forget_calls(table)
+
+        # 4) Only values computed on every path may be reused later
+        if candidate and not conditional and value_key not in table:
+            table[value_key] = {
+                "node": expr,
+                "name": None,
+                "reads": self._read_names(expr),
+                "calls": any(sub.get("type") == "FnExpression" for sub in walk(expr)),
+            }
+
+    def _optimize_children(self, expr, table, conditional):
+        etype = expr["type"]
+
+        if etype == "BinaryExpression" and expr.get("operator") in ("and", "or"):
+            # the right side may be skipped, and a cheap right side is even
+            # emitted *before* the left one (select) => it may only reuse
+            # values that already existed before the whole expression
+            before = dict(table)
+            self._optimize_expression(expr, "left", table, conditional)
+            right_table = {k: v for k, v in before.items() if k in table}
+            self._optimize_expression(expr, "right", right_table, True)
+            return
+
+        if etype == "FnExpression":
+            if isinstance(expr.get("inline"), dict):
+                self._optimize_inline(expr, table, conditional)
+                return
+            arguments = expr.get("arguments", [])
+            for index in range(len(arguments)):
+                self._optimize_expression(arguments, index, table, conditional)
+            return
+
+        if etype == "BinaryExpression":
+            self._optimize_expression(expr, "left", table, conditional)
+            self._optimize_expression(expr, "right", table, conditional)
+            return
+
+        for container, child_key, _ in list(iter_children(expr)):
+            self._optimize_expression(container, child_key, table, conditional)
+
+    def _optimize_inline(self, node, table, conditional):
+        """
+        An inlined call is emitted from its bindings (not its arguments);
+        the body only sees the callee's own (renamed) locals.
+        """
+        inline = node["inline"]
+        bindings = inline.get("bindings", [])
+        for binding in bindings:
+            self._optimize_expression(binding, "expression", table, conditional)
+        if len(bindings) == len(node.get("arguments", [])):
+            node["arguments"] = [binding["expression"] for binding in bindings]
+        self._optimize_block(inline.get("body", []), {})
+
+    def _is_candidate(self, expr) -> bool:
+        etype = expr.get("type")
+        if etype not in CANDIDATE_TYPES or expr.get("inferred_type") not in NUMERIC_TYPES:
+            return False
+        if etype == "BinaryExpression" and expr.get("operator") in NON_ARITHMETIC_OPERATORS:
+            return False
+        if etype == "UnaryExpression" and expr.get("operator") == "not":
+            return False
+        return is_pure_expression(expr, self.pure)
+
+    def _reuse(self, entry) -> dict:
+        node = entry["node"]
+        wasm_type = NUMERIC_TYPES[node["inferred_type"]]
+        if entry["name"] is None:
+            entry["name"] = f"__cse_{self.temp_counter}"
+            self.temp_counter += 1
+            node["cse_store"] = entry["name"]
+            self.temporaries += 1
+            self._stat("temporaries")
+        self.eliminated += 1
+        self._stat("eliminated")
+        return {
+            "type": "VariableExpression",
+            "name": entry["name"],
+            "inferred_type": wasm_type,
+        }
+
+    # -------------------------------------------------------------------------
+    # Barriers
+    # -------------------------------------------------------------------------
+    def _has_side_effects(self, value) -> bool:
+        return any(
+            sub.get("type") in ("AssignmentExpression", "PostfixExpression")
+            for sub in walk(value)
+        )
+
+    def _calls_host(self, stmt) -> bool:
+        for sub in walk(stmt):
+            name = called_function_name(sub)
+            if name and name not in self.pure:
+                return True
+        return False
+
+    def _surviving(self, table, written, calls) -> dict:
+        return {
+            key: entry for key, entry in table.items()
+            if not (entry["reads"] & written) and not (calls and entry["calls"])
+        }
+
+    def _forget_calls(self, table):
+        for key in [key for key, entry in table.items() if entry["calls"]]:
+            del table[key]
+
+    def _read_names(self, expr) -> set:
+        return {
+            sub["name"] for sub in walk(expr)
+            if sub.get("type") == "VariableExpression" and isinstance(sub.get("name"), str)
+        }
+
+    # -------------------------------------------------------------------------
+    # Profile helpers
+    # -------------------------------------------------------------------------
+    def _stat(self, key, amount=1):
+        if self.profile is not None:
+            self.profile.add_stat(PASS_NAME, key, amount)
+
+    def _decision(self, message):
+        if self.profile is not None:
+            self.profile.add_decision(PASS_NAME, message)
+
+
+def eliminate_common_subexpressions(program: dict, options, profile=None) -> None:
+    """
+    Run common subexpression elimination over a lowered dict AST (in place).
+    """
+    CommonSubexpressionEliminator(options, profile).run(program)
@@ -0,0 +1,224 @@
+# file: lmn/compiler/optimizer/fanout.py
+
+import json
+import logging
+
+from lmn.builtins import BUILTINS
+from lmn.compiler.optimizer.ast_utils import (
+    FUNCTION_NODE_TYPES,
+    assigned_names,
+    called_function_name,
+    deep_copy,
+    statement_lists,
+    walk,
+)
+
+logger = logging.getLogger(__name__)
+
+PASS_NAME = "fanout"
+
+# Statements that end a group: code after them may not run, or runs again.
+BARRIER_TYPES = (
+    "IfStatement", "ForStatement", "WhileStatement", "BlockStatement",
+    "ReturnStatement", "BreakStatement", "ContinueStatement", "TailCallStatement",
+    "FunctionDefinition",
+)
+
+# Arguments that can be evaluated again, earlier, without side effects.
+SIMPLE_ARGUMENT_TYPES = ("LiteralExpression", "VariableExpression")
+
+# Hints of other passes that must not be emitted twice.
+IGNORED_KEYS = ("cse_store",)
+
+def prefetchable_builtin_names() -> set:
+    """
+    Host functions whose builtins JSON entry has a "prefetch_handler".
+    """
+    return {name for name, info in BUILTINS.items() if info.get("prefetch_handler")}
+
+
+class CallFanOut:
+    """
+    Starts independent slow host calls (llm, ask_tools, call_tools) together.
+
+    Within a block, a group is a run of statements without control flow,
+    e.g. the elements of `["a", llm("x"), llm("y")]` or consecutive
+    `let a = llm(p)` / `let b = llm(q)`. A group starts at the statement
+    of its first call; a later call joins it if its arguments are literals
+    or variables nothing in the group wrote before the call (so
+    `let b = llm(a)` after `let a = llm(p)` waits for a). A group with two
+    or more such calls gets
+
+        {"type": "PrefetchStatement", "calls": [copies of the calls]}
+
+    in front of that first statement. The emitter turns it into `call $llm__prefetch` (same
+    arguments, no result) per call: the host starts the requests on a
+    thread pool and every real call then just collects its answer, in
+    program order.
+
+    Calls that may be skipped (right side of and/or, statements with
+    `x = ...` / `x++` inside expressions) are left alone; identical calls
+    are prefetched once, the repeat is answered by the response cache.
+    """
+
+    def __init__(self, options, profile=None):
+        self.options = options
+        self.profile = profile
+        self.prefetchable = set()
+
+    def run(self, program: dict) -> None:
+        defined = {
+            node["name"] for node in program.get("body", [])
+            if node.get("type") == "FunctionDefinition"
+        }
+        # a user function shadows a builtin of the same name
+        self.prefetchable = prefetchable_builtin_names() - defined
+        logger.debug("CallFanOut: prefetchable builtins=%s", sorted(self.prefetchable))
+        if not self.prefetchable:
+            return
+
+        # function definitions are barriers; their bodies are blocks of their own
+        self._optimize_block("<top-level>", program.get("body", []))
+
+    # -------------------------------------------------------------------------
+    # Blocks
+    # -------------------------------------------------------------------------
+    def _optimize_block(self, name, statements) -> int:
+        """
+        Insert the prefetch statements of one statement list (in place) and
+        recurse into nested blocks. Returns the number of groups.
+        """
+        groups = 0
+        for stmt in statements:
+            if stmt.get("type") in FUNCTION_NODE_TYPES:
+                groups += self._optimize_block(stmt.get("name"), stmt.get("body", []))
+            for nested in statement_lists(stmt):
+                groups += self._optimize_block(name, nested)
+
+        out = []
+        group_start = 0
+        calls = {}      # canonical JSON => call, in program order
+        written = set()
+
+        def flush():
+            nonlocal groups
+            if len(calls) >= 2:
+                out.insert(group_start, {"type": "PrefetchStatement", "calls": list(calls.values())})
+                groups += 1
+                self._stat("groups")
+                self._stat("calls", len(calls))
+                self._decision(
+                    f"'{name}': {len(calls)} call(s) started together: "
+                    + ", ".join(called_function_name(call) for call in calls.values())
+                )
+            calls.clear()
+            written.clear()
+
+        for stmt in statements:
+            if stmt.get("type") in BARRIER_TYPES or self._has_side_effects(stmt):
+                flush()
+                out.append(stmt)
+                group_start = len(out)
+                continue
+
+            for call in self._candidate_calls(stmt):
+                if not calls:
+                    # the group starts at its first call's statement
+                    group_start = len(out)
+                    written.clear()
+                elif self._reads(call) & written:
+                    continue
+                copy = _strip_hints(deep_copy(call))
+                calls.setdefault(json.dumps(copy, sort_keys=True, default=str), copy)
+            written |= assigned_names(stmt)
+            out.append(stmt)
+        flush()
+
+        statements[:] = out
+        return groups
+
+    # -------------------------------------------------------------------------
+    # Calls
+    # -------------------------------------------------------------------------
+    def _candidate_calls(self, node) -> list:
+        """
+        Prefetchable calls evaluated whenever 'node' is, in evaluation order.
+        """
+        found = []
+        self._collect(node, found)
+        return found
+
+    def _collect(self, node, found):
+        if isinstance(node, list):
+            for item in node:
+                self._collect(item, found)
+            return
+        if not isinstance(node, dict):
+            return
+
+        ntype = node.get("type")
+        if ntype in FUNCTION_NODE_TYPES:
+            return
+        if ntype == "BinaryExpression" and node.get("operator") in ("and", "or"):
+            # the right side may never run
+            self._collect(node.get("left"), found)
+            return
+
+        for key, value in node.items():
+            if key == "inline":
+                # an inlined body runs with the callee's own locals
+                continue
+            if isinstance(value, (dict, list)):
+                self._collect(value, found)
+
+        if self._is_candidate(node):
+            found.append(node)
+
+    def _is_candidate(self, node) -> bool:
+        if node.get("type") != "FnExpression" or node.get("inline"):
+            return False
+        if called_function_name(node) not in self.prefetchable:
+            return False
+        return all(
+            isinstance(arg, dict) and arg.get("type") in SIMPLE_ARGUMENT_TYPES
+            for arg in node.get("arguments", [])
+        )
+
+    def _reads(self, call) -> set:
+        return {
+            arg["name"] for arg in call.get("arguments", [])
+            if arg.get("type") == "VariableExpression"
+        }
+
+    def _has_side_effects(self, stmt) -> bool:
+        return any(
+            sub.get("type") in ("AssignmentExpression", "PostfixExpression")
+            for sub in walk(stmt)
+        )
+
+    # -------------------------------------------------------------------------
+    # Profile helpers
+    # -------------------------------------------------------------------------
+    def _stat(self, key, amount=1):
+        if self.profile is not None:
+            self.profile.add_stat(PASS_NAME, key, amount)
+
+    def _decision(self, message):
+        if self.profile is not None:
+            self.profile.add_decision(PASS_NAME, message)
+
+
+def _strip_hints(value):
+    if isinstance(value, dict):
+        return {k: _strip_hints(v) for k, v in value.items() if k not in IGNORED_KEYS}
+    if isinstance(value, list):
+        return [_strip_hints(item) for item in value]
+    return value
+
+
+def fan_out_calls(program: dict, options, profile=None) -> None:
+    """
+    Insert PrefetchStatements for groups of independent host calls into a
+    lowered dict AST (in place).
+    """
+    CallFanOut(options, profile).run(program)
@@ -0,0 +1,322 @@
+# file: lmn/compiler/optimizer/inliner.py
+
+import logging
+
+from lmn.compiler.optimizer.ast_utils import (
+    FUNCTION_NODE_TYPES,
+    assigned_names,
+    called_function_name,
+    collect_called_names,
+    deep_copy,
+    node_size,
+    remove_statements,
+    uninitialised_locals,
+    walk,
+)
+from lmn.compiler.emitter.wasm.memo_table import is_memoised
+
+logger = logging.getLogger(__name__)
+
+PASS_NAME = "inliner"
+
+class FunctionInliner:
+    """
+    Inlines calls to small, non-recursive functions (and let-bound lambdas)
+    at their call sites.
+
+    The pass works on the lowered dict AST. An inlined call keeps its node
+    type (FnExpression / CallStatement) so every emitter that dispatches on
+    the call still works; it just gains an "inline" payload:
+
+        {
+          "type": "FnExpression",
+          "name": {"type": "VariableExpression", "name": "add"},
+          "arguments": [...],
+          "inline": {
+            "label": "inline_0",
+            "callee": "add",
+            "return_type": "i32",
+            "bindings": [ {"name": "__inl0_a", "type": "i32", "expression": <arg0>}, ... ],
+            "body": [ ...callee body with locals renamed to __inl0_* ... ]
+          }
+        }
+
+    The emitter turns that into arguments stored in the renamed locals,
+    followed by a `block $inline_0 (result i32)` in which every
+    ReturnStatement becomes `br $inline_0`.
+    """
+
+    def __init__(self, options, profile=None):
+        self.options = options
+        self.profile = profile
+
+        # name => callee info (see _callee_info)
+        self.functions = {}
+        self.recursive = set()
+        self.inline_counter = 0
+
+        # ids of `let f = function...` statements whose calls were all inlined
+        self.dead_lambda_lets = set()
+
+        # the whole program body (references to a lambda are checked across it)
+        self.program_body = []
+
+    # -------------------------------------------------------------------------
+    # Entry point
+    # -------------------------------------------------------------------------
+    def run(self, program: dict) -> None:
+        body = program.get("body", [])
+        self.program_body = body
+
+        # 1) Collect top-level function definitions
+        for node in body:
+            if node.get("type") == "FunctionDefinition":
+                params = [
+                    (p["name"], p.get("type_annotation") or "i32")
+                    for p in node.get("params", [])
+                ]
+                self.functions[node["name"]] = self._callee_info(
+                    node["name"], params, node.get("body", []), node.get("return_type")
+                )
+                if is_memoised(node):
+                    # inlining would bypass the memo table
+                    self.functions[node["name"]]["blocker"] = "memoised"
+
+        # 2) Find (mutually) recursive functions => never inlined
+        self.recursive = self._find_recursive_functions()
+        logger.debug("FunctionInliner: recursive functions => %s", sorted(self.recursive))
+
+        # 3) Inline call sites inside every function (top-level lambdas are
+        #    visible there too), then in top-level statements
+        top_level = [node for node in body if node.get("type") != "FunctionDefinition"]
+        top_level_callables = self._scope_callables(top_level)
+        for node in body:
+            if node.get("type") == "FunctionDefinition":
+                self._inline_in_statements(node.get("body", []), node["name"], 0, top_level_callables)
+
+        if top_level:
+            self._inline_in_statements(top_level, "__top_level__", 0, {})
+
+        # 4) Lambdas that are no longer called need not be lifted at all
+        if self.dead_lambda_lets:
+            remove_statements(body, lambda stmt: id(stmt) in self.dead_lambda_lets)
+
+    # -------------------------------------------------------------------------
+    # Call graph helpers
+    # -------------------------------------------------------------------------
+    def _callee_info(self, name, params, body, return_type) -> dict:
+        return {
+            "name": name,
+            "params": params,
+            "body": body,
+            "return_type": return_type,
+            "size": node_size(body),
+            "calls": collect_called_names(body),
+            "blocker": self._structural_blocker(params, body),
+        }
+
+    def _find_recursive_functions(self) -> set:
+        recursive = set()
+        for start in self.functions:
+            stack = list(self.functions[start]["calls"])
+            seen = set()
+            while stack:
+                name = stack.pop()
+                if name == start:
+                    recursive.add(start)
+                    break
+                if name in seen or name not in self.functions:
+                    continue
+                seen.add(name)
+                stack.extend(self.functions[name]["calls"])
+        return recursive
+
+    def _scope_callables(self, statements) -> dict:
+        """
+        Let-bound lambdas (`let sq = function(x) ... end`) and function aliases
+        (`let f = add`) declared directly in this scope.
+        """
+        callables = {}
+        for node in walk(statements):
+            if node.get("type") != "LetStatement":
+                continue
+            expr = node.get("expression") or {}
+            var_name = node["variable"]["name"]
+            if expr.get("type") == "AnonymousFunction":
+                params = [
+                    (p[0], p[1] or "i32") if isinstance(p, (list, tuple))
+                    else (p["name"], p.get("type_annotation") or "i32")
+                    for p in expr.get("parameters", [])
+                ]
+                info = self._callee_info(var_name, params, expr.get("body", []), expr.get("return_type"))
+                info["let_statement"] = node
+                if var_name in info["calls"]:
+                    info["blocker"] = "recursive"
+                callables[var_name] = info
+            elif expr.get("type") == "VariableExpression" and expr["name"] in self.functions:
+                callables[var_name] = self.functions[expr["name"]]
+        return callables
+
+    def _structural_blocker(self, params, body):
+        """
+        Reasons a callee can never be inlined, independent of the call site.
+        """
+        for node in walk(body, enter_functions=True):
+            ntype = node.get("type")
+            if ntype in FUNCTION_NODE_TYPES:
+                return "defines nested functions"
+            if ntype == "LetStatement":
+                expr = node.get("expression") or {}
+                if expr.get("type") == "VariableExpression" or (
+                    expr.get("type") == "FnExpression" and not expr.get("name")
+                ):
+                    return "binds a function value"
+
+        # Inlined locals live on in the caller, so a local that is not always
+        # initialised before use could observe a value from a previous call.
+        uninitialised = uninitialised_locals(body, [p_name for p_name, _ in params])
+        if uninitialised:
+            return f"locals without initialiser: {', '.join(sorted(uninitialised))}"
+        return None
+
+    # -------------------------------------------------------------------------
+    # Call-site rewriting
+    # -------------------------------------------------------------------------
+    def _inline_in_statements(self, statements, caller, depth, outer_callables):
+        callables = dict(outer_callables)
+        callables.update(self._scope_callables(statements))
+
+        # Collect first: inlining attaches new bodies we must not re-walk here.
+        call_sites = [
+            node for node in walk(statements)
+            if node.get("type") in ("FnExpression", "CallStatement") and "inline" not in node
+        ]
+        for node in call_sites:
+            self._try_inline(node, caller, depth, callables)
+
+        for name, callee in callables.items():
+            let_stmt = callee.get("let_statement")
+            # (a top-level lambda may also be called from inside a function
+            #  body where it was not inlined => check the whole program)
+            if let_stmt is not None and name not in outer_callables and not self._is_referenced(self.program_body, name):
+                logger.debug("FunctionInliner: dropping fully inlined lambda '%s'", name)
+                self.dead_lambda_lets.add(id(let_stmt))
+
+    def _is_referenced(self, statements, name) -> bool:
+        """
+        True if 'name' is still used other than by an inlined call
+        (or its own let binding), including inside function bodies.
+        """
+        ignored_nodes = set()
+        for node in walk(statements, enter_functions=True):
+            if node.get("type") == "LetStatement":
+                ignored_nodes.add(id(node["variable"]))
+            elif node.get("type") in ("FnExpression", "CallStatement") and called_function_name(node) == name:
+                if not node.get("inline"):
+                    return True
+                if isinstance(node.get("name"), dict):
+                    ignored_nodes.add(id(node["name"]))
+
+        return any(
+            node.get("type") == "VariableExpression"
+            and node.get("name") == name
+            and id(node) not in ignored_nodes
+            for node in walk(statements, enter_functions=True)
+        )
+
+    def _try_inline(self, node, caller, depth, callables):
+        name = called_function_name(node)
+        callee = callables.get(name) or self.functions.get(name)
+        if callee is None:
+            # builtin / host import => nothing to inline
+            return
+
+        self._stat("call_sites")
+        reason = self._rejection_reason(callee, node, caller, depth)
+        if reason:
+            self._stat("kept")
+            self._decision(f"kept call to '{name}' in '{caller}': {reason}")
+            return
+
+        index = self.inline_counter
+        self.inline_counter += 1
+        prefix = f"__inl{index}_"
+
+        body = deep_copy(callee["body"])
+        param_names = [p_name for p_name, _ in callee["params"]]
+        rename = {local: prefix + local for local in assigned_names(body) | set(param_names)}
+        self._rename_locals(body, rename)
+
+        bindings = [
+            {"name": rename[p_name], "type": p_type, "expression": arg}
+            for (p_name, p_type), arg in zip(callee["params"], node.get("arguments", []))
+        ]
+
+        node["inline"] = {
+            "label": f"inline_{index}",
+            "callee": name,
+            "return_type": callee["return_type"],
+            "bindings": bindings,
+            "body": body,
+        }
+
+        self._stat("inlined")
+        self._decision(f"inlined '{name}' into '{caller}' (size={callee['size']})")
+
+        # Calls inside the inlined body are resolved in the callee's scope.
+        self._inline_in_statements(body, caller, depth + 1, {})
+
+    def _rejection_reason(self, callee, node, caller, depth):
+        name = callee["name"]
+        if name == caller or name in self.recursive:
+            return "recursive"
+        if callee["blocker"]:
+            return callee["blocker"]
+        if depth >= self.options.max_inline_depth:
+            return f"inline depth limit {self.options.max_inline_depth} reached"
+        if callee["size"] > self.options.max_inline_size:
+            return f"size {callee['size']} > {self.options.max_inline_size}"
+
+        arguments = node.get("arguments", [])
+        if len(arguments) != len(callee["params"]) or any(a is None for a in arguments):
+            return "argument count does not match parameters"
+        return None
+
+    def _rename_locals(self, body, rename):
+        # Callee names (FnExpression.name) are function references, not locals.
+        callee_name_nodes = {
+            id(node["name"]) for node in walk(body)
+            if node.get("type") == "FnExpression" and isinstance(node.get("name"), dict)
+        }
+
+        for node in walk(body):
+            ntype = node.get("type")
+            if ntype == "VariableExpression" and id(node) not in callee_name_nodes:
+                if node.get("name") in rename:
+                    node["name"] = rename[node["name"]]
+            elif ntype == "AssignmentStatement" and node.get("variable_name") in rename:
+                node["variable_name"] = rename[node["variable_name"]]
+
+            # A call the callee already inlined declares its parameter locals
+            # through the payload's bindings
+            for binding in (node.get("inline") or {}).get("bindings", []):
+                if binding["name"] in rename:
+                    binding["name"] = rename[binding["name"]]
+
+    # -------------------------------------------------------------------------
+    # Profile helpers
+    # -------------------------------------------------------------------------
+    def _stat(self, key):
+        if self.profile is not None:
+            self.profile.add_stat(PASS_NAME, key)
+
+    def _decision(self, message):
+        if self.profile is not None:
+            self.profile.add_decision(PASS_NAME, message)
+
+
+def inline_functions(program: dict, options, profile=None) -> None:
+    """
+    Run the inliner over a lowered dict AST (in place).
+    """
+    FunctionInliner(options, profile).run(program)
@@ -0,0 +1,307 @@
+# file: lmn/compiler/optimizer/loops.py
+
+import json
+import logging
+
+from lmn.compiler.optimizer.ast_utils import (
+    assigned_names,
+    called_function_name,
+    iter_children,
+    statement_lists,
+    walk,
+)
+from lmn.compiler.optimizer.purity import pure_function_names
+
+logger = logging.getLogger(__name__)
+
+PASS_NAME = "loops"
+
+# Only plain numeric values are hoisted into hidden locals. Some expressions
+# (e.g. for-loop bounds) keep their language-level type after lowering.
+NUMERIC_TYPES = {
+    "i32": "i32", "i64": "i64", "f32": "f32", "f64": "f64",
+    "int": "i32", "long": "i64", "float": "f32", "double": "f64",
+}
+
+# Expressions worth a hidden local (variables / literals are already cheap).
+HOISTABLE_TYPES = ("BinaryExpression", "UnaryExpression", "FnExpression", "ConversionExpression")
+
+# Integer division traps on 0 (and INT_MIN / -1).
+TRAPPING_OPERATORS = ("/", "//", "%")
+
+# Anything that changes control flow makes the rest of a loop body conditional.
+CONTROL_FLOW_TYPES = ("BreakStatement", "ContinueStatement", "ReturnStatement", "TailCallStatement")
+
+# Output that must have happened before a (hoisted) trap could stop the program.
+OBSERVABLE_TYPES = ("PrintStatement",)
+
+class LoopOptimizer:
+    """
+    Loop-invariant code motion for ForStatements.
+
+    For every loop it sets a few hints that the ForEmitter understands:
+
+      "end_local":  "__loop_end_N"   evaluate end_expr once (after start_expr)
+                                     into a hidden local instead of on every
+                                     iteration
+      "step_local": "__loop_step_N"  same for a non-constant, invariant step_expr
+      "preheader":  [LetStatement]   invariant sub-expressions of the body,
+                                     computed once before the first iteration
+      "rotate":     True             test at the bottom of the loop (one
+                                     guard before entry), so each iteration
+                                     takes a single br_if
+
+    A value is invariant if it reads no local that the loop writes and only
+    calls pure functions (see purity.py) or functions listed in
+    OptimizerOptions.invariant_functions.
+    """
+
+    def __init__(self, options, profile=None):
+        self.options = options
+        self.profile = profile
+        self.pure = set()
+        self.temp_counter = 0
+
+    def run(self, program: dict) -> None:
+        self.pure = pure_function_names(program, self.options.invariant_functions)
+
+        bodies = [
+            node.get("body", []) for node in program.get("body", [])
+            if node.get("type") == "FunctionDefinition"
+        ]
+        bodies.append([node for node in program.get("body", []) if node.get("type") != "FunctionDefinition"])
+
+        for body in bodies:
+            # loops inside inlined call bodies, too
+            for node in list(walk(body)):
+                inline = node.get("inline")
+                if isinstance(inline, dict):
+                    self._optimize_statements(inline.get("body", []))
+            self._optimize_statements(body)
+
+    # -------------------------------------------------------------------------
+    # Traversal
+    # -------------------------------------------------------------------------
+    def _optimize_statements(self, statements):
+        for stmt in statements:
+            # inner loops first, so their preheaders can move further out
+            for nested in statement_lists(stmt):
+                self._optimize_statements(nested)
+            if stmt.get("type") == "ForStatement":
+                self._optimize_for(stmt)
+
+    def _optimize_for(self, loop):
+        loop_var = loop["variable"]["name"]
+        written = assigned_names(loop.get("body", [])) | {loop_var}
+        preheader = []
+        hoisted = {}
+
+        # 1) Loop bound => evaluated once
+        end_expr = loop.get("end_expr")
+        if self._worth_hoisting(end_expr) and self._is_invariant(end_expr, written, speculative=False):
+            loop["end_local"] = self._new_temp("__loop_end")
+            self._stat("bounds_hoisted")
+            self._decision(f"loop '{loop_var}': bound evaluated once into {loop['end_local']}")
+
+        # 2) Step => constant steps are emitted as immediates by the ForEmitter,
+        #    invariant ones are evaluated once
+        step_expr = loop.get("step_expr")
+        if step_expr and step_expr.get("type") == "LiteralExpression":
+            self._stat("constant_steps")
+        elif self._worth_hoisting(step_expr) and self._is_invariant(step_expr, written, speculative=False):
+            loop["step_local"] = self._new_temp("__loop_step")
+            self._stat("steps_hoisted")
+
+        # 3) Invariant expressions of the body => preheader. After control
+        #    flow or a side effect the rest of the body is speculative: a
+        #    hoisted trap must not fire before output the loop produced first.
+        conditional = False
+        for stmt in loop.get("body", []):
+            self._hoist_from_statement(stmt, written, preheader, hoisted, conditional)
+            if self._ends_unconditional_part(stmt):
+                conditional = True
+
+        if preheader:
+            loop["preheader"] = preheader
+            self._stat("expressions_hoisted", len(preheader))
+            self._decision(f"loop '{loop_var}': hoisted {len(preheader)} invariant expression(s)")
+
+        # 4) Bottom-tested loop
+        loop["rotate"] = True
+
+    def _hoist_from_statement(self, stmt, written, preheader, hoisted, conditional):
+        stype = stmt.get("type")
+
+        # an inner loop's preheader runs once per outer iteration => may move out
+        if stype == "ForStatement":
+            kept = []
+            for let_stmt in stmt.get("preheader", []):
+                if self._is_invariant(let_stmt["expression"], written, speculative=True):
+                    preheader.append(let_stmt)
+                else:
+                    kept.append(let_stmt)
+            stmt["preheader"] = kept
+
+        nested_lists = statement_lists(stmt)
+        nested_ids = {id(lst) for lst in nested_lists}
+
+        # a switch dispatch replaces the conditions of its elseif chain
+        skipped = ("variable", "preheader")
+        if stype == "IfStatement" and stmt.get("switch"):
+            skipped += ("condition", "elseifClauses", "elseif_clauses", "switch")
+
+        # expressions directly owned by this statement
+        for key, value in list(stmt.items()):
+            if key in skipped or id(value) in nested_ids:
+                continue
+            # a for-loop step only runs after a completed iteration
+            own_conditional = conditional or (stype == "ForStatement" and key == "step_expr")
+            if isinstance(value, dict) and "type" in value:
+                self._hoist_expression(value, stmt, key, written, preheader, hoisted, own_conditional)
+            elif isinstance(value, list):
+                for index, item in enumerate(value):
+                    if not isinstance(item, dict) or "type" not in item:
+                        continue
+                    if item["type"] == "ElseIfClause":
+                        # only evaluated when the previous conditions fail
+                        self._hoist_expression(item.get("condition"), item, "condition",
+                                               written, preheader, hoisted, True)
+                    else:
+                        # e.g. PrintStatement.expressions, CallStatement.arguments
+                        # (a print emits each expression before evaluating the next)
+                        item_conditional = own_conditional or (stype in OBSERVABLE_TYPES and index > 0)
+                        self._hoist_expression(item, value, index, written, preheader, hoisted, item_conditional)
+
+        # statements nested in if/for bodies only run conditionally
+        for nested in nested_lists:
+            for inner in nested:
+                self._hoist_from_statement(inner, written, preheader, hoisted, True)
+
+    def _hoist_expression(self, expr, parent, key, written, preheader, hoisted, conditional):
+        if not isinstance(expr, dict) or "type" not in expr:
+            return
+
+        # (`let a = <variable>` is emitted as an alias, never as a local =>
+        #  only parts of a let's value may be hoisted)
+        aliasing_let = isinstance(parent, dict) and parent.get("type") == "LetStatement" and key == "expression"
+        if not aliasing_let and self._worth_hoisting(expr) and self._is_invariant(expr, written, speculative=conditional):
+            parent[key] = self._hoisted_variable(expr, preheader, hoisted)
+            return
+
+        # an inlined call only evaluates its arguments unconditionally
+        inline = expr.get("inline")
+        if isinstance(inline, dict):
+            for binding in inline.get("bindings", []):
+                self._hoist_expression(binding["expression"], binding, "expression",
+                                       written, preheader, hoisted, conditional)
+            return
+
+        short_circuit = expr.get("type") == "BinaryExpression" and expr.get("operator") in ("and", "or")
+        for container, child_key, child in list(iter_children(expr)):
+            if container is expr and child_key == "name" and expr.get("type") == "FnExpression":
+                continue
+            child_conditional = conditional or (short_circuit and child_key == "right")
+            self._hoist_expression(child, container, child_key, written, preheader, hoisted, child_conditional)
+
+    # -------------------------------------------------------------------------
+    # Invariance
+    # -------------------------------------------------------------------------
+    def _worth_hoisting(self, expr) -> bool:
+        return (
+            isinstance(expr, dict)
+            and expr.get("type") in HOISTABLE_TYPES
+            and expr.get("inferred_type") in NUMERIC_TYPES
+        )
+
+    def _ends_unconditional_part(self, stmt) -> bool:
+        """
+        True if 'stmt' may change control flow or has an observable side
+        effect (output, a call to a non-pure function).
+        """
+        for sub in walk(stmt):
+            stype = sub.get("type")
+            if stype in CONTROL_FLOW_TYPES or stype in OBSERVABLE_TYPES:
+                return True
+            if stype in ("FnExpression", "CallStatement") and called_function_name(sub) not in self.pure:
+                return True
+        return False
+
+    def _is_invariant(self, expr, written, speculative) -> bool:
+        """
+        True if 'expr' yields the same value on every iteration.
+        'speculative' => it may not have run at all in the original program,
+        so it must also be unable to trap or diverge (no calls, no division).
+        """
+        stype = expr.get("type")
+
+        if stype in ("AssignmentExpression", "PostfixExpression", "AnonymousFunction",
+                     "ArrayLiteralExpression", "JsonLiteralExpression"):
+            return False
+
+        if stype == "VariableExpression":
+            return expr.get("name") not in written
+
+        if stype == "FnExpression":
+            if speculative or called_function_name(expr) not in self.pure:
+                return False
+            inline = expr.get("inline")
+            if isinstance(inline, dict):
+                # the inlined body only touches its own renamed locals
+                arguments = [binding["expression"] for binding in inline.get("bindings", [])]
+            else:
+                arguments = expr.get("arguments", [])
+            return all(self._is_invariant(arg, written, speculative) for arg in arguments)
+
+        if stype == "BinaryExpression" and expr.get("operator") in TRAPPING_OPERATORS:
+            right = expr.get("right") or {}
+            is_int = NUMERIC_TYPES.get(expr.get("inferred_type")) in ("i32", "i64")
+            safe_divisor = right.get("type") == "LiteralExpression" and right.get("value") not in (0, -1)
+            if speculative and is_int and not safe_divisor:
+                return False
+
+        return all(
+            self._is_invariant(child, written, speculative)
+            for _, _, child in iter_children(expr)
+        )
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+    def _new_temp(self, prefix) -> str:
+        name = f"{prefix}_{self.temp_counter}"
+        self.temp_counter += 1
+        return name
+
+    def _hoisted_variable(self, expr, preheader, hoisted) -> dict:
+        # identical invariant expressions share one hidden local
+        key = json.dumps(expr, sort_keys=True, default=str)
+        wasm_type = NUMERIC_TYPES[expr["inferred_type"]]
+        if key not in hoisted:
+            name = self._new_temp("__licm")
+            preheader.append({
+                "type": "LetStatement",
+                "variable": {"type": "VariableExpression", "name": name},
+                "expression": expr,
+                "type_annotation": wasm_type,
+            })
+            hoisted[key] = name
+        return {
+            "type": "VariableExpression",
+            "name": hoisted[key],
+            "inferred_type": wasm_type,
+        }
+
+    def _stat(self, key, amount=1):
+        if self.profile is not None:
+            self.profile.add_stat(PASS_NAME, key, amount)
+
+    def _decision(self, message):
+        if self.profile is not None:
+            self.profile.add_decision(PASS_NAME, message)
+
+
+def optimize_loops(program: dict, options, profile=None) -> None:
+    """
+    Run loop-invariant code motion over a lowered dict AST (in place).
+    """
+    LoopOptimizer(options, profile).run(program)
@@ -0,0 +1,84 @@
+# file: lmn/compiler/optimizer/memo.py
+
+import logging
+
+from lmn.compiler.emitter.wasm.memo_table import (
+    MEMO_ANNOTATION, MEMO_KEY_TYPES, MEMO_RESULT_TYPES, is_memoised, memo_capacity
+)
+from lmn.compiler.optimizer.ast_utils import called_function_name, walk
+from lmn.compiler.optimizer.purity import pure_function_names
+
+logger = logging.getLogger(__name__)
+
+PASS_NAME = "memo"
+
+# A function must call itself at least this often to be memoised
+# automatically: a single self-call (linear recursion) never repeats an
+# argument tuple, two or more (fib-style tree recursion) do exponentially.
+MIN_AUTO_SELF_CALLS = 2
+
+class MemoSelector:
+    """
+    Decides which functions the emitter wraps in a memo table (see
+    emitter/wasm/memo_table.py):
+
+      - every function annotated with @memo
+      - with options.auto_memo: pure, tree-recursive functions with only
+        integer parameters and a numeric result
+
+    Selected functions get MEMO_ANNOTATION in "annotations" and a
+    "memo_capacity" (options.memo_capacity entries).
+    """
+
+    def __init__(self, options, profile=None):
+        self.options = options
+        self.profile = profile
+
+    def run(self, program: dict) -> None:
+        functions = [
+            node for node in program.get("body", [])
+            if node.get("type") == "FunctionDefinition"
+        ]
+        pure = pure_function_names(program, self.options.invariant_functions) if self.options.auto_memo else set()
+
+        for node in functions:
+            name = node["name"]
+            if is_memoised(node):
+                reason = "@memo"
+            elif self.options.auto_memo and self._auto_candidate(node, pure):
+                reason = "auto"
+                node["annotations"] = (node.get("annotations") or []) + [MEMO_ANNOTATION]
+            else:
+                continue
+
+            node["memo_capacity"] = memo_capacity(self.options.memo_capacity)
+            self._stat("memoised")
+            self._decision(f"memoised '{name}' ({reason}, {node['memo_capacity']} entries)")
+
+    def _auto_candidate(self, node: dict, pure: set) -> bool:
+        name = node["name"]
+        params = node.get("params", [])
+        if not params or name not in pure:
+            return False
+        if any((p.get("type_annotation") or "i32") not in MEMO_KEY_TYPES for p in params):
+            return False
+        if node.get("return_type") not in MEMO_RESULT_TYPES:
+            return False
+
+        self_calls = sum(1 for sub in walk(node.get("body", [])) if called_function_name(sub) == name)
+        return self_calls >= MIN_AUTO_SELF_CALLS
+
+    def _stat(self, key):
+        if self.profile is not None:
+            self.profile.add_stat(PASS_NAME, key)
+
+    def _decision(self, message):
+        if self.profile is not None:
+            self.profile.add_decision(PASS_NAME, message)
+
+
+def select_memo_functions(program: dict, options, profile=None) -> None:
+    """
+    Mark the functions to memoise in a lowered dict AST (in place).
+    """
+    MemoSelector(options, profile).run(program)
@@ -0,0 +1,70 @@
+# file: lmn/compiler/optimizer/optimizer.py
+
+import logging
+
+from lmn.compiler.optimizer.options import OptimizerOptions
+from lmn.compiler.optimizer.memo import select_memo_functions
+from lmn.compiler.optimizer.inliner import inline_functions
+from lmn.compiler.optimizer.tail_calls import optimize_tail_calls
+from lmn.compiler.optimizer.switches import optimize_switches
+from lmn.compiler.optimizer.loops import optimize_loops
+from lmn.compiler.optimizer.strength import reduce_strength
+from lmn.compiler.optimizer.cse import eliminate_common_subexpressions
+from lmn.compiler.optimizer.fanout import fan_out_calls
+
+logger = logging.getLogger(__name__)
+
+def optimize_program(program: dict, options: OptimizerOptions = None, profile=None) -> dict:
+    """
+    Run the AST optimisation passes over a lowered program dict (in place)
+    and return it. Each pass can be switched off through 'options'; 'profile'
+    (a CompileProfile) collects per-pass statistics and decisions.
+    """
+    if options is None:
+        options = OptimizerOptions()
+
+    # 0) Memoisation: @memo functions (+ automatic candidates) get a memo
+    #    table; runs first so the inliner leaves them alone
+    logger.debug("optimize_program: selecting memoised functions")
+    select_memo_functions(program, options, profile)
+
+    # 1) Function inlining
+    if options.inline:
+        logger.debug("optimize_program: running inliner")
+        inline_functions(program, options, profile)
+
+    # 2) Tail calls => loops (after inlining, which never touches recursive functions)
+    if options.tail_calls:
+        logger.debug("optimize_program: running tail-call pass")
+        optimize_tail_calls(program, options, profile)
+
+    # 3) Integer elseif chains => jump tables (before LICM, which would
+    #    otherwise hoist the comparisons out of the chain)
+    if options.switches:
+        logger.debug("optimize_program: running switch pass")
+        optimize_switches(program, options, profile)
+
+    # 4) Loop-invariant code motion
+    if options.loops:
+        logger.debug("optimize_program: running loop pass")
+        optimize_loops(program, options, profile)
+
+    # 5) Strength reduction + induction variables (after LICM, so hoisted
+    #    expressions are reduced too)
+    if options.strength_reduction:
+        logger.debug("optimize_program: running strength reduction")
+        reduce_strength(program, options, profile)
+
+    # 6) Common subexpression elimination (last, so it also sees the
+    #    expressions produced by the passes above)
+    if options.cse:
+        logger.debug("optimize_program: running CSE")
+        eliminate_common_subexpressions(program, options, profile)
+
+    # 7) Concurrent host calls: start independent llm()/tools calls together
+    #    (last, so no other pass rewrites the copied calls it inserts)
+    if options.concurrent_calls:
+        logger.debug("optimize_program: running call fan-out")
+        fan_out_calls(program, options, profile)
+
+    return program
@@ -0,0 +1,141 @@
+# file: lmn/compiler/optimizer/options.py
+
+from lmn.compiler.emitter.wasm.memo_table import DEFAULT_MEMO_CAPACITY
+
+class OptimizerOptions:
+    """
+    Switches and tuning knobs for the AST optimisation passes (and the
+    peephole pass over the emitted WAT).
+
+    compile_code_to_wat(..., optimize=True) uses the defaults below;
+    pass an OptimizerOptions instance to tune individual passes, or
+    optimize=False to skip the optimiser entirely.
+    """
+
+    def __init__(
+        self,
+        inline: bool = True,
+        max_inline_size: int = 24,
+        max_inline_depth: int = 3,
+        tail_calls: bool = True,
+        accumulate_tail_calls: bool = True,
+        use_return_call: bool = False,
+        loops: bool = True,
+        invariant_functions=(),
+        switches: bool = True,
+        switch_min_cases: int = 4,
+        switch_min_density: float = 0.5,
+        strength_reduction: bool = True,
+        induction_variables: bool = True,
+        cse: bool = True,
+        peephole: bool = True,
+        peephole_rules=None,
+        reuse_locals: bool = True,
+        intern_literals: bool = True,
+        auto_memo: bool = False,
+        memo_capacity: int = DEFAULT_MEMO_CAPACITY,
+        concurrent_calls: bool = False,
+    ):
+        # --- Function inlining ---
+        # Inline calls to small, non-recursive functions and let-bound lambdas.
+        self.inline = inline
+
+        # A callee is "small" if its body has at most this many AST nodes.
+        self.max_inline_size = max_inline_size
+
+        # How many levels of nested inlining (a inlined into b inlined into c...).
+        self.max_inline_depth = max_inline_depth
+
+        # --- Tail calls ---
+        # Rewrite self-recursive tail calls into a loop (constant stack space).
+        self.tail_calls = tail_calls
+
+        # Also rewrite `return e * f(...)` / `return e + f(...)` in integer
+        # functions by threading an accumulator through the loop.
+        self.accumulate_tail_calls = accumulate_tail_calls
+
+        # Emit `return_call` for the remaining tail calls (needs the wasm
+        # tail-call proposal: wat2wasm --enable-tail-call, wasmtime
+        # Config.wasm_tail_call).
+        self.use_return_call = use_return_call
+
+        # --- Loops ---
+        # Evaluate invariant for-loop bounds/steps once, hoist invariant
+        # expressions out of loop bodies and emit bottom-tested loops.
+        self.loops = loops
+
+        # Functions the loop pass may treat as side-effect free even though
+        # it cannot prove it (e.g. host calls known to be invariant).
+        self.invariant_functions = set(invariant_functions)
+
+        # --- Switches ---
+        # Dispatch `if x == c1 ... elseif x == c2 ...` chains with a br_table
+        # (dense constants) or a binary search (sparse ones).
+        self.switches = switches
+
+        # Shortest chain (if + elseifs) worth converting.
+        self.switch_min_cases = switch_min_cases
+
+        # Minimum (number of constants) / (max - min + 1) for a br_table.
+        self.switch_min_density = switch_min_density
+
+        # --- Strength reduction ---
+        # Integer * / % by constants => shifts, adds and magic-number
+        # multiplies; x + 0 / x * 1 => x.
+        self.strength_reduction = strength_reduction
+
+        # Replace `i * c` in for-loop bodies by a hidden local stepped
+        # alongside the loop variable.
+        self.induction_variables = induction_variables
+
+        # --- Common subexpressions ---
+        # Compute a repeated pure expression (`(a*b) + (a*b)`, `f(x) ... f(x)`
+        # with a pure f) once per block and reuse it from a hidden local.
+        self.cse = cse
+
+        # --- Peephole (emitted instructions) ---
+        # Rewrite redundant instruction sequences per function before the
+        # module is assembled (see emitter/wasm/peephole.py).
+        self.peephole = peephole
+
+        # Rule groups / rule names to apply ("local_tee", "const_folding",
+        # "branches", ...); None => all of them.
+        self.peephole_rules = None if peephole_rules is None else set(peephole_rules)
+
+        # --- Locals (emitted instructions) ---
+        # Share local slots of the same type between locals whose live
+        # ranges do not overlap (see emitter/wasm/local_allocator.py).
+        self.reuse_locals = reuse_locals
+
+        # --- Static data ---
+        # Store identical string / JSON / array literals (and strings that
+        # are the tail of another one) once in the data segment.
+        self.intern_literals = intern_literals
+
+        # --- Memoisation ---
+        # Functions annotated with @memo always cache their results. With
+        # auto_memo, pure tree-recursive functions with integer parameters
+        # (naive fib and friends) are memoised as well.
+        self.auto_memo = auto_memo
+
+        # Entries per memo table (rounded up to a power of two); a new
+        # result evicts whatever shares its entry.
+        self.memo_capacity = memo_capacity
+
+        # --- Concurrent host calls ---
+        # Start independent llm() / ask_tools / call_tools calls of a block
+        # (array elements, consecutive lets) together on the host's thread
+        # pool; each call then collects its own answer. Off by default: the
+        # module imports '<name>__prefetch' host functions.
+        self.concurrent_calls = concurrent_calls
+
+    @classmethod
+    def disabled(cls) -> "OptimizerOptions":
+        """
+        Options with every pass switched off.
+        """
+        return cls(
+            inline=False, tail_calls=False, loops=False, switches=False,
+            strength_reduction=False, cse=False, peephole=False, reuse_locals=False,
+            intern_literals=False,
+        )
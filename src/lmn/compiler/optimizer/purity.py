@@ -0,0 +1,67 @@
+# file: lmn/compiler/optimizer/purity.py
+
+import logging
+
+from lmn.builtins import BUILTINS
+from lmn.compiler.optimizer.ast_utils import called_function_name, walk
+
+logger = logging.getLogger(__name__)
+
+# Node types that always have an observable effect (output, allocation, ...)
+IMPURE_NODE_TYPES = (
+    "PrintStatement",
+    "ArrayLiteralExpression",
+    "JsonLiteralExpression",
+    "AnonymousFunction",
+)
+
+def pure_builtin_names() -> set:
+    """
+    Host functions whose builtins JSON block declares "pure": true.
+    """
+    return {name for name, info in BUILTINS.items() if info.get("pure")}
+
+
+def pure_function_names(program: dict, extra_pure=()) -> set:
+    """
+    Names of functions that can be called without observable side effects:
+    pure builtins, names in 'extra_pure' (declared invariant by the user),
+    and every top-level function whose body only calls other pure functions
+    and neither prints nor allocates.
+
+    Functions only touch their own locals, so assignments inside them are fine.
+    Computed as a greatest fixpoint, so pure (mutually) recursive functions
+    stay pure.
+    """
+    bodies = {
+        node["name"]: node.get("body", [])
+        for node in program.get("body", [])
+        if node.get("type") == "FunctionDefinition"
+    }
+
+    # a user function shadows a builtin of the same name (e.g. 'sum')
+    pure = (pure_builtin_names() - set(bodies)) | set(extra_pure)
+    candidates = set(bodies)
+
+    changed = True
+    while changed:
+        changed = False
+        for name in sorted(candidates):
+            if not _body_is_pure(bodies[name], candidates | pure):
+                candidates.discard(name)
+                changed = True
+
+    logger.debug("pure_function_names: user=%s builtin/declared=%s", sorted(candidates), sorted(pure))
+    return candidates | pure
+
+
+def _body_is_pure(body, allowed) -> bool:
+    for node in walk(body):
+        if node.get("type") in IMPURE_NODE_TYPES:
+            return False
+        callee = called_function_name(node)
+        if callee is None and node.get("type") == "TailCallStatement":
+            callee = node.get("function")
+        if callee is not None and callee not in allowed:
+            return False
+    return True
@@ -0,0 +1,366 @@
+# file: lmn/compiler/optimizer/strength.py
+
+import logging
+
+from lmn.compiler.optimizer.ast_utils import (
+    FUNCTION_NODE_TYPES,
+    assigned_names,
+    deep_copy,
+    iter_children,
+    walk,
+)
+
+logger = logging.getLogger(__name__)
+
+PASS_NAME = "strength"
+
+# Wrapping integer arithmetic only: the rewrites below are not exact for floats.
+INTEGER_TYPES = {"i32": "i32", "int": "i32", "i64": "i64", "long": "i64"}
+INTEGER_BITS = {"i32": 32, "i64": 64}
+
+# Internal operators (never produced by the parser) understood by the
+# BinaryExpressionEmitter.
+SHL, SHR_S, SHR_U, AND = "__shl", "__shr_s", "__shr_u", "__and"
+
+DIVISION_OPERATORS = ("/", "//")
+
+def signed_division_magic(divisor: int, bits: int = 32):
+    """
+    Magic multiplier M (unsigned, < 2**bits) and shift s for signed division
+    by a constant divisor >= 2 (Hacker's Delight, 10-1):
+
+        n / d  ==  ((n * M) >> (bits + s)) + (1 if n < 0 else 0)
+
+    with the product computed at double width.
+    """
+    two = 1 << (bits - 1)
+    anc = two - 1 - two % divisor
+    p = bits - 1
+    q1, r1 = divmod(two, anc)
+    q2, r2 = divmod(two, divisor)
+    while True:
+        p += 1
+        q1, r1 = 2 * q1, 2 * r1
+        if r1 >= anc:
+            q1, r1 = q1 + 1, r1 - anc
+        q2, r2 = 2 * q2, 2 * r2
+        if r2 >= divisor:
+            q2, r2 = q2 + 1, r2 - divisor
+        delta = divisor - r2
+        if not (q1 < delta or (q1 == delta and r1 == 0)):
+            break
+    return q2 + 1, p - bits
+
+class StrengthReducer:
+    """
+    Replaces expensive integer arithmetic by cheaper, exactly equivalent
+    sequences on the lowered dict AST:
+
+      x + 0, x - 0, x * 1, x / 1        =>  x
+      x * 2^k                           =>  x << k
+      x * (2^k + 1), x * (2^k - 1)      =>  (x << k) + x, (x << k) - x
+      x / 2^k  (signed)                 =>  (x + bias) >> k
+      x % 2^k  (signed)                 =>  x - ((x + bias) & -2^k)
+      x / d, x % d  (i32, d > 1)        =>  magic-number multiply in i64
+
+    where bias = (x >> bits-1) >>> (bits-k) rounds negative x towards zero.
+    Rewrites that read x more than once need x to be a plain variable.
+
+    It also gives for-loops with a constant step induction variables: inside
+    the body `i * c` becomes a hidden local that the ForEmitter initialises
+    once and bumps by step * c each iteration ("induction" hint).
+    """
+
+    def __init__(self, options, profile=None):
+        self.options = options
+        self.profile = profile
+        self.iv_counter = 0
+
+    def run(self, program: dict) -> None:
+        body = program.get("body", [])
+
+        # 1) Induction variables (before the multiplications they replace are
+        #    turned into shifts)
+        if self.options.induction_variables:
+            for node in list(walk(body, enter_functions=True)):
+                if node.get("type") == "ForStatement":
+                    self._induction_variables(node)
+
+        # 2) Arithmetic rewrites, bottom-up
+        self._rewrite_children(body)
+
+    # -------------------------------------------------------------------------
+    # Induction variables
+    # -------------------------------------------------------------------------
+    def _induction_variables(self, loop):
+        loop_var = loop["variable"]["name"]
+        if loop.get("end_expr") is None:
+            # `for x in array`: x is an element, not a counter
+            return
+        if loop.get("step_local") or loop_var in assigned_names(loop.get("body", [])):
+            return
+        step = 1 if loop.get("step_expr") is None else self._constant(loop["step_expr"])
+        if step is None:
+            return
+
+        variables = {}
+        self._replace_scaled_uses(loop.get("body", []), loop_var, variables)
+        if not variables:
+            return
+
+        loop["induction"] = [
+            {"name": name, "factor": factor, "step": _wrap(step * factor, 32)}
+            for factor, name in variables.items()
+        ]
+        self._stat("induction_variables", len(variables))
+        self._decision(
+            f"loop '{loop_var}': {', '.join(f'{loop_var} * {f}' for f in variables)} => induction variable(s)"
+        )
+
+    def _replace_scaled_uses(self, node, loop_var, variables):
+        for container, key, child in list(iter_children(node)):
+            if child.get("type") in FUNCTION_NODE_TYPES:
+                # a lambda body runs outside this loop's iterations
+                continue
+            factor = self._scaled_loop_variable(child, loop_var)
+            if factor is None or _aliasing_let(container, key):
+                self._replace_scaled_uses(child, loop_var, variables)
+                continue
+            if factor not in variables:
+                variables[factor] = f"__iv_{self.iv_counter}"
+                self.iv_counter += 1
+            container[key] = {
+                "type": "VariableExpression",
+                "name": variables[factor],
+                "inferred_type": "i32",
+            }
+
+    def _scaled_loop_variable(self, expr, loop_var):
+        """
+        Factor c if expr is `i * c` / `c * i` (i32), else None.
+        """
+        if (
+            expr.get("type") != "BinaryExpression"
+            or expr.get("operator") != "*"
+            or INTEGER_TYPES.get(expr.get("inferred_type")) != "i32"
+        ):
+            return None
+        for var_side, const_side in (("left", "right"), ("right", "left")):
+            var = expr.get(var_side) or {}
+            factor = self._constant(expr.get(const_side))
+            if var.get("type") == "VariableExpression" and var.get("name") == loop_var and factor not in (None, 0, 1):
+                return factor
+        return None
+
+    # -------------------------------------------------------------------------
+    # Arithmetic
+    # -------------------------------------------------------------------------
+    def _rewrite_children(self, node):
+        for container, key, child in list(iter_children(node)):
+            self._rewrite_children(child)
+            if child.get("type") == "BinaryExpression":
+                replacement = self._reduce(child)
+                if replacement is child:
+                    continue
+                if replacement.get("type") == "VariableExpression" and _aliasing_let(container, key):
+                    continue
+                container[key] = replacement
+
+    def _reduce(self, expr):
+        wasm_type = INTEGER_TYPES.get(expr.get("inferred_type"))
+        if wasm_type is None:
+            return expr
+        op = expr.get("operator")
+        left, right = expr.get("left"), expr.get("right")
+        left_const, right_const = self._constant(left), self._constant(right)
+
+        # 1) Identities
+        if (op in ("+", "-") and right_const == 0) or (op in ("*",) + DIVISION_OPERATORS and right_const == 1):
+            self._stat("identities")
+            return left
+        if (op == "+" and left_const == 0) or (op == "*" and left_const == 1):
+            self._stat("identities")
+            return right
+
+        # 2) Multiplication by a constant (either side)
+        if op == "*":
+            if right_const is None and left_const is not None:
+                left, right, right_const = right, left, left_const
+            if right_const is not None:
+                return self._reduce_multiply(expr, left, right_const, wasm_type)
+            return expr
+
+        # 3) Division / remainder by a constant
+        if op in DIVISION_OPERATORS + ("%",) and right_const is not None and right_const > 1:
+            if left.get("type") != "VariableExpression":
+                return expr
+            if op == "%":
+                return self._reduce_remainder(expr, left, right_const, wasm_type)
+            return self._reduce_divide(expr, left, right_const, wasm_type)
+        return expr
+
+    def _reduce_multiply(self, expr, x, constant, wasm_type):
+        bits = INTEGER_BITS[wasm_type]
+        magnitude = abs(constant)
+        if _is_power_of_two(magnitude):
+            product = _binary(SHL, x, _literal(_log2(magnitude), wasm_type), wasm_type)
+        elif x.get("type") == "VariableExpression" and _is_power_of_two(magnitude - 1):
+            shifted = _binary(SHL, x, _literal(_log2(magnitude - 1), wasm_type), wasm_type)
+            product = _binary("+", shifted, deep_copy(x), wasm_type)
+        elif x.get("type") == "VariableExpression" and _is_power_of_two(magnitude + 1):
+            shifted = _binary(SHL, x, _literal(_log2(magnitude + 1), wasm_type), wasm_type)
+            product = _binary("-", shifted, deep_copy(x), wasm_type)
+        else:
+            return expr
+        if constant < 0:
+            if constant == -(1 << (bits - 1)):
+                return expr
+            product = _binary("-", _literal(0, wasm_type), product, wasm_type)
+        self._stat("multiplications")
+        return product
+
+    def _reduce_divide(self, expr, x, divisor, wasm_type):
+        if _is_power_of_two(divisor):
+            self._stat("divisions")
+            return self._divide_power_of_two(x, divisor, wasm_type)
+        if wasm_type != "i32":
+            # the magic multiply needs a 2 * 64 bit product
+            return expr
+        self._stat("divisions")
+        return self._divide_magic(x, divisor)
+
+    def _reduce_remainder(self, expr, x, divisor, wasm_type):
+        if _is_power_of_two(divisor):
+            # x - ((x + bias) & -d)
+            rounded = _binary(
+                AND,
+                _binary("+", x, self._rounding_bias(x, divisor, wasm_type), wasm_type),
+                _literal(-divisor, wasm_type),
+                wasm_type,
+            )
+        elif wasm_type == "i32":
+            rounded = _binary("*", self._divide_magic(x, divisor), _literal(divisor, wasm_type), wasm_type)
+        else:
+            return expr
+        self._stat("remainders")
+        return _binary("-", deep_copy(x), rounded, wasm_type)
+
+    def _rounding_bias(self, x, divisor, wasm_type):
+        """
+        d - 1 for negative x, 0 otherwise: (x >> bits-1) >>> (bits-k).
+        """
+        bits = INTEGER_BITS[wasm_type]
+        shift = _log2(divisor)
+        if shift == 1:
+            return _binary(SHR_U, deep_copy(x), _literal(bits - 1, wasm_type), wasm_type)
+        sign = _binary(SHR_S, deep_copy(x), _literal(bits - 1, wasm_type), wasm_type)
+        return _binary(SHR_U, sign, _literal(bits - shift, wasm_type), wasm_type)
+
+    def _divide_power_of_two(self, x, divisor, wasm_type):
+        biased = _binary("+", x, self._rounding_bias(x, divisor, wasm_type), wasm_type)
+        return _binary(SHR_S, biased, _literal(_log2(divisor), wasm_type), wasm_type)
+
+    def _divide_magic(self, x, divisor):
+        """
+        i32 only: wrap(((i64)x * M) >> (32 + s)) + (x >>> 31)
+        """
+        multiplier, shift = signed_division_magic(divisor)
+        widened = {
+            "type": "ConversionExpression",
+            "from_type": "i32",
+            "to_type": "i64",
+            "source_expr": x,
+            "inferred_type": "i64",
+        }
+        high = _binary(
+            SHR_S,
+            _binary("*", widened, _literal(multiplier, "i64"), "i64"),
+            _literal(32 + shift, "i64"),
+            "i64",
+        )
+        quotient = {
+            "type": "ConversionExpression",
+            "from_type": "i64",
+            "to_type": "i32",
+            "source_expr": high,
+            "inferred_type": "i32",
+        }
+        sign = _binary(SHR_U, deep_copy(x), _literal(31, "i32"), "i32")
+        return _binary("+", quotient, sign, "i32")
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+    def _constant(self, expr):
+        """
+        Integer value of a literal (possibly negated or widened), else None.
+        """
+        if not isinstance(expr, dict):
+            return None
+        etype = expr.get("type")
+        if etype == "LiteralExpression":
+            value = expr.get("value")
+            if isinstance(value, int) and not isinstance(value, bool):
+                return value
+            return None
+        if etype == "UnaryExpression" and expr.get("operator") == "-":
+            value = self._constant(expr.get("operand"))
+            return -value if value is not None else None
+        if (
+            etype == "ConversionExpression"
+            and INTEGER_TYPES.get(expr.get("from_type")) == "i32"
+            and INTEGER_TYPES.get(expr.get("to_type")) in ("i32", "i64")
+        ):
+            # widening keeps the value
+            return self._constant(expr.get("source_expr"))
+        return None
+
+    def _stat(self, key, amount=1):
+        if self.profile is not None:
+            self.profile.add_stat(PASS_NAME, key, amount)
+
+    def _decision(self, message):
+        if self.profile is not None:
+            self.profile.add_decision(PASS_NAME, message)
+
+
+def _aliasing_let(container, key) -> bool:
+    """
+    `let a = b` with a plain variable b is emitted as a function alias (no
+    local at all), so rewrites must not produce that shape.
+    """
+    return isinstance(container, dict) and container.get("type") == "LetStatement" and key == "expression"
+
+def _is_power_of_two(value: int) -> bool:
+    return value > 1 and value & (value - 1) == 0
+
+def _log2(value: int) -> int:
+    return value.bit_length() - 1
+
+def _wrap(value: int, bits: int) -> int:
+    value &= (1 << bits) - 1
+    return value - (1 << bits) if value >= 1 << (bits - 1) else value
+
+def _literal(value, wasm_type):
+    return {
+        "type": "LiteralExpression",
+        "value": value,
+        "literal_type": wasm_type,
+        "inferred_type": wasm_type,
+    }
+
+def _binary(op, left, right, wasm_type):
+    return {
+        "type": "BinaryExpression",
+        "operator": op,
+        "left": left,
+        "right": right,
+        "inferred_type": wasm_type,
+    }
+
+
+def reduce_strength(program: dict, options, profile=None) -> None:
+    """
+    Run strength reduction over a lowered dict AST (in place).
+    """
+    StrengthReducer(options, profile).run(program)
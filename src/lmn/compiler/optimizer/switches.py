@@ -0,0 +1,172 @@
+# file: lmn/compiler/optimizer/switches.py
+
+import json
+import logging
+
+from lmn.compiler.optimizer.ast_utils import (
+    elseif_clauses,
+    is_pure_expression,
+    walk,
+)
+
+logger = logging.getLogger(__name__)
+
+PASS_NAME = "switches"
+
+# Only i32 operands can index a br_table.
+I32_TYPES = ("i32", "int")
+
+# Never emit a br_table with more entries than this, however dense.
+MAX_TABLE_SIZE = 1024
+
+def _expression_key(expr) -> str:
+    return json.dumps(expr, sort_keys=True, default=str)
+
+class SwitchOptimizer:
+    """
+    Recognises integer dispatch chains
+
+        if x == 1            (or `1 == x`, or `x == 1 or x == 2`)
+          ...
+        elseif x == 2
+          ...
+        elseif x == 5
+          ...
+        else
+          ...
+        end
+
+    over one side-effect-free i32 operand and attaches a "switch" hint to the
+    IfStatement, which the SwitchEmitter turns into a single dispatch instead
+    of one comparison per arm:
+
+      "switch": {
+        "label":   "switch_N",
+        "operand": <expr>,
+        "cases":   [[value, arm], ...]   arm 0 = then body, arm k = k-th elseif
+        "mode":    "table" | "search"    br_table for dense constants,
+                                         binary search over them otherwise
+      }
+
+    The bodies stay where they are, so later passes see a normal IfStatement.
+    """
+
+    def __init__(self, options, profile=None):
+        self.options = options
+        self.profile = profile
+        self.switch_counter = 0
+
+    def run(self, program: dict) -> None:
+        for node in walk(program.get("body", []), enter_functions=True):
+            if node.get("type") == "IfStatement":
+                self._optimize_if(node)
+
+    # -------------------------------------------------------------------------
+    # Matching
+    # -------------------------------------------------------------------------
+    def _optimize_if(self, node):
+        conditions = [node.get("condition")]
+        conditions.extend(clause.get("condition") for clause in elseif_clauses(node))
+        if len(conditions) < self.options.switch_min_cases:
+            return
+
+        operand = None
+        operand_key = None
+        cases = []
+        seen = set()
+        for arm, condition in enumerate(conditions):
+            matched = self._match_condition(condition)
+            if matched is None:
+                return
+            expr, values = matched
+            key = _expression_key(expr)
+            if operand is None:
+                operand, operand_key = expr, key
+            elif key != operand_key:
+                return
+            for value in values:
+                # a repeated constant can never reach its later arm
+                if value not in seen:
+                    seen.add(value)
+                    cases.append([value, arm])
+
+        if not is_pure_expression(operand):
+            return
+
+        values = [value for value, _ in cases]
+        span = max(values) - min(values) + 1
+        dense = span <= MAX_TABLE_SIZE and len(values) / span >= self.options.switch_min_density
+        mode = "table" if dense else "search"
+
+        label = f"switch_{self.switch_counter}"
+        self.switch_counter += 1
+        node["switch"] = {
+            "label": label,
+            "operand": operand,
+            "cases": sorted(cases),
+            "mode": mode,
+        }
+
+        self._stat("jump_tables" if dense else "binary_searches")
+        self._decision(
+            f"{len(conditions)}-way elseif chain on {len(values)} constant(s) "
+            f"(span {span}) => {'br_table' if dense else 'binary search'}"
+        )
+
+    def _match_condition(self, condition):
+        """
+        `x == c` / `c == x` / `x == c1 or x == c2 ...` => (x, [c, ...]), else None.
+        """
+        if not isinstance(condition, dict) or condition.get("type") != "BinaryExpression":
+            return None
+
+        op = condition.get("operator")
+        if op == "or":
+            left = self._match_condition(condition.get("left"))
+            right = self._match_condition(condition.get("right"))
+            if left is None or right is None:
+                return None
+            if _expression_key(left[0]) != _expression_key(right[0]):
+                return None
+            return left[0], left[1] + right[1]
+
+        # the comparison carries the unified operand type (untyped params don't)
+        if op != "==" or condition.get("inferred_type") not in I32_TYPES:
+            return None
+        for expr_side, const_side in (("left", "right"), ("right", "left")):
+            value = self._constant(condition.get(const_side))
+            expr = condition.get(expr_side)
+            if value is not None and isinstance(expr, dict) and self._constant(expr) is None:
+                return expr, [value]
+        return None
+
+    def _constant(self, expr):
+        if not isinstance(expr, dict):
+            return None
+        if expr.get("type") == "LiteralExpression":
+            value = expr.get("value")
+            if isinstance(value, int) and not isinstance(value, bool) and -2**31 <= value < 2**31:
+                return value
+            return None
+        if expr.get("type") == "UnaryExpression" and expr.get("operator") == "-":
+            value = self._constant(expr.get("operand"))
+            return -value if value is not None and value != -2**31 else None
+        return None
+
+    # -------------------------------------------------------------------------
+    # Profile helpers
+    # -------------------------------------------------------------------------
+    def _stat(self, key, amount=1):
+        if self.profile is not None:
+            self.profile.add_stat(PASS_NAME, key, amount)
+
+    def _decision(self, message):
+        if self.profile is not None:
+            self.profile.add_decision(PASS_NAME, message)
+
+
+def optimize_switches(program: dict, options, profile=None) -> None:
+    """
+    Mark integer elseif chains for jump-table / binary-search dispatch (in place).
+    """
+    SwitchOptimizer(options, profile).run(program)
@@ -0,0 +1,319 @@
+# file: lmn/compiler/optimizer/tail_calls.py
+
+import logging
+
+from lmn.compiler.optimizer.ast_utils import (
+    called_function_name,
+    is_pure_expression,
+    statement_lists,
+    uninitialised_locals,
+    walk,
+)
+
+logger = logging.getLogger(__name__)
+
+PASS_NAME = "tail_calls"
+
+# Operators we may re-associate into an accumulator, with their identity.
+ACCUMULATOR_IDENTITY = {"+": 0, "*": 1}
+
+# Re-association is only exact for wrapping integer arithmetic.
+INTEGER_TYPES = {"i32": "i32", "int": "i32", "i64": "i64", "long": "i64"}
+
+ACCUMULATOR_NAME = "__tail_acc"
+
+class TailCallOptimizer:
+    """
+    Turns self-recursive tail calls into loops.
+
+      function count(n, acc)           (func $count ...
+        if n == 0                        loop $tail_count
+          return acc                       ...
+        end                                local.get $n  i32.const 1  i32.sub
+        return count(n - 1, acc + n)       local.get $acc local.get $n i32.add
+      end                                  local.set $acc
+                                           local.set $n
+                                           br $tail_count
+                                         end
+
+    The FunctionDefinition gets a "tail_call" payload ({"label", "prelude"}),
+    which makes the FunctionEmitter wrap the body in `loop $label`, and each
+    `return f(args)` becomes a TailCallStatement (re-assign params + br).
+
+    Accumulator rewriting handles the common non-tail shape `return e * f(..)`
+    (or `+`, either operand order) for integer functions:
+
+        return n * fact(n - 1)   =>   __tail_acc = __tail_acc * n ; tail call
+        return 1                 =>   return __tail_acc * 1
+        return / end of body     =>   return __tail_acc * 0   (the default result)
+
+    With options.use_return_call, tail calls to *other* functions with the
+    same result type are emitted as `return_call` (wasm tail-call proposal).
+    """
+
+    def __init__(self, options, profile=None):
+        self.options = options
+        self.profile = profile
+        self.functions = {}
+
+    def run(self, program: dict) -> None:
+        for node in program.get("body", []):
+            if node.get("type") == "FunctionDefinition":
+                self.functions[node["name"]] = node
+
+        for fn_node in self.functions.values():
+            self._optimize_function(fn_node)
+
+    # -------------------------------------------------------------------------
+    # Analysis
+    # -------------------------------------------------------------------------
+    def _return_statements(self, statements):
+        """
+        Every ReturnStatement of the function itself (inlined call bodies
+        live inside expressions and are not visited).
+        """
+        for stmt in statements:
+            if stmt.get("type") == "ReturnStatement":
+                yield stmt
+            for nested in statement_lists(stmt):
+                yield from self._return_statements(nested)
+
+    def _self_call(self, expr, fn_name, arity):
+        """
+        Return the call if expr is a direct, non-inlined call to fn_name with
+        the right arity. The type checker may wrap calls in a no-op
+        ConversionExpression (i32 -> i32), which we look through.
+        """
+        while (
+            expr
+            and expr.get("type") == "ConversionExpression"
+            and expr.get("from_type") == expr.get("to_type")
+        ):
+            expr = expr.get("source_expr")
+
+        if (
+            expr
+            and expr.get("type") == "FnExpression"
+            and not expr.get("inline")
+            and called_function_name(expr) == fn_name
+            and len(expr.get("arguments", [])) == arity
+        ):
+            return expr
+        return None
+
+    def _accumulator_split(self, expr, fn_name, arity):
+        """
+        For `e op f(args)` / `f(args) op e` return (op, e, call), else None.
+        'e' must be pure and must not call f itself.
+        """
+        if not expr or expr.get("type") != "BinaryExpression":
+            return None
+        op = expr.get("operator")
+        if op not in ACCUMULATOR_IDENTITY:
+            return None
+
+        for call_side, other_side in (("right", "left"), ("left", "right")):
+            call = self._self_call(expr.get(call_side), fn_name, arity)
+            other = expr.get(other_side)
+            if call and is_pure_expression(other) and not self._calls(other, fn_name):
+                return op, other, call
+        return None
+
+    def _calls(self, node, fn_name) -> bool:
+        return any(called_function_name(sub) == fn_name for sub in walk(node))
+
+    # -------------------------------------------------------------------------
+    # Rewriting
+    # -------------------------------------------------------------------------
+    def _optimize_function(self, fn_node):
+        fn_name = fn_node["name"]
+        params = [p["name"] for p in fn_node.get("params", [])]
+        body = fn_node.get("body", [])
+        returns = list(self._return_statements(body))
+
+        tail_returns = {
+            id(r) for r in returns if self._self_call(r.get("expression"), fn_name, len(params))
+        }
+        acc_returns = {}
+        for r in returns:
+            split = self._accumulator_split(r.get("expression"), fn_name, len(params))
+            if split:
+                acc_returns[id(r)] = split
+
+        # 1) Decide whether accumulator rewriting applies
+        acc_type = INTEGER_TYPES.get(fn_node.get("return_type") or "i32")
+        operators = {op for op, _, _ in acc_returns.values()}
+        use_accumulator = bool(acc_returns) and self.options.accumulate_tail_calls
+        if use_accumulator and (acc_type is None or len(operators) != 1):
+            self._decision(f"'{fn_name}': no accumulator (needs one integer + or * pattern)")
+            use_accumulator = False
+        if not use_accumulator:
+            acc_returns = {}
+
+        if not tail_returns and not acc_returns:
+            if self.options.use_return_call:
+                self._mark_return_calls(fn_node, returns)
+            return
+
+        # 2) Loop-carried locals must be re-initialised on every iteration
+        uninitialised = uninitialised_locals(body, params)
+        if uninitialised:
+            self._stat("kept")
+            self._decision(
+                f"kept recursion in '{fn_name}': locals without initialiser: "
+                f"{', '.join(sorted(uninitialised))}"
+            )
+            return
+
+        label = f"tail_{fn_name}"
+        op = operators.pop() if acc_returns else None
+        context = {
+            "fn_name": fn_name,
+            "params": params,
+            "label": label,
+            "tail_returns": tail_returns,
+            "acc_returns": acc_returns,
+            "acc_type": acc_type,
+            "op": op,
+        }
+        self._rewrite_statements(body, context)
+
+        prelude = []
+        if op:
+            # Falling off the end returns the default 0 => acc op 0 as well
+            # (an explicit return, so the emitter's fallback is never reached)
+            body.append({"type": "ReturnStatement", "expression": self._accumulate(self._zero(context), context)})
+            prelude.append({
+                "type": "LetStatement",
+                "variable": {"type": "VariableExpression", "name": ACCUMULATOR_NAME},
+                "expression": {
+                    "type": "LiteralExpression",
+                    "value": ACCUMULATOR_IDENTITY[op],
+                    "literal_type": acc_type,
+                    "inferred_type": acc_type,
+                },
+                "type_annotation": acc_type,
+            })
+        fn_node["tail_call"] = {"label": label, "prelude": prelude}
+
+        converted = len(tail_returns) + len(acc_returns)
+        self._stat("loops")
+        self._stat("tail_calls", converted)
+        if op:
+            self._stat("accumulators")
+            self._decision(f"'{fn_name}': {converted} recursive call(s) => loop with '{op}' accumulator")
+        else:
+            self._decision(f"'{fn_name}': {converted} tail call(s) => loop")
+
+    def _rewrite_statements(self, statements, context):
+        rewritten = []
+        for stmt in statements:
+            for nested in statement_lists(stmt):
+                self._rewrite_statements(nested, context)
+
+            if stmt.get("type") == "ReturnStatement":
+                rewritten.extend(self._rewrite_return(stmt, context))
+            else:
+                rewritten.append(stmt)
+        statements[:] = rewritten
+
+    def _rewrite_return(self, stmt, context):
+        expr = stmt.get("expression")
+        op = context["op"]
+
+        # a) return f(args) => loop again (accumulator, if any, is unchanged)
+        if id(stmt) in context["tail_returns"]:
+            call = self._self_call(expr, context["fn_name"], len(context["params"]))
+            return [self._tail_call_statement(call, context)]
+
+        # b) return e op f(args) => acc = acc op e ; loop again
+        if id(stmt) in context["acc_returns"]:
+            _, operand, call = context["acc_returns"][id(stmt)]
+            return [
+                {
+                    "type": "AssignmentStatement",
+                    "variable_name": ACCUMULATOR_NAME,
+                    "expression": self._accumulate(operand, context),
+                },
+                self._tail_call_statement(call, context),
+            ]
+
+        # c) any other return => fold the accumulator into the result
+        #    (a bare `return` yields the default 0, like falling off the end)
+        if op:
+            stmt["expression"] = self._accumulate(expr if expr is not None else self._zero(context), context)
+        return [stmt]
+
+    def _zero(self, context):
+        return {
+            "type": "LiteralExpression",
+            "value": 0,
+            "literal_type": context["acc_type"],
+            "inferred_type": context["acc_type"],
+        }
+
+    def _accumulate(self, operand, context):
+        return {
+            "type": "BinaryExpression",
+            "operator": context["op"],
+            "left": {
+                "type": "VariableExpression",
+                "name": ACCUMULATOR_NAME,
+                "inferred_type": context["acc_type"],
+            },
+            "right": operand,
+            "inferred_type": context["acc_type"],
+        }
+
+    def _tail_call_statement(self, call, context):
+        return {
+            "type": "TailCallStatement",
+            "mode": "loop",
+            "function": context["fn_name"],
+            "label": context["label"],
+            "params": context["params"],
+            "arguments": call.get("arguments", []),
+        }
+
+    def _mark_return_calls(self, fn_node, returns):
+        """
+        `return g(args)` => `return_call $g` when g returns the same wasm type.
+        """
+        fn_type = INTEGER_TYPES.get(fn_node.get("return_type") or "i32", fn_node.get("return_type"))
+        for r in returns:
+            expr = r.get("expression")
+            callee = self.functions.get(called_function_name(expr)) if expr else None
+            if callee is None or expr.get("type") != "FnExpression" or expr.get("inline"):
+                continue
+            callee_type = INTEGER_TYPES.get(callee.get("return_type") or "i32", callee.get("return_type"))
+            if callee_type != fn_type:
+                continue
+
+            call = dict(expr)
+            r.clear()
+            r.update({
+                "type": "TailCallStatement",
+                "mode": "return_call",
+                "function": callee["name"],
+                "arguments": call.get("arguments", []),
+            })
+            self._stat("return_calls")
+            self._decision(f"'{fn_node['name']}': return {callee['name']}(...) => return_call")
+
+    # -------------------------------------------------------------------------
+    # Profile helpers
+    # -------------------------------------------------------------------------
+    def _stat(self, key, amount=1):
+        if self.profile is not None:
+            self.profile.add_stat(PASS_NAME, key, amount)
+
+    def _decision(self, message):
+        if self.profile is not None:
+            self.profile.add_decision(PASS_NAME, message)
+
+
+def optimize_tail_calls(program: dict, options, profile=None) -> None:
+    """
+    Run the tail-call pass over a lowered dict AST (in place).
+    """
+    TailCallOptimizer(options, profile).run(program)
@@ -0,0 +1,59 @@
+# file: lmn/compiler/parser/statements/annotation_parser.py
+
+import logging
+
+from lmn.compiler.lexer.token_type import LmnTokenType
+from lmn.compiler.parser.parser_utils import expect_token
+from lmn.compiler.parser.statements.function_definition_parser import FunctionDefinitionParser
+
+logger = logging.getLogger(__name__)
+
+# Annotations a function definition may carry
+KNOWN_ANNOTATIONS = (
+    "memo",   # cache results per argument tuple (see emitter/wasm/memo_table.py)
+)
+
+class AnnotationParser:
+    def __init__(self, parent_parser):
+        self.parser = parent_parser
+
+    def parse(self):
+        """
+        Parses one or more annotations followed by the function they annotate:
+
+        @memo
+        function fib(n)
+            ...
+        end
+        """
+        annotations = []
+
+        # 1) Collect '@name' annotations (comments may sit in between)
+        while self.parser.current_token:
+            ttype = self.parser.current_token.token_type
+            if ttype in (LmnTokenType.COMMENT, LmnTokenType.NEWLINE):
+                self.parser.advance()
+                continue
+            if ttype != LmnTokenType.AT:
+                break
+
+            self.parser.advance()  # consume '@'
+            name_token = expect_token(self.parser, LmnTokenType.IDENTIFIER, "Expected annotation name after '@'")
+            name = name_token.value
+            if name not in KNOWN_ANNOTATIONS:
+                raise SyntaxError(
+                    f"Unknown annotation '@{name}' (expected one of: "
+                    f"{', '.join('@' + a for a in KNOWN_ANNOTATIONS)})"
+                )
+            self.parser.advance()  # consume the name
+            if name not in annotations:
+                annotations.append(name)
+
+        # 2) The annotated function
+        expect_token(self.parser, LmnTokenType.FUNCTION, "Expected 'function' after annotation")
+        self.parser.advance()  # consume 'function'
+        func_def = FunctionDefinitionParser(self.parser).parse()
+        func_def.annotations = annotations
+
+        logger.debug("AnnotationParser: function '%s' annotated with %s", func_def.name, annotations)
+        return func_def
@@ -2,6 +2,7 @@
 
 from typing import Optional
 from lmn.compiler.lexer.token_type import LmnTokenType
+from lmn.compiler.parser.statements.annotation_parser import AnnotationParser
 from lmn.compiler.parser.statements.assignment_parser import AssignmentParser
 from lmn.compiler.parser.statements.block_parser import BlockParser
 from lmn.compiler.parser.statements.break_parser import BreakParser
@@ -31,6 +32,7 @@ class StatementParser:
         Attempts to parse a single statement based on the current token type.
 
         - function -> FunctionDefinitionParser
+        - @annotation -> AnnotationParser (then the function it annotates)
         - identifier -> (function call) or (assignment)
         - if -> IfParser
         - for -> ForParser
@@ -69,6 +71,10 @@ class StatementParser:
             self.parser.advance()
             return FunctionDefinitionParser(self.parser).parse()
 
+        elif ttype == LmnTokenType.AT:
+            logger.debug("StatementParser: Handling '@' function annotation.")
+            return AnnotationParser(self.parser).parse()
+
         elif ttype == LmnTokenType.IDENTIFIER:
             # We need to check if it's a function call or an assignment
             next_token = self.parser.peek(1)  # peek one token ahead
@@ -5,7 +5,7 @@ import subprocess
 import tempfile
 import os
 import json
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 from lmn.compiler.lexer.tokenizer import Tokenizer
 from lmn.compiler.parser.parser import Parser
@@ -14,55 +14,111 @@ from lmn.compiler.typechecker.program_checker import ProgramChecker
 from lmn.compiler.ast.program import Program
 from lmn.compiler.typechecker.ast_type_checker import type_check_program
 from lmn.compiler.lowering.wasm_lowerer import lower_program_to_wasm_types
+from lmn.compiler.optimizer.options import OptimizerOptions
+from lmn.compiler.optimizer.optimizer import optimize_program
 from lmn.compiler.emitter.wasm.wasm_emitter import WasmEmitter
+from lmn.compiler.emitter.wasm.peephole import PeepholeOptimizer
+from lmn.compiler.emitter.wasm.local_allocator import LocalAllocator
+from lmn.compiler.emitter.wasm.literal_pool import LiteralPool
+from lmn.compiler.emitter.wasm.string_layout import NUL_TERMINATED
+from lmn.compiler.compile_profile import CompileProfile
 
 logger = logging.getLogger(__name__)
 
+def wat2wasm_feature_flags(options: Optional[OptimizerOptions]) -> list:
+    """
+    Extra wat2wasm flags for the wasm proposals the optimizer may emit.
+    """
+    flags = []
+    if options is not None and options.use_return_call:
+        flags.append("--enable-tail-call")
+    return flags
+
 def compile_code_to_wat(
     code: str,
     also_produce_wasm: bool = False,
-    import_memory: bool = False
+    import_memory: bool = False,
+    optimize: Union[bool, OptimizerOptions] = True,
+    profile: Optional[CompileProfile] = None,
+    string_layout: str = NUL_TERMINATED
 ) -> Tuple[str, Optional[bytes]]:
     """
     EXACT 4-step pipeline:
       1) parser-cli: parse => AST => JSON
       2) typechecker: read JSON => Program => type_check => JSON
       3) ast-wasm-lowerer: read JSON => type_check => lower => JSON
-      4) ast-to-wat: read JSON => emit WAT
+         (+ optimizer passes on the lowered JSON, unless optimize=False)
+      4) ast-to-wat: read JSON => emit WAT (+ peephole pass, local slot reuse)
       Optionally run wat2wasm.
+
+    'optimize' is True/False or an OptimizerOptions instance. If 'profile'
+    (a CompileProfile) is given, stage timings and optimizer statistics
+    are recorded in it. 'string_layout' ("nul" or "length", see
+    emitter/wasm/string_layout.py) selects how string literals are stored.
     """
 
     logger.debug("Starting compile_code_to_wat with code length=%d", len(code))
 
+    if profile is None:
+        # keep the code below simple: always time into *some* profile
+        profile = CompileProfile()
+
     # ------------------- Step 1: parser-cli -------------------
-    tokenizer = Tokenizer(code)
-    tokens = tokenizer.tokenize()
-    logger.debug("Step1: parser-cli => got %d tokens.", len(tokens))
+    with profile.time_stage("parse"):
+        tokenizer = Tokenizer(code)
+        tokens = tokenizer.tokenize()
+        logger.debug("Step1: parser-cli => got %d tokens.", len(tokens))
 
-    parser_obj = Parser(tokens)
-    ast_program = parser_obj.parse()
-    logger.debug("Step1: parsed AST => %r", ast_program)
+        parser_obj = Parser(tokens)
+        ast_program = parser_obj.parse()
+        logger.debug("Step1: parsed AST => %r", ast_program)
 
-    # “Write” it to JSON (in-memory dict)
-    ast_dict_1 = ast_program.to_dict()
+        # “Write” it to JSON (in-memory dict)
+        ast_dict_1 = ast_program.to_dict()
 
     # ------------------- Step 2: typechecker -------------------
-    checker = ProgramChecker()
-    checker.validate_program(ast_dict_1)  # like reading parsed.json in typechecker
-    program_node_2 = Program.model_validate(ast_dict_1)
-    type_check_program(program_node_2)
-    ast_dict_2 = program_node_2.to_dict()
+    with profile.time_stage("typecheck"):
+        checker = ProgramChecker()
+        checker.validate_program(ast_dict_1)  # like reading parsed.json in typechecker
+        program_node_2 = Program.model_validate(ast_dict_1)
+        type_check_program(program_node_2)
+        ast_dict_2 = program_node_2.to_dict()
 
     # ------------------- Step 3: ast-wasm-lowerer -------------------
-    checker.validate_program(ast_dict_2)
-    program_node_3 = Program.model_validate(ast_dict_2)
-    type_check_program(program_node_3)   # re-check
-    lower_program_to_wasm_types(program_node_3)
-    ast_dict_3 = program_node_3.to_dict()
+    with profile.time_stage("lower"):
+        checker.validate_program(ast_dict_2)
+        program_node_3 = Program.model_validate(ast_dict_2)
+        type_check_program(program_node_3)   # re-check
+        lower_program_to_wasm_types(program_node_3)
+        ast_dict_3 = program_node_3.to_dict()
+
+    # ------------------- Step 3b: optimizer -------------------
+    options = None
+    if optimize:
+        options = optimize if isinstance(optimize, OptimizerOptions) else OptimizerOptions()
+        with profile.time_stage("optimize"):
+            optimize_program(ast_dict_3, options, profile)
 
     # ------------------- Step 4: ast-to-wat -------------------
-    emitter = WasmEmitter(import_memory=import_memory)
-    wat_text = emitter.emit_program(ast_dict_3)
+    with profile.time_stage("emit"):
+        peephole = None
+        if options is not None and options.peephole:
+            peephole = PeepholeOptimizer(options.peephole_rules, profile)
+        local_allocator = None
+        if options is not None and options.reuse_locals:
+            local_allocator = LocalAllocator(profile)
+        literal_pool = LiteralPool(
+            intern=options is not None and options.intern_literals,
+            profile=profile,
+            string_layout=string_layout,
+        )
+        emitter = WasmEmitter(
+            import_memory=import_memory,
+            peephole=peephole,
+            local_allocator=local_allocator,
+            literal_pool=literal_pool,
+        )
+        wat_text = emitter.emit_program(ast_dict_3)
     logger.debug("Step4: Emitted WAT => length=%d chars", len(wat_text))
 
     # (Optional) run wat2wasm
@@ -74,7 +130,11 @@ def compile_code_to_wat(
         wasm_path = wat_path.replace(".wat", ".wasm")
 
         try:
-            subprocess.run(["wat2wasm", wat_path, "-o", wasm_path], check=True)
+            with profile.time_stage("wat2wasm"):
+                subprocess.run(
+                    ["wat2wasm", wat_path, "-o", wasm_path] + wat2wasm_feature_flags(options),
+                    check=True
+                )
             logger.debug("wat2wasm succeeded.")
         except FileNotFoundError:
             logger.error("Error: 'wat2wasm' not found in PATH.")
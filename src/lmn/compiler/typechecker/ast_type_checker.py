@@ -11,6 +11,7 @@ from lmn.compiler.ast.program import Program
 from lmn.compiler.ast.expressions.literal_expression import LiteralExpression
 from lmn.compiler.typechecker.finalize_arguments_pass import finalize_function_calls
 from lmn.compiler.typechecker.function_call_type_unifier import unify_params_from_calls
+from lmn.compiler.typechecker.function_specializer import FunctionSpecializer
 from lmn.compiler.typechecker.utils import unify_types
 from lmn.compiler.typechecker.expressions.expression_dispatcher import ExpressionDispatcher
 
@@ -101,6 +102,9 @@ def type_check_program(program_node: Program) -> None:
         fn_info["param_types"] = param_types
         fn_info["param_defaults"] = param_defaults
         fn_info["return_type"] = return_type
+        # e.g. {"T": ["int", "long", ...]} for sum(values: T[]) -> T
+        if tc_info.get("type_params"):
+            fn_info["type_params"] = tc_info["type_params"]
         symbol_table[fn_name] = fn_info
 
     try:
@@ -110,10 +114,17 @@ def type_check_program(program_node: Program) -> None:
         expr_dispatcher = ExpressionDispatcher(symbol_table)
         statement_dispatcher = StatementDispatcher(symbol_table, expr_dispatcher)
 
+        # Calls whose argument types disagree with an untyped function's
+        # defaults are routed to type-specialised clones
+        specializer = FunctionSpecializer(symbol_table)
+        specializer.statement_dispatcher = statement_dispatcher
+        expr_dispatcher.specializer = specializer
+
         # === PASS 0a: Insert top-level FunctionDefinition in symbol table
         logger.debug("=== PASS 0a: Pre-insert top-level FunctionDefinition names in symbol table ===")
         for node in program_node.body:
             if node.type == "FunctionDefinition":
+                specializer.register(node)
                 param_names, param_types, param_defaults = [], [], []
                 for p in node.params:
                     param_names.append(p.name)
@@ -160,6 +171,10 @@ def type_check_program(program_node: Program) -> None:
                 statement_dispatcher.check_statement(node)
                 log_symbol_table(symbol_table)
 
+        # === PASS 3b: Emit the specialised clones next to their originals
+        logger.debug("=== PASS 3b: Insert specialised function clones ===")
+        specializer.insert_clones(program_node)
+
         # === PASS 4: Finalizing named => positional arguments
         logger.debug("=== PASS 4: Finalizing named arguments => positional ===")
         finalize_function_calls(program_node, symbol_table)
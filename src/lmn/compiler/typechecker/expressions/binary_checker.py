@@ -7,6 +7,10 @@ from lmn.compiler.ast.expressions.conversion_expression import ConversionExpress
 from lmn.compiler.typechecker.expressions.base_expression_checker import BaseExpressionChecker
 from lmn.compiler.typechecker.utils import unify_types
 
+# Operators whose result is a boolean (an 'int' holding 0 / 1).
+COMPARISON_OPERATORS = ("<", "<=", ">", ">=", "==", "!=")
+LOGICAL_OPERATORS = ("and", "or")
+
 class BinaryChecker(BaseExpressionChecker):
     def check(
         self,
@@ -33,14 +37,24 @@ class BinaryChecker(BaseExpressionChecker):
             expr.right, target_type=None, local_scope=local_scope
         )
 
+        # 1b) 'and' / 'or' => both sides must be booleans; no conversions, since
+        #     the right side is only evaluated when needed (short-circuit)
+        if expr.operator in LOGICAL_OPERATORS:
+            self._check_boolean_operand(expr.operator, expr.left, left_type)
+            self._check_boolean_operand(expr.operator, expr.right, right_type)
+            expr.inferred_type = "int"
+            return "int"
+
         # 2) Unify the types
         result_type = unify_types(left_type, right_type, for_assignment=False)
 
         # 3) Store the inferred type in the AST node
         expr.inferred_type = result_type
 
-        # 4) If left doesn't match the result, insert a ConversionExpression
-        if left_type and result_type and left_type != result_type:
+        # 4) If left doesn't match the result, insert a ConversionExpression.
+        #    A 'void' operand is a recursive call whose return type is not
+        #    known yet; the second type-check pass converts it if needed.
+        if left_type not in (None, "void") and result_type and left_type != result_type:
             expr.left = ConversionExpression(
                 source_expr=expr.left,
                 from_type=left_type,
@@ -48,7 +62,7 @@ class BinaryChecker(BaseExpressionChecker):
             )
 
         # 5) If right doesn't match the result, convert it as well
-        if right_type and result_type and right_type != result_type:
+        if right_type not in (None, "void") and result_type and right_type != result_type:
             expr.right = ConversionExpression(
                 source_expr=expr.right,
                 from_type=right_type,
@@ -57,3 +71,18 @@ class BinaryChecker(BaseExpressionChecker):
 
         # 6) Return the common result type
         return result_type
+
+    def _check_boolean_operand(self, op: str, operand, operand_type: str) -> None:
+        """
+        In LMN, 'int' is used for booleans. Comparisons (and nested and/or/not)
+        always produce one, even when they compare floats or longs.
+        """
+        produces_boolean = (
+            (getattr(operand, "type", None) == "BinaryExpression"
+             and operand.operator in COMPARISON_OPERATORS + LOGICAL_OPERATORS)
+            or (getattr(operand, "type", None) == "UnaryExpression" and operand.operator == "not")
+        )
+        if not produces_boolean and operand_type != "int":
+            raise TypeError(
+                f"Cannot apply '{op}' to '{operand_type}'. Expecting 'int' as boolean."
+            )
@@ -37,6 +37,10 @@ class ExpressionDispatcher:
         # Global or outer symbol table
         self.symbol_table = symbol_table
 
+        # FunctionSpecializer (set by type_check_program) => FnChecker routes
+        # calls with differently typed arguments to specialised clones
+        self.specializer = None
+
     def check_expression(
         self,
         expr: Expression,
@@ -7,7 +7,8 @@ from lmn.compiler.ast.expressions.fn_expression import FnExpression
 from lmn.compiler.ast.expressions.anonymous_function_expression import AnonymousFunctionExpression
 
 from lmn.compiler.typechecker.expressions.base_expression_checker import BaseExpressionChecker
-from lmn.compiler.typechecker.utils import unify_types
+from lmn.compiler.ast.expressions.conversion_expression import ConversionExpression
+from lmn.compiler.typechecker.utils import TYPE_PRIORITY, unify_types
 
 class FnChecker(BaseExpressionChecker):
     def check(
@@ -51,6 +52,8 @@ class FnChecker(BaseExpressionChecker):
             return self._check_closure_call(expr, fn_info, scope)
         elif "required_params" in fn_info:
             return self._check_builtin_function(expr, fn_info, scope)
+        elif fn_info.get("type_params"):
+            return self._check_generic_builtin(expr, fn_info, scope)
         else:
             return self._check_user_function(expr, fn_info, scope)
 
@@ -180,6 +183,81 @@ class FnChecker(BaseExpressionChecker):
         expr.inferred_type = return_type
         return return_type
 
+    def _check_generic_builtin(
+        self,
+        expr: FnExpression,
+        fn_info: Dict[str, Any],
+        scope: Dict[str, Any]
+    ) -> str:
+        """
+        Type-check a call to a builtin with type parameters, e.g.
+        sum(values: T[]) -> T with T in int/long/float/double.
+        T is bound by the first array argument; scalar arguments of type T
+        are widened to it (scale(doubles, 2) => factor 2.0).
+        """
+        fn_name = expr.name.name
+        param_names = fn_info.get("param_names", [])
+        param_types = fn_info.get("param_types", [])
+        type_params = fn_info["type_params"]
+        return_type = fn_info.get("return_type", "void")
+
+        # 1) Sort arguments
+        final_args = [None] * len(param_names)
+        next_positional_index = 0
+        for arg_node in expr.arguments:
+            if isinstance(arg_node, AssignmentExpression):
+                pname = arg_node.left.name
+                if pname not in param_names:
+                    raise TypeError(f"Unknown param '{pname}' in call to '{fn_name}'. Valid: {param_names}")
+                final_args[param_names.index(pname)] = arg_node.right
+            else:
+                if next_positional_index >= len(param_names):
+                    raise TypeError(f"Too many arguments for '{fn_name}'. Expected {len(param_names)}.")
+                final_args[next_positional_index] = arg_node
+                next_positional_index += 1
+
+        for pname, arg_node in zip(param_names, final_args):
+            if arg_node is None:
+                raise TypeError(f"Missing required param '{pname}' in call to '{fn_name}'.")
+
+        # 2) Bind the type parameters from the array arguments ('T[]')
+        arg_types = [None] * len(final_args)
+        bindings = {}
+        for i, p_type in enumerate(param_types):
+            if p_type.endswith("[]") and p_type[:-2] in type_params:
+                arg_type = self.dispatcher.check_expression(final_args[i], local_scope=scope)
+                arg_types[i] = arg_type
+                if p_type[:-2] in bindings:
+                    continue
+                element = arg_type[:-2] if isinstance(arg_type, str) and arg_type.endswith("[]") else None
+                if element not in type_params[p_type[:-2]]:
+                    allowed = ", ".join(f"{t}[]" for t in type_params[p_type[:-2]])
+                    raise TypeError(f"'{fn_name}' expects one of {allowed}, got '{arg_type}'")
+                bindings[p_type[:-2]] = element
+
+        def substitute(t: str) -> str:
+            if t in bindings:
+                return bindings[t]
+            if t.endswith("[]") and t[:-2] in bindings:
+                return bindings[t[:-2]] + "[]"
+            return t
+
+        # 3) Every argument must match its (substituted) parameter type
+        for i, (pname, arg_node) in enumerate(zip(param_names, final_args)):
+            expected = substitute(param_types[i])
+            if arg_types[i] is None:
+                arg_types[i] = self.dispatcher.check_expression(arg_node, target_type=expected, local_scope=scope)
+            if arg_types[i] == expected:
+                continue
+            # double => float, too: scale(floats, 2.0)
+            if _widens(arg_types[i], expected) or (arg_types[i], expected) == ("double", "float"):
+                self._convert_argument(expr, arg_node, arg_types[i], expected)
+                continue
+            raise TypeError(f"Parameter '{pname}' of '{fn_name}' expects '{expected}' got '{arg_types[i]}'")
+
+        expr.inferred_type = substitute(return_type)
+        return expr.inferred_type
+
     def _check_user_function(
         self,
         expr: FnExpression,
@@ -236,9 +314,27 @@ class FnChecker(BaseExpressionChecker):
                     )
                 final_args[i] = pdefault
 
-        # 3) unify each argument
+        arg_types = [
+            self.dispatcher.check_expression(arg_node, local_scope=scope)
+            for arg_node in final_args
+        ]
+
+        # 2b) Untyped function called with other argument types => route the
+        #     call to a type-specialised clone (see FunctionSpecializer)
+        specializer = getattr(self.dispatcher, "specializer", None)
+        purely_positional = next_positional_index == len(expr.arguments) == num_params
+        if specializer is not None and purely_positional:
+            clone_info = specializer.route(expr, arg_types)
+            if clone_info is not None:
+                fn_info = clone_info
+                param_names = fn_info["param_names"]
+                param_types = fn_info["param_types"]
+                return_type = fn_info.get("return_type", "void")
+
+        # 3) unify each argument; a numeric argument narrower than its
+        #    parameter is converted at the call site
         for i, arg_node in enumerate(final_args):
-            arg_type = self.dispatcher.check_expression(arg_node, local_scope=scope)
+            arg_type = arg_types[i]
             if param_types[i] is None:
                 param_types[i] = arg_type
             else:
@@ -247,6 +343,8 @@ class FnChecker(BaseExpressionChecker):
                     raise TypeError(
                         f"Parameter '{param_names[i]}' expects '{param_types[i]}' got '{arg_type}'"
                     )
+                if arg_type != param_types[i] and _widens(arg_type, param_types[i]):
+                    self._convert_argument(expr, arg_node, arg_type, param_types[i])
             fn_info["param_types"][i] = param_types[i]
 
         # 4) If return_type=="function", see if it returns an AnonymousFunction => produce a closure
@@ -278,3 +376,27 @@ class FnChecker(BaseExpressionChecker):
         # Otherwise => normal user function returning e.g. "int"
         expr.inferred_type = return_type
         return return_type
+
+    def _convert_argument(self, expr: FnExpression, arg_node, from_type: str, to_type: str) -> None:
+        """
+        Wrap the call argument 'arg_node' (positional or named) in a
+        ConversionExpression to the parameter type.
+        """
+        for i, candidate in enumerate(expr.arguments):
+            conversion = None
+            if candidate is arg_node:
+                conversion = ConversionExpression(source_expr=arg_node, from_type=from_type, to_type=to_type)
+                expr.arguments[i] = conversion
+            elif isinstance(candidate, AssignmentExpression) and candidate.right is arg_node:
+                conversion = ConversionExpression(source_expr=arg_node, from_type=from_type, to_type=to_type)
+                candidate.right = conversion
+            if conversion is not None:
+                conversion.inferred_type = to_type
+                return
+
+
+def _widens(arg_type: str, param_type: str) -> bool:
+    return (
+        arg_type in TYPE_PRIORITY and param_type in TYPE_PRIORITY
+        and TYPE_PRIORITY[arg_type] < TYPE_PRIORITY[param_type]
+    )
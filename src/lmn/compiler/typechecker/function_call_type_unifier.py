@@ -111,8 +111,21 @@ def _unify_fn_call_types(
 
     logger.debug(f"[FnCall] {node.name.name} => param_types(before)={param_types}")
 
+    # Untyped functions that get specialised per call keep their default
+    # (int) parameters; the FnChecker routes other calls to clones.
+    specializer = getattr(dispatcher, "specializer", None)
+    specialised = specializer is not None and specializer.is_specializable(node.name.name)
+
+    # Builtins with type parameters (sum(values: T[]) -> T) are bound per
+    # call by the FnChecker
+    if fn_info.get("type_params"):
+        logger.debug(f"[FnCall unify] '{node.name.name}' is generic => no unify")
+        return
+
     # 1) If param count matches, unify or adopt each arg
-    if purely_positional and len(arguments) == len(param_types):
+    if specialised:
+        logger.debug(f"[FnCall unify] '{node.name.name}' is specialised per call => no unify")
+    elif purely_positional and len(arguments) == len(param_types):
         for i, arg_expr in enumerate(arguments):
             arg_type = _partial_check_expression(arg_expr, symbol_table, dispatcher)
             logger.debug(
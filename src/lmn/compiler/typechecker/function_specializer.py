@@ -0,0 +1,201 @@
+# file: lmn/compiler/typechecker/function_specializer.py
+
+import logging
+from typing import Dict, Any, Optional
+
+from lmn.compiler.lowering.wasm_lowerer import lower_type
+from lmn.compiler.typechecker.utils import TYPE_PRIORITY
+from lmn.compiler.typechecker.statements.function_definition_checker import FunctionDefinitionChecker
+
+logger = logging.getLogger(__name__)
+
+# Clones per function; calls with yet another signature reuse the narrowest
+# existing clone their arguments widen to (conversions at the call site).
+MAX_SPECIALIZATIONS = 4
+
+# An untyped parameter of the original function is checked as 'int'.
+DEFAULT_PARAM_TYPE = "int"
+
+# Argument types a clone may be specialised for
+SPECIALIZABLE_TYPES = (
+    "int", "long", "float", "double", "string", "json",
+    "int[]", "long[]", "float[]", "double[]", "string[]",
+)
+
+class FunctionSpecializer:
+    """
+    Monomorphisation of top-level functions with untyped parameters.
+
+    The original function body is checked once, with its untyped parameters
+    defaulting to int. A call whose argument types disagree with that (e.g.
+    add(1.5, 2.25)) is routed to a clone whose parameters are annotated with
+    the call's types, named after the lowered signature (add__f64_f64). Each
+    clone is type-checked as soon as it is created, so the call gets the
+    clone's return type; inside it, recursive calls route to the clone again.
+
+    Clones are inserted into the program right after their original (see
+    insert_clones), so the rest of the pipeline treats them as ordinary
+    functions.
+    """
+
+    def __init__(self, symbol_table: Dict[str, Any], max_specializations: int = MAX_SPECIALIZATIONS):
+        self.symbol_table = symbol_table
+        self.max_specializations = max_specializations
+
+        # set by type_check_program once the dispatchers exist
+        self.statement_dispatcher = None
+
+        self.originals = {}    # function name => pristine FunctionDefinition copy
+        self.clones = {}       # function name => {signature: clone name}
+        self.clone_nodes = []  # (original name, clone FunctionDefinition)
+
+    # -------------------------------------------------------------------------
+    # Registration
+    # -------------------------------------------------------------------------
+    def register(self, func_def) -> None:
+        """
+        Remember an unchecked copy of a top-level function that has at least
+        one untyped parameter (and returns no closure).
+        """
+        if not any(getattr(p, "type_annotation", None) is None for p in func_def.params):
+            return
+        if _contains_type(func_def.to_dict(), "AnonymousFunction"):
+            return
+        self.originals[func_def.name] = func_def.model_copy(deep=True)
+        logger.debug("FunctionSpecializer: '%s' may be specialised", func_def.name)
+
+    def is_specializable(self, fn_name: str) -> bool:
+        return fn_name in self.originals
+
+    # -------------------------------------------------------------------------
+    # Call routing
+    # -------------------------------------------------------------------------
+    def route(self, expr, arg_types) -> Optional[Dict[str, Any]]:
+        """
+        If the call 'expr' (an FnExpression or a CallStatement; argument
+        types 'arg_types', one per parameter) needs a specialised clone,
+        rename the call to it and return the clone's symbol-table entry;
+        otherwise return None.
+        """
+        fn_name = _called_name(expr)
+        original = self.originals.get(fn_name)
+        if original is None or len(arg_types) != len(original.params):
+            return None
+
+        # 1) Signature: declared types stay, untyped params take the argument type
+        signature = []
+        default = True
+        for param, arg_type in zip(original.params, arg_types):
+            declared = getattr(param, "type_annotation", None)
+            if declared:
+                signature.append(declared)
+            elif arg_type in SPECIALIZABLE_TYPES:
+                signature.append(arg_type)
+                default = default and arg_type == DEFAULT_PARAM_TYPE
+            else:
+                return None
+        if default:
+            return None
+        signature = tuple(signature)
+
+        # 2) Existing clone, new clone, or (over the cap) the narrowest wider one
+        clones = self.clones.setdefault(fn_name, {})
+        clone_name = clones.get(signature)
+        if clone_name is None:
+            if len(clones) < self.max_specializations:
+                clone_name = self._clone(original, signature)
+            else:
+                clone_name = self._widest_fit(clones, signature)
+                logger.debug(
+                    "FunctionSpecializer: '%s' has %d clone(s) => %s reuses %s",
+                    fn_name, len(clones), signature, clone_name
+                )
+        if clone_name is None:
+            return None
+
+        _rename_call(expr, clone_name)
+        return self.symbol_table[clone_name]
+
+    def _clone(self, original, signature) -> str:
+        clone = original.model_copy(deep=True)
+        clone.name = f"{original.name}__{'_'.join(lower_type(t) for t in signature)}"
+        for param, param_type in zip(clone.params, signature):
+            param.type_annotation = param_type
+
+        self.clones[original.name][signature] = clone.name
+        self.clone_nodes.append((original.name, clone))
+        logger.debug("FunctionSpecializer: %s%s => '%s'", original.name, signature, clone.name)
+
+        # entry first, so recursive calls inside the body resolve to the clone
+        self.symbol_table[clone.name] = {
+            "is_function": True,
+            "param_names": [p.name for p in clone.params],
+            "param_types": list(signature),
+            "param_defaults": [None] * len(signature),
+            "return_type": getattr(clone, "return_type", None),
+        }
+        FunctionDefinitionChecker(self.symbol_table, self.statement_dispatcher).check(clone)
+        return clone.name
+
+    def _widest_fit(self, clones, signature) -> Optional[str]:
+        fits = [
+            (sum(TYPE_PRIORITY.get(t, 0) for t in clone_signature), clone_name)
+            for clone_signature, clone_name in clones.items()
+            if all(_widens_to(arg, param) for arg, param in zip(signature, clone_signature))
+        ]
+        return min(fits)[1] if fits else None
+
+    # -------------------------------------------------------------------------
+    # Output
+    # -------------------------------------------------------------------------
+    def insert_clones(self, program_node) -> None:
+        """
+        Put every clone right after its original function (in creation order).
+        """
+        placed = {}  # original name => names already in the body
+        for original_name, clone in self.clone_nodes:
+            names = placed.setdefault(original_name, {original_name})
+            body = program_node.body
+            index = max(
+                (i for i, node in enumerate(body)
+                 if getattr(node, "type", None) == "FunctionDefinition" and node.name in names),
+                default=len(body) - 1
+            )
+            body.insert(index + 1, clone)
+            names.add(clone.name)
+        if self.clone_nodes:
+            logger.debug(
+                "FunctionSpecializer: %d clone(s): %s",
+                len(self.clone_nodes), ", ".join(clone.name for _, clone in self.clone_nodes)
+            )
+
+
+def _called_name(call) -> str:
+    if getattr(call, "type", None) == "CallStatement":
+        return call.tool_name
+    return call.name.name
+
+
+def _rename_call(call, name: str) -> None:
+    if getattr(call, "type", None) == "CallStatement":
+        call.tool_name = name
+    else:
+        call.name.name = name
+
+
+def _widens_to(arg_type: str, param_type: str) -> bool:
+    if arg_type == param_type:
+        return True
+    if arg_type in TYPE_PRIORITY and param_type in TYPE_PRIORITY:
+        return TYPE_PRIORITY[arg_type] < TYPE_PRIORITY[param_type]
+    return False
+
+
+def _contains_type(node, node_type: str) -> bool:
+    if isinstance(node, dict):
+        if node.get("type") == node_type:
+            return True
+        return any(_contains_type(value, node_type) for value in node.values())
+    if isinstance(node, list):
+        return any(_contains_type(item, node_type) for item in node)
+    return False
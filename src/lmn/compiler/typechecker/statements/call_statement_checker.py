@@ -52,13 +52,21 @@ class CallStatementChecker(BaseStatementChecker):
             arg_types.append(arg_type)
             logger.debug(f"[CallStatementChecker] Argument #{i} => type={arg_type}")
 
-        # c) (Optional) unify param_types from tool_info with the actual arg_types
+        # c) Untyped function called with other argument types => call its
+        #    type-specialised clone, as FnChecker does for call expressions
+        specializer = getattr(self.dispatcher.expr_dispatcher, "specializer", None)
+        purely_positional = not any(getattr(arg, "type", None) == "AssignmentExpression" for arg in stmt.arguments)
+        if specializer is not None and purely_positional:
+            if specializer.route(stmt, arg_types) is not None:
+                logger.debug(f"[CallStatementChecker] routed to specialised '{stmt.tool_name}'")
+
+        # d) (Optional) unify param_types from tool_info with the actual arg_types
         #    If your language enforces strict param counts or types, do it here:
         #    param_names   = tool_info.get("param_names", [])
         #    param_types   = tool_info.get("param_types", [])
         #    unify or check each arg_type matches param_types[i]
 
-        # d) This is a statement, not an expression, so no return type.
+        # e) This is a statement, not an expression, so no return type.
         #    You might set `stmt.inferred_type = "void"` or similar.
         stmt.inferred_type = "void"
         logger.debug("[CallStatementChecker] Finished checking CallStatement => type=void")
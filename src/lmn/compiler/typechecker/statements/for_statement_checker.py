@@ -5,6 +5,15 @@ from lmn.compiler.typechecker.statements.base_statement_checker import BaseState
 
 logger = logging.getLogger(__name__)
 
+# for-in loops: collection type => loop variable type
+ELEMENT_TYPES = {
+    "int[]": "int",
+    "long[]": "long",
+    "float[]": "float",
+    "double[]": "double",
+    "string[]": "string",
+}
+
 class ForStatementChecker(BaseStatementChecker):
     def check(self, stmt, local_scope=None):
         """
@@ -131,11 +140,15 @@ class ForStatementChecker(BaseStatementChecker):
         loop_scope["__in_loop__"] = True
 
         # (C) Decide the element_type
-        element_type = "any"
-        # If arr_type == "int[]" => element_type = "int"
-        # (You can do your unify logic here.)
+        element_type = ELEMENT_TYPES.get(arr_type)
+        if element_type is None:
+            raise TypeError(
+                f"Cannot iterate over '{arr_type}' in 'for {var_name} in ...'; "
+                f"expected one of {', '.join(ELEMENT_TYPES)}."
+            )
 
         loop_scope[var_name] = element_type
+        stmt.variable.inferred_type = element_type
         assigned_vars.add(var_name)
         
         logger.debug(
@@ -5,6 +5,11 @@ import logging
 # lmn imports
 from lmn.compiler.typechecker.statements.base_statement_checker import BaseStatementChecker
 from lmn.compiler.typechecker.utils import normalize_type
+from lmn.compiler.emitter.wasm.memo_table import MEMO_ANNOTATION
+
+# Types a @memo function may take (untyped => int) and return
+MEMO_PARAM_TYPES = (None, "int", "long")
+MEMO_RETURN_TYPES = ("int", "long", "float", "double")
 
 logger = logging.getLogger(__name__)
 
@@ -142,7 +147,27 @@ class FunctionDefinitionChecker(BaseStatementChecker):
         for i, param in enumerate(func_def.params):
             param.type_annotation = param_types[i]
 
+        # ------------------------------------------------------------
+        # 8) @memo => results are cached per (integer) argument tuple
+        # ------------------------------------------------------------
+        if MEMO_ANNOTATION in (getattr(func_def, "annotations", None) or []):
+            self._check_memo_signature(func_name, param_names, param_types, final_return_type)
+
         logger.debug(
             f"=== Finished type-checking function '{func_name}' => "
             f"return_type={final_return_type}, param_types={param_types} ===\n"
         )
+
+    def _check_memo_signature(self, func_name, param_names, param_types, return_type):
+        if not param_names:
+            raise TypeError(f"@memo function '{func_name}' needs at least one parameter")
+        for p_name, p_type in zip(param_names, param_types):
+            if p_type not in MEMO_PARAM_TYPES:
+                raise TypeError(
+                    f"@memo function '{func_name}': parameter '{p_name}' is '{p_type}', "
+                    f"only int/long parameters can be memoised"
+                )
+        # 'void' can still mean "not known yet" (e.g. `return n` with an
+        # untyped n on the first pass); the emitter rejects a real void result
+        if return_type not in MEMO_RETURN_TYPES + ("void",):
+            raise TypeError(f"@memo function '{func_name}' must return a number, not '{return_type}'")
@@ -0,0 +1,80 @@
+# file: src/lmn/runtime/code_block_pipeline.py
+
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from lmn.runtime.utils import LmnBlockScanner
+from lmn.runtime.wasm_runner import WasmBuildError, compile_module, run_module
+
+logger = logging.getLogger(__name__)
+
+class CodeBlockPipeline:
+    """
+    Runs the LMN code blocks of a streamed LLM reply while it arrives:
+
+      - feed(chunk) with every chunk: each ```lmn block is handed to the
+        compile worker as soon as its closing fence arrives
+      - compiled blocks run in the environment, in reply order, as soon as
+        they (and all blocks before them) are ready - between chunks, on the
+        calling thread, which is the only one touching the store
+      - finish() when the reply is complete: picks up the remaining blocks
+        and waits for them
+
+    on_start(block) is called right before a block runs and
+    on_result(block, outputs) after it (outputs: the output lines, or the
+    compile error as a one-line list). 'compile_fn(code, engine)' builds the
+    wasmtime.Module (compile_module by default).
+    """
+
+    def __init__(self, env: dict, on_start=None, on_result=None, compile_fn=compile_module):
+        self.env = env
+        self.on_start = on_start
+        self.on_result = on_result
+        self.compile_fn = compile_fn
+        self.scanner = LmnBlockScanner()
+        self.results = []        # (block, outputs) in reply order
+        self._pending = deque()  # (block, future) not run yet
+        # one worker: the compiler is not re-entrant, blocks compile in order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lmn-compile")
+
+    def feed(self, chunk: str) -> None:
+        for block in self.scanner.feed(chunk):
+            self._submit(block)
+        self.run_ready()
+
+    def finish(self) -> list:
+        """
+        The reply is complete: run every block left (waiting for their
+        compilation); returns all (block, outputs) of the reply.
+        """
+        for block in self.scanner.finish():
+            self._submit(block)
+        self.run_ready(wait=True)
+        self._executor.shutdown(wait=False)
+        return self.results
+
+    def run_ready(self, wait: bool = False) -> None:
+        """
+        Run the compiled blocks at the head of the queue (all of them, waiting
+        for their compilation, with wait=True).
+        """
+        while self._pending and (wait or self._pending[0][1].done()):
+            block, future = self._pending.popleft()
+            try:
+                module = future.result()
+            except WasmBuildError as e:
+                outputs = [str(e)]
+            except Exception as e:
+                outputs = [f"Compilation error: {e}"]
+            else:
+                if self.on_start is not None:
+                    self.on_start(block)
+                outputs = run_module(module, self.env)
+            self.results.append((block, list(outputs)))  # the env's lines are reused by the next run
+            if self.on_result is not None:
+                self.on_result(block, outputs)
+
+    def _submit(self, block):
+        logger.debug("CodeBlockPipeline: compiling block %d", len(self.results) + len(self._pending) + 1)
+        self._pending.append((block, self._executor.submit(self.compile_fn, block, self.env["engine"])))
@@ -0,0 +1,159 @@
+# file: src/lmn/runtime/host/call_prefetcher.py
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+
+class CallPrefetcher:
+    """
+    Runs host calls ahead of time on a thread pool.
+
+    A program compiled with OptimizerOptions(concurrent_calls=True) calls
+    '<builtin>__prefetch' for a group of independent llm()/tools calls
+    before the first of them runs. The prefetch handlers read their
+    arguments from WASM memory on the calling thread and submit only the
+    slow part (the LLM request) here, keyed by (function name, arguments).
+    When the real call happens, its handler take()s the pending call,
+    waits for it and stores the result in memory as usual - so N prompts
+    cost about as much as the slowest one.
+
+    Several submissions under one key are answered in order. Counters:
+    submitted, taken, missed (a call found nothing to take).
+
+    Only the WASM thread touches the program's output_list: a prefetched
+    call writes its output lines (e.g. an error message) to a list of its
+    own, which is added to output_list when the real call takes the result
+    - so the lines appear where they would without prefetching.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.max_workers = max_workers
+
+        self._executor = None
+        self._pending = {}   # key => deque of PrefetchedCalls
+        self._lock = threading.Lock()
+        self.stats = dict.fromkeys(("submitted", "taken", "missed"), 0)
+
+    def submit(self, key, fn, *args, output_list=None):
+        """
+        Start fn(*args) in the background; returns its PrefetchedCall. With
+        'output_list', fn is called as fn(lines, *args) instead, 'lines'
+        being the call's own output buffer (see PrefetchedCall.result).
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="lmn-prefetch"
+                )
+            lines = []
+            if output_list is not None:
+                args = (lines, *args)
+            call = PrefetchedCall(self._executor.submit(fn, *args), lines, output_list)
+            self._pending.setdefault(key, deque()).append(call)
+            self.stats["submitted"] += 1
+        logger.debug("CallPrefetcher: submitted %s", key)
+        return call
+
+    def take(self, key):
+        """
+        The oldest pending call for 'key', or None if nothing was prefetched.
+        """
+        with self._lock:
+            calls = self._pending.get(key)
+            if not calls:
+                self.stats["missed"] += 1
+                return None
+            call = calls.popleft()
+            if not calls:
+                del self._pending[key]
+            self.stats["taken"] += 1
+        logger.debug("CallPrefetcher: took %s", key)
+        return call
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(len(calls) for calls in self._pending.values())
+
+    def clear(self) -> None:
+        """
+        Forget results nobody took (e.g. after a trap); running requests finish
+        in the background.
+        """
+        with self._lock:
+            for calls in self._pending.values():
+                for call in calls:
+                    call.cancel()
+            self._pending.clear()
+
+    def shutdown(self) -> None:
+        self.clear()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+class PrefetchedCall:
+    """
+    A submitted call: its future and the output lines it wrote so far.
+    """
+
+    def __init__(self, future, lines: list, output_list=None):
+        self.future = future
+        self.lines = lines
+        self.output_list = output_list
+
+    def result(self):
+        """
+        Wait for the call; on success its buffered output lines are appended
+        to output_list (on the calling thread, i.e. in program order). If it
+        raised, the lines are dropped - the caller's fallback runs it again.
+        """
+        result = self.future.result()
+        if self.output_list is not None:
+            for line in self.lines:
+                self.output_list.append(line)
+        return result
+
+    def cancel(self) -> bool:
+        return self.future.cancel()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+
+def wait_for(future, fallback):
+    """
+    The result of a prefetched call (a PrefetchedCall or a plain future),
+    with its output lines; if it raised, run 'fallback()' instead
+    (the same thing the call would have done without prefetching).
+    """
+    try:
+        return future.result()
+    except Exception as e:
+        logger.debug("CallPrefetcher: prefetched call failed (%s) => calling directly", e)
+        return fallback()
+
+
+# ---------------------------------------------------------------------------
+# Process-wide prefetcher shared by the host handlers
+# ---------------------------------------------------------------------------
+_prefetcher = CallPrefetcher()
+
+def get_prefetcher() -> CallPrefetcher:
+    return _prefetcher
+
+def configure_prefetcher(**prefetcher_options) -> CallPrefetcher:
+    """
+    Replace the shared prefetcher, e.g. configure_prefetcher(max_workers=16).
+    """
+    global _prefetcher
+    _prefetcher.shutdown()
+    _prefetcher = CallPrefetcher(**prefetcher_options)
+    logger.debug("configure_prefetcher: %s", prefetcher_options)
+    return _prefetcher
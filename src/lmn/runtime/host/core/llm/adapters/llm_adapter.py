@@ -1,40 +1,99 @@
 # src/lmn/runtime/core/llm/adapters/lm_adapter.py
 
-from lmn.runtime.host.core.llm.adapters.ollama_adapter import OllamaAdapter
+import logging
+
+from lmn.runtime.host.core.llm.adapters.ollama_adapter import LLM_ERROR_TEXT, OllamaAdapter
+from lmn.runtime.host.core.llm.adapters.provider_registry import get_default_provider, get_provider, provider_names
+from lmn.runtime.host.core.llm.response_cache import get_response_cache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Marker passed as 'cache' to use the process-wide response cache
+SHARED_CACHE = "shared"
 
 class LLMAdapter:
     """
-    Top-level adapter that dispatches to specific LLM providers.
-    Default provider is 'ollama' if not specified.
+    Top-level adapter that dispatches to specific LLM providers, looked up
+    in the provider registry (see provider_registry.py: 'ollama', 'mock', ...).
+    A missing provider means the default one ('ollama' unless configured).
+
+    Responses are cached (see response_cache.py): by default in the
+    process-wide cache, or in the LLMResponseCache passed as 'cache'
+    (None => no caching).
     """
 
-    def __init__(self, output_list):
+    def __init__(self, output_list, cache=SHARED_CACHE):
         self.output_list = output_list
-        # Instantiate each provider adapter here
+        # Provider adapters, created on first use
         self.ollama_adapter = OllamaAdapter(output_list)
-        # Future adapters (OpenAI, Azure, etc.) can be added similarly.
+        self._adapters = {"ollama": self.ollama_adapter}
+        self.cache = get_response_cache() if cache == SHARED_CACHE else cache
 
-    def chat(self, provider: str, model_name: str, messages: list[dict]) -> str:
+    def chat(self, provider: str, model_name: str, messages: list[dict],
+             options: dict = None, use_cache: bool = True, on_chunk=None) -> str:
         """
         Dispatches to the appropriate adapter based on 'provider'.
 
-        :param provider:    Name of the provider, e.g. 'ollama'
+        :param provider:    Name of the provider, e.g. 'ollama' or 'mock'
+                            (empty => the default provider)
         :param model_name:  The model to use, e.g. 'llama3.2'
         :param messages:    A list of messages, each a dict like:
                             {
                                 "role": "user",
                                 "content": "Hello, how are you?"
                             }
+        :param options:     Decoding options passed to the provider
+                            (part of the cache key)
+        :param use_cache:   False => always ask the provider (the fresh
+                            response still replaces the cached one)
+        :param on_chunk:    Streaming: called with each piece of the response
+                            as it arrives (a cached response is one piece)
         :return: The LLM's response text.
         """
-        provider_lower = (provider or "").strip().lower()
+        # 1) Cached?
+        provider = (provider or "").strip().lower() or get_default_provider()
+        key = None
+        if self.cache is not None:
+            key = make_cache_key(provider, model_name, messages, options)
+            if not use_cache:
+                self.cache.record_bypass()
+            else:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    logger.debug("[LLM] cache hit for model '%s'", model_name)
+                    if on_chunk is not None:
+                        on_chunk(cached)
+                    return cached
+
+        # 2) Ask the provider
+        response_text = self._dispatch(provider, model_name, messages, options, on_chunk)
 
-        # Default to Ollama if missing/empty/unrecognized
-        if provider_lower in ("", "ollama"):
-            return self.ollama_adapter.chat(model_name, messages)
-        else:
-            # In a real implementation, you'd route to other adapters or raise an error.
+        # 3) Remember successful responses
+        if key is not None and response_text != LLM_ERROR_TEXT:
+            self.cache.put(key, response_text)
+        return response_text
+
+    def _dispatch(self, provider: str, model_name: str, messages: list[dict], options: dict = None,
+                  on_chunk=None) -> str:
+        adapter = self._adapter_for(provider)
+        if adapter is None:
+            # Unknown => say so, then use the default provider (or Ollama)
+            fallback = get_default_provider() if get_provider(get_default_provider()) else "ollama"
             self.output_list.append(
-                f"[LLM] Unknown provider '{provider}', falling back to Ollama."
+                f"[LLM] Unknown provider '{provider}' (known: {', '.join(provider_names())}), "
+                f"falling back to '{fallback}'."
             )
-            return self.ollama_adapter.chat(model_name, messages)
+            adapter = self._adapter_for(fallback)
+        return adapter.chat(model_name, messages, options, on_chunk)
+
+    def _adapter_for(self, provider: str):
+        """
+        This adapter's instance of the registered provider (None if unknown).
+        """
+        adapter = self._adapters.get(provider)
+        if adapter is None:
+            adapter_class = get_provider(provider)
+            if adapter_class is None:
+                return None
+            adapter = self._adapters[provider] = adapter_class(self.output_list)
+        return adapter
@@ -0,0 +1,168 @@
+# file: src/lmn/runtime/host/core/llm/adapters/mock_adapter.py
+
+import hashlib
+import json
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+# Words appended to a response to reach its sampled size
+FILLER_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua"
+).split()
+
+ECHO = "echo"
+TEMPLATE = "template"
+
+def sample(spec, rng: random.Random) -> float:
+    """
+    One value of a distribution spec (never negative):
+
+        0.25                        => always 0.25
+        ("uniform", low, high)
+        ("normal", mean, stddev)
+        ("lognormal", mu, sigma)
+        ("choice", [v1, v2, ...])
+    """
+    if spec is None:
+        return 0.0
+    if isinstance(spec, (int, float)):
+        return max(0.0, float(spec))
+
+    kind, *params = spec
+    if kind == "uniform":
+        value = rng.uniform(*params)
+    elif kind == "normal":
+        value = rng.gauss(*params)
+    elif kind == "lognormal":
+        value = rng.lognormvariate(*params)
+    elif kind == "choice":
+        value = rng.choice(params[0])
+    else:
+        raise ValueError(f"Unknown distribution '{kind}'")
+    return max(0.0, float(value))
+
+def parse_distribution(text: str):
+    """
+    The command-line form of a distribution spec: "0.25", "uniform:0.05,0.2",
+    "normal:0.1,0.02", "lognormal:-2,0.5" or "choice:10,100,1000".
+    """
+    if ":" not in text:
+        return float(text)
+    kind, values = text.split(":", 1)
+    numbers = [float(v) for v in values.split(",")]
+    return (kind, numbers) if kind == "choice" else (kind, *numbers)
+
+
+class MockLLMSettings:
+    """
+    How the mock provider answers:
+
+      - mode:              'echo' (the last user message) or 'template'
+      - template:          str.format template with {prompt} and {model}
+      - latency_seconds:   distribution of the time per response
+      - response_words:    distribution of the response length in words
+                           (None => the echo / template text as is)
+      - chunk_words:       words per chunk when streaming
+      - seed:              same seed + model + messages => same response
+                           and latency, run after run
+    """
+
+    def __init__(self, mode: str = ECHO, template: str = "Mock answer from {model}: {prompt}",
+                 latency_seconds=0.0, response_words=None, chunk_words: int = 4, seed: int = 0):
+        if mode not in (ECHO, TEMPLATE):
+            raise ValueError(f"Unknown mock mode '{mode}' (expected '{ECHO}' or '{TEMPLATE}')")
+        self.mode = mode
+        self.template = template
+        self.latency_seconds = latency_seconds
+        self.response_words = response_words
+        self.chunk_words = max(1, chunk_words)
+        self.seed = seed
+
+    def respond(self, model_name: str, messages: list[dict]) -> tuple[str, float]:
+        """
+        The (response text, latency in seconds) for this request.
+        """
+        # 1) A generator seeded by the request => deterministic
+        digest = hashlib.sha256(
+            json.dumps([self.seed, model_name, messages], sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).digest()
+        rng = random.Random(digest)
+
+        # 2) The text
+        prompt = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        text = prompt if self.mode == ECHO else self.template.format(prompt=prompt, model=model_name)
+
+        # 3) Resized to the sampled number of words
+        if self.response_words is not None:
+            size = int(sample(self.response_words, rng))
+            words = text.split()[:size]
+            words += [rng.choice(FILLER_WORDS) for _ in range(size - len(words))]
+            text = " ".join(words)
+
+        return text, sample(self.latency_seconds, rng)
+
+    def chunks(self, text: str) -> list[str]:
+        """
+        'text' split into streaming chunks of chunk_words words (joined they
+        give 'text' back).
+        """
+        words = text.split(" ")
+        return [
+            " ".join(words[i:i + self.chunk_words]) + (" " if i + self.chunk_words < len(words) else "")
+            for i in range(0, len(words), self.chunk_words)
+        ] or [""]
+
+
+class MockAdapter:
+    """
+    The 'mock' provider: answers locally from MockLLMSettings (echo or
+    template text, sampled latency and size) - for load tests and
+    benchmarks without a model server.
+    """
+
+    def __init__(self, output_list, settings: MockLLMSettings = None):
+        self.output_list = output_list
+        self.settings = settings
+
+    def chat(self, model_name: str, messages: list[dict], options: dict = None, on_chunk=None) -> str:
+        settings = self.settings or get_mock_settings()
+        text, latency = settings.respond(model_name, messages)
+        logger.debug("MockAdapter: %d chars after %.3fs for model '%s'", len(text), latency, model_name)
+
+        if on_chunk is None:
+            time.sleep(latency)
+            return text
+
+        # Streaming: the latency is spread over the chunks
+        chunks = settings.chunks(text)
+        for chunk in chunks:
+            time.sleep(latency / len(chunks))
+            if chunk:
+                on_chunk(chunk)
+        return text
+
+
+# ---------------------------------------------------------------------------
+# Process-wide settings of the mock provider
+# ---------------------------------------------------------------------------
+_mock_settings = MockLLMSettings()
+
+def get_mock_settings() -> MockLLMSettings:
+    return _mock_settings
+
+def configure_mock_llm(**settings_options) -> MockLLMSettings:
+    """
+    Replace the mock provider's settings, e.g.
+
+        configure_mock_llm(latency_seconds=("uniform", 0.05, 0.2), response_words=("choice", [20, 200]))
+
+    'settings_options' are MockLLMSettings arguments. Returns the new settings.
+    """
+    global _mock_settings
+    _mock_settings = MockLLMSettings(**settings_options)
+    logger.debug("configure_mock_llm: %s", settings_options)
+    return _mock_settings
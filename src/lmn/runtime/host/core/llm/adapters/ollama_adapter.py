@@ -1,16 +1,22 @@
 # src/lmn/runtime/core/llm/adapters/ollama_adapter.py
 
-from ollama import chat, ChatResponse
+from ollama import ChatResponse
+
+from lmn.runtime.host.core.llm.client_manager import get_client_manager
+
+# Returned (and never cached) when the Ollama call fails
+LLM_ERROR_TEXT = "LLM error."
 
 class OllamaAdapter:
     """
-    A thin wrapper around Ollama's Python API.
+    A thin wrapper around Ollama's Python API, sending every request
+    through the process-wide pooled client (see client_manager.py).
     """
 
     def __init__(self, output_list):
         self.output_list = output_list
 
-    def chat(self, model_name: str, messages: list[dict]) -> str:
+    def chat(self, model_name: str, messages: list[dict], options: dict = None, on_chunk=None) -> str:
         """
         Calls Ollama with the provided model name and a list of message dicts,
         returning the LLM's response as a string.
@@ -20,13 +26,27 @@ class OllamaAdapter:
                 {"role": "system", "content": "You are a helpful assistant."},
                 {"role": "user",   "content": "Why is the sky blue?"}
             ]
+
+        'options' are Ollama decoding options, e.g. {"temperature": 0, "seed": 42}.
+        With 'on_chunk' the response is streamed: on_chunk(text) is called for
+        every piece as it arrives, and the joined text is returned at the end.
         """
         try:
-            response: ChatResponse = chat(
-                model=model_name,
-                messages=messages
-            )
-            return response.message.content
+            if on_chunk is None:
+                response: ChatResponse = get_client_manager().chat(
+                    model_name,
+                    messages,
+                    options=options
+                )
+                return response.message.content
+
+            parts = []
+            for part in get_client_manager().chat(model_name, messages, options=options, stream=True):
+                chunk = part.message.content or ""
+                if chunk:
+                    parts.append(chunk)
+                    on_chunk(chunk)
+            return "".join(parts)
         except Exception as e:
             self.output_list.append(f"[LLM] Ollama call failed: {e}")
-            return "LLM error."
+            return LLM_ERROR_TEXT
@@ -0,0 +1,53 @@
+# file: src/lmn/runtime/host/core/llm/adapters/provider_registry.py
+
+import logging
+import os
+
+from lmn.runtime.host.core.llm.adapters.mock_adapter import MockAdapter
+from lmn.runtime.host.core.llm.adapters.ollama_adapter import OllamaAdapter
+
+logger = logging.getLogger(__name__)
+
+# Environment variable naming the provider used when none is given
+# (e.g. LMN_LLM_PROVIDER=mock for load tests)
+DEFAULT_PROVIDER_ENV = "LMN_LLM_PROVIDER"
+
+# provider name => adapter class; an adapter is created with the output list
+# and answers chat(model_name, messages, options, on_chunk) -> str
+_providers = {
+    "ollama": OllamaAdapter,
+    "mock": MockAdapter,
+}
+
+_default_provider = (os.environ.get(DEFAULT_PROVIDER_ENV) or "ollama").strip().lower()
+
+def register_provider(name: str, adapter_class) -> None:
+    """
+    Make 'adapter_class' available as LLMAdapter.chat(provider=name, ...).
+    """
+    _providers[name.strip().lower()] = adapter_class
+    logger.debug("register_provider: '%s' => %s", name, adapter_class.__name__)
+
+def get_provider(name: str):
+    """
+    The adapter class registered as 'name' (None if there is none).
+    """
+    return _providers.get((name or "").strip().lower())
+
+def provider_names() -> list[str]:
+    return sorted(_providers)
+
+def get_default_provider() -> str:
+    return _default_provider
+
+def configure_default_provider(name: str) -> str:
+    """
+    Use 'name' for the LLM calls of the host handlers (llm, ask_tools, ...).
+    """
+    global _default_provider
+    name = name.strip().lower()
+    if name not in _providers:
+        raise ValueError(f"Unknown LLM provider '{name}' (known: {', '.join(provider_names())})")
+    _default_provider = name
+    logger.debug("configure_default_provider: '%s'", name)
+    return _default_provider
@@ -0,0 +1,125 @@
+# file: src/lmn/runtime/host/core/llm/client_manager.py
+
+import logging
+import threading
+
+import httpx
+from ollama import Client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_SECONDS = 120.0
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5.0
+DEFAULT_KEEP_ALIVE = "30m"  # how long Ollama keeps the model loaded after a call
+DEFAULT_MAX_CONNECTIONS = 8
+
+class LLMClientManager:
+    """
+    One Ollama client per process instead of one per call:
+
+      - a single httpx connection pool ('max_connections' sockets, reused
+        across calls and threads)
+      - explicit timeouts
+      - 'keep_alive' sent with every request, so the model stays loaded
+        between calls
+      - warm_up(models) to load models before the first real prompt
+
+    'host' is the server URL (None => $OLLAMA_HOST or localhost:11434), so
+    tests and benchmarks can point it at a local stand-in server.
+    """
+
+    def __init__(self, host: str = None, timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+                 keep_alive=DEFAULT_KEEP_ALIVE, max_connections: int = DEFAULT_MAX_CONNECTIONS):
+        self.host = host
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.keep_alive = keep_alive
+        self.max_connections = max_connections
+
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> Client:
+        """
+        The pooled client, created on first use.
+        """
+        with self._lock:
+            if self._client is None:
+                self._client = Client(
+                    host=self.host,
+                    timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                    ),
+                )
+                logger.debug(
+                    "LLMClientManager: client for host=%s (timeout=%ss, pool=%d)",
+                    self.host or "<default>", self.timeout, self.max_connections
+                )
+            return self._client
+
+    def chat(self, model_name: str, messages: list[dict], options: dict = None, **kwargs):
+        """
+        client.chat with the manager's keep_alive; returns Ollama's ChatResponse
+        (or an iterator of them with stream=True).
+        """
+        return self.client.chat(
+            model=model_name,
+            messages=messages,
+            options=options,
+            keep_alive=self.keep_alive,
+            **kwargs
+        )
+
+    def warm_up(self, model_names, background: bool = True):
+        """
+        Load the given models (an empty generate request) so the first real
+        prompt does not pay the load time. Failures are only logged.
+        With background=True returns the started thread.
+        """
+        def load():
+            for model_name in model_names:
+                try:
+                    self.client.generate(model=model_name, prompt="", keep_alive=self.keep_alive)
+                    logger.debug("LLMClientManager: warmed up '%s'", model_name)
+                except Exception as e:
+                    logger.warning("LLMClientManager: warm-up of '%s' failed: %s", model_name, e)
+
+        if not background:
+            load()
+            return None
+        thread = threading.Thread(target=load, name="lmn-llm-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client._client.close()
+                self._client = None
+
+
+# ---------------------------------------------------------------------------
+# Process-wide manager shared by the host handlers and the chat CLI
+# ---------------------------------------------------------------------------
+_client_manager = LLMClientManager()
+
+def get_client_manager() -> LLMClientManager:
+    return _client_manager
+
+def configure_client_manager(**manager_options) -> LLMClientManager:
+    """
+    Replace the shared manager, e.g.
+
+        configure_client_manager(host="http://127.0.0.1:8765", timeout=10)
+
+    'manager_options' are LLMClientManager arguments. Returns the new manager.
+    """
+    global _client_manager
+    _client_manager.close()
+    _client_manager = LLMClientManager(**manager_options)
+    logger.debug("configure_client_manager: %s", manager_options)
+    return _client_manager
@@ -1,16 +1,26 @@
 # file: src/lmn/runtime/core/llm/handler.py
 
+import functools
 import logging
 from lmn.runtime.host.memory_utils import read_utf8_string
+from lmn.runtime.host.memory_utils_extra import store_string_with_malloc
 from lmn.runtime.host.core.llm.adapters.llm_adapter import LLMAdapter
+from lmn.runtime.host.core.llm.adapters.provider_registry import get_default_provider
+from lmn.runtime.host.call_prefetcher import get_prefetcher, wait_for
+from lmn.runtime.host.output_sink import append_streamed, stream_chunk
 
 logger = logging.getLogger(__name__)
 
+def _ask(output_list, prompt_str: str, model_str: str, on_chunk=None) -> str:
+    llm_adapter = LLMAdapter(output_list)
+    messages = [{"role": "user", "content": prompt_str}]
+    return llm_adapter.chat(get_default_provider(), model_str, messages, on_chunk=on_chunk)
+
 def llm_handler(def_info, store, memory_ref, output_list, *args) -> int:
     """
     A single, catch-all LLM handler that:
       - Expects exactly 2 i32 arguments: (prompt_ptr, model_ptr).
-      - Stores the response in WASM memory using a simple bump offset.
+      - Stores the response in WASM memory via store_string_with_malloc.
     """
 
     if not memory_ref or memory_ref[0] is None:
@@ -35,47 +45,83 @@ def llm_handler(def_info, store, memory_ref, output_list, *args) -> int:
         # 3) Read the prompt/model strings from WASM memory
         prompt_str = read_utf8_string(store, mem, prompt_ptr)
         model_str  = read_utf8_string(store, mem, model_ptr)
-        provider_str = "ollama"  # Hard-coded or read from def_info, etc.
-
-        logger.debug(f"[LLM] Called with prompt='{prompt_str}', model='{model_str}', provider='{provider_str}'")
-
-        # 4) Get a response from your LLM adapter
-        llm_adapter = LLMAdapter(output_list)
-        messages = [{"role": "user", "content": prompt_str}]
-        response_text = llm_adapter.chat(provider_str, model_str, messages)
-
-        # 5) Null-terminate the response and encode it
-        response_text += "\0"
-        encoded = response_text.encode("utf-8")
 
-        # 6) Use a simple bump-pointer offset (old approach).
-        #    If you prefer to call your WASM malloc, you'd do:
-        #       offset = wasm_malloc(len(encoded))
-        offset = getattr(llm_handler, "current_offset", 4096)
-        next_offset = offset + len(encoded)
+        logger.debug(f"[LLM] Called with prompt='{prompt_str}', model='{model_str}', provider='{get_default_provider()}'")
 
-        mem_data = mem.data_ptr(store)
-        mem_size = mem.data_len(store)
+        # 4) Get a response from your LLM adapter (or the request an
+        #    llm__prefetch call already started)
+        ask = functools.partial(_ask, output_list, prompt_str, model_str)
+        pending = get_prefetcher().take((func_name, prompt_str, model_str))
+        response_text = wait_for(pending, ask) if pending is not None else ask()
 
-        # 7) Bounds check
-        if next_offset > mem_size:
-            logger.debug("[LLM] <out-of-bounds for LLM response>")
+        # 5) Store the response in a malloc'd block (length header + text + NUL);
+        #    memory grows as needed, so long responses are never truncated.
+        offset = store_string_with_malloc(store, mem, output_list, response_text)
+        if offset == 0:
+            logger.debug("[LLM] <could not allocate LLM response>")
             output_list.append("<response out-of-bounds>")
             return 0
 
-        # 8) Write the response bytes into WASM memory
-        for i, byte_val in enumerate(encoded):
-            mem_data[offset + i] = byte_val
-
         logger.debug(f"[LLM] Response written at offset {offset}")
-        # Update the static offset
-        llm_handler.current_offset = next_offset
 
-        # 9) Return the pointer to that string
+        # 6) Return the pointer to that string
         return offset
 
     else:
         # If the function is not "llm", handle it
         logger.debug(f"[LLM Handler] Unrecognized LLM function '{func_name}'")
         output_list.append("<unrecognized LLM function>")
-        return 0
\ No newline at end of file
+        return 0
+
+
+def llm_prefetch_handler(def_info, store, memory_ref, output_list, *args) -> None:
+    """
+    'llm__prefetch' (same arguments as 'llm', no result): start the request
+    on the prefetcher's thread pool; the following llm() call with the same
+    prompt and model picks up the response (and the lines it output, in
+    place of the call). WASM memory is only read here, on the calling thread.
+    """
+    if not memory_ref or memory_ref[0] is None or len(args) != 2:
+        logger.debug(f"[LLM] prefetch ignored => args={args}")
+        return None
+
+    mem = memory_ref[0]
+    prompt_ptr, model_ptr = args
+    prompt_str = read_utf8_string(store, mem, prompt_ptr)
+    model_str  = read_utf8_string(store, mem, model_ptr)
+
+    get_prefetcher().submit(("llm", prompt_str, model_str), _ask, prompt_str, model_str, output_list=output_list)
+    return None
+
+
+def llm_print_handler(def_info, store, memory_ref, output_list, *args) -> int:
+    """
+    'llm_print' (emitted for `print llm(prompt, model)`): streams the response
+    to the output while it arrives instead of printing it once complete.
+    The full response is then stored in one malloc'd block, like llm();
+    returns its pointer.
+    """
+    if not memory_ref or memory_ref[0] is None or len(args) != 2:
+        logger.debug(f"[LLM] llm_print: invalid call => args={args}")
+        output_list.append("<llm argument mismatch>")
+        return 0
+
+    mem = memory_ref[0]
+    prompt_ptr, model_ptr = args
+    prompt_str = read_utf8_string(store, mem, prompt_ptr)
+    model_str  = read_utf8_string(store, mem, model_ptr)
+
+    # 1) Stream the chunks (a prefetched response is already complete => one chunk)
+    on_chunk = functools.partial(stream_chunk, output_list)
+    pending = get_prefetcher().take(("llm", prompt_str, model_str))
+    if pending is not None:
+        response_text = wait_for(pending, functools.partial(_ask, output_list, prompt_str, model_str))
+        on_chunk(response_text)
+    else:
+        response_text = _ask(output_list, prompt_str, model_str, on_chunk)
+    append_streamed(output_list, response_text)
+
+    # 2) Materialise the whole response once
+    offset = store_string_with_malloc(store, mem, output_list, response_text)
+    logger.debug(f"[LLM] llm_print: streamed {len(response_text)} chars, stored at {offset}")
+    return offset
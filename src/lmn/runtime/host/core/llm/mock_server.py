@@ -0,0 +1,181 @@
+# file: src/lmn/runtime/host/core/llm/mock_server.py
+
+import argparse
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from lmn.runtime.host.core.llm.adapters.mock_adapter import (
+    ECHO,
+    MockLLMSettings,
+    TEMPLATE,
+    get_mock_settings,
+    parse_distribution,
+)
+
+logger = logging.getLogger(__name__)
+
+CREATED_AT = "2024-01-01T00:00:00Z"
+
+class MockOllamaServer:
+    """
+    A local HTTP stand-in speaking (the parts LMN uses of) the Ollama API,
+    answering from MockLLMSettings instead of a model:
+
+      POST /api/chat       streamed (NDJSON) or not, like Ollama
+      POST /api/generate   model warm-up (an empty answer)
+      GET  /api/tags       the models seen so far
+
+    Point LMN at it with OLLAMA_HOST=<server.url> or
+    configure_client_manager(host=server.url). Counter: requests.
+    """
+
+    def __init__(self, settings: MockLLMSettings = None, host: str = "127.0.0.1", port: int = 0):
+        self.settings = settings
+        self.requests = 0
+        self.models = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockOllamaServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="lmn-mock-ollama", daemon=True)
+        self._thread.start()
+        logger.debug("MockOllamaServer: listening on %s", self.url)
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # -------------------------------------------------------------------------
+    # Requests
+    # -------------------------------------------------------------------------
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    with server._lock:
+                        models = [{"name": name, "model": name} for name in sorted(server.models)]
+                    self._send_json({"models": models})
+                else:
+                    self._send_text("Ollama is running")
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with server._lock:
+                    server.requests += 1
+                    server.models.add(body.get("model", ""))
+
+                if self.path == "/api/chat":
+                    server._chat(self, body)
+                elif self.path == "/api/generate":
+                    self._send_json({"model": body.get("model"), "created_at": CREATED_AT,
+                                     "response": "", "done": True})
+                else:
+                    self.send_error(404)
+
+            def _send_json(self, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_text(self, text):
+                data = text.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def _chat(self, handler, body):
+        settings = self.settings or get_mock_settings()
+        model_name = body.get("model", "")
+        text, latency = settings.respond(model_name, body.get("messages", []))
+
+        def message(content, done):
+            reply = {"model": model_name, "created_at": CREATED_AT,
+                     "message": {"role": "assistant", "content": content}, "done": done}
+            if done:
+                reply["done_reason"] = "stop"
+            return reply
+
+        # 1) Not streamed => one JSON object after the whole latency
+        if body.get("stream") is False:
+            time.sleep(latency)
+            handler._send_json(message(text, True))
+            return
+
+        # 2) Streamed => one JSON line per chunk, the latency spread over them
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/x-ndjson")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+        chunks = settings.chunks(text)
+        for chunk in chunks + [None]:
+            if chunk is not None:
+                time.sleep(latency / len(chunks))
+            line = json.dumps(message(chunk or "", chunk is None)).encode("utf-8") + b"\n"
+            handler.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            handler.wfile.flush()
+        handler.wfile.write(b"0\r\n\r\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A local stand-in for the Ollama chat API (no model needed).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--mode", choices=(ECHO, TEMPLATE), default=ECHO)
+    parser.add_argument("--template", default="Mock answer from {model}: {prompt}")
+    parser.add_argument("--latency", default="0", help='seconds per response, e.g. "0.1" or "uniform:0.05,0.2"')
+    parser.add_argument("--words", default=None, help='response length in words, e.g. "choice:20,200"')
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    settings = MockLLMSettings(
+        mode=args.mode,
+        template=args.template,
+        latency_seconds=parse_distribution(args.latency),
+        response_words=parse_distribution(args.words) if args.words else None,
+        seed=args.seed,
+    )
+    server = MockOllamaServer(settings, args.host, args.port)
+    print(f"Mock Ollama listening on {server.url} (OLLAMA_HOST={server.url})")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+if __name__ == "__main__":
+    main()
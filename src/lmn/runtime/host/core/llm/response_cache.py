@@ -0,0 +1,166 @@
+# file: src/lmn/runtime/host/core/llm/response_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+def make_cache_key(provider: str, model_name: str, messages: list[dict], options: dict = None) -> str:
+    """
+    Stable key for one chat request: provider, model, the full message list
+    (system context included) and the decoding options.
+    """
+    payload = json.dumps(
+        [(provider or "").strip().lower() or "ollama", model_name, messages, options or {}],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache of LLM responses:
+
+      1) an in-memory LRU of at most 'max_entries' responses
+      2) optionally, a sqlite file ('db_path') that survives the process,
+         e.g. across REPL sessions or repeated `run-wasm` invocations
+
+    Entries older than 'ttl_seconds' are treated as missing in both tiers.
+    A disk hit is promoted into memory. Thread-safe.
+
+    Counters: memory_hits, disk_hits, misses, bypasses, stores, evictions.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 db_path: str = None, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.clock = clock
+
+        # key => (response, stored_at); most recently used last
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = dict.fromkeys(
+            ("memory_hits", "disk_hits", "misses", "bypasses", "stores", "evictions"), 0
+        )
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(os.path.expanduser(db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._db.commit()
+            logger.debug("LLMResponseCache: on-disk store at %s", db_path)
+
+    def get(self, key: str):
+        """
+        The cached response for 'key', or None.
+        """
+        now = self.clock()
+        with self._lock:
+            # 1) Memory
+            entry = self._entries.get(key)
+            if entry is not None:
+                response, stored_at = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return response
+                del self._entries[key]
+
+            # 2) Disk
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT response, stored_at FROM llm_responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    response, stored_at = row
+                    if now - stored_at <= self.ttl_seconds:
+                        self._remember(key, response, stored_at)
+                        self.stats["disk_hits"] += 1
+                        return response
+                    self._db.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, response: str) -> None:
+        now = self.clock()
+        with self._lock:
+            self._remember(key, response, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, response, stored_at) VALUES (?, ?, ?)",
+                    (key, response, now),
+                )
+                self._db.commit()
+            self.stats["stores"] += 1
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.stats["bypasses"] += 1
+
+    def clear(self) -> None:
+        """
+        Drop every entry (both tiers); the counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_responses")
+                self._db.commit()
+
+    def hit_rate(self) -> float:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict:
+        return dict(self.stats, entries=len(self._entries), hit_rate=self.hit_rate())
+
+    def _remember(self, key: str, response: str, stored_at: float) -> None:
+        self._entries[key] = (response, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+
+# ---------------------------------------------------------------------------
+# Process-wide cache shared by every LLMAdapter
+# ---------------------------------------------------------------------------
+_response_cache = LLMResponseCache()
+
+def get_response_cache():
+    """
+    The shared cache, or None if caching was disabled.
+    """
+    return _response_cache
+
+def configure_response_cache(enabled: bool = True, **cache_options):
+    """
+    Replace the shared cache, e.g.
+
+        configure_response_cache(db_path="~/.lmn/llm_cache.sqlite", ttl_seconds=3600)
+        configure_response_cache(enabled=False)
+
+    'cache_options' are LLMResponseCache arguments. Returns the new cache.
+    """
+    global _response_cache
+    _response_cache = LLMResponseCache(**cache_options) if enabled else None
+    logger.debug("configure_response_cache: enabled=%s options=%s", enabled, cache_options)
+    return _response_cache
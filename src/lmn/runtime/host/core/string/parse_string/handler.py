@@ -2,12 +2,14 @@
 
 import logging
 
+from lmn.runtime.host.memory_utils import read_string_bytes
+
 logger = logging.getLogger(__name__)
 
 def parse_string_to_i32(def_info, store, memory_ref, output_list, *args) -> int:
     """
     A minimal "parse_string_to_i32" function that expects one param: the pointer to
-    a zero-terminated UTF-8 string in WASM memory. It then returns an integer
+    a UTF-8 string in WASM memory. It then returns an integer
     parsed from that text.
 
     If the text can't be parsed, we return 0 as a fallback.
@@ -33,25 +35,17 @@ def parse_string_to_i32(def_info, store, memory_ref, output_list, *args) -> int:
     pointer = args[0]
     logger.debug(f"[{func_name}] Parsing string at pointer={pointer}")
 
-    # 3) Access the raw bytes of WASM memory
-    mem_data = mem.data_ptr(store)
-    mem_size = mem.data_len(store)
-
-    # 4) Read bytes until we find a 0 byte (C-style string terminator) or run out of memory
-    byte_buffer = []
-    i = pointer
-    while i < mem_size:
-        b = mem_data[i]
-        if b == 0:
-            break
-        byte_buffer.append(b)
-        i += 1
+    # 3) Read the string (length header or NUL terminator, see memory_utils)
+    raw_bytes = read_string_bytes(store, mem, pointer)
+    if raw_bytes is None:
+        logger.debug(f"[{func_name}] Pointer {pointer} is out of bounds.")
+        return 0
 
-    # 5) Decode to Python string
-    text = bytes(byte_buffer).decode("utf-8", errors="replace").strip()
+    # 4) Decode to Python string
+    text = raw_bytes.decode("utf-8", errors="replace").strip()
     logger.debug(f"[{func_name}] Raw text => '{text}'")
 
-    # 6) Try to parse as integer
+    # 5) Try to parse as integer
     #    If your string is something like "what's 10+5?", you'll need more logic.
     try:
         val = int(text)
@@ -59,6 +53,6 @@ def parse_string_to_i32(def_info, store, memory_ref, output_list, *args) -> int:
         logger.debug(f"[{func_name}] Failed to parse '{text}' as integer. Returning 0.")
         val = 0
 
-    # 7) Return the integer result to WebAssembly
+    # 6) Return the integer result to WebAssembly
     logger.debug(f"[{func_name}] Returning integer={val}")
     return val
@@ -2,10 +2,10 @@
 
 import json
 import logging
-import requests
 import time
 
 from lmn.runtime.host.memory_utils_extra import store_string_with_malloc
+from lmn.runtime.host.core.tools.http_client import get_tools_http_client
 
 # logger
 logger = logging.getLogger(__name__)
@@ -26,12 +26,9 @@ def get_internet_time(def_info, store, memory_ref, output_list, *args) -> int:
 
     mem = memory_ref[0]
 
-    # The API endpoint
-    url = "http://worldtimeapi.org/api/timezone/Etc/UTC"
+    # The API endpoint (pooled + cached per second, see http_client.py)
     try:
-        resp = requests.get(url, timeout=5)
-        resp.raise_for_status()
-        data = resp.json()  # Python dict
+        data = get_tools_http_client().get_json("internet_time", "/api/timezone/Etc/UTC")  # Python dict
         # Convert to JSON text
         json_str = json.dumps(data, ensure_ascii=False)
 
@@ -83,16 +80,13 @@ def get_weather(def_info, store, memory_ref, output_list, *args) -> int:
         lat = float(args[0])
         lon = float(args[1])
 
-    url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&hourly=temperature_2m"
-    logger.debug(f"[{func_name}] => requesting {url}")
+    params = {"latitude": lat, "longitude": lon, "hourly": "temperature_2m"}
+    logger.debug(f"[{func_name}] => requesting forecast for {params}")
 
     try:
-        # 2) Fetch data
-        resp = requests.get(url, timeout=5)
-        resp.raise_for_status()
-
-        # 3) Convert the response to a Python dict
-        data = resp.json()   # parse JSON => dict
+        # 2) + 3) Fetch data (pooled; the same coordinates are answered from
+        #    the cache for a while) => Python dict
+        data = get_tools_http_client().get_json("weather", "/v1/forecast", params)
 
         # 4) (Optional) Tweak or add a new key
         data["fetched_at"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
@@ -125,13 +119,10 @@ def get_joke(def_info, store, memory_ref, output_list, *args) -> int:
 
     mem = memory_ref[0]
 
-    url = "https://icanhazdadjoke.com/"
     headers = {"Accept": "text/plain"}
 
     try:
-        resp = requests.get(url, headers=headers, timeout=5)
-        resp.raise_for_status()
-        joke_text = resp.text.strip()
+        joke_text = get_tools_http_client().get_text("joke", "/", headers=headers).strip()
         logger.debug(f"[{func_name}] => fetched joke: {joke_text[:50]}...")
 
         # Key fix: pass all four parameters
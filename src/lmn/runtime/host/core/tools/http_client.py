@@ -0,0 +1,220 @@
+# file: src/lmn/runtime/host/core/tools/http_client.py
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Where each tool's API lives; override them (e.g. with a local stand-in
+# server) through ToolsHttpClient(base_urls={...}).
+DEFAULT_BASE_URLS = {
+    "internet_time": "http://worldtimeapi.org",
+    "weather": "https://api.open-meteo.com",
+    "joke": "https://icanhazdadjoke.com",
+}
+
+# How long a response is served from the cache (0 => never cached: every
+# joke should be a new one).
+DEFAULT_TTL_SECONDS = {
+    "internet_time": 1.0,
+    "weather": 10 * 60.0,
+    "joke": 0.0,
+}
+
+# How long after its TTL a response may still be served while a fresh one is
+# fetched in the background (stale-while-revalidate).
+DEFAULT_STALE_SECONDS = {
+    "weather": 60 * 60.0,
+}
+
+# Tools whose answer depends on *when* they are asked: the cache key includes
+# the current time bucket (of TTL seconds), and stale answers are never served.
+TIME_BUCKETED_TOOLS = ("internet_time",)
+
+DEFAULT_TIMEOUT_SECONDS = 5.0
+DEFAULT_POOL_SIZE = 8
+DEFAULT_MAX_ENTRIES = 256
+
+class ToolsHttpClient:
+    """
+    The HTTP layer of the tool builtins (get_weather, get_joke, ...):
+
+      - one requests.Session with a connection pool, shared by all tools
+      - a per-tool TTL cache of response texts, keyed by path + query
+      - the clock tool is cached per time bucket
+      - stale-while-revalidate: shortly after the TTL the old response is
+        returned at once and refreshed in a background thread
+
+    Counters: hits, stale_hits, misses, refreshes, errors. Thread-safe.
+    """
+
+    def __init__(self, base_urls: dict = None, ttl_seconds: dict = None, stale_seconds: dict = None,
+                 timeout: float = DEFAULT_TIMEOUT_SECONDS, pool_size: int = DEFAULT_POOL_SIZE,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, clock=time.time):
+        self.base_urls = dict(DEFAULT_BASE_URLS, **(base_urls or {}))
+        self.ttl_seconds = dict(DEFAULT_TTL_SECONDS, **(ttl_seconds or {}))
+        self.stale_seconds = dict(DEFAULT_STALE_SECONDS, **(stale_seconds or {}))
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.max_entries = max_entries
+        self.clock = clock
+
+        self._session = None
+        # key => (text, stored_at); most recently used last
+        self._entries = OrderedDict()
+        self._refreshing = {}   # key => refresh thread
+        self._lock = threading.Lock()
+        self.stats = dict.fromkeys(("hits", "stale_hits", "misses", "refreshes", "errors"), 0)
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        The pooled session, created on first use.
+        """
+        with self._lock:
+            if self._session is None:
+                self._session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                self._session.mount("http://", adapter)
+                self._session.mount("https://", adapter)
+            return self._session
+
+    def get_text(self, tool: str, path: str, params: dict = None, headers: dict = None) -> str:
+        """
+        GET <base url of 'tool'><path>?<params>; returns the response text
+        (possibly cached). Raises on HTTP / connection errors.
+        """
+        ttl = self.ttl_seconds.get(tool, 0.0)
+        if ttl <= 0:
+            return self._fetch(tool, path, params, headers)
+
+        now = self.clock()
+        key = self._key(tool, path, params, now, ttl)
+
+        # 1) Fresh or (still) stale enough?
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                text, stored_at = entry
+                age = now - stored_at
+                if age < ttl:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return text
+                if tool not in TIME_BUCKETED_TOOLS and age < ttl + self.stale_seconds.get(tool, 0.0):
+                    self._entries.move_to_end(key)
+                    self.stats["stale_hits"] += 1
+                    self._start_refresh(key, tool, path, params, headers)
+                    return text
+            self.stats["misses"] += 1
+
+        # 2) Fetch + remember
+        text = self._fetch(tool, path, params, headers)
+        self._store(key, text)
+        return text
+
+    def get_json(self, tool: str, path: str, params: dict = None, headers: dict = None):
+        """
+        get_text(...) parsed as JSON (a new object on every call, so callers
+        may modify it).
+        """
+        return json.loads(self.get_text(tool, path, params, headers))
+
+    def wait_for_refreshes(self, timeout: float = None) -> None:
+        """
+        Join the background refreshes currently running (tests, shutdown).
+        """
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+    def _key(self, tool, path, params, now, ttl):
+        key = (tool, path, tuple(sorted((params or {}).items())))
+        if tool in TIME_BUCKETED_TOOLS:
+            key += (int(now // ttl),)
+        return key
+
+    def _fetch(self, tool, path, params, headers) -> str:
+        url = self.base_urls[tool].rstrip("/") + path
+        try:
+            resp = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            resp.raise_for_status()
+        except Exception:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        logger.debug("ToolsHttpClient: fetched %s (%d bytes)", resp.url, len(resp.content))
+        return resp.text
+
+    def _store(self, key, text):
+        with self._lock:
+            self._entries[key] = (text, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _start_refresh(self, key, tool, path, params, headers):
+        """
+        Fetch 'key' again in the background (at most one refresh per key);
+        called with self._lock held.
+        """
+        if key in self._refreshing:
+            return
+
+        def refresh():
+            try:
+                self._store(key, self._fetch(tool, path, params, headers))
+                with self._lock:
+                    self.stats["refreshes"] += 1
+            except Exception as e:
+                logger.debug("ToolsHttpClient: refresh of %s failed: %s", key, e)
+            finally:
+                with self._lock:
+                    self._refreshing.pop(key, None)
+
+        thread = threading.Thread(target=refresh, name="lmn-tools-refresh", daemon=True)
+        self._refreshing[key] = thread
+        thread.start()
+
+
+# ---------------------------------------------------------------------------
+# Process-wide client shared by the tool handlers
+# ---------------------------------------------------------------------------
+_tools_http_client = ToolsHttpClient()
+
+def get_tools_http_client() -> ToolsHttpClient:
+    return _tools_http_client
+
+def configure_tools_http_client(**client_options) -> ToolsHttpClient:
+    """
+    Replace the shared client, e.g.
+
+        configure_tools_http_client(base_urls={"weather": "http://127.0.0.1:8765"})
+
+    'client_options' are ToolsHttpClient arguments. Returns the new client.
+    """
+    global _tools_http_client
+    _tools_http_client.close()
+    _tools_http_client = ToolsHttpClient(**client_options)
+    logger.debug("configure_tools_http_client: %s", client_options)
+    return _tools_http_client
@@ -0,0 +1,214 @@
+# file: src/lmn/runtime/host/core/tools/tool_router.py
+
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+
+from lmn.builtins import BUILTINS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_DECISIONS = 1024
+
+_NUMBER = r"[-+]?\d+(?:\.\d+)?"
+
+class ToolRouter:
+    """
+    Picks the tool for a call_tools command without asking the LLM when it can:
+
+      1) a cached decision for the same (normalised) command
+      2) the keyword / regex index over the tool catalogue: builtins with a
+         "router" entry in tools.json, e.g.
+
+             "router": {"keywords": ["weather", "forecast"], "default_args": [40.7128, -74.006]}
+
+         An explicit call ("get_weather(52.5, 13.4)") always wins; otherwise
+         the tool whose name / keywords match most often, if no other tool
+         matches as often.
+      3) otherwise the caller asks the LLM with function_calling_prompt() and
+         hands the answer to route_llm_response().
+
+    A decision is (tool name, argument list). Numbers in the command become
+    the arguments of tools with numeric parameters (else their default_args).
+    Counters: cached, indexed, llm, unrouted. Thread-safe.
+    """
+
+    def __init__(self, builtins: dict = None, max_decisions: int = DEFAULT_MAX_DECISIONS):
+        self.max_decisions = max_decisions
+        self.tools = {}      # tool name => builtin definition
+        self._patterns = {}  # tool name => [compiled keyword regexes]
+        self._decisions = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = dict.fromkeys(("cached", "indexed", "llm", "unrouted"), 0)
+        self._build_index(BUILTINS if builtins is None else builtins)
+
+    # -------------------------------------------------------------------------
+    # Routing
+    # -------------------------------------------------------------------------
+    def route(self, command: str):
+        """
+        The (tool, args) for 'command' from the cache or the index; None if
+        the LLM has to decide.
+        """
+        key = self._key(command)
+        with self._lock:
+            decision = self._decisions.get(key)
+            if decision is not None:
+                self._decisions.move_to_end(key)
+                self.stats["cached"] += 1
+                return decision
+
+        decision = self.match(command)
+        if decision is not None:
+            self._remember(key, decision)
+            with self._lock:
+                self.stats["indexed"] += 1
+            logger.debug("ToolRouter: '%s' => %s (index)", command, decision)
+        return decision
+
+    def match(self, text: str):
+        """
+        Index lookup only (no cache, no counters): (tool, args) or None.
+        """
+        # 1) An explicit call
+        for name in self.tools:
+            call = re.search(rf"\b{re.escape(name)}\s*\(([^)]*)\)", text)
+            if call:
+                return name, self._arguments(name, re.findall(_NUMBER, call.group(1)))
+
+        # 2) The one tool matching best
+        scores = {
+            name: sum(len(pattern.findall(text)) for pattern in patterns)
+            for name, patterns in self._patterns.items()
+        }
+        best = max(scores.values(), default=0)
+        winners = [name for name, score in scores.items() if score == best]
+        if best == 0 or len(winners) != 1:
+            return None
+        return winners[0], self._arguments(winners[0], re.findall(_NUMBER, text))
+
+    def function_calling_prompt(self) -> str:
+        """
+        System prompt asking the LLM for a structured tool choice (a JSON object).
+        """
+        lines = ["Pick the tool that executes the user's command. Tools:"]
+        for name, info in self.tools.items():
+            params = ", ".join(f"{p['name']}: {p['type']}" for p in info["typechecker"].get("params", []))
+            lines.append(f"- {name}({params}): {info.get('description') or ''}")
+        lines.append(
+            'Answer with one JSON object and nothing else: {"tool": "<tool name>", '
+            '"arguments": [<values in parameter order>]}, or {"tool": null, "reply": "<short answer>"} '
+            "if no tool fits."
+        )
+        return "\n".join(lines)
+
+    def route_llm_response(self, command: str, response_text: str):
+        """
+        Read the LLM's answer to function_calling_prompt(): returns
+        (decision or None, reply text). Answers that are not the requested
+        JSON are searched with the index instead.
+        """
+        choice = _parse_json_object(response_text)
+        decision, reply = None, response_text
+        if choice is not None:
+            reply = str(choice.get("reply") or "")
+            name = choice.get("tool")
+            if name in self.tools:
+                decision = name, self._arguments(name, choice.get("arguments"))
+        else:
+            decision = self.match(response_text)
+
+        with self._lock:
+            self.stats["llm" if decision is not None else "unrouted"] += 1
+        if decision is not None:
+            self._remember(self._key(command), decision)
+        logger.debug("ToolRouter: '%s' => %s (llm)", command, decision)
+        return decision, reply
+
+    def clear(self) -> None:
+        with self._lock:
+            self._decisions.clear()
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+    def _build_index(self, builtins):
+        for name, info in builtins.items():
+            router = info.get("router")
+            if not router:
+                continue
+            phrases = [name, name.removeprefix("get_")] + list(router.get("keywords", []))
+            self.tools[name] = info
+            regexes = (
+                r"\b" + r"[\s_-]+".join(map(re.escape, re.split(r"[\s_]+", phrase))) + r"\b"
+                for phrase in phrases
+            )
+            self._patterns[name] = [re.compile(regex, re.I) for regex in dict.fromkeys(regexes)]
+        logger.debug("ToolRouter: indexed %s", list(self.tools))
+
+    def _arguments(self, name, values) -> list:
+        """
+        The argument list for tool 'name': the given values (a list, or a
+        dict by parameter name) if they fill its parameters, else its
+        default_args.
+        """
+        info = self.tools[name]
+        params = info["typechecker"].get("params", [])
+        if not params:
+            return []
+        if isinstance(values, dict):
+            values = [values.get(p["name"]) for p in params]
+        try:
+            values = [float(v) if p["type"] in ("double", "float") else int(v)
+                      for p, v in zip(params, values or [])]
+        except (TypeError, ValueError):
+            values = []
+        if len(values) == len(params):
+            return values
+        return list(info["router"].get("default_args", []))
+
+    def _key(self, command):
+        return " ".join(command.lower().split())
+
+    def _remember(self, key, decision):
+        with self._lock:
+            self._decisions[key] = decision
+            self._decisions.move_to_end(key)
+            while len(self._decisions) > self.max_decisions:
+                self._decisions.popitem(last=False)
+
+
+def _parse_json_object(text: str):
+    """
+    The first {...} in 'text' as a dict (LLMs like to wrap JSON in prose or
+    code fences); None if there is none.
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        return None
+    try:
+        value = json.loads(text[start:end + 1])
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+# ---------------------------------------------------------------------------
+# Process-wide router shared by the call_tools handler
+# ---------------------------------------------------------------------------
+_tool_router = ToolRouter()
+
+def get_tool_router() -> ToolRouter:
+    return _tool_router
+
+def configure_tool_router(**router_options) -> ToolRouter:
+    """
+    Replace the shared router (and its cached decisions), e.g.
+    configure_tool_router(max_decisions=4096).
+    """
+    global _tool_router
+    _tool_router = ToolRouter(**router_options)
+    logger.debug("configure_tool_router: %s", router_options)
+    return _tool_router
@@ -0,0 +1,106 @@
+# file: src/lmn/runtime/host/host_call_trace.py
+
+import gzip
+import json
+import logging
+import os
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+class ReplayMissError(LookupError):
+    """
+    A host call the trace has no (more) answers for.
+    """
+
+
+class HostCallTrace:
+    """
+    A trace file of host calls (builtins marked "record": true - llm, the
+    tools, the clock), written in RECORD mode and served in REPLAY mode.
+
+    One compact JSON object per line (gzip'ed if the path ends in .gz):
+
+        {"f": "llm", "a": ["Why?", "llama3.2"], "r": "Because.", "o": []}
+
+    'a' are the call's arguments with strings read from WASM memory, 'r' the
+    result (the returned string's text for string/json builtins, else the
+    number) and 'o' whatever the call appended to the output.
+
+    Replay answers calls by (function, arguments); repeated calls get the
+    recorded answers in order (the last one again once they run out, so
+    benchmarks can replay a trace over and over). A call the trace does
+    not know raises ReplayMissError instead of going to the network.
+    """
+
+    def __init__(self, path: str, mode: str = REPLAY):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown trace mode '{mode}' (expected '{RECORD}' or '{REPLAY}')")
+        self.path = os.path.expanduser(path)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._file = None
+        self._answers = {}   # (function, arguments) => deque of entries
+        self.stats = dict.fromkeys(("recorded", "replayed"), 0)
+
+        if mode == RECORD:
+            self._file = self._open("wt")
+        else:
+            self._load()
+
+    # -------------------------------------------------------------------------
+    # Record
+    # -------------------------------------------------------------------------
+    def record(self, func_name: str, args: list, result, output: list) -> None:
+        entry = {"f": func_name, "a": list(args), "r": result, "o": list(output)}
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.stats["recorded"] += 1
+
+    # -------------------------------------------------------------------------
+    # Replay
+    # -------------------------------------------------------------------------
+    def replay(self, func_name: str, args: list) -> dict:
+        """
+        The next recorded entry for this call: {"r": result, "o": output}.
+        """
+        key = self._key(func_name, args)
+        with self._lock:
+            answers = self._answers.get(key)
+            if not answers:
+                raise ReplayMissError(f"No recorded result for {func_name}{tuple(args)} in '{self.path}'")
+            entry = answers.popleft() if len(answers) > 1 else answers[0]
+            self.stats["replayed"] += 1
+        return entry
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+    def _open(self, mode):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode, encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def _load(self):
+        with self._open("rt") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._answers.setdefault(self._key(entry["f"], entry["a"]), deque()).append(entry)
+        logger.debug("HostCallTrace: loaded %d call(s) from '%s'", sum(map(len, self._answers.values())), self.path)
+
+    def _key(self, func_name, args):
+        return json.dumps([func_name, list(args)], ensure_ascii=False)
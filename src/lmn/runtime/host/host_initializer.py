@@ -12,8 +12,9 @@ def initialize_host_functions(
     linker: wasmtime.Linker,
     store: wasmtime.Store,
     output_list: list,
-    memory_ref=None
+    memory_ref=None,
+    trace=None
 ):
     logger.debug("Initializing host functions via UniversalHostLoader.")
-    UniversalHostLoader(linker, store, output_list, memory_ref)
+    UniversalHostLoader(linker, store, output_list, memory_ref, trace=trace)
     logger.debug("All host functions initialized.")
@@ -2,30 +2,73 @@
 
 import struct
 
-def read_utf8_string(store, memory, offset, max_len=65535):
+from lmn.compiler.emitter.wasm.string_layout import (
+    LAYOUT_MARKER, LAYOUT_MARKER_OFFSET, LENGTH_HEADER, LENGTH_HEADER_SIZE
+)
+
+# bytes fetched per step while looking for a NUL terminator
+NUL_SCAN_CHUNK = 4096
+
+def has_length_prefixed_strings(store, memory) -> bool:
     """
-    Reads a UTF-8 string from 'memory' starting at 'offset',
-    stopping at a null byte or after max_len bytes, whichever comes first.
-    Returns the decoded Python string.
+    True if the module was compiled with the "length" string layout
+    (it stores LAYOUT_MARKER at LAYOUT_MARKER_OFFSET).
+    """
+    end = LAYOUT_MARKER_OFFSET + len(LAYOUT_MARKER)
+    if memory.data_len(store) < end:
+        return False
+    return memory.read(store, LAYOUT_MARKER_OFFSET, end) == LAYOUT_MARKER
+
 
-    Increase 'max_len' if you need to read very large strings.
-    If you remove it, be sure there's a null terminator or you might scan
-    all of memory.
+def read_string_bytes(store, memory, offset, max_len=None):
     """
-    mem_data = memory.data_ptr(store)
-    mem_size = memory.data_len(store)
+    Returns the raw bytes of the string at 'offset', or None if 'offset' is
+    outside memory.
 
+    With length-prefixed strings the length header (offset - 4) is read and
+    the text is fetched in one copy; the header is only trusted if a NUL
+    follows the text. Otherwise the terminator is searched chunk by chunk.
+    'max_len' optionally caps the number of bytes returned.
+    """
+    mem_size = memory.data_len(store)
     if offset < 0 or offset >= mem_size:
-        return f"<invalid pointer {offset}>"
-
+        return None
+
+    # 1) O(1) length from the header
+    if offset >= LENGTH_HEADER_SIZE and has_length_prefixed_strings(store, memory):
+        header = memory.read(store, offset - LENGTH_HEADER_SIZE, offset)
+        length = LENGTH_HEADER.unpack(header)[0]
+        end = offset + length
+        if end < mem_size and memory.read(store, end, end + 1) == b"\0":
+            if max_len is not None:
+                end = min(end, offset + max_len)
+            return bytes(memory.read(store, offset, end))
+
+    # 2) NUL-terminated: scan in bulk chunks
+    limit = mem_size if max_len is None else min(mem_size, offset + max_len)
     raw_bytes = bytearray()
-    end = min(offset + max_len, mem_size)
-    for i in range(offset, end):
-        b = mem_data[i]
-        if b == 0:
-            # Stop at null terminator
+    start = offset
+    while start < limit:
+        chunk = memory.read(store, start, min(start + NUL_SCAN_CHUNK, limit))
+        nul = chunk.find(0)
+        if nul != -1:
+            raw_bytes += chunk[:nul]
             break
-        raw_bytes.append(b)
+        raw_bytes += chunk
+        start += len(chunk)
+    return bytes(raw_bytes)
+
+
+def read_utf8_string(store, memory, offset, max_len=None):
+    """
+    Reads a UTF-8 string from 'memory' starting at 'offset' (see
+    read_string_bytes: length header or NUL terminator, no size cap
+    unless 'max_len' is given).
+    Returns the decoded Python string.
+    """
+    raw_bytes = read_string_bytes(store, memory, offset, max_len)
+    if raw_bytes is None:
+        return f"<invalid pointer {offset}>"
 
     return raw_bytes.decode("utf-8", errors="replace")
 
@@ -149,7 +192,7 @@ def parse_i32_string_array(store, memory, offset):
       [ pointer1 : i32 ]
       [ pointer2 : i32 ]
       ...
-    Each pointer references a null-terminated UTF-8 string.
+    Each pointer references a UTF-8 string (see read_utf8_string).
     """
     mem_data = memory.data_ptr(store)
     mem_size = memory.data_len(store)
@@ -1,18 +1,22 @@
 # file: src/lmn/runtime/host/memory_utils_extra.py
 
 import logging
+from lmn.compiler.emitter.wasm.string_layout import LENGTH_HEADER_SIZE, LENGTH_PREFIXED, encode_string
 from lmn.runtime.host.core.malloc.call_malloc import call_malloc
 
 logger = logging.getLogger(__name__)
 
 def store_string_with_malloc(store, memory, output_list, text: str) -> int:
     """
-    1) Calls call_malloc(...) to allocate len(text)+1 bytes.
-    2) Writes 'text\\0' into that block.
-    3) Returns the pointer or 0 on failure.
+    1) Calls call_malloc(...) to allocate <length:u32> + text + '\\0'.
+    2) Writes the block in one copy.
+    3) Returns the string pointer (just past the length) or 0 on failure.
+
+    The block is valid in both string layouts: NUL-terminated readers
+    simply never look at the length in front of the pointer.
     """
-    # 1) Encode with a null terminator
-    encoded = text.encode("utf-8", errors="replace") + b"\0"
+    # 1) Encode with a length header and a null terminator
+    encoded = encode_string(text, LENGTH_PREFIXED)
     size_needed = len(encoded)
 
     # 2) Allocate
@@ -21,7 +25,6 @@ def store_string_with_malloc(store, memory, output_list, text: str) -> int:
         return 0  # out of memory / grow failed
 
     # 3) Ensure the allocated region is in bounds
-    mem_data = memory.data_ptr(store)
     mem_size = memory.data_len(store)
     if ptr + size_needed > mem_size:
         logger.debug(
@@ -31,7 +34,6 @@ def store_string_with_malloc(store, memory, output_list, text: str) -> int:
         return 0
 
     # 4) Write
-    for i, b in enumerate(encoded):
-        mem_data[ptr + i] = b
+    memory.write(store, encoded, ptr)
 
-    return ptr
+    return ptr + LENGTH_HEADER_SIZE
@@ -0,0 +1,57 @@
+# file: src/lmn/runtime/host/output_sink.py
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+class OutputSink(list):
+    """
+    The environment's output_lines, which also pass every piece of text to
+    'on_text' as soon as it is produced, so a REPL can show output while the
+    program is still running.
+
+    Handlers keep appending whole items as before. Streamed text (an LLM
+    response arriving in chunks) goes through stream_chunk() while it arrives
+    and is added as one item with append_streamed() at the end, so the list
+    ends up exactly as without streaming.
+    """
+
+    def __init__(self, on_text=None):
+        super().__init__()
+        self.on_text = on_text
+
+    def append(self, text):
+        super().append(text)
+        self._emit(text)
+
+    def write_chunk(self, chunk: str) -> None:
+        self._emit(chunk)
+
+    def append_streamed(self, text) -> None:
+        super().append(text)
+
+    def _emit(self, text):
+        if self.on_text is not None and text:
+            try:
+                self.on_text(text)
+            except Exception as e:
+                logger.debug("OutputSink: on_text failed: %s", e)
+
+
+def stream_chunk(output_list, chunk: str) -> None:
+    """
+    Show 'chunk' right away if output_list is an OutputSink (plain lists
+    only get the final text).
+    """
+    if isinstance(output_list, OutputSink):
+        output_list.write_chunk(chunk)
+
+
+def append_streamed(output_list, text: str) -> None:
+    """
+    Record text whose chunks were already passed to stream_chunk().
+    """
+    if isinstance(output_list, OutputSink):
+        output_list.append_streamed(text)
+    else:
+        output_list.append(text)
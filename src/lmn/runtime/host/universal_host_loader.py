@@ -3,7 +3,10 @@
 import wasmtime
 import importlib
 import logging
-from lmn.builtins import BUILTINS  # The merged dictionary from lmn/builtins/__init__.py
+from lmn.builtins import BUILTINS, PREFETCH_SUFFIX  # The merged dictionary from lmn/builtins/__init__.py
+from lmn.runtime.host.host_call_trace import REPLAY
+from lmn.runtime.host.memory_utils import read_utf8_string
+from lmn.runtime.host.memory_utils_extra import store_string_with_malloc
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +14,10 @@ class UniversalHostLoader:
     """
     A single loader that takes all definitions from `lmn.builtins.BUILTINS`
     and registers them in Wasmtime.
+
+    With a HostCallTrace ('trace'), calls to builtins marked "record": true
+    are logged to the trace file (record mode) or answered from it without
+    running their handler (replay mode; prefetches become no-ops).
     """
 
     def __init__(
@@ -18,12 +25,14 @@ class UniversalHostLoader:
         linker: wasmtime.Linker,
         store: wasmtime.Store,
         output_list: list,
-        memory_ref=None
+        memory_ref=None,
+        trace=None
     ):
         self.linker = linker
         self.store = store
         self.output_list = output_list
         self.memory_ref = memory_ref
+        self.trace = trace
 
         # We'll store function definitions in self.func_defs:
         #  { "funcName": { "name": "...", "namespace": "...", "signature": {...}, "handler": "...", ... }, ... }
@@ -45,6 +54,10 @@ class UniversalHostLoader:
             return
 
         for func_name, def_info in self.func_defs.items():
+            # inline builtins are compiled into the module, not imported
+            if def_info.get("inline"):
+                continue
+
             name = def_info["name"]
             namespace = def_info.get("namespace", "env")  # fallback to "env"
             signature = def_info["signature"]
@@ -106,9 +119,56 @@ class UniversalHostLoader:
                 f"Module '{module_path}' has no attribute '{func_name_in_module}'"
             )
 
+        # Record / replay network-bound calls (see host_call_trace.py)
+        if self.trace is not None and self.memory_ref and self.memory_ref[0] is not None:
+            if def_info.get("record"):
+                return self._traced_call(def_info, handler_fn, args)
+            if self.trace.mode == REPLAY and def_info.get("prefetch_of"):
+                return None  # nothing to start: the call itself is replayed
+
         # Call the handler with (def_info, store, memory_ref, output_list, *args)
         return handler_fn(def_info, self.store, self.memory_ref, self.output_list, *args)
 
+    def _traced_call(self, def_info: dict, handler_fn, args):
+        """
+        Record mode: run the handler, then log arguments, result and output.
+        Replay mode: answer from the trace (string results are stored in
+        memory again, the recorded output is appended).
+        """
+        name = def_info["name"]
+        mem = self.memory_ref[0]
+        call_args = self._trace_arguments(def_info, mem, args)
+        returns_string = (def_info.get("typechecker") or {}).get("return_type") in ("string", "json")
+
+        if self.trace.mode == REPLAY:
+            entry = self.trace.replay(name, call_args)
+            for line in entry["o"]:
+                self.output_list.append(line)
+            result = entry["r"]
+            if returns_string:
+                return 0 if result is None else store_string_with_malloc(self.store, mem, self.output_list, result)
+            return result
+
+        output_before = len(self.output_list)
+        result = handler_fn(def_info, self.store, self.memory_ref, self.output_list, *args)
+        recorded = result
+        if returns_string:
+            recorded = read_utf8_string(self.store, mem, result) if result else None
+        self.trace.record(name, call_args, recorded, self.output_list[output_before:])
+        return result
+
+    def _trace_arguments(self, def_info: dict, mem, args) -> list:
+        """
+        The call's arguments as recorded: string parameters by their text
+        (pointers differ from run to run), everything else as is.
+        """
+        params = (def_info.get("typechecker") or {}).get("params", [])
+        values = []
+        for index, value in enumerate(args):
+            param_type = params[index].get("type") if index < len(params) else None
+            values.append(read_utf8_string(self.store, mem, value) if param_type == "string" else value)
+        return values
+
     def _merge_builtins(self, builtins_dict: dict):
         """
         Convert the loaded BUILTINS dictionary into `self.func_defs` shape.
@@ -124,6 +184,20 @@ class UniversalHostLoader:
             # Store it in self.func_defs
             self.func_defs[fn_name] = fn_info
 
+            # '<name>__prefetch': same parameters, no result, its own handler
+            if fn_info.get("prefetch_handler"):
+                prefetch_name = f"{fn_name}{PREFETCH_SUFFIX}"
+                self.func_defs[prefetch_name] = {
+                    "name": prefetch_name,
+                    "namespace": fn_info.get("namespace", "env"),
+                    "signature": {
+                        "parameters": fn_info["signature"].get("parameters", []),
+                        "results": [],
+                    },
+                    "handler": fn_info["prefetch_handler"],
+                    "prefetch_of": fn_name,
+                }
+
     def _map_json_type_to_wasmtime(self, t: str) -> wasmtime.ValType:
         """
         Convert JSON string types ('i32', 'i64', 'f32', 'f64') to wasmtime.ValType.
@@ -0,0 +1,88 @@
+# file: lmn/runtime/runtime_profile.py
+
+import logging
+
+from lmn.compiler.emitter.wasm.memo_table import MEMO_COUNTERS, MEMO_EXPORT_PREFIX
+from lmn.runtime.host.core.llm.response_cache import get_response_cache
+
+logger = logging.getLogger(__name__)
+
+class RuntimeProfile:
+    """
+    Counters read back from a module instance after it ran - the runtime
+    counterpart of CompileProfile.
+
+    Currently:
+      - per memoised function, the hits / misses / evictions of its memo
+        table (exported as __memo_<fn>_<counter> globals)
+      - the counters of the (process-wide) LLM response cache
+    e.g.
+
+        profile = RuntimeProfile()
+        run_wasm(code, profile=profile)
+        profile.memo_hit_rate("fib")   # => 0.49...
+    """
+
+    def __init__(self):
+        # function name => {"hits": n, "misses": n, "evictions": n}
+        self.memo = {}
+        # LLMResponseCache.to_dict() (empty if caching is disabled)
+        self.llm_cache = {}
+
+    def collect(self, store, exports) -> None:
+        """
+        Read every memo counter exported by an instance ('exports' is
+        instance.exports(store)).
+        """
+        for export_name in exports.keys():
+            if not export_name.startswith(MEMO_EXPORT_PREFIX):
+                continue
+            fn_and_counter = export_name[len(MEMO_EXPORT_PREFIX):]
+            for counter in MEMO_COUNTERS:
+                suffix = f"_{counter}"
+                if fn_and_counter.endswith(suffix):
+                    fn_name = fn_and_counter[:-len(suffix)]
+                    value = exports[export_name].value(store)
+                    self.memo.setdefault(fn_name, dict.fromkeys(MEMO_COUNTERS, 0))[counter] = value
+                    break
+
+        cache = get_response_cache()
+        self.llm_cache = cache.to_dict() if cache is not None else {}
+
+        logger.debug("RuntimeProfile: memo counters => %s, llm cache => %s", self.memo, self.llm_cache)
+
+    def memo_hit_rate(self, fn_name: str) -> float:
+        """
+        hits / (hits + misses) of a memoised function (0.0 before any call).
+        """
+        stats = self.memo.get(fn_name, {})
+        calls = stats.get("hits", 0) + stats.get("misses", 0)
+        return stats.get("hits", 0) / calls if calls else 0.0
+
+    def llm_cache_lookups(self) -> int:
+        return sum(self.llm_cache.get(k, 0) for k in ("memory_hits", "disk_hits", "misses"))
+
+    def to_dict(self) -> dict:
+        return {
+            "memo": {
+                fn_name: dict(stats, hit_rate=self.memo_hit_rate(fn_name))
+                for fn_name, stats in self.memo.items()
+            },
+            "llm_cache": dict(self.llm_cache),
+        }
+
+    def format_report(self) -> str:
+        lines = ["=== Runtime profile ==="]
+        for fn_name, stats in self.memo.items():
+            lines.append(
+                f"  memo {fn_name:<20} hit rate {self.memo_hit_rate(fn_name) * 100:6.2f}%  "
+                f"(hits={stats['hits']}, misses={stats['misses']}, evictions={stats['evictions']})"
+            )
+        if self.llm_cache_lookups():
+            stats = self.llm_cache
+            lines.append(
+                f"  llm cache{'':<16} hit rate {stats['hit_rate'] * 100:6.2f}%  "
+                f"(memory={stats['memory_hits']}, disk={stats['disk_hits']}, misses={stats['misses']}, "
+                f"bypasses={stats['bypasses']})"
+            )
+        return "\n".join(lines)
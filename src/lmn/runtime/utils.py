@@ -38,3 +38,38 @@ def extract_lmn_code(text: str) -> list[str]:
             unique_blocks.append(block)
 
     return unique_blocks
+
+
+class LmnBlockScanner:
+    """
+    Finds LMN code blocks in a reply while it streams in: feed() each chunk
+    and get the ```lmn blocks whose closing fence just arrived; finish()
+    returns whatever else extract_lmn_code finds in the whole text (e.g. the
+    single-backtick form). Every block is returned once, in reply order.
+    """
+
+    _pattern_triple = re.compile(r"```lmn\s+(.*?)```", re.DOTALL)
+
+    def __init__(self):
+        self.text = ""
+        self._scan_from = 0
+        self._seen = set()
+
+    def feed(self, chunk: str) -> list[str]:
+        self.text += chunk
+        blocks = []
+        for match in self._pattern_triple.finditer(self.text, self._scan_from):
+            self._scan_from = match.end()
+            blocks += self._new([match.group(1)])
+        return blocks
+
+    def finish(self) -> list[str]:
+        return self._new(extract_lmn_code(self.text))
+
+    def _new(self, blocks):
+        fresh = []
+        for block in (b.strip() for b in blocks):
+            if block and block not in self._seen:
+                self._seen.add(block)
+                fresh.append(block)
+        return fresh
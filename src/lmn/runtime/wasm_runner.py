@@ -2,14 +2,41 @@
 import wasmtime
 import logging
 from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.emitter.wasm.string_layout import NUL_TERMINATED
 from lmn.runtime.host.host_initializer import initialize_host_functions
+from lmn.runtime.host.core.llm.client_manager import get_client_manager
+from lmn.runtime.host.call_prefetcher import get_prefetcher
+from lmn.runtime.host.output_sink import OutputSink
 
-def create_environment():
+def create_engine_config() -> wasmtime.Config:
+    """
+    Wasmtime configuration shared by every LMN environment.
+    """
+    config = wasmtime.Config()
+
+    # allow 'return_call' (emitted with OptimizerOptions(use_return_call=True))
+    config.wasm_tail_call = True
+
+    # allow v128 (the array builtins sum, dot, ... are SIMD helpers)
+    config.wasm_simd = True
+    return config
+
+def create_environment(warm_up_models=(), on_output=None, trace=None):
     """
     Creates a reusable Wasmtime environment.
+
+    :param warm_up_models: LLM models to load in the background right away
+                           (e.g. ["llama3.2"]), so the first llm() call does
+                           not pay the model load time.
+    :param on_output:      Called with each piece of output text as soon as
+                           the program produces it (`print llm(...)` streams
+                           the response chunk by chunk); the output lines are
+                           collected as usual either way.
+    :param trace:          A HostCallTrace: record the network-bound host calls
+                           (llm, tools, clock) or replay them offline.
     """
     # create the wasm engine, stor and linker
-    engine = wasmtime.Engine()
+    engine = wasmtime.Engine(create_engine_config())
     store = wasmtime.Store(engine)
     linker = wasmtime.Linker(engine)
 
@@ -17,21 +44,31 @@ def create_environment():
     memory_ref = [None]
 
     # clear output
-    output_lines = []
+    output_lines = OutputSink(on_output)
 
     # initialize host functions
-    initialize_host_functions(linker, store, output_lines, memory_ref=memory_ref)
+    initialize_host_functions(linker, store, output_lines, memory_ref=memory_ref, trace=trace)
+
+    # optionally start loading LLM models
+    if warm_up_models:
+        get_client_manager().warm_up(warm_up_models)
 
     # return the environment
     return {"engine": engine, "store": store, "linker": linker, "memory_ref": memory_ref, "output_lines": output_lines}
 
-def run_wasm(code: str, env: dict = None) -> list[str]:
+def run_wasm(code: str, env: dict = None, string_layout: str = NUL_TERMINATED, profile=None,
+             optimize=True) -> list[str]:
     """
     Compiles and runs LMN code using a Wasmtime environment.
     If an environment is provided, it reuses the same engine, store, and linker.
 
     :param code: LMN source code to compile and run.
     :param env: A reusable Wasmtime environment.
+    :param string_layout: "nul" or "length" (see compile_code_to_wat).
+    :param profile: optional RuntimeProfile, filled with the module's counters
+                    (e.g. memo table hit rates) after the run.
+    :param optimize: True/False or an OptimizerOptions instance (see
+                     compile_code_to_wat), e.g. OptimizerOptions(concurrent_calls=True).
     :return: A list of strings representing output from the code execution.
     """
     # check if we have an environment
@@ -39,42 +76,82 @@ def run_wasm(code: str, env: dict = None) -> list[str]:
         # no environment, so create it
         env = create_environment()
 
-    # get the environment
-    engine = env["engine"]
-    store = env["store"]
-    linker = env["linker"]
-    memory_ref = env["memory_ref"]
-    output_lines = env["output_lines"]
+    # Clear previous output (and answers an earlier, aborted run never took)
+    env["output_lines"].clear()
+    get_prefetcher().clear()
 
-    # Clear previous output
-    output_lines.clear()
+    # Compile LMN code to WASM, then run it
+    try:
+        module = compile_module(code, env["engine"], string_layout=string_layout, optimize=optimize)
+    except WasmBuildError as e:
+        return [str(e)]
+    return run_module(module, env, profile=profile)
+
+class WasmBuildError(Exception):
+    """
+    Compiling LMN code into a wasmtime.Module failed; the message is the
+    line run_wasm reports for it.
+    """
+
+
+def compile_module(code: str, engine: wasmtime.Engine, string_layout: str = NUL_TERMINATED,
+                   optimize=True) -> wasmtime.Module:
+    """
+    Compiles LMN code into a wasmtime.Module for 'engine' (the first half of
+    run_wasm). Touches no store, so it may run on another thread while the
+    environment is busy, e.g. while lmn_chat is still streaming a reply.
 
+    :raises WasmBuildError: compilation failed or produced no WASM.
+    """
     # Compile LMN code to WASM
     try:
         # compile to wat and wasm
         wat_text, wasm_bytes = compile_code_to_wat(
             code,
             also_produce_wasm=True,
-            import_memory=False
+            import_memory=False,
+            optimize=optimize,
+            string_layout=string_layout
         )
 
-        # debug
+        # debug
         logging.debug("Compilation to WAT and WASM successful.")
     except Exception as e:
         # error in compilation
         logging.error(f"Compilation error: {e}")
-        return [f"Compilation error: {e}"]
-    
+        raise WasmBuildError(f"Compilation error: {e}") from e
+
     # check we got wasm
     if not wasm_bytes:
         # no wasm
         logging.error("No WASM produced. Ensure 'wat2wasm' is available.")
-        return ["No WASM produced (wat2wasm missing?)."]
+        raise WasmBuildError("No WASM produced (wat2wasm missing?).")
+
+    try:
+        # Validate + compile the WASM module
+        return wasmtime.Module(engine, wasm_bytes)
+    except Exception as e:
+        # error
+        logging.error(f"Instantiation error: {e}")
+        raise WasmBuildError(f"Instantiation error: {e}") from e
+
+def run_module(module: wasmtime.Module, env: dict, profile=None) -> list[str]:
+    """
+    Instantiates a compiled module in the environment and runs its entry
+    point (the second half of run_wasm); returns the output lines.
+    """
+    # get the environment
+    store = env["store"]
+    linker = env["linker"]
+    memory_ref = env["memory_ref"]
+    output_lines = env["output_lines"]
+
+    # Clear previous output (and answers an earlier, aborted run never took)
+    output_lines.clear()
+    get_prefetcher().clear()
 
-    
     try:
         # Instantiate WASM module
-        module = wasmtime.Module(engine, wasm_bytes)
         instance = linker.instantiate(store, module)
         logging.debug("WASM module instantiated successfully.")
     except Exception as e:
@@ -129,4 +206,8 @@ def run_wasm(code: str, env: dict = None) -> list[str]:
         logging.error(error_msg)
         output_lines.append(error_msg)
 
+    # collect runtime counters
+    if profile is not None:
+        profile.collect(store, instance.exports(store))
+
     return output_lines
\ No newline at end of file
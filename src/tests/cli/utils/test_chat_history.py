@@ -0,0 +1,52 @@
+# file: tests/cli/utils/test_chat_history.py
+
+from lmn.cli.utils.chat_history import ChatHistory, estimate_messages_tokens, summarize_turns
+from lmn.cli.utils.system_prompt import get_system_prompt
+
+REPLY = "Sure, here is the code:\n```lmn\n" + "print 1\n" * 40 + "```\nIt prints 1 forty times."
+
+
+def test_long_sessions_keep_a_bounded_prompt_with_a_fixed_system_prompt():
+    history = ChatHistory(get_system_prompt(), token_budget=1500)
+    sizes = []
+    for turn in range(200):
+        history.add_user(f"Question {turn}: write some LMN code please")
+        messages = history.prompt()
+        sizes.append(history.last_prompt_tokens)
+        history.add_assistant(REPLY)
+
+        assert messages[0] == {"role": "system", "content": get_system_prompt()}
+        assert messages[-1]["content"].startswith(f"Question {turn}:")
+
+    assert max(sizes) <= 1500
+    assert max(sizes[100:]) - min(sizes[100:]) < 500         # flat, not growing
+    assert history.summarized_turns > 150
+    assert "Question 199" not in history.summary
+    assert "[code]" in history.summary and "print 1" not in history.summary
+    assert "prompt ~" in history.report()
+
+
+def test_compaction_keeps_the_prefix_stable_between_compactions():
+    history = ChatHistory("system", token_budget=400, max_summary_tokens=50)
+    prefixes = []
+    for turn in range(30):
+        history.add_user(f"q{turn} " + "x" * 200)
+        messages = history.prompt()
+        prefixes.append(messages[1]["content"] if history.summary else None)
+        history.add_assistant("a" * 200)
+
+    # the summary only changes when the budget is hit, not on every turn
+    changes = sum(1 for a, b in zip(prefixes, prefixes[1:]) if a != b)
+    assert 0 < changes < 15
+
+
+def test_the_newest_message_stays_even_if_it_alone_exceeds_the_budget():
+    history = ChatHistory("system", token_budget=50)
+    history.add_user("hello")
+    history.add_assistant("hi")
+    history.add_user("y" * 1000)
+
+    messages = history.prompt()
+    assert messages[-1]["content"] == "y" * 1000
+    assert estimate_messages_tokens(messages) > 50
+    assert summarize_turns("", [{"role": "user", "content": "hello"}], 10) == "user: hello"
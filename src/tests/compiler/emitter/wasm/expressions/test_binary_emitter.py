@@ -154,3 +154,76 @@ def test_binary_fallback(left_t, right_t):
     assert out_lines[-1].strip() == f"{final_type}.add", (
         f"Fallback => expecting '{final_type}.add', got '{out_lines[-1].strip()}'\n{out_lines}"
     )
+
+def _call(name):
+    return {
+        "type": "FnExpression",
+        "name": {"type": "VariableExpression", "name": name},
+        "arguments": [],
+        "inferred_type": "i32",
+    }
+
+def _compare(left, right):
+    return {
+        "type": "BinaryExpression",
+        "operator": "<",
+        "inferred_type": "i32",
+        "left": left,
+        "right": right,
+    }
+
+def _variable(name):
+    return {"type": "VariableExpression", "name": name, "inferred_type": "i32"}
+
+@pytest.mark.parametrize("op,then_line,else_line", [
+    ("and", "i32.const 777", "i32.const 0"),
+    ("or", "i32.const 1", "i32.const 777"),
+])
+def test_logical_short_circuits_expensive_right_side(op, then_line, else_line):
+    """
+    'and' / 'or' with a call on the right => the call sits in one branch of an if.
+    """
+    controller = MockController()
+    be = BinaryExpressionEmitter(controller)
+
+    node = {
+        "type": "BinaryExpression",
+        "operator": op,
+        "inferred_type": "i32",
+        "left": _variable("a"),
+        "right": _call("expensive"),
+    }
+    out_lines = []
+    be.emit(node, out_lines)
+
+    lines = [line.strip() for line in out_lines]
+    # right side (a plain value) is normalised to 0 / 1
+    right = ["i32.const 777", "i32.const 0", "i32.ne"]
+    if op == "and":
+        assert lines == ["i32.const 777", "if (result i32)"] + right + ["else", "i32.const 0", "end"]
+    else:
+        assert lines == ["i32.const 777", "if (result i32)", "i32.const 1", "else"] + right + ["end"]
+    assert "i32.add" not in lines
+
+def test_logical_with_cheap_right_side_uses_select():
+    controller = MockController()
+    be = BinaryExpressionEmitter(controller)
+
+    node = {
+        "type": "BinaryExpression",
+        "operator": "and",
+        "inferred_type": "i32",
+        "left": _compare(_variable("a"), _variable("b")),
+        "right": _compare(_variable("b"), _variable("c")),
+    }
+    out_lines = []
+    be.emit(node, out_lines)
+
+    # comparisons are already 0 / 1 => no normalisation
+    # (MockController emits one line per sub-expression)
+    assert [line.strip() for line in out_lines] == [
+        "i32.const 777",   # right
+        "i32.const 0",
+        "i32.const 777",   # left
+        "select",
+    ]
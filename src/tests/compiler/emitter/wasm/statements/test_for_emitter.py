@@ -90,3 +90,102 @@ def test_simple_for_loop():
 
     # Finally, we should see "br $for_loop"
     assert 'br $for_loop' in combined
+
+
+# -----------------------------------------------------------------------------
+# for x in <typed array> (compiled and run end to end)
+# -----------------------------------------------------------------------------
+from lmn.compiler.pipeline import compile_code_to_wat
+from tests.wasm_helpers import run_main
+
+
+def compile_and_run(code, optimize=True):
+    wat_text, _ = compile_code_to_wat(code, optimize=optimize)
+    return run_main(wat_text), wat_text
+
+
+FOR_IN_PROGRAM = r"""
+function total(xs: int[])
+  let t = 0
+  for x in xs
+    t = t + x * 4
+  end
+  return t
+end
+
+function main()
+  let a = [10, 20, 30]
+  let b: long[] = [10000000000, 20000000000]
+  let d = [1.5, 2.25]
+  let s = ["ab", "cd"]
+  let e: int[] = []
+  let lt: long = 0
+  for y in b
+    lt = lt + y
+  end
+  let dt = 0.0
+  for z in d
+    dt = dt + z
+  end
+  let n = 0
+  for q in e
+    n = n + 1
+  end
+  print total(a)
+  print lt
+  print dt
+  print n
+  for w in s
+    print w
+  end
+  for i in a
+    for j in a
+      if (j > i)
+        continue
+      end
+      n = n + j
+    end
+  end
+  print n
+  return 0
+end
+"""
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_for_in_walks_typed_arrays(optimize):
+    output, wat_text = compile_and_run(FOR_IN_PROGRAM, optimize)
+
+    assert output == ["240", "30000000000", "3.75", "0", "ab", "cd", "100"]
+    # length read once, one load of the element width per iteration
+    assert "i32.load offset=4" in wat_text
+    assert "i64.load offset=4" in wat_text
+    assert "f64.load offset=4" in wat_text
+    assert "999999" not in wat_text
+
+
+def test_for_in_element_loads_use_a_moving_cursor():
+    fe = ForEmitter(MockController())
+    fe.controller.request_local = lambda name, local_type: None
+    node = {
+        "type": "ForStatement",
+        "variable": {"type": "VariableExpression", "name": "x"},
+        "start_expr": {"type": "VariableExpression", "name": "xs", "inferred_type": "f64_ptr"},
+        "end_expr": None,
+        "step_expr": None,
+        "body": [],
+    }
+
+    out = []
+    fe.emit_for(node, out)
+    lines = [line.strip() for line in out]
+
+    assert lines[:8] == [
+        "local.get $xs", "local.tee $__for_cur_0", "i32.load", "i32.const 3", "i32.shl",
+        "local.get $__for_cur_0", "i32.add", "local.set $__for_end_0",
+    ]
+    assert "f64.load offset=4" in lines
+    assert lines[-9:] == [
+        "local.get $__for_cur_0", "i32.const 8", "i32.add", "local.tee $__for_cur_0",
+        "local.get $__for_end_0", "i32.lt_u", "br_if $for_loop", "end", "end",
+    ]
@@ -195,3 +195,31 @@ def test_if_with_multiple_elseif_and_else():
     assert combined.count('end') == 3
     # We also expect multiple 'i32.const 999' from all statements
     assert 'i32.const 999' in combined
+
+
+def test_if_with_alias_keys():
+    """
+    The pipeline serializes IfStatement by alias => thenBody / elseifClauses / elseBody
+    """
+    emitter = IfEmitter(MockController())
+    node = {
+      "type": "IfStatement",
+      "condition": {"type": "LiteralExpression", "value": 1},
+      "thenBody": [{"type": "PrintStatement"}],
+      "elseifClauses": [
+        {
+          "type": "ElseIfClause",
+          "condition": {"type": "LiteralExpression", "value": 2},
+          "body": [{"type": "PrintStatement"}]
+        }
+      ],
+      "elseBody": [{"type": "PrintStatement"}]
+    }
+
+    out = []
+    emitter.emit_if(node, out)
+    combined = "\n".join(out)
+
+    # then + elseif + else bodies are all emitted
+    assert combined.count('i32.const 999') == 3
+    assert combined.count('else') == 2
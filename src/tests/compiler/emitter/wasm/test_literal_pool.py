@@ -0,0 +1,55 @@
+# file: tests/compiler/emitter/wasm/test_literal_pool.py
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.compile_profile import CompileProfile
+from lmn.compiler.optimizer.options import OptimizerOptions
+from lmn.compiler.emitter.wasm.literal_pool import DATA_BASE_OFFSET, LiteralPool, escape_wat_bytes
+from tests.wasm_helpers import run_wat
+
+
+def test_identical_strings_are_stored_once():
+    pool = LiteralPool()
+    first = pool.add_string("hello")
+    assert pool.add_string("hello") == first
+    assert pool.segments() == [(DATA_BASE_OFFSET, b"hello\0")]
+
+
+def test_string_tail_points_into_longer_string():
+    pool = LiteralPool()
+    whole = pool.add_string("hello world")
+    assert pool.add_string("world") == whole + len("hello ")
+    assert pool.add_string("") == whole + len("hello world")
+    assert len(pool.data) == len("hello world") + 1
+
+
+def test_typed_arrays_are_aligned_after_their_header():
+    pool = LiteralPool()
+    pool.add_string("ab")
+    offset = pool.add(b"\x02\x00\x00\x00" + b"\x00" * 16, align=8, header=4)
+    assert (offset + 4) % 8 == 0
+    assert pool.add(b"\x01\x00\x00\x00", align=4) % 4 == 0
+
+
+def test_without_interning_every_literal_gets_its_own_bytes():
+    pool = LiteralPool(intern=False)
+    first = pool.add_string("hello")
+    assert pool.add_string("hello") == first + len("hello\0")
+
+
+def test_escape_keeps_printable_ascii():
+    assert escape_wat_bytes(b'say "hi"\\\n\0') == 'say \\22hi\\22\\5c\\0a\\00'
+
+
+def test_repeated_print_literal_is_stored_once():
+    code = "function main()\n" + '  print "status: ok"\n' * 50 + "  return 0\nend\n"
+    profile = CompileProfile()
+    wat_text, _ = compile_code_to_wat(code, profile=profile)
+
+    assert "".join(run_wat(wat_text)).splitlines() == ["status: ok"] * 50
+    assert wat_text.count("status: ok") == 1
+    assert wat_text.count("(data ") == 1
+    assert profile.get_stat("data", "bytes_saved") == 49 * len("status: ok\0")
+
+    plain, _ = compile_code_to_wat(code, optimize=OptimizerOptions(intern_literals=False))
+    assert plain.count("status: ok") == 50
+    assert len(wat_text) < len(plain)
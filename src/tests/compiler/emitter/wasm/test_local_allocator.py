@@ -0,0 +1,102 @@
+# file: tests/compiler/emitter/wasm/test_local_allocator.py
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.compile_profile import CompileProfile
+from lmn.compiler.optimizer.options import OptimizerOptions
+from lmn.compiler.emitter.wasm.local_allocator import LocalAllocator
+from tests.wasm_helpers import run_main
+
+
+def allocate(locals_, body):
+    lines = ["(func $f (result i32)"]
+    lines += [f"  (local ${name} {wasm_type})" for name, wasm_type in locals_]
+    lines += [f"  {line}" for line in body] + [")"]
+    allocated = LocalAllocator().allocate_function(lines)
+    declarations = [line.strip() for line in allocated if line.strip().startswith("(local ")]
+    body = [line.strip() for line in allocated[1 + len(declarations):-1]]
+    return declarations, body
+
+
+def test_disjoint_temporaries_share_a_slot():
+    declarations, body = allocate(
+        [("a", "i32"), ("b", "i32")],
+        ["i32.const 1", "local.set $a", "local.get $a", "drop",
+         "i32.const 2", "local.set $b", "local.get $b", "return"],
+    )
+    assert declarations == ["(local $a i32)"]
+    assert body[-3:] == ["local.set $a", "local.get $a", "return"]
+
+
+def test_overlapping_and_differently_typed_locals_keep_their_slots():
+    declarations, _ = allocate(
+        [("a", "i32"), ("b", "i32"), ("c", "f64")],
+        ["i32.const 1", "local.set $a", "i32.const 2", "local.set $b",
+         "local.get $a", "drop", "f64.const 1", "local.set $c",
+         "local.get $c", "drop", "local.get $b", "return"],
+    )
+    assert declarations == ["(local $a i32)", "(local $b i32)", "(local $c f64)"]
+
+
+def test_value_read_inside_a_loop_lives_until_the_loop_ends():
+    # $b is written after the last read of $a, but $a is read again next iteration
+    declarations, _ = allocate(
+        [("a", "i32"), ("b", "i32")],
+        ["i32.const 1", "local.set $a",
+         "loop $l", "local.get $a", "drop", "i32.const 2", "local.set $b",
+         "local.get $b", "br_if $l", "end",
+         "i32.const 0", "return"],
+    )
+    assert len(declarations) == 2
+
+
+def test_zero_initialised_and_escaping_locals_are_not_shared():
+    declarations, _ = allocate(
+        [("zero", "i32"), ("arm", "i32"), ("t", "i32")],
+        ["local.get $zero", "drop",
+         "i32.const 1", "if", "i32.const 5", "local.set $arm", "end",
+         "local.get $arm", "drop",
+         "i32.const 3", "local.set $t", "local.get $t", "return"],
+    )
+    assert declarations == ["(local $zero i32)", "(local $arm i32)", "(local $t i32)"]
+
+
+def test_unused_declarations_are_dropped():
+    declarations, _ = allocate([("unused", "i32")], ["i32.const 0", "return"])
+    assert declarations == []
+
+
+PROGRAM = r"""
+function main()
+  let total = 0
+  for i = 0 to 10
+    total = total + i
+  end
+  print total
+  let s = 0
+  for j = 1 to 5
+    s = s + j * j
+  end
+  print s
+  return 0
+end
+"""
+
+
+def test_pipeline_reports_locals_before_and_after():
+    profile = CompileProfile()
+    wat_text, _ = compile_code_to_wat(PROGRAM, profile=profile)
+
+    assert run_main(wat_text) == ["45", "30"]
+    before = profile.get_stat("locals", "locals_before")
+    after = profile.get_stat("locals", "locals_after")
+    assert before == 4 and after < before
+    assert wat_text.count("(local ") == after
+
+
+def test_local_reuse_can_be_disabled():
+    profile = CompileProfile()
+    wat_text, _ = compile_code_to_wat(PROGRAM, optimize=OptimizerOptions(reuse_locals=False), profile=profile)
+
+    assert "locals" not in profile.passes
+    assert wat_text.count("(local ") == 4
+    assert run_main(wat_text) == ["45", "30"]
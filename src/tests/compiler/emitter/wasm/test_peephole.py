@@ -0,0 +1,114 @@
+# file: tests/compiler/emitter/wasm/test_peephole.py
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.compile_profile import CompileProfile
+from lmn.compiler.optimizer.options import OptimizerOptions
+from lmn.compiler.emitter.wasm.peephole import PeepholeOptimizer
+from tests.wasm_helpers import run_main
+
+
+def optimize(body, rules=None):
+    lines = ["(func $f (result i32)", "  (local $x i32)"] + [f"  {line}" for line in body] + [")"]
+    optimized = PeepholeOptimizer(rules).optimize_function(lines)
+    return [line.strip() for line in optimized[2:-1]]
+
+
+def test_set_get_becomes_tee():
+    assert optimize(["i32.const 5", "local.set $x", "local.get $x", "return"]) == [
+        "i32.const 5", "local.tee $x", "return"
+    ]
+
+
+def test_set_get_of_different_locals_is_kept():
+    body = ["local.set $x", "local.get $y", "return"]
+    assert optimize(body) == body
+
+
+def test_const_eqz_and_compare_folding():
+    assert optimize(["i32.const 0", "i32.eqz", "return"]) == ["i32.const 1", "return"]
+    assert optimize(["i32.const 3", "i32.const 4", "i32.lt_s", "return"]) == ["i32.const 1", "return"]
+    assert optimize(["i32.const 2147483647", "i32.const 1", "i32.add", "return"]) == [
+        "i32.const -2147483648", "return"
+    ]
+
+
+def test_division_is_not_folded():
+    body = ["i32.const 1", "i32.const 0", "i32.div_s", "return"]
+    assert optimize(body) == body
+
+
+def test_compare_eqz_is_inverted():
+    assert optimize(["local.get $x", "i32.const 10", "i32.lt_s", "i32.eqz", "br_if $l"]) == [
+        "local.get $x", "i32.const 10", "i32.ge_s", "br_if $l"
+    ]
+    # float compares are not invertible (NaN)
+    body = ["f64.lt", "i32.eqz", "br_if $l"]
+    assert optimize(body) == body
+
+
+def test_double_eqz_before_branch_and_dead_push():
+    assert optimize(["local.get $x", "i32.eqz", "i32.eqz", "if"]) == ["local.get $x", "if"]
+    assert optimize(["local.get $x", "drop", "i32.const 0", "return"]) == ["i32.const 0", "return"]
+
+
+def test_unreachable_code_after_branch():
+    body = [
+        "block $b (result i32)",
+        "i32.const 1",
+        "br $b",
+        "block",
+        "nop",
+        "end",
+        "i32.const 0",
+        "end",
+        "return",
+        "i32.const 0",
+        "return",
+    ]
+    assert optimize(body) == ["block $b (result i32)", "i32.const 1", "br $b", "end", "return"]
+
+
+def test_rule_selection():
+    body = ["i32.const 5", "local.set $x", "local.get $x", "i32.const 0", "i32.eqz", "return"]
+    assert optimize(body, rules=["const_folding"]) == [
+        "i32.const 5", "local.set $x", "local.get $x", "i32.const 1", "return"
+    ]
+
+
+PROGRAM = r"""
+function clamp(n)
+  if n > 100
+    return 100
+  end
+  return n
+end
+
+function main()
+  let s = 0
+  for i = 0 to 50
+    s = s + i * 1
+    s = clamp(s)
+  end
+  print s
+  return 0
+end
+"""
+
+
+def test_pipeline_reports_removed_instructions_per_function():
+    profile = CompileProfile()
+    wat_text, _ = compile_code_to_wat(PROGRAM, profile=profile)
+
+    assert run_main(wat_text) == ["100"]
+    assert profile.get_stat("peephole", "instructions_removed") > 0
+    assert profile.get_stat("peephole", "removed[main]") > 0
+    assert "removed[clamp]" in profile.passes["peephole"]["stats"]
+
+
+def test_peephole_can_be_disabled():
+    profile = CompileProfile()
+    without_pass, _ = compile_code_to_wat(PROGRAM, optimize=OptimizerOptions(peephole=False), profile=profile)
+
+    assert "peephole" not in profile.passes
+    assert run_main(without_pass) == ["100"]
+    assert len(without_pass) > len(compile_code_to_wat(PROGRAM)[0])
@@ -0,0 +1,153 @@
+# file: tests/compiler/emitter/wasm/test_simd_array_builtins.py
+
+import struct
+
+import pytest
+import wasmtime
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.emitter.wasm.simd_array_builtins import SIMD_ELEMENTS, SimdArrayBuiltinEmitter, simd_helper_name
+from lmn.runtime.wasm_runner import create_engine_config
+from tests.wasm_helpers import run_main
+
+FORMATS = {"i32_ptr": "i", "i64_ptr": "q", "f32_ptr": "f", "f64_ptr": "d"}
+
+# arrays are placed from offset 1024 on; a bump allocator above them
+HELPER_MODULE = """
+(module
+  (memory (export "memory") 1)
+  (global $heap (mut i32) (i32.const 32768))
+  (func $malloc (param $size i32) (result i32)
+    global.get $heap
+    global.get $heap
+    local.get $size
+    i32.add
+    global.set $heap)
+  {helper}
+  (export "run" (func ${name})))
+"""
+
+
+def call_helper(op, array_type, *arrays, scalar=None):
+    """
+    Instantiate the helper for (op, array_type) alone and call it on
+    arrays written straight into memory.
+    """
+    lines = SimdArrayBuiltinEmitter(controller=None).build_helper(op, array_type)
+    name = simd_helper_name(op, SIMD_ELEMENTS[array_type][0])
+    wat = HELPER_MODULE.format(helper="\n  ".join(lines), name=name)
+
+    store = wasmtime.Store(wasmtime.Engine(create_engine_config()))
+    instance = wasmtime.Instance(store, wasmtime.Module(store.engine, wat), [])
+    memory = instance.exports(store)["memory"]
+    fmt = FORMATS[array_type]
+
+    pointers, offset = [], 1024
+    for values in arrays:
+        data = struct.pack(f"<i{len(values)}{fmt}", len(values), *values)
+        memory.write(store, data, offset)
+        pointers.append(offset)
+        offset += len(data) + 4  # keep the next array misaligned, too
+
+    args = pointers + ([scalar] if scalar is not None else [])
+    result = instance.exports(store)["run"](store, *args)
+    if op in ("scale", "add"):
+        length = struct.unpack("<i", memory.read(store, result, result + 4))[0]
+        size = struct.calcsize(fmt)
+        raw = memory.read(store, result + 4, result + 4 + length * size)
+        return list(struct.unpack(f"<{length}{fmt}", raw))
+    return result
+
+
+@pytest.mark.parametrize("array_type", ["i32_ptr", "i64_ptr"])
+@pytest.mark.parametrize("length", [0, 1, 3, 4, 5, 1001])
+def test_integer_reductions_cover_vector_body_and_tail(array_type, length):
+    values = [(i * 7919) % 201 - 100 for i in range(length)]
+    other = [(i * 31) % 17 - 8 for i in range(length + 2)]
+
+    assert call_helper("sum", array_type, values) == sum(values)
+    assert call_helper("min", array_type, values) == (min(values) if values else 0)
+    assert call_helper("max", array_type, values) == (max(values) if values else 0)
+    # dot runs over the shorter array
+    assert call_helper("dot", array_type, values, other) == sum(a * b for a, b in zip(values, other))
+
+
+@pytest.mark.parametrize("array_type", ["f32_ptr", "f64_ptr"])
+def test_float_reductions(array_type):
+    values = [0.5 * i - 20.0 for i in range(77)]
+
+    assert call_helper("sum", array_type, values) == pytest.approx(sum(values))
+    assert call_helper("min", array_type, values) == -20.0
+    assert call_helper("max", array_type, values) == 18.0
+    assert call_helper("dot", array_type, values, values) == pytest.approx(sum(v * v for v in values))
+
+
+@pytest.mark.parametrize("array_type", ["i32_ptr", "i64_ptr", "f64_ptr"])
+def test_elementwise_builtins_allocate_a_new_array(array_type):
+    values = list(range(-3, 8))
+    other = list(range(100, 120))
+
+    factor = 3.0 if array_type == "f64_ptr" else 3
+    assert call_helper("scale", array_type, values, scalar=factor) == [3 * v for v in values]
+    assert call_helper("add", array_type, values, other) == [a + b for a, b in zip(values, other)]
+
+
+def test_helpers_use_128_bit_simd():
+    helper = "\n".join(SimdArrayBuiltinEmitter(controller=None).build_helper("dot", "f64_ptr"))
+    assert "(local $acc v128)" in helper
+    assert "v128.load offset=4 align=1" in helper
+    assert "f64x2.mul" in helper and "f64x2.add" in helper
+    # scalar tail
+    assert "f64.load offset=4" in helper
+
+
+def test_array_builtins_in_a_program():
+    code = r"""
+    function main()
+      let xs: int[] = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]
+      let ds: double[] = [1.5, 2.5, 4.0, 0.25]
+      print sum(xs)
+      print dot(xs, xs)
+      print max(ds)
+      print sum(scale(ds, 2))
+      print add(xs, scale(xs, 2))
+      return 0
+    end
+    """
+    wat, _ = compile_code_to_wat(code)
+
+    # one helper per (builtin, element type), not imported from the host
+    assert wat.count("(func $__array_scale_") == 2
+    assert '"env" "sum"' not in wat
+
+    assert run_main(wat) == [
+        "66", "506", "4.0", "16.5", "[3,", "6,", "9,", "12,", "15,", "18,", "21,", "24,", "27,", "30,", "33]",
+    ]
+
+
+def test_user_function_shadows_builtin():
+    code = r"""
+    function sum(a, b)
+      return a - b
+    end
+
+    function main()
+      print sum(10, 3)
+      return 0
+    end
+    """
+    wat, _ = compile_code_to_wat(code)
+    assert "__array_sum" not in wat
+    assert run_main(wat) == ["7"]
+
+
+def test_builtin_rejects_non_numeric_arrays():
+    code = r"""
+    function main()
+      let s: string[] = ["a", "b"]
+      print sum(s)
+      return 0
+    end
+    """
+    with pytest.raises(TypeError, match=r"'sum' expects one of int\[\], long\[\], float\[\], double\[\]"):
+        compile_code_to_wat(code)
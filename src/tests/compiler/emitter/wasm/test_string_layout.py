@@ -0,0 +1,52 @@
+# file: tests/compiler/emitter/wasm/test_string_layout.py
+
+import pytest
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.emitter.wasm.literal_pool import LiteralPool
+from lmn.compiler.emitter.wasm.string_layout import (
+    LAYOUT_MARKER, LAYOUT_MARKER_OFFSET, LENGTH_PREFIXED, encode_string
+)
+from lmn.runtime.host.memory_utils import has_length_prefixed_strings, read_utf8_string
+from lmn.runtime.host.memory_utils_extra import store_string_with_malloc
+from tests.wasm_helpers import instantiate, run_wat
+
+
+def test_length_prefixed_literals_point_past_their_header():
+    pool = LiteralPool(string_layout=LENGTH_PREFIXED)
+    whole = pool.add_string("hello world")
+    assert whole % 4 == 0
+    assert pool.add_string("hello world") == whole
+    # a tail has no header of its own => stored separately
+    assert pool.add_string("world") != whole + len("hello ")
+    assert pool.segments()[0] == (LAYOUT_MARKER_OFFSET, LAYOUT_MARKER)
+    assert encode_string("hi", LENGTH_PREFIXED) == b"\x02\x00\x00\x00hi\0"
+
+
+def test_unknown_layout_is_rejected():
+    with pytest.raises(ValueError):
+        LiteralPool(string_layout="pascal")
+
+
+@pytest.mark.parametrize("layout", ["nul", "length"])
+def test_long_literal_is_printed_in_full(layout):
+    text = "abcdefgh" * 10000  # 80 KB, above the old 64 KB read limit
+    code = f'function main()\n  print "{text}"\n  print "done"\n  return 0\nend\n'
+    wat_text, _ = compile_code_to_wat(code, string_layout=layout)
+
+    assert run_wat(wat_text) == [text, "\n", "done", "\n"]
+    assert ("LMNSTR" in wat_text) == (layout == "length")
+
+
+@pytest.mark.parametrize("layout", ["nul", "length"])
+def test_host_strings_round_trip(layout):
+    wat_text, _ = compile_code_to_wat('function main()\n  print "x"\n  return 0\nend\n', string_layout=layout)
+    env, exports = instantiate(wat_text)
+    memory = exports["memory"]
+
+    assert has_length_prefixed_strings(env["store"], memory) == (layout == "length")
+    for text in ["", "héllo", "z" * 200000]:
+        ptr = store_string_with_malloc(env["store"], memory, env["output_lines"], text)
+        assert ptr != 0
+        assert read_utf8_string(env["store"], memory, ptr) == text
+    assert read_utf8_string(env["store"], memory, ptr, max_len=3) == "zzz"
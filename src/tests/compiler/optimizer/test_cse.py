@@ -0,0 +1,150 @@
+# file: tests/compiler/optimizer/test_cse.py
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.compile_profile import CompileProfile
+from lmn.compiler.optimizer.options import OptimizerOptions
+from tests.wasm_helpers import run_main
+
+
+def compile_both(code, **options):
+    profile = CompileProfile()
+    optimized, _ = compile_code_to_wat(code, optimize=OptimizerOptions(**options), profile=profile)
+    plain, _ = compile_code_to_wat(code, optimize=False)
+    assert run_main(optimized) == run_main(plain)
+    return optimized, profile
+
+
+def function_text(wat_text, name):
+    start = wat_text.index(f"(func ${name} ")
+    end = wat_text.index("(func $", start + 1) if "(func $" in wat_text[start + 1:] else len(wat_text)
+    return wat_text[start:end]
+
+
+def test_repeated_product_is_computed_once():
+    code = """
+function main()
+  let a = 7
+  let b = 9
+  let s = (a * b) + (a * b)
+  print s
+  return 0
+end
+"""
+    optimized, profile = compile_both(code, reuse_locals=False)
+
+    assert optimized.count("i32.mul") == 1
+    assert "local.tee $__cse_0" in optimized
+    assert run_main(optimized) == ["126"]
+    assert profile.get_stat("cse", "eliminated") == 1
+    assert profile.get_stat("cse", "temporaries") == 1
+
+
+def test_assignment_is_a_barrier():
+    code = """
+function main()
+  let a = 7
+  let b = 9
+  let before = (a * b) + (a * b)
+  a = a + 1
+  let after = (a * b) + (a * b)
+  print before
+  print after
+  return 0
+end
+"""
+    optimized, profile = compile_both(code)
+
+    assert optimized.count("i32.mul") == 2
+    assert run_main(optimized) == ["126", "144"]
+    assert profile.get_stat("cse", "eliminated") == 2
+
+
+def test_pure_call_is_reused_until_a_host_call():
+    code = """
+function square(x)
+  return x * x
+end
+
+function noisy(x)
+  print x
+  return x
+end
+
+function main()
+  let a = 5
+  let u = square(a) + 1
+  let v = square(a) + 2
+  let w = noisy(a)
+  let z = square(a) + 3
+  print u
+  print v
+  print z
+  return 0
+end
+"""
+    optimized, _ = compile_both(code, inline=False)
+    main = function_text(optimized, "main")
+
+    # once before noisy(...), once after it
+    assert main.count("call $square") == 2
+    assert run_main(optimized) == ["5", "26", "27", "28"]
+
+
+def test_loop_body_reuses_only_values_it_does_not_change():
+    code = """
+function main()
+  let a = 3
+  let b = 4
+  let c = a * b
+  let total = 0
+  for i = 0 to 5
+    total = total + (a * b) + (i * b) + (i * b)
+    b = b + 0
+  end
+  print c
+  print total
+  return 0
+end
+"""
+    optimized, _ = compile_both(code, strength_reduction=False, loops=False)
+    main = function_text(optimized, "main")
+
+    # `a * b` before the loop and inside it (b is written there); `i * b` once per iteration
+    assert main.count("i32.mul") == 3
+    assert run_main(optimized) == ["12", "140"]
+
+
+def test_short_circuit_right_side_only_reuses_earlier_values():
+    code = """
+function main()
+  let a = 6
+  let b = 7
+  if a * b > 10 and a * b < 100
+    print a * b
+  end
+  if a > 100 and a * b > 0
+    print 0
+  end
+  print a * b
+  return 0
+end
+"""
+    optimized, _ = compile_both(code)
+    assert run_main(optimized) == ["42", "42"]
+
+
+def test_cse_can_be_disabled():
+    code = """
+function main()
+  let a = 7
+  let b = 9
+  print (a * b) + (a * b)
+  return 0
+end
+"""
+    profile = CompileProfile()
+    optimized, _ = compile_code_to_wat(code, optimize=OptimizerOptions(cse=False), profile=profile)
+
+    assert "__cse" not in optimized
+    assert "cse" not in profile.passes
+    assert optimized.count("i32.mul") == 2
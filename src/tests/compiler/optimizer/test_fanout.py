@@ -0,0 +1,120 @@
+# file: tests/compiler/optimizer/test_fanout.py
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.compile_profile import CompileProfile
+from lmn.compiler.optimizer.options import OptimizerOptions
+from lmn.compiler.optimizer.fanout import fan_out_calls
+
+
+def compile_concurrent(code, **options):
+    profile = CompileProfile()
+    wat_text, _ = compile_code_to_wat(
+        code, optimize=OptimizerOptions(concurrent_calls=True, **options), profile=profile
+    )
+    return wat_text, profile
+
+
+def calls_in_order(wat_text):
+    return [
+        line.split()[1] for line in wat_text.splitlines()
+        if line.strip().startswith("call $") and "malloc" not in line
+    ]
+
+
+def test_array_elements_are_started_together():
+    code = """
+function main()
+  let xs = ["a", llm("x"), llm("y"), llm("z")]
+  print xs
+  return 0
+end
+"""
+    wat_text, profile = compile_concurrent(code)
+
+    assert '(import "env" "llm__prefetch" (func $llm__prefetch (param i32 i32)))' in wat_text
+    assert calls_in_order(wat_text)[:6] == ["$llm__prefetch"] * 3 + ["$llm"] * 3
+    assert profile.get_stat("fanout", "groups") == 1
+    assert profile.get_stat("fanout", "calls") == 3
+
+
+def test_dependent_call_waits_and_identical_calls_are_started_once():
+    code = """
+function main()
+  let a = llm("x")
+  let b = llm(a)
+  let c = ask_tools("which tools?")
+  let d = llm("x")
+  print b
+  print c
+  print d
+  return 0
+end
+"""
+    wat_text, profile = compile_concurrent(code)
+
+    assert calls_in_order(wat_text)[:2] == ["$llm__prefetch", "$ask_tools__prefetch"]
+    assert wat_text.count("call $llm__prefetch") == 1
+    assert profile.get_stat("fanout", "calls") == 2
+
+
+def test_control_flow_ends_a_group():
+    code = """
+function ask(n)
+  let a = llm("x")
+  if (n > 0)
+    print llm("y")
+  end
+  let b = llm("z")
+  print a
+  print b
+  return 0
+end
+"""
+    wat_text, profile = compile_concurrent(code)
+
+    assert "__prefetch" not in wat_text
+    assert profile.get_stat("fanout", "groups") == 0
+
+
+def llm_call(prompt):
+    return {
+        "type": "FnExpression",
+        "name": {"type": "VariableExpression", "name": "llm"},
+        "arguments": [
+            {"type": "LiteralExpression", "value": prompt, "inferred_type": "i32_string"},
+            {"type": "LiteralExpression", "value": "llama3.2", "inferred_type": "i32_string"},
+        ],
+    }
+
+
+def test_right_side_of_and_is_never_started_early():
+    condition = {"type": "BinaryExpression", "operator": "and", "left": llm_call("p"), "right": llm_call("q")}
+    body = [
+        {"type": "PrintStatement", "expressions": [llm_call("x")]},
+        {"type": "PrintStatement", "expressions": [condition]},
+    ]
+    program = {"type": "Program", "body": body}
+
+    fan_out_calls(program, OptimizerOptions(concurrent_calls=True))
+
+    prefetch = program["body"][0]
+    assert prefetch["type"] == "PrefetchStatement"
+    assert [call["arguments"][0]["value"] for call in prefetch["calls"]] == ["x", "p"]
+
+
+def test_off_by_default_and_user_functions_shadow_builtins():
+    code = """
+function llm(prompt, model)
+  return prompt
+end
+
+function main()
+  print [llm("x", "m"), llm("y", "m")]
+  return 0
+end
+"""
+    plain, _ = compile_code_to_wat('print [llm("x"), llm("y")]')
+    assert "__prefetch" not in plain
+
+    wat_text, _ = compile_concurrent(code)
+    assert "__prefetch" not in wat_text
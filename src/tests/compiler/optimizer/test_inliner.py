@@ -0,0 +1,186 @@
+# file: tests/compiler/optimizer/test_inliner.py
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.compile_profile import CompileProfile
+from lmn.compiler.optimizer.options import OptimizerOptions
+from tests.wasm_helpers import run_main
+
+
+def main_body(wat_text):
+    start = wat_text.index("(func $main")
+    return wat_text[start:wat_text.index("(export", start)]
+
+
+SMALL_FUNCTIONS = r"""
+function add(a, b)
+  return a + b
+end
+
+function sq(x)
+  let y = x * x
+  return y
+end
+
+function main()
+  print add(2, 3)
+  print sq(add(1, 2))
+  return 0
+end
+"""
+
+
+def test_small_functions_are_inlined():
+    profile = CompileProfile()
+    wat, _ = compile_code_to_wat(SMALL_FUNCTIONS, profile=profile)
+    body = main_body(wat)
+
+    assert "call $add" not in body
+    assert "call $sq" not in body
+    assert "block $inline_0 (result i32)" in body
+    assert "(local $__inl0_a i32)" in body
+    assert profile.get_stat("inliner", "inlined") == 3
+    assert run_main(wat) == ["5", "9"]
+
+
+def test_no_opt_keeps_calls():
+    wat, _ = compile_code_to_wat(SMALL_FUNCTIONS, optimize=False)
+    body = main_body(wat)
+
+    assert "call $add" in body
+    assert "block $inline" not in body
+    assert run_main(wat) == ["5", "9"]
+
+
+def test_recursive_function_is_not_inlined():
+    code = r"""
+    function fact(n)
+      if n <= 1
+        return 1
+      else
+        return n * fact(n - 1)
+      end
+    end
+
+    function main()
+      print fact(5)
+      return 0
+    end
+    """
+    profile = CompileProfile()
+    wat, _ = compile_code_to_wat(code, profile=profile)
+
+    assert "call $fact" in main_body(wat)
+    assert "kept call to 'fact' in 'main': recursive" in profile.passes["inliner"]["decisions"]
+    assert run_main(wat) == ["120"]
+
+
+def test_size_limit():
+    code = r"""
+    function add(a, b)
+      return a + b
+    end
+
+    function main()
+      print add(1, 2)
+      return 0
+    end
+    """
+    profile = CompileProfile()
+    wat, _ = compile_code_to_wat(code, optimize=OptimizerOptions(max_inline_size=2), profile=profile)
+
+    assert "call $add" in main_body(wat)
+    assert profile.get_stat("inliner", "kept") == 1
+    assert run_main(wat) == ["3"]
+
+
+def test_early_return_branches_out_of_inline_block():
+    code = r"""
+    function clamp(x)
+      if x > 10
+        return 10
+      end
+      let z = x + 100
+      return z
+    end
+
+    function main()
+      print clamp(50)
+      print clamp(5)
+      return 0
+    end
+    """
+    wat, _ = compile_code_to_wat(code)
+    body = main_body(wat)
+
+    assert "br $inline_0" in body
+    assert "call $clamp" not in body
+    assert run_main(wat) == ["10", "105"]
+
+
+def test_helper_chains_are_inlined_through_every_level():
+    code = r"""
+    function sq(x)
+      return x * x
+    end
+
+    function g(y)
+      return sq(y) + 1
+    end
+
+    function h(z)
+      return g(z) * 2
+    end
+
+    function main()
+      print g(3)
+      print h(4)
+      return 0
+    end
+    """
+    wat, _ = compile_code_to_wat(code)
+    unoptimized, _ = compile_code_to_wat(code, optimize=False)
+
+    assert "call $" not in main_body(wat).replace("call $print", "")
+    assert run_main(wat) == run_main(unoptimized) == ["10", "34"]
+
+
+def test_lambda_is_inlined_and_not_lifted():
+    code = r"""
+    function main()
+      let dbl = function(v: int) : int
+        return v * 2
+      end
+      print dbl(21)
+      return 0
+    end
+    """
+    wat, _ = compile_code_to_wat(code)
+
+    assert "closure_fn" not in wat
+    assert run_main(wat) == ["42"]
+
+
+TOP_LEVEL_LAMBDA = r"""
+let sq = function(x)
+  return x * x
+end
+
+function main()
+  print sq(4)
+  return 0
+end
+"""
+
+
+def test_top_level_lambda_called_from_a_function_is_inlined_there():
+    wat, _ = compile_code_to_wat(TOP_LEVEL_LAMBDA)
+
+    assert "call $sq" not in wat
+    assert run_main(wat) == ["16"]
+
+
+def test_top_level_lambda_with_kept_calls_in_a_function_is_not_dropped():
+    wat, _ = compile_code_to_wat(TOP_LEVEL_LAMBDA, optimize=OptimizerOptions(max_inline_size=1))
+    unoptimized, _ = compile_code_to_wat(TOP_LEVEL_LAMBDA, optimize=False)
+
+    assert "$closure_fn_0" in wat and "$closure_fn_0" in unoptimized
@@ -0,0 +1,140 @@
+# file: tests/compiler/optimizer/test_memo.py
+
+import math
+
+import pytest
+
+from lmn.compiler.lexer.tokenizer import Tokenizer
+from lmn.compiler.parser.parser import Parser
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.compile_profile import CompileProfile
+from lmn.compiler.optimizer.options import OptimizerOptions
+from lmn.runtime.runtime_profile import RuntimeProfile
+from tests.wasm_helpers import run_main
+
+
+def run_profiled(wat_text):
+    profile = RuntimeProfile()
+    return run_main(wat_text, profile=profile), profile
+
+
+FIB = r"""
+function fib(n)
+  if (n < 2)
+    return n
+  end
+  return fib(n - 1) + fib(n - 2)
+end
+
+function main()
+  print fib(N)
+  return 0
+end
+"""
+
+
+def fib_program(n, memo=True):
+    return ("@memo\n" if memo else "") + FIB.strip().replace("N)", f"{n})", 1)
+
+
+def test_memo_annotation_is_parsed():
+    program = Parser(Tokenizer(fib_program(5)).tokenize()).parse()
+    assert program.body[0].annotations == ["memo"]
+
+
+def test_unknown_annotation_is_rejected():
+    with pytest.raises(SyntaxError, match="Unknown annotation '@fast'"):
+        Parser(Tokenizer("@fast\nfunction f(n)\n  return n\nend\n").tokenize()).parse()
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_memo_function_is_wrapped_and_counts_hits(optimize):
+    wat, _ = compile_code_to_wat(fib_program(40), optimize=optimize)
+
+    assert "(func $fib__memo_body (param $n i32) (result i32)" in wat
+    assert "call $malloc" in wat
+    assert '(export "__memo_fib_hits")' in wat
+
+    output, profile = run_profiled(wat)
+    assert output == ["102334155"]
+    # each fib(k), k = 0..40, is computed exactly once
+    assert profile.memo["fib"]["misses"] == 41
+    assert profile.memo["fib"]["hits"] == 38
+    assert profile.memo_hit_rate("fib") == pytest.approx(38 / 79)
+
+
+def test_small_table_evicts_but_stays_correct():
+    wat, _ = compile_code_to_wat(fib_program(22), optimize=OptimizerOptions(memo_capacity=2))
+    output, profile = run_profiled(wat)
+
+    assert output == ["17711"]
+    assert profile.memo["fib"]["evictions"] > 0
+
+
+def test_auto_mode_memoises_tree_recursion_only():
+    code = fib_program(20, memo=False).replace("function main()", (
+        "function fact(n)\n"
+        "  if (n < 2)\n"
+        "    return 1\n"
+        "  end\n"
+        "  return n * fact(n - 1)\n"
+        "end\n\n"
+        "function main()\n"
+        "  print fact(5)"
+    ), 1)
+    profile = CompileProfile()
+    wat, _ = compile_code_to_wat(code, optimize=OptimizerOptions(auto_memo=True), profile=profile)
+
+    assert profile.passes["memo"]["decisions"] == ["memoised 'fib' (auto, 4096 entries)"]
+    assert "$fact__memo_body" not in wat
+    assert run_main(wat) == ["120", "6765"]
+
+    # off by default
+    wat, _ = compile_code_to_wat(code)
+    assert "__memo" not in wat
+
+
+def test_memo_keys_can_be_longs_and_several_params():
+    code = (
+        "@memo\n"
+        "function walk(n: long, k): long\n"
+        "  if (k == 0)\n"
+        "    return n\n"
+        "  end\n"
+        "  return walk(n + 1, k - 1) + walk(n, k - 1)\n"
+        "end\n\n"
+        "function main()\n"
+        "  let big: long = 5000000000\n"
+        "  let r: long = walk(big, 30)\n"
+        "  print r\n"
+        "  return 0\n"
+        "end\n"
+    )
+    wat, _ = compile_code_to_wat(code)
+    output, profile = run_profiled(wat)
+
+    assert output == [str(sum((5000000000 + i) * math.comb(30, i) for i in range(31)))]
+    assert profile.memo_hit_rate("walk") > 0.4
+
+
+def test_memo_needs_integer_parameters():
+    code = "@memo\nfunction half(x: double)\n  return x / 2.0\nend\n\nfunction main()\n  print half(3.0)\n  return 0\nend\n"
+    with pytest.raises(TypeError, match="only int/long parameters"):
+        compile_code_to_wat(code)
+
+
+def test_memo_function_is_not_inlined():
+    code = (
+        "@memo\n"
+        "function sq(n)\n"
+        "  return n * n\n"
+        "end\n\n"
+        "function main()\n"
+        "  print sq(7)\n"
+        "  return 0\n"
+        "end\n"
+    )
+    wat, _ = compile_code_to_wat(code)
+
+    assert "call $sq" in wat
+    assert run_main(wat) == ["49"]
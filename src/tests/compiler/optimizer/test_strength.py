@@ -0,0 +1,95 @@
+# file: tests/compiler/optimizer/test_strength.py
+
+import random
+
+import pytest
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.compile_profile import CompileProfile
+from lmn.compiler.optimizer.options import OptimizerOptions
+from lmn.compiler.optimizer.strength import signed_division_magic
+from tests.wasm_helpers import run_main
+
+
+def truncated_division(n, d):
+    q = abs(n) // abs(d)
+    return q if (n >= 0) == (d > 0) else -q
+
+
+@pytest.mark.parametrize("divisor", [3, 5, 6, 7, 10, 641, 1000, 65537, 2**31 - 1])
+def test_signed_division_magic(divisor):
+    multiplier, shift = signed_division_magic(divisor)
+    assert 0 < multiplier < 2**32
+
+    rng = random.Random(divisor)
+    samples = [0, 1, -1, divisor, -divisor, divisor - 1, 1 - divisor, 2**31 - 1, -2**31]
+    samples += [rng.randint(-2**31, 2**31 - 1) for _ in range(2000)]
+    for n in samples:
+        quotient = ((n * multiplier) >> (32 + shift)) + (1 if n < 0 else 0)
+        assert quotient == truncated_division(n, divisor), n
+
+
+EXPRESSIONS = [
+    "x / 8", "x // 4", "x % 8", "x % 2", "x / 2", "x * 8", "x * 9", "x * 7",
+    "x * -4", "x / 7", "x % 7", "x / 10", "x % 10", "x % 641", "x + 0", "x * 1",
+]
+VALUES = ["0 - 2147483647 - 1", "0 - 2147483647", "0 - 1000", "0 - 9", "0 - 8", "0 - 7",
+          "0 - 1", "0", "1", "7", "8", "9", "1000", "2147483647"]
+
+
+def test_reduced_arithmetic_matches_unoptimised():
+    prints = "".join(f"  print {expr}\n" for expr in EXPRESSIONS)
+    calls = "".join(f"  check({value})\n" for value in VALUES)
+    code = f"function check(x)\n{prints}  return 0\nend\n\nfunction main()\n{calls}  return 0\nend\n"
+
+    profile = CompileProfile()
+    optimized, _ = compile_code_to_wat(code, optimize=OptimizerOptions(inline=False), profile=profile)
+    plain, _ = compile_code_to_wat(code, optimize=False)
+
+    assert "i32.div_s" not in optimized and "i32.rem_s" not in optimized
+    assert "i32.shr_s" in optimized and "i64.mul" in optimized
+    assert profile.get_stat("strength", "divisions") > 0
+    assert run_main(optimized) == run_main(plain)
+
+
+LOOP = r"""
+function main()
+  let total = 0
+  for i = 0 to 10
+    let scaled = i * 4
+    total = total + scaled + i * 4 + i * 12 + i * 1
+  end
+  print total
+  return 0
+end
+"""
+
+
+def test_induction_variables():
+    profile = CompileProfile()
+    wat_text, _ = compile_code_to_wat(LOOP, profile=profile)
+
+    assert profile.get_stat("strength", "induction_variables") == 2
+    assert "$__iv_0" in wat_text
+    assert run_main(wat_text) == run_main(compile_code_to_wat(LOOP, optimize=False)[0]) == ["945"]
+
+
+def test_let_of_folded_identity_keeps_its_local():
+    # `let b = a + 0` must not become `let b = a` (a function alias)
+    code = r"""
+function main()
+  let a = 5
+  let b = a + 0
+  print b
+  return 0
+end
+"""
+    assert run_main(compile_code_to_wat(code)[0]) == ["5"]
+
+
+def test_strength_reduction_can_be_disabled():
+    code = "function main()\n  let x = 100\n  print x / 8\n  return 0\nend\n"
+    profile = CompileProfile()
+    wat_text, _ = compile_code_to_wat(code, optimize=OptimizerOptions(strength_reduction=False), profile=profile)
+    assert "i32.div_s" in wat_text
+    assert "strength" not in profile.passes
@@ -0,0 +1,124 @@
+# file: tests/compiler/optimizer/test_switches.py
+
+import pytest
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.compile_profile import CompileProfile
+from lmn.compiler.optimizer.options import OptimizerOptions
+from tests.wasm_helpers import run_main
+
+
+def chain_program(constants, probes):
+    arms = []
+    for index, constant in enumerate(constants):
+        keyword = "if" if index == 0 else "elseif"
+        arms.append(f"  {keyword} x == {constant}\n    return {index + 1}")
+    prints = "\n".join(f"  print pick({probe})" for probe in probes)
+    return (
+        "function pick(x)\n" + "\n".join(arms) + "\n  else\n    return 0\n  end\nend\n\n"
+        "function main()\n" + prints + "\n  return 0\nend\n"
+    )
+
+
+def compile_with_profile(code):
+    profile = CompileProfile()
+    # no inlining => 'pick' stays one function we can look at
+    wat_text, _ = compile_code_to_wat(code, optimize=OptimizerOptions(inline=False), profile=profile)
+    return wat_text, profile
+
+
+def test_dense_chain_becomes_br_table():
+    code = chain_program([3, 4, 5, 6, 8], range(0, 10))
+    wat_text, profile = compile_with_profile(code)
+
+    assert "br_table" in wat_text
+    assert profile.get_stat("switches", "jump_tables") == 1
+    assert run_main(wat_text) == ["0", "0", "0", "1", "2", "3", "4", "0", "5", "0"]
+
+
+def test_sparse_chain_uses_binary_search():
+    constants = [-1000, 7, 100, 9000, 12345, 2000000]
+    probes = constants + [0, 8, 3000000]
+    wat_text, profile = compile_with_profile(chain_program(constants, probes))
+
+    assert "br_table" not in wat_text
+    assert profile.get_stat("switches", "binary_searches") == 1
+    assert run_main(wat_text) == ["1", "2", "3", "4", "5", "6", "0", "0", "0"]
+
+
+def test_or_conditions_and_repeated_constants():
+    code = r"""
+function pick(x)
+  if x == 1 or x == 2
+    return 12
+  elseif 3 == x
+    return 3
+  elseif x == 2
+    return 99
+  elseif x == 4
+    return 4
+  end
+  return 0
+end
+
+function main()
+  for i = 0 to 6
+    print pick(i)
+  end
+  return 0
+end
+"""
+    wat_text, profile = compile_with_profile(code)
+    assert profile.get_stat("switches", "jump_tables") == 1
+    assert run_main(wat_text) == ["0", "12", "12", "3", "4", "0"]
+
+
+@pytest.mark.parametrize("condition", ["x == 1 and x > 0", "x < 2"])
+def test_non_equality_chains_are_kept(condition):
+    code = f"""
+function pick(x)
+  if {condition}
+    return 1
+  elseif x == 2
+    return 2
+  elseif x == 3
+    return 3
+  elseif x == 4
+    return 4
+  end
+  return 0
+end
+
+function main()
+  print pick(3)
+  return 0
+end
+"""
+    wat_text, profile = compile_with_profile(code)
+    assert "switches" not in profile.passes
+    assert run_main(wat_text) == ["3"]
+
+
+def test_switch_inside_loop_with_invariant_operand():
+    code = r"""
+function main()
+  let k = 2
+  let total = 0
+  for i = 0 to 5
+    if k * 1 == 0
+      total = total + 1
+    elseif k * 1 == 1
+      total = total + 10
+    elseif k * 1 == 2
+      total = total + 100
+    elseif k * 1 == 3
+      total = total + 1000
+    end
+  end
+  print total
+  return 0
+end
+"""
+    wat_text, profile = compile_with_profile(code)
+    assert profile.get_stat("switches", "jump_tables") == 1
+    assert run_main(wat_text) == ["500"]
@@ -0,0 +1,166 @@
+# file: tests/compiler/optimizer/test_tail_calls.py
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.compile_profile import CompileProfile
+from lmn.compiler.optimizer.options import OptimizerOptions
+from tests.wasm_helpers import run_main
+
+
+def function_body(wat_text, name):
+    start = wat_text.index(f"(func ${name}")
+    return wat_text[start:wat_text.index("\n  )", start)]
+
+
+FACT = r"""
+function fact(n)
+  if n <= 1
+    return 1
+  else
+    return n * fact(n - 1)
+  end
+end
+
+function main()
+  print fact(5)
+  return 0
+end
+"""
+
+
+def test_fact_uses_accumulator_loop():
+    profile = CompileProfile()
+    wat, _ = compile_code_to_wat(FACT, profile=profile)
+    body = function_body(wat, "fact")
+
+    assert "loop $tail_fact" in body
+    assert "br $tail_fact" in body
+    assert "call $fact" not in body
+    assert "(local $__tail_acc i32)" in body
+    assert profile.get_stat("tail_calls", "accumulators") == 1
+    assert run_main(wat) == ["120"]
+
+
+def test_accumulator_can_be_disabled():
+    wat, _ = compile_code_to_wat(FACT, optimize=OptimizerOptions(accumulate_tail_calls=False))
+
+    assert "call $fact" in function_body(wat, "fact")
+    assert run_main(wat) == ["120"]
+
+
+def test_accumulator_is_kept_when_falling_off_the_end():
+    code = r"""
+    function s(n)
+      if n > 0
+        return n + s(n - 1)
+      end
+    end
+
+    function main()
+      print s(3)
+      return 0
+    end
+    """
+    optimized, _ = compile_code_to_wat(code)
+    unoptimized, _ = compile_code_to_wat(code, optimize=False)
+
+    assert "loop $tail_s" in function_body(optimized, "s")
+    assert run_main(optimized) == run_main(unoptimized) == ["6"]
+
+
+def test_accumulator_is_kept_by_a_bare_return():
+    code = r"""
+    function s(n)
+      if n > 0
+        return n + s(n - 1)
+      end
+      return
+    end
+
+    function prod(n)
+      if n > 0
+        return n * prod(n - 1)
+      end
+      return
+    end
+
+    function main()
+      print s(3)
+      print prod(3)
+      return 0
+    end
+    """
+    wat, _ = compile_code_to_wat(code)
+
+    # a bare return yields the default 0: 3 + 2 + 1 + 0 and 3 * 2 * 1 * 0
+    assert "loop $tail_prod" in function_body(wat, "prod")
+    assert run_main(wat) == ["6", "0"]
+
+
+def test_deep_tail_recursion_runs_in_constant_stack():
+    code = r"""
+    function count(n, acc)
+      if n == 0
+        return acc
+      end
+      return count(n - 1, acc + 1)
+    end
+
+    function main()
+      print count(1000000, 0)
+      return 0
+    end
+    """
+    wat, _ = compile_code_to_wat(code)
+    body = function_body(wat, "count")
+
+    assert "call $count" not in body
+    assert run_main(wat) == ["1000000"]
+
+
+def test_arguments_are_evaluated_before_params_change():
+    # swap(a, b) must see the *old* a when computing the second argument
+    code = r"""
+    function steps(n, a, b)
+      if n == 0
+        return a
+      end
+      return steps(n - 1, b, a + b)
+    end
+
+    function main()
+      print steps(10, 0, 1)
+      return 0
+    end
+    """
+    wat, _ = compile_code_to_wat(code)
+    assert run_main(wat) == ["55"]
+
+
+def test_return_call_for_mutual_recursion():
+    code = r"""
+    function is_even(n)
+      if n == 0
+        return 1
+      end
+      return is_odd(n - 1)
+    end
+
+    function is_odd(n)
+      if n == 0
+        return 0
+      end
+      return is_even(n - 1)
+    end
+
+    function main()
+      print is_even(100000)
+      return 0
+    end
+    """
+    wat, _ = compile_code_to_wat(code, optimize=OptimizerOptions(use_return_call=True))
+
+    assert "return_call $is_odd" in function_body(wat, "is_even")
+    assert run_main(wat) == ["1"]
+
+    plain, _ = compile_code_to_wat(code)
+    assert "return_call" not in plain
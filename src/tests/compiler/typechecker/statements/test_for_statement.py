@@ -0,0 +1,34 @@
+# file: tests/compiler/typechecker/statements/test_for_statement.py
+
+import pytest
+
+from lmn.compiler.lexer.tokenizer import Tokenizer
+from lmn.compiler.parser.parser import Parser
+from lmn.compiler.typechecker.ast_type_checker import type_check_program
+
+
+def check(code):
+    program = Parser(Tokenizer(code).tokenize()).parse()
+    type_check_program(program)
+    return program
+
+
+def find_for(program):
+    main = program.body[0]
+    return next(stmt for stmt in main.body if stmt.type == "ForStatement")
+
+
+@pytest.mark.parametrize("declaration, element_type", [
+    ("let xs = [1, 2, 3]", "int"),
+    ("let xs: long[] = [1, 2]", "long"),
+    ("let xs = [1.5, 2.5]", "double"),
+    ('let xs = ["a", "b"]', "string"),
+])
+def test_for_in_loop_variable_gets_the_element_type(declaration, element_type):
+    program = check(f"function main()\n  {declaration}\n  for x in xs\n    print x\n  end\n  return 0\nend\n")
+    assert find_for(program).variable.inferred_type == element_type
+
+
+def test_for_in_over_a_scalar_is_rejected():
+    with pytest.raises(TypeError, match="Cannot iterate over 'int'"):
+        check("function main()\n  let n = 5\n  for x in n\n    print x\n  end\n  return 0\nend\n")
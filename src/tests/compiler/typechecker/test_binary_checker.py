@@ -0,0 +1,52 @@
+# file: tests/compiler/typechecker/test_binary_checker.py
+
+import pytest
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from tests.wasm_helpers import run_main
+
+
+SHORT_CIRCUIT = r"""
+function expensive(n)
+  print n
+  return 1
+end
+
+function main()
+  let a = 0
+  let x = 2.5
+  if a > 1 and expensive(1) == 1
+    print 100
+  end
+  if x > 1.0 or expensive(2) == 1
+    print 200
+  end
+  if a == 0 and expensive(3) == 1
+    print 300
+  end
+  let both = a == 0 and x < 3.0
+  print both
+  return 0
+end
+"""
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_and_or_skip_the_right_side(optimize):
+    wat_text, _ = compile_code_to_wat(SHORT_CIRCUIT, optimize=optimize)
+    # expensive(1) and expensive(2) never run
+    assert run_main(wat_text) == ["200", "3", "300", "1"]
+
+
+@pytest.mark.parametrize("operand", ["x", "s"])
+def test_and_rejects_non_boolean_operands(operand):
+    code = f"""
+function main()
+  let x = 2.5
+  let s = "text"
+  let flag = 1 and {operand}
+  return 0
+end
+"""
+    with pytest.raises(TypeError, match="Expecting 'int' as boolean"):
+        compile_code_to_wat(code)
@@ -0,0 +1,142 @@
+# file: tests/compiler/typechecker/test_function_specializer.py
+
+import re
+
+import pytest
+
+from lmn.compiler.lexer.tokenizer import Tokenizer
+from lmn.compiler.parser.parser import Parser
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.typechecker.ast_type_checker import type_check_program
+from tests.wasm_helpers import run_wat
+
+
+ADD = "function add(a, b)\n  return a + b\nend\n\n"
+
+
+def check(code):
+    program = Parser(Tokenizer(code).tokenize()).parse()
+    type_check_program(program)
+    return program
+
+
+def compile_and_run(code, optimize=True):
+    wat_text, _ = compile_code_to_wat(code, optimize=optimize)
+    return wat_text, [line for line in run_wat(wat_text) if line != "\n"]
+
+
+def function_names(program):
+    return [node.name for node in program.body if node.type == "FunctionDefinition"]
+
+
+def test_int_calls_keep_the_original_function():
+    program = check(ADD + "function main()\n  let x = add(2, 3)\n  print x\n  return 0\nend\n")
+    assert function_names(program) == ["add", "main"]
+
+
+def test_double_call_gets_a_clone_next_to_the_original():
+    program = check(ADD + "function main()\n  let y = add(1.5, 2.25)\n  print y\n  return 0\nend\n")
+    assert function_names(program) == ["add", "add__f64_f64", "main"]
+
+    clone = program.body[1]
+    assert [p.type_annotation for p in clone.params] == ["double", "double"]
+    assert clone.return_type == "double"
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_each_signature_runs_its_own_specialisation(optimize):
+    code = ADD + (
+        "function main()\n"
+        "  let x = add(2, 3)\n"
+        "  let y = add(1.5, 2.25)\n"
+        "  let z = add(1.5, 2.25)\n"
+        "  print x\n"
+        "  print y\n"
+        "  print z\n"
+        "  return 0\n"
+        "end\n"
+    )
+    wat_text, output = compile_and_run(code, optimize)
+
+    assert output == ["5", "3.75", "3.75"]
+    assert "func $add (param $a i32) (param $b i32) (result i32)" in wat_text
+    assert "func $add__f64_f64 (param $a f64) (param $b f64) (result f64)" in wat_text
+    assert len(re.findall(r"^\s*\(func \$add__", wat_text, re.MULTILINE)) == 1
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_statement_calls_are_routed_to_the_clone(optimize):
+    code = (
+        "function show(v)\n"
+        "  print \"value \" v\n"
+        "end\n\n"
+        "function main()\n"
+        "  show(\"bob\")\n"
+        "  show(2.5)\n"
+        "  show(7)\n"
+        "  return 0\n"
+        "end\n"
+    )
+    wat_text, output = compile_and_run(code, optimize)
+
+    assert output == ["value ", "bob", "value ", "2.5", "value ", "7"]
+    assert "show__i32_string" in wat_text and "show__f64" in wat_text
+
+
+def test_recursive_calls_stay_inside_the_clone():
+    code = (
+        "function pw(x, n)\n"
+        "  if (n < 1)\n"
+        "    return x / x\n"
+        "  end\n"
+        "  return x * pw(x, n - 1)\n"
+        "end\n\n"
+        "function main()\n"
+        "  let a = pw(2, 10)\n"
+        "  let b = pw(1.5, 3)\n"
+        "  print a\n"
+        "  print b\n"
+        "  return 0\n"
+        "end\n"
+    )
+    wat_text, output = compile_and_run(code)
+
+    assert output == ["1024", "3.375"]
+    clone = wat_text[wat_text.index("(func $pw__f64_i32"):]
+    assert "call $pw__f64_i32" in clone[:clone.index("(func", 1)]
+
+
+def test_calls_over_the_cap_reuse_the_narrowest_wider_clone():
+    code = (
+        "function scale(a, b)\n  return a * b\nend\n\n"
+        "function main()\n"
+        "  let l: long = 7\n"
+        "  let s1 = scale(2.5, 2)\n"
+        "  let s2 = scale(2, 2.5)\n"
+        "  let s3 = scale(1.5, 1.5)\n"
+        "  let s4 = scale(l, l)\n"
+        "  let s5 = scale(l, 2)\n"
+        "  print s1\n"
+        "  print s2\n"
+        "  print s3\n"
+        "  print s4\n"
+        "  print s5\n"
+        "  return 0\n"
+        "end\n"
+    )
+    wat_text, output = compile_and_run(code)
+
+    assert output == ["5.0", "5.0", "2.25", "49", "14"]
+    assert "scale__i64_i32" not in wat_text
+    assert "i64.extend_i32_s" in wat_text
+
+
+def test_annotated_double_params_accept_int_arguments():
+    code = (
+        "function half(a: double)\n  return a / 2.0\nend\n\n"
+        "function main()\n  let h = half(3)\n  print h\n  return 0\nend\n"
+    )
+    wat_text, output = compile_and_run(code)
+
+    assert output == ["1.5"]
+    assert "f64.convert_i32_s" in wat_text
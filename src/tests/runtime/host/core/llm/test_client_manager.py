@@ -0,0 +1,86 @@
+# file: tests/runtime/host/core/llm/test_client_manager.py
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lmn.runtime.host.core.llm.adapters.llm_adapter import LLMAdapter
+from lmn.runtime.host.core.llm import client_manager
+from lmn.runtime.host.core.llm.client_manager import LLMClientManager, get_client_manager
+
+
+class StandInOllama(BaseHTTPRequestHandler):
+    """
+    Answers /api/chat and /api/generate like Ollama; records every request
+    and the client connection it arrived on.
+    """
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append((self.path, self.client_address, body))
+
+        reply = {"model": body.get("model"), "created_at": "2024-01-01T00:00:00Z", "done": True}
+        if self.path == "/api/chat":
+            reply["message"] = {"role": "assistant", "content": f"echo: {body['messages'][-1]['content']}"}
+        else:
+            reply["response"] = ""
+        data = json.dumps(reply).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    StandInOllama.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInOllama)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", StandInOllama.requests
+    server.shutdown()
+    server.server_close()
+
+
+def test_calls_share_one_pooled_connection(stand_in):
+    host, requests = stand_in
+    manager = LLMClientManager(host=host, keep_alive="5m")
+
+    for i in range(3):
+        response = manager.chat("llama3.2", [{"role": "user", "content": f"hi {i}"}])
+        assert response.message.content == f"echo: hi {i}"
+
+    assert len(requests) == 3
+    assert len({client for _, client, _ in requests}) == 1
+    assert all(body["keep_alive"] == "5m" for _, _, body in requests)
+    manager.close()
+
+
+def test_warm_up_loads_each_model(stand_in):
+    host, requests = stand_in
+    manager = LLMClientManager(host=host)
+
+    manager.warm_up(["llama3.2", "qwen2.5"], background=False)
+    assert [(path, body["model"]) for path, _, body in requests] == [
+        ("/api/generate", "llama3.2"), ("/api/generate", "qwen2.5"),
+    ]
+    manager.close()
+
+
+def test_adapters_use_the_shared_manager(stand_in, monkeypatch):
+    host, requests = stand_in
+    monkeypatch.setattr(client_manager, "_client_manager", LLMClientManager(host=host))
+
+    assert LLMAdapter([], cache=None).chat("ollama", "llama3.2", [{"role": "user", "content": "ping"}]) == "echo: ping"
+    assert LLMAdapter([], cache=None).chat("ollama", "llama3.2", [{"role": "user", "content": "pong"}]) == "echo: pong"
+    assert len({client for _, client, _ in requests}) == 1
+    get_client_manager().close()
@@ -0,0 +1,106 @@
+# file: tests/runtime/host/core/llm/test_mock_provider.py
+
+import random
+import time
+
+import pytest
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.runtime.host.core.llm import client_manager, response_cache
+from lmn.runtime.host.core.llm.adapters import mock_adapter, provider_registry
+from lmn.runtime.host.core.llm.adapters.llm_adapter import LLMAdapter
+from lmn.runtime.host.core.llm.adapters.mock_adapter import MockLLMSettings, parse_distribution, sample
+from lmn.runtime.host.core.llm.client_manager import LLMClientManager
+from lmn.runtime.host.core.llm.mock_server import MockOllamaServer
+from lmn.runtime.host.core.llm.response_cache import LLMResponseCache
+from tests.wasm_helpers import instantiate
+
+MESSAGES = [{"role": "user", "content": "Why is the sky blue?"}]
+
+
+@pytest.fixture
+def mock_provider(monkeypatch):
+    monkeypatch.setattr(provider_registry, "_default_provider", "mock")
+    monkeypatch.setattr(mock_adapter, "_mock_settings", MockLLMSettings(mode="template", template="[{prompt}]"))
+    monkeypatch.setattr(response_cache, "_response_cache", LLMResponseCache())
+
+
+def test_responses_are_deterministic_and_follow_the_distributions():
+    settings = MockLLMSettings(latency_seconds=("uniform", 0.1, 0.2), response_words=("choice", [3, 50]), seed=7)
+
+    text, latency = settings.respond("m", MESSAGES)
+    assert settings.respond("m", MESSAGES) == (text, latency)
+    assert MockLLMSettings(seed=7).respond("m", MESSAGES)[0] == "Why is the sky blue?"
+    assert 0.1 <= latency <= 0.2
+    assert len(text.split()) in (3, 50)
+    assert "".join(settings.chunks(text)) == text
+
+    assert parse_distribution("uniform:0.05,0.2") == ("uniform", 0.05, 0.2)
+    assert parse_distribution("choice:10,100") == ("choice", [10.0, 100.0])
+    assert sample(("normal", -5, 0.1), random.Random(1)) == 0.0
+
+
+def test_llm_adapter_dispatches_through_the_registry(mock_provider):
+    output = []
+    adapter = LLMAdapter(output, cache=None)
+
+    assert adapter.chat("", "m", MESSAGES) == "[Why is the sky blue?]"
+    chunks = []
+    assert adapter.chat("mock", "m", MESSAGES, on_chunk=chunks.append) == "".join(chunks)
+
+    assert adapter.chat("no-such-provider", "m", MESSAGES) == "[Why is the sky blue?]"
+    assert "falling back to 'mock'" in output[-1]
+
+    with pytest.raises(ValueError):
+        provider_registry.configure_default_provider("no-such-provider")
+
+
+class CountingMockAdapter(mock_adapter.MockAdapter):
+    calls = 0
+
+    def chat(self, *args, **kwargs):
+        CountingMockAdapter.calls += 1
+        return super().chat(*args, **kwargs)
+
+
+def test_a_program_makes_thousands_of_llm_calls_without_a_model_server(mock_provider, monkeypatch):
+    monkeypatch.setitem(provider_registry._providers, "mock", CountingMockAdapter)
+    monkeypatch.setattr(response_cache, "_response_cache", None)   # every call reaches the provider
+    CountingMockAdapter.calls = 0
+
+    wat_text, _ = compile_code_to_wat("""
+let n = 0
+for i = 0 to 2000
+  let answer = llm("q")
+  n = n + 1
+end
+print n
+""")
+    env, exports = instantiate(wat_text)
+
+    started = time.perf_counter()
+    exports["__top_level__"](env["store"])
+
+    assert CountingMockAdapter.calls == int("".join(env["output_lines"]).split()[0]) >= 2000
+    assert time.perf_counter() - started < 30
+
+
+def test_stand_in_server_speaks_the_ollama_chat_api(monkeypatch):
+    settings = MockLLMSettings(mode="template", template="{model} says {prompt}", latency_seconds=0.01)
+    with MockOllamaServer(settings) as server:
+        manager = LLMClientManager(host=server.url)
+        monkeypatch.setattr(client_manager, "_client_manager", manager)
+        adapter = LLMAdapter([], cache=None)
+        try:
+            assert adapter.chat("ollama", "tiny", MESSAGES) == "tiny says Why is the sky blue?"
+
+            chunks = []
+            streamed = adapter.chat("ollama", "tiny", MESSAGES, on_chunk=chunks.append)
+            assert streamed == "tiny says Why is the sky blue?"
+            assert len(chunks) == len(settings.chunks(streamed))
+
+            manager.warm_up(["tiny"], background=False)
+            assert server.requests == 3
+            assert server.models == {"tiny"}
+        finally:
+            manager.close()
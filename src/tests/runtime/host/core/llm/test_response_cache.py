@@ -0,0 +1,108 @@
+# file: tests/runtime/host/core/llm/test_response_cache.py
+
+from lmn.runtime.host.core.llm.adapters.llm_adapter import LLMAdapter
+from lmn.runtime.host.core.llm.adapters.ollama_adapter import LLM_ERROR_TEXT
+from lmn.runtime.host.core.llm.response_cache import LLMResponseCache, make_cache_key
+
+MESSAGES = [{"role": "user", "content": "Why is the sky blue?"}]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def counting_adapter(cache, replies=None):
+    """
+    An LLMAdapter whose Ollama calls are counted instead of sent.
+    """
+    calls = []
+
+    def fake_chat(model_name, messages, options=None, on_chunk=None):
+        calls.append((model_name, messages, options))
+        return (replies or {}).get(messages[-1]["content"], f"answer #{len(calls)}")
+
+    adapter = LLMAdapter([], cache=cache)
+    adapter.ollama_adapter.chat = fake_chat
+    return adapter, calls
+
+
+def test_key_covers_provider_model_messages_and_options():
+    key = make_cache_key("ollama", "llama3.2", MESSAGES)
+    assert key == make_cache_key("", "llama3.2", MESSAGES)
+    assert key != make_cache_key("ollama", "qwen", MESSAGES)
+    assert key != make_cache_key("ollama", "llama3.2", [{"role": "system", "content": "be brief"}] + MESSAGES)
+    assert key != make_cache_key("ollama", "llama3.2", MESSAGES, {"temperature": 0})
+
+
+def test_repeated_prompt_is_answered_from_memory():
+    cache = LLMResponseCache()
+    adapter, calls = counting_adapter(cache)
+
+    assert adapter.chat("ollama", "llama3.2", MESSAGES) == "answer #1"
+    assert adapter.chat("ollama", "llama3.2", MESSAGES) == "answer #1"
+    assert len(calls) == 1
+    assert cache.stats["memory_hits"] == 1 and cache.stats["misses"] == 1
+    assert cache.hit_rate() == 0.5
+
+
+def test_bypass_asks_again_and_refreshes_the_entry():
+    cache = LLMResponseCache()
+    adapter, calls = counting_adapter(cache)
+
+    adapter.chat("ollama", "llama3.2", MESSAGES)
+    assert adapter.chat("ollama", "llama3.2", MESSAGES, use_cache=False) == "answer #2"
+    assert adapter.chat("ollama", "llama3.2", MESSAGES) == "answer #2"
+    assert len(calls) == 2
+    assert cache.stats["bypasses"] == 1
+
+
+def test_errors_are_not_cached():
+    cache = LLMResponseCache()
+    adapter, calls = counting_adapter(cache, replies={"Why is the sky blue?": LLM_ERROR_TEXT})
+
+    adapter.chat("ollama", "llama3.2", MESSAGES)
+    adapter.chat("ollama", "llama3.2", MESSAGES)
+    assert len(calls) == 2
+    assert cache.stats["stores"] == 0
+
+
+def test_entries_expire_and_the_lru_is_bounded():
+    clock = FakeClock()
+    cache = LLMResponseCache(max_entries=2, ttl_seconds=60, clock=clock)
+
+    cache.put("a", "A")
+    clock.now += 61
+    assert cache.get("a") is None
+
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")          # 'b' is now least recently used
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+    assert cache.stats["evictions"] == 1
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    db_path = str(tmp_path / "llm_cache.sqlite")
+    clock = FakeClock()
+    LLMResponseCache(db_path=db_path, ttl_seconds=60, clock=clock).put("k", "from disk")
+
+    cache = LLMResponseCache(db_path=db_path, ttl_seconds=60, clock=clock)
+    assert cache.get("k") == "from disk"
+    assert cache.get("k") == "from disk"
+    assert cache.stats["disk_hits"] == 1 and cache.stats["memory_hits"] == 1
+
+    clock.now += 61
+    assert LLMResponseCache(db_path=db_path, ttl_seconds=60, clock=clock).get("k") is None
+
+
+def test_caching_can_be_disabled():
+    adapter, calls = counting_adapter(cache=None)
+    adapter.chat("ollama", "llama3.2", MESSAGES)
+    adapter.chat("ollama", "llama3.2", MESSAGES)
+    assert len(calls) == 2
@@ -0,0 +1,127 @@
+# file: tests/runtime/host/core/tools/test_http_client.py
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.runtime.host.core.tools import http_client
+from lmn.runtime.host.core.tools.http_client import ToolsHttpClient
+from tests.wasm_helpers import instantiate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class StandInTools(BaseHTTPRequestHandler):
+    """
+    Answers the weather / time / joke endpoints; numbers every response and
+    records the client connection it arrived on.
+    """
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def do_GET(self):
+        self.requests.append((self.path, self.client_address))
+        url = urlparse(self.path)
+        count = len(self.requests)
+        if url.path == "/v1/forecast":
+            query = parse_qs(url.query)
+            body = json.dumps({"latitude": float(query["latitude"][0]), "response": count})
+        elif url.path == "/api/timezone/Etc/UTC":
+            body = json.dumps({"datetime": f"tick {count}"})
+        else:
+            body = f"joke #{count}"
+        data = body.encode()
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    StandInTools.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInTools)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield {tool: base_url for tool in ("weather", "internet_time", "joke")}, StandInTools.requests
+    server.shutdown()
+    server.server_close()
+
+
+def test_same_coordinates_are_answered_from_the_cache(stand_in):
+    base_urls, requests = stand_in
+    clock = FakeClock()
+    client = ToolsHttpClient(base_urls=base_urls, clock=clock)
+
+    first = client.get_json("weather", "/v1/forecast", {"latitude": 1.5, "longitude": 2.0})
+    clock.now += 30
+    assert client.get_json("weather", "/v1/forecast", {"latitude": 1.5, "longitude": 2.0}) == first
+    client.get_json("weather", "/v1/forecast", {"latitude": 9.0, "longitude": 2.0})
+
+    assert len(requests) == 2
+    assert client.stats["hits"] == 1 and client.stats["misses"] == 2
+    assert len({conn for _, conn in requests}) == 1     # one pooled connection
+    client.close()
+
+
+def test_stale_response_is_served_while_it_is_refreshed(stand_in):
+    base_urls, requests = stand_in
+    clock = FakeClock()
+    client = ToolsHttpClient(base_urls=base_urls, ttl_seconds={"weather": 60},
+                             stale_seconds={"weather": 600}, clock=clock)
+    params = {"latitude": 1.0, "longitude": 2.0}
+
+    assert client.get_json("weather", "/v1/forecast", params)["response"] == 1
+    clock.now += 120
+    assert client.get_json("weather", "/v1/forecast", params)["response"] == 1   # stale, at once
+    client.wait_for_refreshes(timeout=5)
+    assert client.get_json("weather", "/v1/forecast", params)["response"] == 2   # refreshed
+    assert client.stats["stale_hits"] == 1 and client.stats["refreshes"] == 1
+
+    clock.now += 2000                                                            # too old to serve
+    assert client.get_json("weather", "/v1/forecast", params)["response"] == 3
+    client.close()
+
+
+def test_clock_is_cached_per_time_bucket_and_jokes_never(stand_in):
+    base_urls, requests = stand_in
+    clock = FakeClock()
+    client = ToolsHttpClient(base_urls=base_urls, clock=clock)
+
+    first = client.get_json("internet_time", "/api/timezone/Etc/UTC")
+    clock.now += 0.5
+    assert client.get_json("internet_time", "/api/timezone/Etc/UTC") == first
+    clock.now += 0.5                                                             # next bucket
+    assert client.get_json("internet_time", "/api/timezone/Etc/UTC") != first
+
+    assert client.get_text("joke", "/") != client.get_text("joke", "/")
+    client.close()
+
+
+def test_weather_builtin_uses_the_shared_client(stand_in, monkeypatch):
+    base_urls, requests = stand_in
+    monkeypatch.setattr(http_client, "_tools_http_client", ToolsHttpClient(base_urls=base_urls))
+
+    wat_text, _ = compile_code_to_wat("print get_weather(1.5, 2.0)\nprint get_weather(1.5, 2.0)")
+    env, exports = instantiate(wat_text)
+    exports["__top_level__"](env["store"])
+
+    printed = [json.loads(line) for line in env["output_lines"] if line.strip()]
+    assert [data["response"] for data in printed] == [1, 1]
+    assert all("fetched_at" in data for data in printed)
+    assert len(requests) == 1
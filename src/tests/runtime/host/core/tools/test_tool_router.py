@@ -0,0 +1,115 @@
+# file: tests/runtime/host/core/tools/test_tool_router.py
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.runtime.host.core.llm import response_cache
+from lmn.runtime.host.core.llm.adapters import mock_adapter, provider_registry
+from lmn.runtime.host.core.tools import http_client, tool_router
+from lmn.runtime.host.core.tools.http_client import ToolsHttpClient
+from lmn.runtime.host.core.tools.tool_router import ToolRouter
+from tests.wasm_helpers import run_wat
+
+
+class StandInJokes(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        data = b"Why did the scarecrow win? He was outstanding in his field."
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class CountingMockAdapter(mock_adapter.MockAdapter):
+    calls = 0
+
+    def chat(self, *args, **kwargs):
+        CountingMockAdapter.calls += 1
+        return super().chat(*args, **kwargs)
+
+
+@pytest.fixture
+def tools_offline(monkeypatch):
+    """
+    Jokes from a local stand-in, the LLM is the mock provider answering
+    with a structured get_system_time choice (counting its calls).
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInJokes)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = ToolsHttpClient(base_urls={"joke": f"http://127.0.0.1:{server.server_address[1]}"})
+    monkeypatch.setattr(http_client, "_tools_http_client", client)
+
+    settings = mock_adapter.MockLLMSettings(mode="template", template='{{"tool": "get_system_time"}}')
+    monkeypatch.setattr(mock_adapter, "_mock_settings", settings)
+    monkeypatch.setitem(provider_registry._providers, "mock", CountingMockAdapter)
+    monkeypatch.setattr(provider_registry, "_default_provider", "mock")
+    monkeypatch.setattr(response_cache, "_response_cache", None)
+    monkeypatch.setattr(tool_router, "_tool_router", ToolRouter())
+    CountingMockAdapter.calls = 0
+    yield
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def run(code):
+    wat_text, _ = compile_code_to_wat(code)
+    return "".join(run_wat(wat_text))
+
+
+def test_index_routes_unambiguous_commands():
+    router = ToolRouter()
+
+    assert router.route("Tell me a joke!") == ("get_joke", [])
+    assert router.route("get_weather(52.52, 13.41)") == ("get_weather", [52.52, 13.41])
+    assert router.route("weather in Berlin, 52.52 13.41") == ("get_weather", [52.52, 13.41])
+    assert router.route("what's the forecast?") == ("get_weather", [40.7128, -74.006])
+    assert router.route("unix timestamp please") == ("get_system_time", [])
+    assert router.route("what time is it?") is None          # system or internet time?
+    assert router.route("a joke or the weather") is None     # two tools, one match each
+
+    assert router.route("TELL me   a joke!") == ("get_joke", [])
+    assert router.stats["cached"] == 1
+
+
+def test_llm_answers_are_read_as_structured_choices():
+    router = ToolRouter()
+
+    assert router.route_llm_response("time?", 'Sure: {"tool": "get_internet_time", "arguments": []}') == \
+        (("get_internet_time", []), "")
+    assert router.route("time?") == ("get_internet_time", [])   # decision cached
+
+    assert router.route_llm_response("weather", '{"tool": "get_weather", "arguments": {"lat": 1, "lon": 2}}')[0] == \
+        ("get_weather", [1.0, 2.0])
+    assert router.route_llm_response("hi", '{"tool": null, "reply": "Hello!"}') == (None, "Hello!")
+    assert router.route_llm_response("x", "You could call get_joke() for that.")[0] == ("get_joke", [])
+    assert router.stats["unrouted"] == 1
+
+
+def test_call_tools_skips_the_llm_for_indexed_commands(tools_offline):
+    started = time.perf_counter()
+    output = run('print call_tools("tell me a joke")')
+
+    assert "outstanding in his field" in output
+    assert CountingMockAdapter.calls == 0
+    assert time.perf_counter() - started < 1
+
+
+def test_call_tools_asks_the_llm_once_per_ambiguous_command(tools_offline, monkeypatch):
+    monkeypatch.setattr(time, "time", lambda: 1234567.0)
+
+    output = run('print call_tools("what time is it?")\nprint call_tools("what time is it?")')
+
+    assert output.split() == ["1234567", "1234567"]
+    assert CountingMockAdapter.calls == 1
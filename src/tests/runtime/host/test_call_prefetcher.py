@@ -0,0 +1,133 @@
+# file: tests/runtime/host/test_call_prefetcher.py
+
+import json
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.compiler.optimizer.options import OptimizerOptions
+from lmn.runtime.host.call_prefetcher import CallPrefetcher, wait_for
+from lmn.runtime.host.core.llm import client_manager, response_cache
+from lmn.runtime.host.core.llm.client_manager import LLMClientManager
+from lmn.runtime.host.core.llm.response_cache import LLMResponseCache
+from tests.wasm_helpers import instantiate, run_main
+
+DELAY_SECONDS = 0.5
+
+
+class SlowOllama(BaseHTTPRequestHandler):
+    """
+    Answers /api/chat like Ollama after DELAY_SECONDS.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(DELAY_SECONDS)
+        reply = {
+            "model": body.get("model"), "created_at": "2024-01-01T00:00:00Z", "done": True,
+            "message": {"role": "assistant", "content": f"<{body['messages'][-1]['content']}>"},
+        }
+        data = json.dumps(reply).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_concurrent(code):
+    wat_text, _ = compile_code_to_wat(code, optimize=OptimizerOptions(concurrent_calls=True))
+    return run_main(wat_text)
+
+
+@pytest.fixture
+def slow_llm(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowOllama)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    manager = LLMClientManager(host=f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setattr(client_manager, "_client_manager", manager)
+    monkeypatch.setattr(response_cache, "_response_cache", LLMResponseCache())
+    yield
+    manager.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_independent_prompts_take_about_as_long_as_one(slow_llm):
+    code = """
+let answers = [llm("a"), llm("b"), llm("c"), llm("d")]
+print answers
+"""
+    started = time.perf_counter()
+    output = run_concurrent(code)
+    elapsed = time.perf_counter() - started
+
+    assert output == ["['<a>',", "'<b>',", "'<c>',", "'<d>']"]
+    assert elapsed < 2.5 * DELAY_SECONDS   # sequential: 4 * DELAY_SECONDS
+
+
+def test_dependent_prompt_still_sees_the_first_answer(slow_llm):
+    code = """
+let first = llm("a")
+let second = llm(first)
+print second
+"""
+    output = run_concurrent(code)
+    assert output == ["<<a>>"]
+
+
+def test_futures_are_taken_in_submission_order():
+    prefetcher = CallPrefetcher(max_workers=2)
+    first = prefetcher.submit(("llm", "x"), lambda: "one")
+    second = prefetcher.submit(("llm", "x"), lambda: "two")
+
+    assert prefetcher.take(("llm", "x")) is first
+    assert prefetcher.take(("llm", "x")) is second
+    assert prefetcher.take(("llm", "x")) is None
+    assert prefetcher.stats == {"submitted": 2, "taken": 2, "missed": 1}
+    prefetcher.shutdown()
+
+
+def test_failed_prefetch_falls_back_to_a_direct_call():
+    future = Future()
+    future.set_exception(ConnectionError("refused"))
+    assert wait_for(future, lambda: "direct") == "direct"
+
+
+@pytest.fixture
+def unreachable_llm(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowOllama)
+    port = server.server_address[1]
+    server.server_close()                   # nothing listens there any more
+    manager = LLMClientManager(host=f"http://127.0.0.1:{port}")
+    monkeypatch.setattr(client_manager, "_client_manager", manager)
+    monkeypatch.setattr(response_cache, "_response_cache", LLMResponseCache())
+    yield
+    manager.close()
+
+
+def test_prefetched_calls_output_their_lines_in_program_order(unreachable_llm):
+    code = """
+let first = llm("a")
+print "mid"
+let second = llm("b")
+"""
+    wat_text, _ = compile_code_to_wat(code, optimize=OptimizerOptions(concurrent_calls=True))
+    threads = set()
+    env, exports = instantiate(wat_text, on_output=lambda text: threads.add(threading.current_thread()))
+    exports["__top_level__"](env["store"])
+
+    lines = [line.strip() for line in env["output_lines"] if line.strip()]
+    assert len(lines) == 3 and "mid" == lines[1]
+    assert lines[0].startswith("[LLM]") and lines[2].startswith("[LLM]")
+    assert threads == {threading.current_thread()}
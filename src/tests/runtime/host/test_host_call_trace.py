@@ -0,0 +1,109 @@
+# file: tests/runtime/host/test_host_call_trace.py
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.runtime.host.core.llm import client_manager, response_cache
+from lmn.runtime.host.core.llm.client_manager import LLMClientManager
+from lmn.runtime.host.core.llm.response_cache import LLMResponseCache
+from lmn.runtime.host.host_call_trace import HostCallTrace, ReplayMissError, RECORD, REPLAY
+from tests.wasm_helpers import run_wat
+
+CODE = """
+let now = get_system_time()
+let answer = llm("Why is the sky blue?")
+print now
+print answer
+"""
+
+
+class EchoOllama(BaseHTTPRequestHandler):
+    """
+    Answers /api/chat like Ollama, counting the requests it gets.
+    """
+    protocol_version = "HTTP/1.1"
+    requests_seen = 0
+
+    def do_POST(self):
+        EchoOllama.requests_seen += 1
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        reply = {
+            "model": body.get("model"), "created_at": "2024-01-01T00:00:00Z", "done": True,
+            "message": {"role": "assistant", "content": f"<{body['messages'][-1]['content']}>"},
+        }
+        data = json.dumps(reply).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def use_llm_host(monkeypatch, host):
+    manager = LLMClientManager(host=host)
+    monkeypatch.setattr(client_manager, "_client_manager", manager)
+    monkeypatch.setattr(response_cache, "_response_cache", LLMResponseCache())
+    return manager
+
+
+def run_traced(code, trace):
+    wat_text, _ = compile_code_to_wat(code)
+    return "".join(run_wat(wat_text, trace=trace))
+
+
+@pytest.fixture
+def echo_llm(monkeypatch):
+    EchoOllama.requests_seen = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoOllama)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    manager = use_llm_host(monkeypatch, f"http://127.0.0.1:{server.server_address[1]}")
+    yield
+    manager.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_replay_reproduces_a_recorded_run_offline(echo_llm, monkeypatch, tmp_path):
+    path = str(tmp_path / "trace.jsonl.gz")
+
+    trace = HostCallTrace(path, RECORD)
+    recorded = run_traced(CODE, trace)
+    trace.close()
+    assert "<Why is the sky blue?>" in recorded
+    assert trace.stats["recorded"] == 2
+
+    # Another clock, no LLM server: everything comes from the trace
+    monkeypatch.setattr(time, "time", lambda: 0.0)
+    use_llm_host(monkeypatch, "http://127.0.0.1:9")
+    requests_before = EchoOllama.requests_seen
+
+    trace = HostCallTrace(path, REPLAY)
+    assert run_traced(CODE, trace) == recorded
+    assert trace.stats["replayed"] == 2
+    assert EchoOllama.requests_seen == requests_before
+
+
+def test_replay_raises_for_calls_not_in_the_trace(echo_llm, tmp_path):
+    path = str(tmp_path / "trace.jsonl")
+
+    trace = HostCallTrace(path, RECORD)
+    run_traced('print llm("a")', trace)
+    trace.close()
+
+    with open(path) as f:
+        assert [json.loads(line)["a"][0] for line in f] == ["a"]
+
+    with pytest.raises(Exception) as excinfo:
+        run_traced('print llm("b")', HostCallTrace(path, REPLAY))
+    assert "No recorded result" in str(excinfo.value)
+    assert issubclass(ReplayMissError, LookupError)
@@ -0,0 +1,94 @@
+# file: tests/runtime/host/test_output_sink.py
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.runtime.host.core.llm import client_manager, response_cache
+from lmn.runtime.host.core.llm.client_manager import LLMClientManager
+from lmn.runtime.host.core.llm.response_cache import LLMResponseCache
+from lmn.runtime.host.output_sink import OutputSink, append_streamed, stream_chunk
+from tests.wasm_helpers import instantiate
+
+CHUNKS = ["The sky ", "is blue ", "because of Rayleigh scattering."]
+CHUNK_DELAY_SECONDS = 0.2
+
+
+class StreamingOllama(BaseHTTPRequestHandler):
+    """
+    Answers a streamed /api/chat like Ollama: one JSON line per chunk,
+    CHUNK_DELAY_SECONDS apart.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        assert body.get("stream") is True
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, chunk in enumerate(CHUNKS + [""]):
+            line = json.dumps({
+                "model": body["model"], "created_at": "2024-01-01T00:00:00Z",
+                "message": {"role": "assistant", "content": chunk}, "done": index == len(CHUNKS),
+            }).encode() + b"\n"
+            self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            self.wfile.flush()
+            time.sleep(CHUNK_DELAY_SECONDS)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def streaming_llm(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StreamingOllama)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    manager = LLMClientManager(host=f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setattr(client_manager, "_client_manager", manager)
+    monkeypatch.setattr(response_cache, "_response_cache", LLMResponseCache())
+    yield
+    manager.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_sink_forwards_appends_and_chunks_but_records_whole_items():
+    shown = []
+    sink = OutputSink(shown.append)
+
+    sink.append("1")
+    stream_chunk(sink, "ab")
+    stream_chunk(sink, "cd")
+    append_streamed(sink, "abcd")
+
+    assert shown == ["1", "ab", "cd"]
+    assert sink == ["1", "abcd"]
+
+    plain = []
+    stream_chunk(plain, "ab")
+    append_streamed(plain, "ab")
+    assert plain == ["ab"]
+
+
+def test_printed_llm_response_is_shown_while_it_arrives(streaming_llm):
+    wat_text, _ = compile_code_to_wat('print llm("Why is the sky blue?")')
+    assert "call $llm_print" in wat_text
+
+    shown = []
+    started = time.perf_counter()
+    env, exports = instantiate(wat_text, on_output=lambda text: shown.append((time.perf_counter() - started, text)))
+    exports["__top_level__"](env["store"])
+    finished = time.perf_counter() - started
+
+    assert [text for _, text in shown] == CHUNKS + ["\n"]
+    assert shown[0][0] < finished - CHUNK_DELAY_SECONDS   # first output long before the end
+    assert list(env["output_lines"]) == ["".join(CHUNKS), "\n"]
@@ -0,0 +1,79 @@
+# file: tests/runtime/test_code_block_pipeline.py
+
+import time
+
+import wasmtime
+
+from lmn.compiler.pipeline import compile_code_to_wat
+from lmn.runtime.code_block_pipeline import CodeBlockPipeline
+from lmn.runtime.utils import LmnBlockScanner, extract_lmn_code
+from lmn.runtime.wasm_runner import create_environment
+
+REPLY = (
+    "Here you go:\n```lmn\nprint 1 + 1\n```\n"
+    "and a second one:\n```lmn\nprint 6 * 7\n```\n"
+    "That's all."
+)
+COMPILE_SECONDS = 0.2
+CHUNK_SECONDS = 0.02
+
+
+def compile_wat(code, engine):
+    # WAT straight into wasmtime (no wat2wasm needed), slowed down like a big block
+    time.sleep(COMPILE_SECONDS)
+    return wasmtime.Module(engine, compile_code_to_wat(code)[0])
+
+
+def chunked(text, size=5):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_scanner_returns_each_block_once_its_fence_closes():
+    scanner = LmnBlockScanner()
+    found = [(len(scanner.text), block) for chunk in chunked(REPLY) for block in scanner.feed(chunk)]
+
+    assert [block for _, block in found] == extract_lmn_code(REPLY)
+    assert found[0][0] < REPLY.index("second")       # long before the reply is complete
+    assert scanner.finish() == []
+
+    scanner = LmnBlockScanner()
+    scanner.feed("Try `lmn\nprint 3` now")
+    assert scanner.finish() == ["print 3"]
+
+
+def test_blocks_compile_while_the_reply_streams_and_run_in_order():
+    env = create_environment()
+    events = []
+    pipeline = CodeBlockPipeline(
+        env,
+        on_start=lambda block: events.append(("run", block)),
+        on_result=lambda block, outputs: events.append(("output", "".join(outputs).strip())),
+        compile_fn=compile_wat,
+    )
+
+    started = time.perf_counter()
+    chunks = chunked(REPLY + " Bye!" * 40)
+    for chunk in chunks:
+        time.sleep(CHUNK_SECONDS)
+        pipeline.feed(chunk)
+        if not events:
+            streamed_before_first_run = pipeline.scanner.text
+    streaming_done = time.perf_counter() - started
+    results = pipeline.finish()
+    total = time.perf_counter() - started
+
+    assert events == [("run", "print 1 + 1"), ("output", "2"), ("run", "print 6 * 7"), ("output", "42")]
+    assert [(block, "".join(outputs).strip()) for block, outputs in results] == \
+        [("print 1 + 1", "2"), ("print 6 * 7", "42")]
+    assert len(streamed_before_first_run) < len(pipeline.scanner.text)   # ran mid-reply
+    assert total - streaming_done < COMPILE_SECONDS                       # compile hidden behind the stream
+
+
+def test_compile_errors_are_reported_in_place():
+    env = create_environment()
+    pipeline = CodeBlockPipeline(env, compile_fn=compile_wat)
+    pipeline.feed("```lmn\nprint (\n```\n```lmn\nprint 5\n```")
+    results = pipeline.finish()
+
+    assert results[0][1][0].startswith("Compilation error:")
+    assert "".join(results[1][1]).strip() == "5"
@@ -0,0 +1,39 @@
+# file: tests/wasm_helpers.py
+
+import wasmtime
+
+from lmn.runtime.wasm_runner import create_environment
+
+
+def instantiate(wat_text, **environment_options):
+    """
+    Instantiate the WAT directly (no wat2wasm needed) in a fresh
+    environment, create_environment(**environment_options); returns
+    (env, exports).
+    """
+    env = create_environment(**environment_options)
+    module = wasmtime.Module(env["engine"], wat_text)
+    instance = env["linker"].instantiate(env["store"], module)
+    exports = instance.exports(env["store"])
+    env["memory_ref"][0] = exports["memory"]
+    return env, exports
+
+
+def run_wat(wat_text, profile=None, **environment_options) -> list[str]:
+    """
+    Run the module's main (or __top_level__); returns the output lines.
+    'profile' (a RuntimeProfile) gets the module's counters after the run.
+    """
+    env, exports = instantiate(wat_text, **environment_options)
+    entry = exports.get("main") or exports.get("__top_level__")
+    entry(env["store"])
+    if profile is not None:
+        profile.collect(env["store"], exports)
+    return list(env["output_lines"])
+
+
+def run_main(wat_text, profile=None, **environment_options) -> list[str]:
+    """
+    Like run_wat, but returns the printed output as a list of tokens.
+    """
+    return "".join(run_wat(wat_text, profile=profile, **environment_options)).split()